@@ -7,35 +7,141 @@ using Algorand Standard Assets (ASA) with ARC-53 metadata integration.
 
 Features:
 - ASA Creation with metadata
-- Mint/Burn functionality (admin only)
-- Transfer restrictions (blacklist/whitelist)
+- Mint/Burn functionality (admin only) with minted/burned/circulating supply counters
+- Blacklist (box-backed, one box per address): blacklisted accounts cannot
+  receive mints. Plain ASA transfers between holders do not pass through the
+  app (the ASA has no freeze address), so the blacklist does not restrict them
 - Multisig enforcement
 - IPFS metadata integration
+- ARC-28 events for mints, burns, blacklist changes and CID updates
 
 Note: This is a template file showing the intended structure.
 For actual deployment, use AlgoKit with AlgoPy framework.
 """
 
-from algopy import ARC4Contract, Asset, Txn, Global, UInt64, String, Bytes
-from algopy.arc4 import abimethod, String as ARC4String
+from algopy import (
+    ARC4Contract, arc4, Account, BoxMap, GlobalState, Txn, Global, TransactionType, UInt64, Bytes, itxn, op,
+    subroutine, urange
+)
+from algopy.arc4 import (
+    abimethod, baremethod, Address, Bool as ARC4Bool, DynamicArray, String as ARC4String, Struct,
+    UInt8 as ARC4UInt8, UInt64 as ARC4UInt64
+)
 from typing import Literal
 
+# Bumped whenever CoreState or TextState change shape; off-chain decoders
+# (scripts/state_layout.py) check it
+STATE_LAYOUT_VERSION = 2
+
+# Key + value of one global entry may not exceed 128 bytes
+MAX_TEXT_STATE_BYTES = 127
+
+
+class CoreState(Struct):
+    """
+    Fixed-width contract fields, packed into global key "c" (66 bytes)
+    
+    `minted` and `burned` are running totals kept by mint and burn;
+    circulating supply is their difference, so it is never summed over
+    holders.
+    """
+    version: ARC4UInt8
+    admin: Address
+    farm_token_id: ARC4UInt64
+    total_supply: ARC4UInt64
+    multisig_threshold: ARC4UInt8
+    minted: ARC4UInt64
+    burned: ARC4UInt64
+
+
+class TextState(Struct):
+    """
+    Variable-length contract fields, packed into global key "t"
+    """
+    token_name: ARC4String
+    token_unit: ARC4String
+    ipfs_cid: ARC4String
+
+
+# ARC-28 events. Each is logged as sha512_256("<Name>(<types>)")[:4] followed
+# by the ARC-4 encoded struct; scripts/contract_events.py decodes them.
+# Batch methods emit one event per item actually changed, which stays
+# within the 32-log / 1 KB per-call limits at their maximum batch sizes.
+
+class Minted(Struct):
+    """
+    Tokens released from the app reserve to a recipient
+    """
+    recipient: Address
+    amount: ARC4UInt64
+
+
+class Burned(Struct):
+    """
+    Tokens clawed back from an account into the app reserve
+    """
+    account: Address
+    amount: ARC4UInt64
+
+
+class BlacklistUpdated(Struct):
+    """
+    An address was added to (True) or removed from (False) the blacklist
+    """
+    account: Address
+    blacklisted: ARC4Bool
+
+
+class MetadataCidUpdated(Struct):
+    """
+    The token's IPFS metadata CID changed
+    """
+    cid: ARC4String
+
+
 class FarmFoodTokenizer(ARC4Contract):
     """
     Smart contract for tokenizing agricultural products
     """
     
     def __init__(self) -> None:
-        # Contract state
-        self.admin = Txn.sender
-        self.farm_token_id = UInt64(0)
-        self.total_supply = UInt64(1_000_000_00)  # 1M tokens with 2 decimals
-        self.multisig_threshold = UInt64(2)  # 2-of-3 multisig
+        # Contract state: two global byte slices instead of one key per
+        # field, so app creation reserves 2 schema entries rather than 7
+        self.core = GlobalState(
+            CoreState(
+                version=ARC4UInt8(STATE_LAYOUT_VERSION),
+                admin=Address(Txn.sender),
+                farm_token_id=ARC4UInt64(0),
+                total_supply=ARC4UInt64(1_000_000_00),  # 1M tokens with 2 decimals
+                multisig_threshold=ARC4UInt8(2),  # 2-of-3 multisig
+                minted=ARC4UInt64(0),
+                burned=ARC4UInt64(0),
+            ),
+            key="c",
+        )
         
         # Metadata
-        self.token_name = String("FarmToken")
-        self.token_unit = String("FT")
-        self.ipfs_cid = String("QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG")
+        self.text = GlobalState(
+            TextState(
+                token_name=ARC4String("FarmToken"),
+                token_unit=ARC4String("FT"),
+                ipfs_cid=ARC4String("QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"),
+            ),
+            key="t",
+        )
+        
+        # Blacklist: one box per address ("bl" + 32-byte public key), so
+        # lookups are a single box read and the list is not bound by the
+        # global state key limit. Each entry locks 16,500 microAlgos of
+        # min-balance in the app account.
+        self.blacklist = BoxMap(Account, ARC4Bool, key_prefix=b"bl")
+    
+    @baremethod(allow_actions=["UpdateApplication"])
+    def update(self) -> None:
+        """
+        Allow the admin to update the program in place on redeploy
+        """
+        assert Txn.sender == self._admin(), "Only admin can update the contract"
     
     @abimethod
     def create_asa(self, 
@@ -58,22 +164,38 @@ class FarmFoodTokenizer(ARC4Contract):
             Asset ID of created ASA
         """
         # Only admin can create ASA
-        assert Txn.sender == self.admin, "Only admin can create ASA"
+        core = self.core.value.copy()
+        assert Txn.sender == core.admin.native, "Only admin can create ASA"
+        assert core.farm_token_id.native == UInt64(0), "ASA already created"
         
         # Create ASA with metadata URL pointing to IPFS
-        metadata_url = Bytes("ipfs://") + metadata_cid.native
+        metadata_url = Bytes(b"ipfs://") + metadata_cid.native.bytes
         
-        # In actual implementation, use Asset.create() from AlgoPy
-        # This is a placeholder for the template
-        asset_id = UInt64(123456789)  # Mock asset ID
-        self.farm_token_id = asset_id
+        # The app account holds the full supply as reserve and keeps the
+        # manager and clawback roles so mint/burn can move tokens
+        asset = itxn.AssetConfig(
+            asset_name=asset_name.native,
+            unit_name=unit_name.native,
+            total=total_supply,
+            decimals=decimals,
+            url=metadata_url,
+            manager=Global.current_application_address,
+            reserve=Global.current_application_address,
+            clawback=Global.current_application_address,
+            fee=0,
+        ).submit().created_asset
         
-        return asset_id
+        core.farm_token_id = ARC4UInt64(asset.id)
+        core.total_supply = ARC4UInt64(total_supply)
+        self.core.value = core.copy()
+        self._set_text(TextState(token_name=asset_name, token_unit=unit_name, ipfs_cid=metadata_cid))
+        
+        return asset.id
     
     @abimethod
-    def mint_tokens(self, recipient: ARC4String, amount: UInt64) -> Literal["success"]:
+    def mint_tokens(self, recipient: Address, amount: UInt64) -> Literal["success"]:
         """
-        Mint new tokens (admin only)
+        Mint new tokens (admin only) to a recipient that is not blacklisted
         
         Args:
             recipient: Address to receive minted tokens
@@ -83,16 +205,80 @@ class FarmFoodTokenizer(ARC4Contract):
             Success message
         """
         # Only admin can mint
-        assert Txn.sender == self.admin, "Only admin can mint tokens"
+        assert Txn.sender == self._admin(), "Only admin can mint tokens"
         
-        # Check supply limits
+        # Check supply limits: circulating supply may never exceed total_supply
         assert amount > UInt64(0), "Amount must be positive"
+        core = self.core.value.copy()
+        assert amount <= self._unminted(core), "Mint exceeds available supply"
+        assert recipient.native not in self.blacklist, "Recipient is blacklisted"
+        core.minted = ARC4UInt64(core.minted.native + amount)
+        self.core.value = core.copy()
         
-        # In actual implementation, perform asset transfer from creator
-        # This is a placeholder for the template
+        # Release tokens from the app reserve to the recipient
+        itxn.AssetTransfer(
+            xfer_asset=core.farm_token_id.native,
+            asset_receiver=recipient.native,
+            asset_amount=amount,
+            fee=0,
+        ).submit()
+        arc4.emit(Minted(recipient, ARC4UInt64(amount)))
         
         return "success"
     
+    @abimethod
+    def mint_tokens_batch(self,
+                          recipients: DynamicArray[Address],
+                          amounts: DynamicArray[ARC4UInt64]) -> UInt64:
+        """
+        Mint tokens to many recipients in one call (admin only)
+        
+        Transfers are sent as a single inner transaction group with zero
+        fees; the outer call covers them through fee pooling. The whole batch
+        fails if any recipient is blacklisted, so every recipient needs its
+        blacklist box referenced.
+        
+        Args:
+            recipients: Addresses to receive minted tokens
+            amounts: Amount for each recipient
+            
+        Returns:
+            Total amount minted
+        """
+        assert Txn.sender == self._admin(), "Only admin can mint tokens"
+        assert recipients.length == amounts.length, "Recipients and amounts must match"
+        assert recipients.length > 0, "Batch must not be empty"
+        
+        total = UInt64(0)
+        for amount in amounts:
+            assert amount.native > 0, "Amount must be positive"
+            total += amount.native
+        
+        # Check supply limits once for the whole batch
+        core = self.core.value.copy()
+        assert total <= self._unminted(core), "Mint exceeds available supply"
+        for recipient in recipients:
+            assert recipient.native not in self.blacklist, "Recipient is blacklisted"
+        core.minted = ARC4UInt64(core.minted.native + total)
+        self.core.value = core.copy()
+        
+        for i in urange(recipients.length):
+            if i == 0:
+                op.ITxnCreate.begin()
+            else:
+                op.ITxnCreate.next()
+            op.ITxnCreate.set_type_enum(TransactionType.AssetTransfer)
+            op.ITxnCreate.set_xfer_asset(self._token_id())
+            op.ITxnCreate.set_asset_receiver(recipients[i].native)
+            op.ITxnCreate.set_asset_amount(amounts[i].native)
+            op.ITxnCreate.set_fee(0)
+        op.ITxnCreate.submit()
+        
+        for i in urange(recipients.length):
+            arc4.emit(Minted(recipients[i], amounts[i]))
+        
+        return total
+    
     @abimethod
     def burn_tokens(self, amount: UInt64) -> Literal["success"]:
         """
@@ -105,18 +291,30 @@ class FarmFoodTokenizer(ARC4Contract):
             Success message
         """
         # Only admin can burn
-        assert Txn.sender == self.admin, "Only admin can burn tokens"
+        assert Txn.sender == self._admin(), "Only admin can burn tokens"
         
         # Validate amount
         assert amount > UInt64(0), "Amount must be positive"
+        core = self.core.value.copy()
+        core.burned = ARC4UInt64(core.burned.native + amount)
+        self.core.value = core.copy()
         
-        # In actual implementation, perform asset transfer to creator for burning
-        # This is a placeholder for the template
+        # Claw the tokens back from the admin into the app reserve; the
+        # transfer fails (and the counter update with it) if the balance
+        # is short
+        itxn.AssetTransfer(
+            xfer_asset=core.farm_token_id.native,
+            asset_sender=Txn.sender,
+            asset_receiver=Global.current_application_address,
+            asset_amount=amount,
+            fee=0,
+        ).submit()
+        arc4.emit(Burned(Address(Txn.sender), ARC4UInt64(amount)))
         
         return "success"
     
     @abimethod
-    def add_to_blacklist(self, address: ARC4String) -> Literal["success"]:
+    def add_to_blacklist(self, address: Address) -> Literal["success"]:
         """
         Add address to blacklist (admin only)
         
@@ -127,15 +325,17 @@ class FarmFoodTokenizer(ARC4Contract):
             Success message
         """
         # Only admin can manage blacklist
-        assert Txn.sender == self.admin, "Only admin can manage blacklist"
+        assert Txn.sender == self._admin(), "Only admin can manage blacklist"
         
-        # In actual implementation, store in global state
-        # This is a placeholder for the template
+        # Creating the box requires the app account to cover its min-balance
+        if address.native not in self.blacklist:
+            self.blacklist[address.native] = ARC4Bool(True)
+            arc4.emit(BlacklistUpdated(address, ARC4Bool(True)))
         
         return "success"
     
     @abimethod
-    def remove_from_blacklist(self, address: ARC4String) -> Literal["success"]:
+    def remove_from_blacklist(self, address: Address) -> Literal["success"]:
         """
         Remove address from blacklist (admin only)
         
@@ -146,15 +346,64 @@ class FarmFoodTokenizer(ARC4Contract):
             Success message
         """
         # Only admin can manage blacklist
-        assert Txn.sender == self.admin, "Only admin can manage blacklist"
+        assert Txn.sender == self._admin(), "Only admin can manage blacklist"
         
-        # In actual implementation, remove from global state
-        # This is a placeholder for the template
+        # Deleting the box releases its min-balance back to the app account
+        if address.native in self.blacklist:
+            del self.blacklist[address.native]
+            arc4.emit(BlacklistUpdated(address, ARC4Bool(False)))
         
         return "success"
     
     @abimethod
-    def is_blacklisted(self, address: ARC4String) -> bool:
+    def add_to_blacklist_batch(self, addresses: DynamicArray[Address]) -> UInt64:
+        """
+        Add many addresses to the blacklist in one call (admin only)
+        
+        Every address needs a box reference on the transaction group, so the
+        client sizes batches to the reference and opcode budget limits.
+        
+        Args:
+            addresses: Addresses to blacklist
+            
+        Returns:
+            Number of addresses newly added
+        """
+        assert Txn.sender == self._admin(), "Only admin can manage blacklist"
+        
+        added = UInt64(0)
+        for address in addresses:
+            if address.native not in self.blacklist:
+                self.blacklist[address.native] = ARC4Bool(True)
+                arc4.emit(BlacklistUpdated(address, ARC4Bool(True)))
+                added += 1
+        
+        return added
+    
+    @abimethod
+    def remove_from_blacklist_batch(self, addresses: DynamicArray[Address]) -> UInt64:
+        """
+        Remove many addresses from the blacklist in one call (admin only)
+        
+        Args:
+            addresses: Addresses to remove from blacklist
+            
+        Returns:
+            Number of addresses actually removed
+        """
+        assert Txn.sender == self._admin(), "Only admin can manage blacklist"
+        
+        removed = UInt64(0)
+        for address in addresses:
+            if address.native in self.blacklist:
+                del self.blacklist[address.native]
+                arc4.emit(BlacklistUpdated(address, ARC4Bool(False)))
+                removed += 1
+        
+        return removed
+    
+    @abimethod(readonly=True)
+    def is_blacklisted(self, address: Address) -> bool:
         """
         Check if address is blacklisted
         
@@ -164,11 +413,10 @@ class FarmFoodTokenizer(ARC4Contract):
         Returns:
             True if blacklisted, False otherwise
         """
-        # In actual implementation, check global state
-        # This is a placeholder for the template
-        return False
+        # Single box_len on a known name, independent of blacklist size
+        return address.native in self.blacklist
     
-    @abimethod
+    @abimethod(readonly=True)
     def get_metadata_cid(self) -> ARC4String:
         """
         Get IPFS CID for metadata
@@ -176,7 +424,8 @@ class FarmFoodTokenizer(ARC4Contract):
         Returns:
             IPFS CID string
         """
-        return ARC4String(self.ipfs_cid)
+        # Already ARC-4 encoded in state; returned without re-encoding
+        return self.text.value.ipfs_cid
     
     @abimethod
     def update_metadata_cid(self, new_cid: ARC4String) -> Literal["success"]:
@@ -190,22 +439,49 @@ class FarmFoodTokenizer(ARC4Contract):
             Success message
         """
         # Only admin can update metadata
-        assert Txn.sender == self.admin, "Only admin can update metadata"
+        assert Txn.sender == self._admin(), "Only admin can update metadata"
         
-        self.ipfs_cid = new_cid.native
+        text = self.text.value.copy()
+        self._set_text(TextState(token_name=text.token_name, token_unit=text.token_unit, ipfs_cid=new_cid))
+        arc4.emit(MetadataCidUpdated(new_cid))
         
         return "success"
     
-    @abimethod
-    def get_contract_info(self) -> tuple[ARC4String, UInt64, UInt64]:
+    @abimethod(readonly=True)
+    def get_contract_info(self) -> tuple[
+        ARC4String, ARC4UInt64, ARC4UInt64, ARC4UInt64, ARC4UInt64, ARC4UInt64
+    ]:
         """
         Get contract information
         
         Returns:
-            Tuple of (token_name, asset_id, total_supply)
+            Tuple of (token_name, asset_id, total_supply, minted, burned,
+            circulating)
         """
+        # Two global reads; every field but circulating is already ARC-4 encoded
+        core = self.core.value.copy()
         return (
-            ARC4String(self.token_name),
-            self.farm_token_id,
-            self.total_supply
-        )
\ No newline at end of file
+            self.text.value.token_name,
+            core.farm_token_id,
+            core.total_supply,
+            core.minted,
+            core.burned,
+            ARC4UInt64(core.minted.native - core.burned.native),
+        )
+    
+    @subroutine
+    def _admin(self) -> Account:
+        return self.core.value.admin.native
+    
+    @subroutine
+    def _token_id(self) -> UInt64:
+        return self.core.value.farm_token_id.native
+    
+    @subroutine
+    def _unminted(self, core: CoreState) -> UInt64:
+        return core.total_supply.native - (core.minted.native - core.burned.native)
+    
+    @subroutine
+    def _set_text(self, text: TextState) -> None:
+        assert text.bytes.length <= MAX_TEXT_STATE_BYTES, "Token text exceeds global state size"
+        self.text.value = text.copy()
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Algorand address helpers
+========================
+
+Pure-Python encoding and decoding of Algorand account addresses so tooling
+can derive box names and validate input without importing algosdk.
+
+An address is the base32 encoding (no padding) of the 32-byte public key
+followed by the last 4 bytes of its SHA-512/256 digest.
+"""
+
+import base64
+import hashlib
+import os
+from typing import Sequence
+
+PUBLIC_KEY_LENGTH = 32
+CHECKSUM_LENGTH = 4
+ADDRESS_LENGTH = 58
+
+
+def _checksum(public_key: bytes) -> bytes:
+    return hashlib.new("sha512_256", public_key).digest()[-CHECKSUM_LENGTH:]
+
+
+def encode_address(public_key: bytes) -> str:
+    """Encode a 32-byte public key as an Algorand address"""
+    if len(public_key) != PUBLIC_KEY_LENGTH:
+        raise ValueError(f"Public key must be {PUBLIC_KEY_LENGTH} bytes")
+    raw = public_key + _checksum(public_key)
+    return base64.b32encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_address(address: str) -> bytes:
+    """Decode an Algorand address to its 32-byte public key"""
+    if len(address) != ADDRESS_LENGTH:
+        raise ValueError(f"Invalid address length: {address!r}")
+    try:
+        raw = base64.b32decode(address + "=" * (-len(address) % 8))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid address encoding: {address!r}") from e
+    public_key, checksum = raw[:PUBLIC_KEY_LENGTH], raw[PUBLIC_KEY_LENGTH:]
+    if checksum != _checksum(public_key):
+        raise ValueError(f"Invalid address checksum: {address!r}")
+    return public_key
+
+
+def is_valid_address(address: str) -> bool:
+    """Check whether a string is a well-formed Algorand address"""
+    try:
+        decode_address(address)
+    except ValueError:
+        return False
+    return True
+
+
+def application_address(app_id: int) -> str:
+    """Address of the account controlled by an application"""
+    digest = hashlib.new("sha512_256", b"appID" + app_id.to_bytes(8, "big")).digest()
+    return encode_address(digest)
+
+
+def multisig_address(threshold: int, addresses: Sequence[str], version: int = 1) -> str:
+    """Address of a multisig account over the given ordered member addresses"""
+    if not 1 <= threshold <= len(addresses):
+        raise ValueError("Threshold must be between 1 and the number of members")
+    preimage = b"MultisigAddr" + bytes([version, threshold])
+    preimage += b"".join(decode_address(address) for address in addresses)
+    return encode_address(hashlib.new("sha512_256", preimage).digest())
+
+
+def random_address() -> str:
+    """Generate a random (keyless) address, useful for tests and load generation"""
+    return encode_address(os.urandom(PUBLIC_KEY_LENGTH))
@@ -0,0 +1,287 @@
+"""
+Asynchronous deployment pipeline
+================================
+
+Runs the FarmFoodDeployer steps as a dependency graph so independent steps
+overlap instead of each waiting for the previous confirmation:
+
+    setup_client, then deployer_account -> deploy_contract
+    deploy_contract -> fund_app_account -> create_asa
+    deploy_contract -> configure_multisig
+    create_asa -> opt_in_asa, set_initial_metadata
+    (all) -> save_deployment_info
+
+Confirmations are event-driven: one `RoundWatcher` thread long-polls algod's
+status-after-block endpoint and wakes every pending wait when a new round
+lands, so nothing sleeps or polls on a timer. The thread is a daemon that
+stopping abandons, so a long-poll in progress never holds up exit. If the long-poll fails, every
+wait re-raises the error; a node that stops producing rounds fails the wait
+after `round_timeout` seconds.
+
+Every step result carrying a transaction id is confirmed before dependent
+steps start. Placeholder steps that return mock ids (not 52-character
+base32) are not waited on.
+
+Usage:
+    python scripts/deploy_farm_food.py deploy --network localnet --async
+"""
+
+import asyncio
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from deploy_farm_food import FarmFoodDeployer
+
+# Seconds a wait may go without the node reporting a new round
+ROUND_TIMEOUT = 60.0
+
+_TXID = re.compile(r"^[A-Z2-7]{52}$")
+
+
+class ConfirmationTimeout(Exception):
+    """
+    A transaction was not confirmed within the allowed number of rounds
+    """
+
+
+class RoundWatcher:
+    """
+    Shares one status-after-block long-poll between all confirmation waits
+    """
+
+    def __init__(self, algod_client, round_timeout: float = ROUND_TIMEOUT):
+        self.algod_client = algod_client
+        self.round_timeout = round_timeout
+        self.last_round = 0
+        self._new_round = asyncio.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        # Set when the long-poll fails; every wait re-raises it
+        self._error: Optional[BaseException] = None
+
+    async def start(self):
+        """Start the long-poll; a no-op if it is already running"""
+        if self._thread is not None:
+            return
+        status = await asyncio.to_thread(self.algod_client.status)
+        self.last_round = status["last-round"]
+        self._stopped.clear()
+        # A daemon thread rather than asyncio.to_thread: a long-poll in
+        # progress cannot be cancelled, and asyncio.run joins the default
+        # executor on exit, so the CLI would hang until the next block
+        self._thread = threading.Thread(
+            target=self._watch, args=(asyncio.get_running_loop(), self.last_round), name="round-watcher", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self):
+        """Stop publishing rounds; a poll still in flight is abandoned, not awaited"""
+        self._stopped.set()
+        self._thread = None
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, round_number: int):
+        try:
+            while not self._stopped.is_set():
+                round_number = self.algod_client.status_after_block(round_number)["last-round"]
+                self._post(loop, self._publish(round_number))
+        except Exception as e:
+            self._post(loop, self._publish(error=e))
+
+    def _post(self, loop: asyncio.AbstractEventLoop, coroutine):
+        """Run `coroutine` on the waiters' loop, unless the watcher stopped or the loop is gone"""
+        if not self._stopped.is_set():
+            try:
+                asyncio.run_coroutine_threadsafe(coroutine, loop)
+                return
+            except RuntimeError:
+                pass
+        coroutine.close()
+
+    async def _publish(self, round_number: int = 0, error: Optional[BaseException] = None):
+        async with self._new_round:
+            if error is not None:
+                self._error = error
+            self.last_round = max(self.last_round, round_number)
+            self._new_round.notify_all()
+
+    async def wait_for_round(self, round_number: int) -> int:
+        """Block until the node has seen `round_number`"""
+        async with self._new_round:
+            try:
+                await asyncio.wait_for(
+                    self._new_round.wait_for(lambda: self._error is not None or self.last_round >= round_number),
+                    self.round_timeout,
+                )
+            except asyncio.TimeoutError:
+                raise ConfirmationTimeout(
+                    f"No new round within {self.round_timeout}s (waiting for round {round_number})"
+                ) from None
+            if self._error is not None:
+                raise RuntimeError(f"Round watcher failed: {self._error}") from self._error
+            return self.last_round
+
+    async def wait_for_confirmation(self, txid: str, max_rounds: int = 10) -> Dict[str, Any]:
+        """Wait until `txid` is confirmed, re-checking once per new round"""
+        deadline = self.last_round + max_rounds
+        while True:
+            info = await asyncio.to_thread(self.algod_client.pending_transaction_info, txid)
+            if info.get("confirmed-round"):
+                return info
+            if info.get("pool-error"):
+                raise RuntimeError(f"Transaction {txid} rejected: {info['pool-error']}")
+            if self.last_round >= deadline:
+                raise ConfirmationTimeout(f"Transaction {txid} not confirmed after {max_rounds} rounds")
+            await self.wait_for_round(self.last_round + 1)
+
+
+class PipelineStep:
+    """
+    One node of the deployment graph
+    """
+
+    def __init__(self,
+                 name: str,
+                 run: Callable[[Dict[str, Any]], Any],
+                 depends_on: Sequence[str] = ()):
+        self.name = name
+        self.run = run
+        self.depends_on = tuple(depends_on)
+
+
+async def run_pipeline(steps: List[PipelineStep],
+                       confirm: Optional[Callable[[str], Awaitable[Any]]] = None):
+    """
+    Run steps as soon as their dependencies finish
+
+    Synchronous step functions run in worker threads. If a step returns a
+    dict with a `txn_id` and `confirm` is given, the step only completes once
+    that transaction is confirmed.
+
+    Returns:
+        (results by step name, timings by step name)
+    """
+    names = {step.name for step in steps}
+    for step in steps:
+        missing = set(step.depends_on) - names
+        if missing:
+            raise ValueError(f"Step {step.name} depends on unknown steps: {sorted(missing)}")
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, Dict[str, float]] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+    origin = time.perf_counter()
+
+    async def execute(step: PipelineStep):
+        await asyncio.gather(*(tasks[name] for name in step.depends_on))
+        started = time.perf_counter()
+        if asyncio.iscoroutinefunction(step.run):
+            result = await step.run(results)
+        else:
+            result = await asyncio.to_thread(step.run, results)
+        if confirm and isinstance(result, dict) and result.get("txn_id"):
+            result["confirmation"] = await confirm(result["txn_id"])
+        finished = time.perf_counter()
+        results[step.name] = result
+        timings[step.name] = {
+            "start": started - origin,
+            "end": finished - origin,
+            "duration": finished - started,
+        }
+
+    for step in steps:
+        tasks[step.name] = asyncio.ensure_future(execute(step))
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    return results, timings
+
+
+class AsyncFarmFoodDeployer(FarmFoodDeployer):
+    """
+    FarmFoodDeployer that overlaps independent deployment steps
+    """
+
+    def build_steps(self) -> List[PipelineStep]:
+        """Deployment graph over the FarmFoodDeployer steps"""
+        return [
+            PipelineStep("deployer_account", lambda r: self.get_deployer_account()),
+            PipelineStep("deploy_contract", lambda r: self.deploy_contract(r["deployer_account"]),
+                         ["deployer_account"]),
+            PipelineStep("fund_app_account", lambda r: self.fund_app_account(r["deploy_contract"]),
+                         ["deploy_contract"]),
+            PipelineStep("configure_multisig", lambda r: self.configure_multisig(r["deploy_contract"]),
+                         ["deploy_contract"]),
+            PipelineStep("create_asa", lambda r: self.create_asa(r["deploy_contract"]),
+                         ["fund_app_account"]),
+            PipelineStep("opt_in_asa", lambda r: self.opt_in_asa(r["deploy_contract"], r["create_asa"]),
+                         ["create_asa"]),
+            PipelineStep("set_initial_metadata",
+                         lambda r: self.set_initial_metadata(r["deploy_contract"], r["create_asa"]),
+                         ["create_asa"]),
+            PipelineStep("save_deployment_info",
+                         lambda r: self.save_deployment_info(r["deploy_contract"], r["create_asa"]),
+                         ["configure_multisig", "opt_in_asa", "set_initial_metadata"]),
+        ]
+
+    async def deploy_async(self) -> Dict[str, Any]:
+        """
+        Main deployment process, with independent steps running concurrently
+
+        Follows the same plan as `deploy`: an up-to-date network submits
+        nothing and an incremental change is redeployed in place; only a
+        plan that needs a new app runs the step graph.
+
+        Returns:
+            {"plan": deployment plan, "results": by step, "timings": by step};
+            results and timings are empty when the graph did not run
+        """
+        print(f"🌱 Starting Farm Food Tokenization deployment on {self.network} (async)...")
+        print("=" * 60)
+
+        plan = self.plan_deployment()
+        if await asyncio.to_thread(self.apply_existing, plan):
+            return {"plan": plan, "results": {}, "timings": {}}
+
+        # The client is needed by everything else, including the watcher
+        started = time.perf_counter()
+        await asyncio.to_thread(self.setup_client)
+        setup_duration = time.perf_counter() - started
+
+        # Started on the first real transaction id, so mock-only runs never poll
+        watcher = RoundWatcher(self.algod_client)
+        started_watcher = asyncio.Lock()
+
+        async def confirm(txid: str) -> Optional[Dict[str, Any]]:
+            if not _TXID.match(txid):
+                return None
+            async with started_watcher:
+                await watcher.start()
+            return await watcher.wait_for_confirmation(txid)
+
+        try:
+            results, timings = await run_pipeline(self.build_steps(), confirm)
+        except Exception as e:
+            print(f"❌ Deployment failed: {str(e)}")
+            raise
+        finally:
+            await watcher.stop()
+
+        for timing in timings.values():
+            timing["start"] += setup_duration
+            timing["end"] += setup_duration
+        timings["setup_client"] = {"start": 0.0, "end": setup_duration, "duration": setup_duration}
+
+        print("=" * 60)
+        print("🎉 Deployment completed successfully!")
+        print(f"📋 Contract App ID: {results['deploy_contract']['app_id']}")
+        print(f"🪙 Token Asset ID: {results['create_asa']['asset_id']}")
+        print("⏱️ Step timings:")
+        for name, timing in sorted(timings.items(), key=lambda item: item[1]["start"]):
+            print(f"   {name:<22} +{timing['start'] * 1000:8.1f}ms  {timing['duration'] * 1000:8.1f}ms")
+
+        return {"plan": plan, "results": results, "timings": timings}
@@ -0,0 +1,204 @@
+"""
+FarmFoodTokenizer benchmark suite
+=================================
+
+Runs mint, burn, transfer, blacklist and metadata-update workloads against
+the in-process FarmFoodSimulator and records ops/sec and p50/p95/p99 latency
+per ABI method. Results can be saved as a JSON baseline; later runs fail
+when a method regresses beyond a threshold.
+
+Blacklist add/remove calls are only a no-op the second time they see an
+address, so every warm-up and timed call of those workloads gets an address
+of its own and always takes the state-changing path.
+
+Usage:
+    python scripts/benchmark.py --update-baseline
+    python scripts/benchmark.py --baseline benchmarks/baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from addresses import encode_address
+from farm_food_simulator import FarmFoodSimulator
+
+DEFAULT_BASELINE = Path("benchmarks/baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+# Latency changes smaller than this are timer noise for in-process calls
+LATENCY_NOISE_FLOOR_MS = 0.01
+
+# Each workload returns (method, sender, args) for iteration i
+Workload = Callable[[Dict[str, Any], int], tuple]
+
+# Warm-up calls per workload, as a fraction of the timed iterations
+WARMUP_FRACTION = 0.1
+
+
+def _seeded_address(rng: random.Random) -> str:
+    return encode_address(rng.randbytes(32))
+
+
+def setup_context(accounts: int = 100, seed: int = 0, fresh: int = 100) -> Dict[str, Any]:
+    """
+    Build a simulator with a created ASA and funded, opted-in accounts
+
+    `fresh` is the number of distinct blacklisted ("flagged") and
+    non-blacklisted ("unflagged") addresses to prepare, one per blacklist call.
+    """
+    rng = random.Random(seed)
+    admin = _seeded_address(rng)
+    simulator = FarmFoodSimulator(admin)
+    simulator.create_asa(admin, "FarmToken", "FT", 10**15, 2, "QmBenchmarkCID")
+
+    users = [_seeded_address(rng) for _ in range(accounts)]
+    for address in [admin] + users:
+        simulator.opt_in(address)
+    simulator.mint_tokens(admin, admin, 10**12)
+
+    flagged = [_seeded_address(rng) for _ in range(fresh)]
+    simulator.add_to_blacklist_batch(admin, flagged)
+
+    return {
+        "simulator": simulator,
+        "admin": admin,
+        "users": users,
+        "flagged": flagged,
+        "unflagged": [_seeded_address(rng) for _ in range(fresh)],
+    }
+
+
+WORKLOADS: Dict[str, Workload] = {
+    "mint_tokens": lambda ctx, i: ("mint_tokens", ctx["admin"], ctx["users"][i % len(ctx["users"])], 1),
+    "mint_tokens_batch": lambda ctx, i: (
+        "mint_tokens_batch", ctx["admin"], ctx["users"][i % 25 * 4:i % 25 * 4 + 4], [1, 1, 1, 1]
+    ),
+    "burn_tokens": lambda ctx, i: ("burn_tokens", ctx["admin"], 1),
+    "transfer": lambda ctx, i: ("transfer", ctx["admin"], ctx["users"][i % len(ctx["users"])], 1),
+    "add_to_blacklist": lambda ctx, i: ("add_to_blacklist", ctx["admin"], ctx["unflagged"][i]),
+    "remove_from_blacklist": lambda ctx, i: ("remove_from_blacklist", ctx["admin"], ctx["flagged"][i]),
+    "is_blacklisted": lambda ctx, i: ("is_blacklisted", None, ctx["users"][i % len(ctx["users"])]),
+    "update_metadata_cid": lambda ctx, i: ("update_metadata_cid", ctx["admin"], f"QmBenchmarkCID{i}"),
+    "get_contract_info": lambda ctx, i: ("get_contract_info", None),
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def warmup_iterations(iterations: int) -> int:
+    return int(iterations * WARMUP_FRACTION)
+
+
+def run_workload(ctx: Dict[str, Any], workload: Workload, iterations: int) -> Dict[str, float]:
+    """
+    Run one workload and summarize its latency distribution
+
+    Warm-up calls use iterations [iterations, iterations + warm-up), so they
+    never consume the inputs of the timed calls.
+    """
+    simulator = ctx["simulator"]
+    for i in range(iterations, iterations + warmup_iterations(iterations)):
+        method, sender, *args = workload(ctx, i)
+        simulator.call(method, sender, *args)
+
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        method, sender, *args = workload(ctx, i)
+        op_start = time.perf_counter()
+        simulator.call(method, sender, *args)
+        latencies.append(time.perf_counter() - op_start)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / elapsed if elapsed else float("inf"),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def run_benchmarks(iterations: int = 2_000, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Run every workload against a fresh context"""
+    results = {}
+    fresh = iterations + warmup_iterations(iterations)
+    for name, workload in WORKLOADS.items():
+        results[name] = run_workload(setup_context(seed=seed, fresh=fresh), workload, iterations)
+    return results
+
+
+def find_regressions(results: Dict[str, Dict[str, float]],
+                     baseline: Dict[str, Dict[str, float]],
+                     threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Describe every method whose throughput or p95 latency regressed beyond `threshold`"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: ops/sec {current['ops_per_sec']:.0f} < baseline {previous['ops_per_sec']:.0f}"
+            )
+        limit = max(previous["p95_ms"] * (1 + threshold), previous["p95_ms"] + LATENCY_NOISE_FLOOR_MS)
+        if current["p95_ms"] > limit:
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.4f}ms > baseline {previous['p95_ms']:.4f}ms"
+            )
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, float]]):
+    print(f"{'method':<24}{'ops/sec':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in results.items():
+        print(f"{name:<24}{r['ops_per_sec']:>12.0f}{r['p50_ms']:>10.4f}{r['p95_ms']:>10.4f}{r['p99_ms']:>10.4f}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark FarmFoodTokenizer workloads")
+    parser.add_argument("--iterations", type=int, default=2_000, help="Calls per workload")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative regression, e.g. 0.25 for 25%%")
+    parser.add_argument("--update-baseline", action="store_true", help="Save this run as the baseline")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.iterations, args.seed)
+    print_results(results)
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"✅ Baseline saved to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"⚠️ No baseline at {args.baseline}; run with --update-baseline first")
+        return
+
+    regressions = find_regressions(results, json.loads(args.baseline.read_text()), args.threshold)
+    if regressions:
+        print("❌ Performance regressions:")
+        for line in regressions:
+            print(f"   {line}")
+        sys.exit(1)
+    print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Blacklist box layout
+====================
+
+Off-chain mirror of the box storage used by FarmFoodTokenizer for its
+blacklist. Each flagged address lives in its own box:
+
+    name  = b"bl" + <32-byte public key>
+    value = 0x80 (ARC-4 encoded True)
+
+so a membership check is a single box_len on a known name, and the list is
+bounded only by the app account's min-balance rather than the 64-key limit
+of global state.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+from addresses import decode_address
+from opcode_costs import OPCODE_COSTS
+from protocol import BOX_BYTE_MIN_BALANCE, BOX_FLAT_MIN_BALANCE
+
+BLACKLIST_BOX_PREFIX = b"bl"
+BLACKLIST_BOX_VALUE = b"\x80"
+
+# Opcode counts for the method bodies (ARC-4 routing excluded), from
+# opcode_costs.json. Every path is straight-line code around one box op, so
+# the cost does not depend on how many addresses are already blacklisted;
+# profile_costs.py measures them at growing list sizes to check that. Add/
+# remove include the BlacklistUpdated ARC-28 event log.
+BLACKLIST_OPCODE_COST: Dict[str, int] = OPCODE_COSTS["blacklist"]
+
+# Batch methods: (fixed cost, cost per address) for the loop bodies
+BLACKLIST_BATCH_OPCODE_COST: Dict[str, Tuple[int, int]] = OPCODE_COSTS["blacklist_batch"]
+
+
+def batch_opcode_cost(method: str, count: int) -> int:
+    """Opcode cost of a batch blacklist call over `count` addresses"""
+    base, per_address = BLACKLIST_BATCH_OPCODE_COST[method]
+    return base + per_address * count
+
+
+def blacklist_box_name(address: str) -> bytes:
+    """Box name holding the blacklist flag for an address"""
+    return BLACKLIST_BOX_PREFIX + decode_address(address)
+
+
+def box_min_balance(name_length: int, value_length: int) -> int:
+    """Min-balance increase (microAlgos) for a box of the given shape"""
+    return BOX_FLAT_MIN_BALANCE + BOX_BYTE_MIN_BALANCE * (name_length + value_length)
+
+
+BLACKLIST_ENTRY_MIN_BALANCE = box_min_balance(
+    len(BLACKLIST_BOX_PREFIX) + 32, len(BLACKLIST_BOX_VALUE)
+)
+
+
+class BoxBlacklist:
+    """
+    In-memory model of the blacklist boxes with opcode and min-balance accounting
+    """
+
+    def __init__(self):
+        self.boxes: Dict[bytes, bytes] = {}
+        self.last_opcode_cost = 0
+
+    def _charge(self, method: str):
+        self.last_opcode_cost = BLACKLIST_OPCODE_COST[method]
+
+    def add(self, address: str) -> bool:
+        """Flag an address; returns False if it was already flagged"""
+        self._charge("add_to_blacklist")
+        name = blacklist_box_name(address)
+        if name in self.boxes:
+            return False
+        self.boxes[name] = BLACKLIST_BOX_VALUE
+        return True
+
+    def remove(self, address: str) -> bool:
+        """Clear an address; returns False if it was not flagged"""
+        self._charge("remove_from_blacklist")
+        return self.boxes.pop(blacklist_box_name(address), None) is not None
+
+    def contains(self, address: str) -> bool:
+        self._charge("is_blacklisted")
+        return blacklist_box_name(address) in self.boxes
+
+    def add_many(self, addresses: Iterable[str]) -> int:
+        return sum(self.add(address) for address in addresses)
+
+    def add_batch(self, addresses: List[str]) -> int:
+        """Model of add_to_blacklist_batch; returns the number newly added"""
+        names = [blacklist_box_name(address) for address in addresses]
+        added = 0
+        for name in names:
+            if name not in self.boxes:
+                self.boxes[name] = BLACKLIST_BOX_VALUE
+                added += 1
+        self.last_opcode_cost = batch_opcode_cost("add_to_blacklist_batch", len(names))
+        return added
+
+    def remove_batch(self, addresses: List[str]) -> int:
+        """Model of remove_from_blacklist_batch; returns the number removed"""
+        names = [blacklist_box_name(address) for address in addresses]
+        removed = sum(self.boxes.pop(name, None) is not None for name in names)
+        self.last_opcode_cost = batch_opcode_cost("remove_from_blacklist_batch", len(names))
+        return removed
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    @property
+    def min_balance(self) -> int:
+        """Total min-balance locked in the app account by blacklist boxes"""
+        return sum(box_min_balance(len(name), len(value)) for name, value in self.boxes.items())
@@ -0,0 +1,237 @@
+"""
+Blacklist management client
+===========================
+
+Packs lists of addresses into the fewest `add_to_blacklist_batch` /
+`remove_from_blacklist_batch` calls that fit the protocol limits:
+
+- at most 8 box references per app call (one box per address)
+- at most 16 transactions per atomic group (one round trip per group)
+- the 700-opcode budget and 2KB argument limit of each call
+
+Each new box raises the app account's min-balance by 16,500 µAlgo, so every
+add group starts with a payment to the app account covering the boxes it
+may create (less whatever the account already holds above its min-balance).
+That payment takes one of the group's 16 slots.
+
+Usage:
+    python scripts/blacklist_client.py add flagged.txt --dry-run
+    python scripts/blacklist_client.py remove cleared.txt --network localnet
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+from addresses import application_address
+from blacklist_boxes import BLACKLIST_BATCH_OPCODE_COST, BLACKLIST_ENTRY_MIN_BALANCE, blacklist_box_name
+from contract_abi import abi_method
+from node_client import clients_for_network
+from protocol import (
+    APP_CALL_OPCODE_BUDGET,
+    MAX_APP_ARGS_BYTES,
+    MAX_BOX_REFERENCES_PER_TXN,
+    MAX_GROUP_SIZE,
+    MIN_TXN_FEE,
+)
+from round_cache import CachedAlgodClient
+
+BATCH_METHODS = {
+    "add": "add_to_blacklist_batch",
+    "remove": "remove_from_blacklist_batch",
+}
+
+# Sends one atomic group: (method name, per-call address chunks) -> per-call results
+GroupSender = Callable[[str, List[List[str]]], List[int]]
+
+
+def max_addresses_per_call(method: str) -> int:
+    """Largest address count a single batch call can carry"""
+    base, per_address = BLACKLIST_BATCH_OPCODE_COST[method]
+    by_budget = (APP_CALL_OPCODE_BUDGET - base) // per_address
+    # 4-byte selector + 2-byte array length prefix + 32 bytes per address
+    by_args = (MAX_APP_ARGS_BYTES - 4 - 2) // 32
+    return min(MAX_BOX_REFERENCES_PER_TXN, by_budget, by_args)
+
+
+def calls_per_group(method: str) -> int:
+    """Batch calls per atomic group; adds leave a slot for the box funding payment"""
+    return MAX_GROUP_SIZE - 1 if method == "add_to_blacklist_batch" else MAX_GROUP_SIZE
+
+
+def box_funding(new_boxes: int, spare_balance: int = 0) -> int:
+    """
+    Payment (microAlgos) the app account needs before creating `new_boxes` boxes
+
+    Args:
+        new_boxes: Boxes the group may create
+        spare_balance: What the app account already holds above its min-balance
+    """
+    return max(0, new_boxes * BLACKLIST_ENTRY_MIN_BALANCE - max(0, spare_balance))
+
+
+def unique_addresses(addresses: Iterable[str]) -> List[str]:
+    """Validate addresses and drop duplicates, keeping first-seen order"""
+    seen = set()
+    result = []
+    for address in addresses:
+        address = address.strip()
+        if not address or address in seen:
+            continue
+        blacklist_box_name(address)  # raises ValueError on malformed input
+        seen.add(address)
+        result.append(address)
+    return result
+
+
+def plan_batches(addresses: Iterable[str], method: str) -> List[List[List[str]]]:
+    """
+    Split addresses into atomic groups of batch calls
+    
+    Returns:
+        A list of groups; each group is a list of per-call address chunks
+    """
+    per_call = max_addresses_per_call(method)
+    unique = unique_addresses(addresses)
+    calls = [unique[i:i + per_call] for i in range(0, len(unique), per_call)]
+    per_group = calls_per_group(method)
+    return [calls[i:i + per_group] for i in range(0, len(calls), per_group)]
+
+
+def plan_report(plan: List[List[List[str]]], method: str) -> Dict[str, Any]:
+    """
+    Calls, round trips and fees for a plan against the one-by-one path
+
+    Add fees include one box funding payment per group (per call one by one);
+    a payment is skipped when the app account already has the spare balance.
+    """
+    addresses = sum(len(call) for group in plan for call in group)
+    calls = sum(len(group) for group in plan)
+    funded = method == "add_to_blacklist_batch"
+    report = {
+        "method": method,
+        "addresses": addresses,
+        "batched": {
+            "calls": calls,
+            "groups": len(plan),
+            "fees_microalgos": (calls + len(plan) * funded) * MIN_TXN_FEE,
+        },
+        "one_by_one": {
+            "calls": addresses,
+            "groups": addresses,
+            "fees_microalgos": addresses * (1 + funded) * MIN_TXN_FEE,
+        },
+    }
+    if method == "add_to_blacklist_batch":
+        report["max_min_balance_microalgos"] = addresses * BLACKLIST_ENTRY_MIN_BALANCE
+    return report
+
+
+class BlacklistClient:
+    """
+    Submits batched blacklist changes through a group sender
+    """
+
+    def __init__(self, send_group: GroupSender):
+        self.send_group = send_group
+
+    def _run(self, action: str, addresses: Iterable[str]) -> Dict[str, Any]:
+        method = BATCH_METHODS[action]
+        plan = plan_batches(addresses, method)
+        changed = 0
+        for group in plan:
+            changed += sum(self.send_group(method, group))
+        report = plan_report(plan, method)
+        report["changed"] = changed
+        return report
+
+    def add(self, addresses: Iterable[str]) -> Dict[str, Any]:
+        """Blacklist addresses; returns the plan report with the number added"""
+        return self._run("add", addresses)
+
+    def remove(self, addresses: Iterable[str]) -> Dict[str, Any]:
+        """Un-blacklist addresses; returns the plan report with the number removed"""
+        return self._run("remove", addresses)
+
+
+def make_atc_sender(algod_client, app_id: int, sender: str, signer) -> GroupSender:
+    """
+    Build a group sender on top of algosdk's AtomicTransactionComposer
+
+    Add groups are prefixed with the box funding payment to the app account.
+    """
+    from algosdk import transaction
+    from algosdk.atomic_transaction_composer import AtomicTransactionComposer, TransactionWithSigner
+
+    methods = {name: abi_method(name) for name in BATCH_METHODS.values()}
+    app_address = application_address(app_id)
+
+    def send_group(method: str, calls: List[List[str]]) -> List[int]:
+        atc = AtomicTransactionComposer()
+        sp = algod_client.suggested_params()
+        if method == "add_to_blacklist_batch":
+            account = algod_client.account_info(app_address)
+            funding = box_funding(sum(len(chunk) for chunk in calls), account["amount"] - account["min-balance"])
+            if funding:
+                payment = transaction.PaymentTxn(sender, sp, app_address, funding)
+                atc.add_transaction(TransactionWithSigner(payment, signer))
+        for chunk in calls:
+            atc.add_method_call(
+                app_id=app_id,
+                method=methods[method],
+                sender=sender,
+                sp=sp,
+                signer=signer,
+                method_args=[chunk],
+                boxes=[(0, blacklist_box_name(address)) for address in chunk],
+            )
+        result = atc.execute(algod_client, 4)
+        return [r.return_value for r in result.abi_results]
+
+    return send_group
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Batch blacklist management for FarmFoodTokenizer")
+    parser.add_argument("action", choices=sorted(BATCH_METHODS), help="Add or remove addresses")
+    parser.add_argument("addresses_file", type=Path, help="File with one address per line")
+    parser.add_argument("--network", choices=["localnet", "testnet"], default="localnet")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the batching plan")
+    args = parser.parse_args()
+
+    addresses = args.addresses_file.read_text().splitlines()
+    method = BATCH_METHODS[args.action]
+
+    if args.dry_run:
+        report = plan_report(plan_batches(addresses, method), method)
+    else:
+        from algosdk import account, mnemonic
+        from algosdk.atomic_transaction_composer import AccountTransactionSigner
+
+        config = json.loads(Path("scripts/deploy_config.json").read_text())
+        deployment = json.loads(Path(f"deployments/{args.network}_deployment.json").read_text())
+        private_key = mnemonic.to_private_key(os.environ["DEPLOYER_MNEMONIC"])
+        client = CachedAlgodClient(clients_for_network(config, args.network)[0])
+        sender = make_atc_sender(
+            client,
+            deployment["contract"]["app_id"],
+            account.address_from_private_key(private_key),
+            AccountTransactionSigner(private_key),
+        )
+        report = getattr(BlacklistClient(sender), args.action)(addresses)
+
+    batched, single = report["batched"], report["one_by_one"]
+    print(f"📋 {report['method']}: {report['addresses']} addresses")
+    print(f"   Batched:    {batched['calls']} calls in {batched['groups']} groups, "
+          f"{batched['fees_microalgos']} µAlgo fees")
+    print(f"   One-by-one: {single['calls']} calls, {single['fees_microalgos']} µAlgo fees")
+    if not args.dry_run:
+        for kind, stats in client.cache.stats().items():
+            print(f"   Cache {kind}: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Contract compile cache
+======================
+
+Compiling contracts/farm_food_tokenizer.py with puyapy takes seconds, and
+its output depends only on the contract source and the compiler version.
+Artifacts (approval/clear TEAL and the ARC-56 app spec) are therefore
+cached under a key derived from both:
+
+    deployments/build/<sha256(compiler version, source)>/
+        manifest.json
+        FarmFoodTokenizer.approval.teal
+        FarmFoodTokenizer.clear.teal
+        FarmFoodTokenizer.arc56.json
+
+A cache entry is compiled into a temporary directory and renamed into
+place, so an interrupted compile never leaves a partial entry behind.
+
+Usage:
+    cache = CompileCache()
+    artifacts = cache.artifacts(Path("contracts/farm_food_tokenizer.py"))
+    approval = artifacts.approval_teal()
+"""
+
+import hashlib
+import json
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+DEFAULT_CACHE_DIR = Path("deployments/build")
+
+MANIFEST = "manifest.json"
+
+# (contract source path, output directory) -> None; writes the artifacts
+Compiler = Callable[[Path, Path], None]
+
+
+def source_hash(contract_path: Path) -> str:
+    """sha256 of the contract source"""
+    return hashlib.sha256(contract_path.read_bytes()).hexdigest()
+
+
+def cache_key(contract_hash: str, compiler_version: str) -> str:
+    return hashlib.sha256(f"{compiler_version}\0{contract_hash}".encode()).hexdigest()
+
+
+def puyapy_version() -> str:
+    """Version string reported by the installed puyapy compiler"""
+    import subprocess
+
+    result = subprocess.run(["puyapy", "--version"], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def puyapy_compile(contract_path: Path, out_dir: Path):
+    """Compile with puyapy, writing TEAL and the ARC-56 app spec"""
+    import subprocess
+
+    subprocess.run(
+        ["puyapy", str(contract_path), "--out-dir", str(out_dir), "--output-arc56", "--no-output-arc32"],
+        check=True,
+    )
+
+
+class CompiledContract:
+    """
+    One cache entry: the artifact files of a compiled contract
+    """
+
+    def __init__(self, path: Path, manifest: Dict[str, str]):
+        self.path = path
+        self.source_hash = manifest["source_hash"]
+        self.compiler_version = manifest["compiler_version"]
+        self.key = manifest["key"]
+
+    def _find(self, suffix: str) -> Path:
+        matches = sorted(self.path.glob(f"*{suffix}"))
+        if not matches:
+            raise FileNotFoundError(f"No *{suffix} artifact in {self.path}")
+        return matches[0]
+
+    def approval_teal(self) -> str:
+        return self._find(".approval.teal").read_text()
+
+    def clear_teal(self) -> str:
+        return self._find(".clear.teal").read_text()
+
+    def app_spec(self) -> Dict:
+        return json.loads(self._find(".arc56.json").read_text())
+
+
+class CompileCache:
+    """
+    Content-addressed store of compiled contract artifacts
+    """
+
+    def __init__(self,
+                 root: Path = DEFAULT_CACHE_DIR,
+                 compiler: Compiler = puyapy_compile,
+                 compiler_version: Optional[Callable[[], str]] = None):
+        self.root = Path(root)
+        self.compiler = compiler
+        self._compiler_version = compiler_version or puyapy_version
+        self._version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        # Concurrent deploys in one process wait for a single compile
+        self._lock = threading.Lock()
+
+    @property
+    def compiler_version(self) -> str:
+        if self._version is None:
+            self._version = self._compiler_version()
+        return self._version
+
+    def lookup(self, contract_hash: str) -> Optional[CompiledContract]:
+        """Cached artifacts for a source hash under the current compiler, if any"""
+        entry = self.root / cache_key(contract_hash, self.compiler_version)
+        manifest = entry / MANIFEST
+        if not manifest.exists():
+            return None
+        return CompiledContract(entry, json.loads(manifest.read_text()))
+
+    def artifacts(self, contract_path: Path) -> CompiledContract:
+        """Artifacts for the contract, compiling only on a cache miss"""
+        contract_hash = source_hash(contract_path)
+        with self._lock:
+            cached = self.lookup(contract_hash)
+            if cached:
+                self.hits += 1
+                return cached
+            self.misses += 1
+            return self._compile(contract_path, contract_hash)
+
+    def _compile(self, contract_path: Path, contract_hash: str) -> CompiledContract:
+        # Imported here so hashing-only callers (deploy planning) stay fast to start
+        import tempfile
+
+        key = cache_key(contract_hash, self.compiler_version)
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=self.root))
+        try:
+            self.compiler(contract_path, staging)
+            manifest = {"key": key, "source_hash": contract_hash, "compiler_version": self.compiler_version}
+            (staging / MANIFEST).write_text(json.dumps(manifest, indent=2))
+            entry = self.root / key
+            try:
+                staging.rename(entry)
+            except OSError:
+                # Another process finished the same entry first
+                if not (entry / MANIFEST).exists():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return CompiledContract(entry, manifest)
@@ -0,0 +1,61 @@
+"""
+FarmFoodTokenizer ABI
+=====================
+
+ARC-4 method signatures of contracts/farm_food_tokenizer.py, shared by the
+off-chain tooling so nothing needs the compiled app spec to build calls.
+"""
+
+import hashlib
+
+METHOD_SIGNATURES = {
+    "create_asa": "create_asa(string,string,uint64,uint64,string)uint64",
+    "mint_tokens": "mint_tokens(address,uint64)string",
+    "mint_tokens_batch": "mint_tokens_batch(address[],uint64[])uint64",
+    "burn_tokens": "burn_tokens(uint64)string",
+    "add_to_blacklist": "add_to_blacklist(address)string",
+    "remove_from_blacklist": "remove_from_blacklist(address)string",
+    "add_to_blacklist_batch": "add_to_blacklist_batch(address[])uint64",
+    "remove_from_blacklist_batch": "remove_from_blacklist_batch(address[])uint64",
+    "is_blacklisted": "is_blacklisted(address)bool",
+    "get_metadata_cid": "get_metadata_cid()string",
+    "update_metadata_cid": "update_metadata_cid(string)string",
+    "get_contract_info": "get_contract_info()(string,uint64,uint64,uint64,uint64,uint64)",
+}
+
+# ARC-28 events the contract emits, as "<Name>(<ARC-4 types>)"
+EVENT_SIGNATURES = {
+    "Minted": "Minted(address,uint64)",
+    "Burned": "Burned(address,uint64)",
+    "BlacklistUpdated": "BlacklistUpdated(address,bool)",
+    "MetadataCidUpdated": "MetadataCidUpdated(string)",
+}
+
+# Methods that only read state
+READONLY_METHODS = frozenset({"is_blacklisted", "get_metadata_cid", "get_contract_info"})
+
+
+def abi_method(name: str):
+    """algosdk Method object for a contract method"""
+    from algosdk import abi
+
+    return abi.Method.from_signature(METHOD_SIGNATURES[name])
+
+
+def method_selector(name: str) -> bytes:
+    """ARC-4 selector of a contract method: the first app arg of every call to it"""
+    return hashlib.new("sha512_256", METHOD_SIGNATURES[name].encode("utf-8")).digest()[:4]
+
+
+def return_type(name: str) -> str:
+    """ABI return type of a contract method, e.g. 'bool' or '(string,uint64,uint64)'"""
+    signature = METHOD_SIGNATURES[name]
+    depth = 0
+    for i, char in enumerate(signature):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return signature[i + 1:]
+    raise ValueError(f"Malformed signature: {signature}")
@@ -0,0 +1,240 @@
+"""
+FarmFoodTokenizer ARC-28 events
+===============================
+
+The contract logs an ARC-28 event for every mint, burn, blacklist change and
+metadata CID update (see EVENT_SIGNATURES in contract_abi.py). Each log is
+a 4-byte selector, sha512_256("<Name>(<types>)")[:4], followed by the ARC-4
+encoded fields.
+
+`EventDecoder` decodes the logs of many transactions in one pass into
+columns instead of one dict per event:
+
+- a selector -> decoder table is built once, so each log costs one dict
+  lookup on its first four bytes (ABI return logs and foreign logs miss)
+- fixed-width events (all but MetadataCidUpdated) are unpacked with a
+  precompiled `struct.Struct`
+- addresses land as raw 32-byte public keys in one bytearray per column,
+  amounts in `array('Q')`, flags in `array('B')`; base32 encoding happens
+  only for rows that are read back through `EventBatch.rows`
+
+Usage:
+    decoder = EventDecoder()
+    batch = decoder.decode_transactions(indexer_response["transactions"], app_id)
+    batch.columns["Minted"]["amount"]      # array('Q')
+    for event in batch.rows("BlacklistUpdated"):
+        event["account"], event["blacklisted"], event["round"]
+"""
+
+import base64
+import hashlib
+import struct
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from addresses import decode_address, encode_address
+from contract_abi import EVENT_SIGNATURES
+from txn_ingester import flatten_transactions
+
+# Field names of each event, in signature order
+EVENT_FIELDS = {
+    "Minted": ("recipient", "amount"),
+    "Burned": ("account", "amount"),
+    "BlacklistUpdated": ("account", "blacklisted"),
+    "MetadataCidUpdated": ("cid",),
+}
+
+_FORMATS = {"address": "32s", "uint64": "Q", "bool": "B"}
+
+
+def event_selector(signature: str) -> bytes:
+    """ARC-28 selector of an event signature"""
+    return hashlib.new("sha512_256", signature.encode("utf-8")).digest()[:4]
+
+
+def event_types(signature: str) -> List[str]:
+    return signature[signature.index("(") + 1:-1].split(",")
+
+
+def encode_event(name: str, *values) -> bytes:
+    """The log line the contract writes for an event"""
+    signature = EVENT_SIGNATURES[name]
+    body, tails = b"", b""
+    types = event_types(signature)
+    head_size = sum(2 if kind == "string" else struct.calcsize(">" + _FORMATS[kind]) for kind in types)
+    for kind, value in zip(types, values):
+        if kind == "address":
+            body += decode_address(value)
+        elif kind == "uint64":
+            body += value.to_bytes(8, "big")
+        elif kind == "bool":
+            body += b"\x80" if value else b"\x00"
+        else:
+            encoded = value.encode("utf-8")
+            body += (head_size + len(tails)).to_bytes(2, "big")
+            tails += len(encoded).to_bytes(2, "big") + encoded
+    return event_selector(signature) + body + tails
+
+
+def _empty_column(kind: str):
+    if kind == "address":
+        return bytearray()
+    if kind == "uint64":
+        return array("Q")
+    if kind == "bool":
+        return array("B")
+    return []
+
+
+class EventBatch:
+    """
+    Decoded events as columns: columns[event][field], plus "round" and "txn"
+    (index into `txids`) for every event
+    """
+
+    def __init__(self):
+        self.txids: List[str] = []
+        self.columns: Dict[str, Dict[str, Any]] = {}
+        for name, fields in EVENT_FIELDS.items():
+            types = event_types(EVENT_SIGNATURES[name])
+            columns = {field: _empty_column(kind) for field, kind in zip(fields, types)}
+            columns["round"] = array("Q")
+            columns["txn"] = array("I")
+            self.columns[name] = columns
+
+    def count(self, name: str) -> int:
+        return len(self.columns[name]["round"])
+
+    def __len__(self) -> int:
+        return sum(self.count(name) for name in self.columns)
+
+    def rows(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Materialize one event type as dicts (addresses base32-encoded)"""
+        columns = self.columns[name]
+        types = dict(zip(EVENT_FIELDS[name], event_types(EVENT_SIGNATURES[name])))
+        for i in range(self.count(name)):
+            row = {}
+            for field, kind in types.items():
+                column = columns[field]
+                if kind == "address":
+                    row[field] = encode_address(bytes(column[i * 32:(i + 1) * 32]))
+                elif kind == "bool":
+                    row[field] = bool(column[i])
+                else:
+                    row[field] = column[i]
+            row["round"] = columns["round"][i]
+            row["txid"] = self.txids[columns["txn"][i]] if self.txids else None
+            yield row
+
+
+# Appends one log body to the batch: (body, round, txn index) -> None
+EventAppender = Callable[[bytes, int, int], None]
+
+
+class EventDecoder:
+    """
+    Batch ARC-28 decoder with a precompiled selector lookup table
+    """
+
+    def __init__(self):
+        self.selectors = {event_selector(signature): name for name, signature in EVENT_SIGNATURES.items()}
+
+    def _appenders(self, batch: EventBatch) -> Dict[bytes, EventAppender]:
+        table = {}
+        for selector, name in self.selectors.items():
+            columns = batch.columns[name]
+            types = event_types(EVENT_SIGNATURES[name])
+            targets = [columns[field] for field in EVENT_FIELDS[name]]
+            table[selector] = (
+                self._string_appender(targets[0], columns) if types == ["string"]
+                else self._fixed_appender(types, targets, columns)
+            )
+        return table
+
+    @staticmethod
+    def _fixed_appender(types: List[str], targets: List[Any], columns: Dict[str, Any]) -> EventAppender:
+        layout = struct.Struct(">" + "".join(_FORMATS[kind] for kind in types))
+        unpack, size = layout.unpack_from, layout.size
+        rounds, txns = columns["round"], columns["txn"]
+        # Specialized for the (address, uint64|bool) shape every fixed event has
+        if len(types) == 2 and types[0] == "address":
+            extend_keys, append_value = targets[0].extend, targets[1].append
+            shift = 7 if types[1] == "bool" else 0
+
+            def append(body: bytes, round_number: int, txn: int):
+                if len(body) < 4 + size:
+                    return
+                key, value = unpack(body, 4)
+                extend_keys(key)
+                append_value(value >> shift)
+                rounds.append(round_number)
+                txns.append(txn)
+
+            return append
+
+        shifts = [7 if kind == "bool" else 0 for kind in types]
+
+        def append(body: bytes, round_number: int, txn: int):
+            if len(body) < 4 + size:
+                return
+            for target, value, shift in zip(targets, unpack(body, 4), shifts):
+                if isinstance(target, bytearray):
+                    target.extend(value)
+                else:
+                    target.append(value >> shift)
+            rounds.append(round_number)
+            txns.append(txn)
+
+        return append
+
+    @staticmethod
+    def _string_appender(target: List[str], columns: Dict[str, Any]) -> EventAppender:
+        rounds, txns = columns["round"], columns["txn"]
+
+        def append(body: bytes, round_number: int, txn: int):
+            offset = 4 + int.from_bytes(body[4:6], "big")
+            length = int.from_bytes(body[offset:offset + 2], "big")
+            target.append(body[offset + 2:offset + 2 + length].decode("utf-8", "replace"))
+            rounds.append(round_number)
+            txns.append(txn)
+
+        return append
+
+    def decode_logs(self,
+                    logs: Iterable[Tuple[bytes, int, int]],
+                    batch: Optional[EventBatch] = None) -> EventBatch:
+        """
+        Decode (log bytes, round, txn index) triples in one pass
+
+        Logs that are not FarmFoodTokenizer events (ABI return values,
+        other apps' events) are skipped.
+        """
+        if batch is None:
+            batch = EventBatch()
+        table = self._appenders(batch)
+        get = table.get
+        for body, round_number, txn in logs:
+            append = get(body[:4])
+            if append is not None:
+                append(body, round_number, txn)
+        return batch
+
+    def decode_transactions(self, transactions: Sequence[Dict[str, Any]], app_id: int) -> EventBatch:
+        """Events from indexer transactions (inner transactions included) calling `app_id`"""
+        batch = EventBatch()
+        txids = batch.txids
+
+        def logs() -> Iterator[Tuple[bytes, int, int]]:
+            b64decode = base64.b64decode
+            for root in transactions:
+                for txn in flatten_transactions(root):
+                    encoded = txn.get("logs")
+                    if not encoded or txn.get("application-transaction", {}).get("application-id") != app_id:
+                        continue
+                    index = len(txids)
+                    txids.append(txn["id"])
+                    round_number = txn["confirmed-round"]
+                    for entry in encoded:
+                        yield b64decode(entry), round_number, index
+
+        return self.decode_logs(logs(), batch)
@@ -0,0 +1,69 @@
+"""
+FarmFoodTokenizer state reader
+==============================
+
+Answers the read-only methods (`get_contract_info`, `get_metadata_cid`,
+`is_blacklisted`) by decoding the app's global state and blacklist boxes
+straight from algod, without submitting a transaction. All contract fields
+come from one `application_info` fetch (see state_layout.py).
+
+Usage:
+    reader = ContractStateReader(algod_client, app_id)
+    reader.get_contract_info()
+    reader.is_blacklisted(address)
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from blacklist_boxes import blacklist_box_name
+from node_client import NodeHTTPError
+from state_layout import decode_contract_state
+
+
+# (token_name, asset_id, total_supply, minted, burned, circulating); the
+# supply counters are None for apps created before they existed
+ContractInfo = Tuple[str, int, int, Optional[int], Optional[int], Optional[int]]
+
+
+def contract_info(state: Dict[str, Any]) -> ContractInfo:
+    """`get_contract_info` result from decoded contract state"""
+    return (state["token_name"], state["farm_token_id"], state["total_supply"],
+            state["minted"], state["burned"], state["circulating"])
+
+
+def metadata_cid(state: Dict[str, Any]) -> str:
+    """`get_metadata_cid` result from decoded contract state"""
+    return state["ipfs_cid"]
+
+
+class ContractStateReader:
+    """
+    Reads FarmFoodTokenizer state directly from algod
+    """
+
+    def __init__(self, algod_client, app_id: int):
+        self.algod_client = algod_client
+        self.app_id = app_id
+
+    def global_state(self) -> Dict[str, Any]:
+        """Every contract field, decoded from one application_info fetch"""
+        info = self.algod_client.application_info(self.app_id)
+        return decode_contract_state(info["params"].get("global-state", []))
+
+    def get_contract_info(self) -> ContractInfo:
+        return contract_info(self.global_state())
+
+    def get_metadata_cid(self) -> str:
+        return metadata_cid(self.global_state())
+
+    def get_admin(self) -> str:
+        return self.global_state()["admin"]
+
+    def is_blacklisted(self, address: str) -> bool:
+        try:
+            self.algod_client.application_box_by_name(self.app_id, blacklist_box_name(address))
+        except NodeHTTPError as e:
+            if e.status == 404:
+                return False
+            raise
+        return True
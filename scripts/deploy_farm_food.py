@@ -4,85 +4,192 @@ Deployment script for Farm Food Tokenization Platform
 
 This script handles the deployment of the smart contract and initial setup.
 
+Redeploys are incremental: the saved deployment record is diffed against
+the contract source and config first. An unchanged contract is skipped,
+a changed one is updated in place, and a run with nothing to change
+submits no transactions. Compiled artifacts are cached by source hash and
+compiler version (see compile_cache.py).
+
 Requirements:
 - AlgoKit CLI installed
 - Algorand node running (LocalNet/TestNet)
 - Python environment with AlgoPy and AlgoKit
 
+The node clients and SDKs are imported only by the commands that talk to
+a node, so `plan` and `--help` start quickly and work offline.
+
 Usage:
-    python scripts/deploy_farm_food.py --network localnet
-    python scripts/deploy_farm_food.py --network testnet
+    python scripts/deploy_farm_food.py plan --network testnet
+    python scripts/deploy_farm_food.py deploy --network localnet [--async]
+    python scripts/deploy_farm_food.py status --network localnet
+    python scripts/deploy_farm_food.py verify --network testnet
+    python scripts/deploy_farm_food.py deploy --trace-file deployments/traces.jsonl --metrics-port 9108
+
+`python scripts/deploy_farm_food.py --network localnet` still deploys.
 """
 
 import argparse
+import copy
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
+
+from compile_cache import CompileCache, source_hash
+from state_layout import STATE_LAYOUT_VERSION
+from telemetry import TELEMETRY, traced
 
-# Import AlgoKit SDK (placeholder - actual imports would be from algokit_utils)
+# AlgoKit SDK imports happen inside the deploy steps that need them, e.g.
 # from algokit_utils import ApplicationClient, get_localnet_default_account
 # from algosdk import account, mnemonic
-# from algosdk.v2client import algod
+
+NETWORKS = ("localnet", "testnet")
+
+COMMANDS = ("plan", "deploy", "status", "verify")
+
+CONFIG_PATH = Path("scripts/deploy_config.json")
+
+DEFAULT_CONFIG = {
+    "localnet": {
+        "algod_address": "http://localhost:4001",
+        "algod_token": "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+        "indexer_address": "http://localhost:8980",
+        "indexer_token": "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+    },
+    "testnet": {
+        "algod_address": "https://testnet-api.algonode.cloud",
+        "algod_token": "",
+        "indexer_address": "https://testnet-idx.algonode.cloud",
+        "indexer_token": ""
+    },
+    "token_config": {
+        "name": "FarmToken",
+        "unit_name": "FT",
+        "total_supply": 1000000,
+        "decimals": 2,
+        "metadata_cid": "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"
+    }
+}
+
+
+def validate_config(config: Dict[str, Any], network: str) -> Tuple[List[str], List[str]]:
+    """
+    Check a deployment config without touching the network
+    
+    Returns:
+        (errors that would make the deploy fail, warnings)
+    """
+    from addresses import is_valid_address
+    from ipfs_blocks import CID
+    
+    errors, warnings = [], []
+    network_config = config.get(network)
+    if not isinstance(network_config, dict):
+        errors.append(f"missing '{network}' network section")
+    elif not network_config.get("algod_address"):
+        errors.append(f"{network}.algod_address is not set")
+    
+    token = config.get("token_config")
+    if not isinstance(token, dict):
+        return errors + ["missing 'token_config' section"], warnings
+    name, unit_name = token.get("name", ""), token.get("unit_name", "")
+    if not name or len(name.encode()) > 32:
+        errors.append("token_config.name must be 1-32 bytes")
+    if not unit_name or len(unit_name.encode()) > 8:
+        errors.append("token_config.unit_name must be 1-8 bytes")
+    total_supply, decimals = token.get("total_supply"), token.get("decimals")
+    if not isinstance(decimals, int) or not 0 <= decimals <= 19:
+        errors.append("token_config.decimals must be an integer from 0 to 19")
+    elif not isinstance(total_supply, int) or not 0 < total_supply * 10 ** decimals < 2 ** 64:
+        errors.append("token_config.total_supply must be a positive integer that fits in uint64 base units")
+    try:
+        CID.parse(token.get("metadata_cid", ""))
+    except ValueError as e:
+        errors.append(f"token_config.metadata_cid: {e}")
+    
+    multisig = config.get("multisig")
+    if multisig:
+        members = multisig.get("addresses", [])
+        if not 1 <= multisig.get("threshold", 0) <= len(members):
+            errors.append("multisig.threshold must be between 1 and the number of addresses")
+        invalid = [member for member in members if not is_valid_address(member)]
+        if invalid:
+            warnings.append(f"multisig addresses are not valid Algorand addresses yet: {', '.join(invalid)}")
+    return errors, warnings
+
+
+def planned_transactions(plan: Dict[str, Any], config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Transactions a deploy would submit for a plan from `plan_deployment`"""
+    from protocol import MIN_TXN_FEE
+    
+    token = config["token_config"]
+    txns = []
+    
+    def add(step: str, kind: str, description: str, inner: int = 0):
+        # Inner transactions are fee-pooled onto the outer call
+        txns.append({"step": step, "type": kind, "description": description, "fee": MIN_TXN_FEE * (1 + inner)})
+    
+    if plan["contract"] == "create":
+        add("deploy_contract", "appl", "create FarmFoodTokenizer application")
+        add("fund_app_account", "pay", "fund app account for ASA and box min-balance")
+    elif plan["contract"] == "update":
+        add("update_contract", "appl", "update application programs in place")
+    if plan["asa"] == "create":
+        add("create_asa", "appl",
+            f"create_asa {token['name']} ({token['unit_name']}), {token['total_supply']} "
+            f"with {token['decimals']} decimals", inner=1)
+        add("opt_in_asa", "axfer", "deployer opts into the ASA")
+    if plan["multisig"] == "configure":
+        multisig = config.get("multisig", {})
+        add("configure_multisig", "pay",
+            f"rekey admin to {multisig.get('threshold', 2)}-of-{len(multisig.get('addresses', []))} multisig")
+    if plan["metadata"] == "set":
+        add("set_initial_metadata", "appl", f"update_metadata_cid {token['metadata_cid']}")
+    return txns
 
 class FarmFoodDeployer:
     """
     Deployment manager for Farm Food Tokenization platform
     """
     
-    def __init__(self, network: str = "localnet"):
+    # Fixed when the contract creates its ASA; changing any of them needs a new app
+    ASA_FIELDS = ("name", "unit_name", "total_supply", "decimals")
+    
+    def __init__(self,
+                 network: str = "localnet",
+                 config: Optional[Dict[str, Any]] = None,
+                 compile_cache: Optional[CompileCache] = None):
         self.network = network
         self.contract_path = Path("contracts/farm_food_tokenizer.py")
-        self.config = self.load_config()
+        self.output_file = Path(f"deployments/{network}_deployment.json")
+        self.config = config if config is not None else self.load_config()
+        self.compile_cache = compile_cache or CompileCache()
+        self.algod_client = None
         
     def load_config(self) -> Dict[str, Any]:
-        """Load deployment configuration"""
-        config_path = Path("scripts/deploy_config.json")
-        
-        default_config = {
-            "localnet": {
-                "algod_address": "http://localhost:4001",
-                "algod_token": "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
-                "indexer_address": "http://localhost:8980",
-                "indexer_token": "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
-            },
-            "testnet": {
-                "algod_address": "https://testnet-api.algonode.cloud",
-                "algod_token": "",
-                "indexer_address": "https://testnet-idx.algonode.cloud",
-                "indexer_token": ""
-            },
-            "token_config": {
-                "name": "FarmToken",
-                "unit_name": "FT",
-                "total_supply": 1000000,
-                "decimals": 2,
-                "metadata_cid": "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"
-            }
-        }
-        
-        if config_path.exists():
-            with open(config_path, 'r') as f:
+        """Load deployment configuration, falling back to the defaults if there is no file"""
+        if CONFIG_PATH.exists():
+            with open(CONFIG_PATH, 'r') as f:
                 return json.load(f)
-        else:
-            # Create default config file
-            with open(config_path, 'w') as f:
-                json.dump(default_config, f, indent=2)
-            return default_config
+        return copy.deepcopy(DEFAULT_CONFIG)
     
+    @traced("deploy.setup_client")
     def setup_client(self):
         """Setup Algorand client"""
+        from node_client import clients_for_network
+        from round_cache import CachedAlgodClient
+        
         network_config = self.config[self.network]
         
-        # In actual implementation:
-        # self.algod_client = algod.AlgodClient(
-        #     network_config["algod_token"],
-        #     network_config["algod_address"]
-        # )
+        # Shared keep-alive pools; no request is made until first use.
+        # Params and app state reads are cached per round.
+        algod_client, self.indexer_client = clients_for_network(self.config, self.network)
+        self.algod_client = CachedAlgodClient(algod_client)
         
         print(f"✅ Connected to {self.network} network")
         print(f"   Algod: {network_config['algod_address']}")
         return True
     
+    @traced("deploy.get_deployer_account")
     def get_deployer_account(self):
         """Get or create deployer account"""
         if self.network == "localnet":
@@ -102,22 +209,33 @@ class FarmFoodDeployer:
         print(f"✅ Deployer account: {account_info['address']}")
         return account_info
     
+    @traced("deploy.compile_contract")
+    def compile_contract(self):
+        """Compiled artifacts for the contract, from the cache when unchanged"""
+        hits = self.compile_cache.hits
+        artifacts = self.compile_cache.artifacts(self.contract_path)
+        print(f"✅ Contract compiled ({'cached' if self.compile_cache.hits > hits else 'fresh'}): {artifacts.path}")
+        return artifacts
+    
+    @traced("deploy.deploy_contract")
     def deploy_contract(self, deployer_account: Dict[str, str]) -> Dict[str, Any]:
         """Deploy the smart contract"""
         print("🚀 Deploying Farm Food Tokenization contract...")
+        artifacts = self.compile_contract()
         
         # In actual implementation:
-        # 1. Compile the contract
-        # 2. Create ApplicationClient
-        # 3. Deploy to network
-        # 4. Fund the contract if needed
+        # 1. Create ApplicationClient from artifacts.app_spec()
+        # 2. Deploy to network
         
         # Mock deployment result
         deployment_result = {
             "app_id": 123456789,
             "app_address": "CONTRACT_ADDRESS_HERE",
             "txn_id": "DEPLOYMENT_TXN_ID",
-            "network": self.network
+            "network": self.network,
+            "source_hash": artifacts.source_hash,
+            "compiler_version": artifacts.compiler_version,
+            "state_layout": STATE_LAYOUT_VERSION
         }
         
         print(f"✅ Contract deployed successfully!")
@@ -127,6 +245,25 @@ class FarmFoodDeployer:
         
         return deployment_result
     
+    @traced("deploy.update_contract")
+    def update_contract(self, deployment_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Update the deployed program in place with the current source"""
+        print(f"🔄 Updating contract {deployment_result['app_id']} in place...")
+        artifacts = self.compile_contract()
+        
+        # In actual implementation:
+        # 1. Send an UpdateApplication call with the new approval/clear programs
+        
+        updated = {
+            **deployment_result,
+            "txn_id": "UPDATE_TXN_ID",
+            "source_hash": artifacts.source_hash,
+            "compiler_version": artifacts.compiler_version
+        }
+        print(f"✅ Contract updated: {updated['app_id']}")
+        return updated
+    
+    @traced("deploy.create_asa")
     def create_asa(self, deployment_result: Dict[str, Any]) -> Dict[str, Any]:
         """Create the ASA token"""
         print("🪙 Creating FarmToken ASA...")
@@ -156,29 +293,206 @@ class FarmFoodDeployer:
         
         return asa_result
     
+    @traced("deploy.fund_app_account")
+    def fund_app_account(self, deployment_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Fund the app account to cover ASA and box min-balance"""
+        # In actual implementation:
+        # 1. Send a payment from the deployer to the app address
+        # 2. Amount covers the ASA holding plus expected blacklist boxes
+        
+        print(f"✅ App account funded: {deployment_result['app_address']}")
+        return {"txn_id": "FUND_APP_TXN_ID"}
+    
+    @traced("deploy.configure_multisig")
+    def configure_multisig(self, deployment_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Configure multisig settings"""
+        multisig = self.config.get("multisig", {})
+        
+        # In actual implementation:
+        # 1. Derive the multisig address from the configured members
+        # 2. Rekey / transfer admin to the multisig account
+        
+        print(f"✅ Multisig configured: {multisig.get('threshold', 2)}-of-{len(multisig.get('addresses', []))}")
+        return {"txn_id": "MULTISIG_TXN_ID"}
+    
+    @traced("deploy.set_initial_metadata")
+    def set_initial_metadata(self, deployment_result: Dict[str, Any], asa_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Set initial metadata CID"""
+        token_config = self.config["token_config"]
+        
+        # In actual implementation:
+        # 1. Call update_metadata_cid if the configured CID differs
+        
+        print(f"✅ Metadata CID set: {token_config['metadata_cid']}")
+        return {"txn_id": "METADATA_TXN_ID"}
+    
+    @traced("deploy.opt_in_asa")
+    def opt_in_asa(self, deployment_result: Dict[str, Any], asa_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Opt the deployer account into the ASA"""
+        # In actual implementation:
+        # 1. Send a 0-amount asset transfer from the deployer to itself
+        
+        print(f"✅ Opted into ASA {asa_result['asset_id']}")
+        return {"txn_id": "OPT_IN_TXN_ID"}
+    
+    @traced("deploy.setup_initial_state")
     def setup_initial_state(self, deployment_result: Dict[str, Any], asa_result: Dict[str, Any]):
         """Setup initial contract state"""
         print("⚙️ Setting up initial contract state...")
         
-        # In actual implementation:
-        # 1. Set up initial admin permissions
-        # 2. Configure multisig settings
-        # 3. Set initial metadata
-        # 4. Opt contract into ASA
+        self.configure_multisig(deployment_result)
+        self.set_initial_metadata(deployment_result, asa_result)
+        self.opt_in_asa(deployment_result, asa_result)
         
         print("✅ Initial state configured!")
         
-    def save_deployment_info(self, deployment_result: Dict[str, Any], asa_result: Dict[str, Any]):
-        """Save deployment information"""
-        deployment_info = {
+    def deployment_record(self, deployment_result: Dict[str, Any], asa_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Deployment information as saved to deployments/"""
+        return {
             "network": self.network,
             "timestamp": "2025-01-01T00:00:00Z",  # In actual implementation: datetime.utcnow().isoformat()
             "contract": deployment_result,
             "asa": asa_result,
             "config": self.config
         }
+    
+    def load_deployment_record(self) -> Optional[Dict[str, Any]]:
+        """The saved deployment record for this network, if any"""
+        if not self.output_file.exists():
+            return None
+        with open(self.output_file, 'r') as f:
+            return json.load(f)
+    
+    def plan_deployment(self) -> Dict[str, Any]:
+        """
+        Diff the contract source and config against the saved deployment record
+        
+        Returns:
+            Action per component (contract, asa, multisig, metadata) and the
+            reasons behind them; `changes` is empty when nothing needs doing
+        """
+        record = self.load_deployment_record()
+        current_hash = source_hash(self.contract_path)
+        token_config = self.config["token_config"]
+        plan = {
+            "contract": "create",
+            "asa": "create",
+            "multisig": "configure",
+            "metadata": "set",
+            "changes": [],
+            "source_hash": current_hash,
+            "record": record
+        }
+        if record is None:
+            plan["changes"].append(f"no deployment record for {self.network}")
+            return plan
+        
+        saved_config = record.get("config", {})
+        saved_token = saved_config.get("token_config", {})
+        asa_changes = [f for f in self.ASA_FIELDS if saved_token.get(f) != token_config.get(f)]
+        if asa_changes:
+            plan["changes"].append(f"ASA parameters changed ({', '.join(asa_changes)}); a new app is required")
+            return plan
+        # An in-place update keeps the old global schema and keys
+        saved_layout = record["contract"].get("state_layout", 0)
+        if saved_layout != STATE_LAYOUT_VERSION:
+            plan["changes"].append(
+                f"global state layout changed (v{saved_layout} -> v{STATE_LAYOUT_VERSION}); a new app is required"
+            )
+            return plan
+        
+        plan["asa"] = "skip"
+        if record["contract"].get("source_hash") == current_hash:
+            plan["contract"] = "skip"
+        else:
+            plan["contract"] = "update"
+            plan["changes"].append("contract source changed")
+        if saved_config.get("multisig") == self.config.get("multisig"):
+            plan["multisig"] = "skip"
+        else:
+            plan["changes"].append("multisig members or threshold changed")
+        if saved_token.get("metadata_cid") == token_config.get("metadata_cid"):
+            plan["metadata"] = "skip"
+        else:
+            plan["changes"].append(f"metadata CID changed to {token_config['metadata_cid']}")
+        return plan
+    
+    @traced("deploy.status")
+    def status(self) -> Optional[Dict[str, Any]]:
+        """Print and return the deployed app's on-chain state"""
+        from contract_state import ContractStateReader
+        
+        record = self.load_deployment_record()
+        if record is None:
+            print(f"❌ No deployment record for {self.network} ({self.output_file})")
+            return None
+        if self.algod_client is None:
+            self.setup_client()
+        
+        app_id = record["contract"]["app_id"]
+        reader = ContractStateReader(self.algod_client, app_id)
+        token_name, asset_id, total_supply, minted, burned, circulating = reader.get_contract_info()
+        status = {
+            "app_id": app_id,
+            "admin": reader.get_admin(),
+            "token_name": token_name,
+            "asset_id": asset_id,
+            "total_supply": total_supply,
+            "minted": minted,
+            "burned": burned,
+            "circulating": circulating,
+            "metadata_cid": reader.get_metadata_cid(),
+        }
+        print(f"📋 Contract App ID: {app_id} (admin {status['admin']})")
+        print(f"🪙 {token_name}: asset {asset_id}, total supply {total_supply}")
+        if circulating is not None:
+            print(f"   Circulating: {circulating} (minted {minted}, burned {burned})")
+        print(f"🌐 Metadata CID: {status['metadata_cid']}")
+        return status
+    
+    @traced("deploy.verify")
+    def verify(self) -> List[str]:
+        """
+        Compare the on-chain deployment with the saved record, local source and config
+        
+        Returns:
+            Mismatches found; empty when the deployment is consistent
+        """
+        status = self.status()
+        if status is None:
+            return [f"no deployment record for {self.network}"]
+        record = self.load_deployment_record()
+        token_config = self.config["token_config"]
+        problems = []
+        
+        if status["asset_id"] != record["asa"]["asset_id"]:
+            problems.append(f"app holds asset {status['asset_id']}, record says {record['asa']['asset_id']}")
+        if status["token_name"] != token_config["name"]:
+            problems.append(f"on-chain token name {status['token_name']!r} != config {token_config['name']!r}")
+        if status["metadata_cid"] != token_config["metadata_cid"]:
+            problems.append(f"on-chain metadata CID {status['metadata_cid']} != config {token_config['metadata_cid']}")
+        if record["contract"].get("source_hash") != source_hash(self.contract_path):
+            problems.append("contract source changed since the last deploy")
+        else:
+            artifacts = self.compile_cache.lookup(record["contract"]["source_hash"])
+            if artifacts is not None:
+                app = self.algod_client.application_info(record["contract"]["app_id"])
+                compiled = self.algod_client.compile(artifacts.approval_teal())
+                if compiled["result"] != app["params"]["approval-program"]:
+                    problems.append("on-chain approval program differs from the compiled source")
+        
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not problems:
+            print(f"✅ {self.network} deployment matches its record, source and config")
+        return problems
+    
+    @traced("deploy.save_deployment_info")
+    def save_deployment_info(self, deployment_result: Dict[str, Any], asa_result: Dict[str, Any]):
+        """Save deployment information"""
+        deployment_info = self.deployment_record(deployment_result, asa_result)
         
-        output_file = Path(f"deployments/{self.network}_deployment.json")
+        output_file = self.output_file
         output_file.parent.mkdir(exist_ok=True)
         
         with open(output_file, 'w') as f:
@@ -186,11 +500,36 @@ class FarmFoodDeployer:
         
         print(f"✅ Deployment info saved to {output_file}")
         
-    def deploy(self):
-        """Main deployment process"""
+    def apply_existing(self, plan: Dict[str, Any]) -> bool:
+        """
+        Carry out a plan that keeps the saved app: nothing to do, or an in-place redeploy
+        
+        Returns:
+            True if the plan was handled; False when a new app has to be created
+        """
+        if not plan["changes"]:
+            record = plan["record"]
+            print(f"♻️ {self.network} is up to date; nothing to submit")
+            print(f"📋 Contract App ID: {record['contract']['app_id']}")
+            print(f"🪙 Token Asset ID: {record['asa']['asset_id']}")
+            return True
+        for change in plan["changes"]:
+            print(f"📋 {change}")
+        if plan["contract"] != "create":
+            self.redeploy(plan)
+            return True
+        return False
+    
+    @traced("deploy.deploy")
+    def deploy(self) -> Dict[str, Any]:
+        """Main deployment process; returns the deployment plan that was carried out"""
         print(f"🌱 Starting Farm Food Tokenization deployment on {self.network}...")
         print("=" * 60)
         
+        plan = self.plan_deployment()
+        if self.apply_existing(plan):
+            return plan
+        
         try:
             # 1. Setup client
             self.setup_client()
@@ -200,6 +539,7 @@ class FarmFoodDeployer:
             
             # 3. Deploy contract
             deployment_result = self.deploy_contract(deployer_account)
+            self.fund_app_account(deployment_result)
             
             # 4. Create ASA
             asa_result = self.create_asa(deployment_result)
@@ -219,21 +559,131 @@ class FarmFoodDeployer:
         except Exception as e:
             print(f"❌ Deployment failed: {str(e)}")
             raise
+        return plan
+    
+    @traced("deploy.redeploy")
+    def redeploy(self, plan: Dict[str, Any]):
+        """Apply an incremental plan to an existing deployment"""
+        record = plan["record"]
+        deployment_result, asa_result = record["contract"], record["asa"]
+        
+        try:
+            self.setup_client()
+            self.get_deployer_account()
+            
+            if plan["contract"] == "update":
+                deployment_result = self.update_contract(deployment_result)
+            if plan["multisig"] == "configure":
+                self.configure_multisig(deployment_result)
+            if plan["metadata"] == "set":
+                self.set_initial_metadata(deployment_result, asa_result)
+            
+            self.save_deployment_info(deployment_result, asa_result)
+            
+            print("=" * 60)
+            print("🎉 Redeployment completed successfully!")
+            print(f"📋 Contract App ID: {deployment_result['app_id']}")
+            print(f"🪙 Token Asset ID: {asa_result['asset_id']}")
+        
+        except Exception as e:
+            print(f"❌ Redeployment failed: {str(e)}")
+            raise
+
+def run_plan(deployer: FarmFoodDeployer) -> int:
+    """Validate the config and print what a deploy would submit; no network access"""
+    errors, warnings = validate_config(deployer.config, deployer.network)
+    for warning in warnings:
+        print(f"⚠️ {warning}")
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        return 1
+    print(f"✅ {CONFIG_PATH if CONFIG_PATH.exists() else 'Default config'} is valid for {deployer.network}")
+    
+    plan = deployer.plan_deployment()
+    if not plan["changes"]:
+        print(f"♻️ {deployer.network} is up to date; a deploy would submit nothing")
+        return 0
+    for change in plan["changes"]:
+        print(f"📋 {change}")
+    txns = planned_transactions(plan, deployer.config)
+    print(f"🚀 A deploy would submit {len(txns)} transactions "
+          f"({sum(txn['fee'] for txn in txns) / 1_000_000:.3f} ALGO in fees):")
+    for txn in txns:
+        print(f"   {txn['step']:<22} {txn['type']:<6} {txn['description']}")
+    return 0
 
-def main():
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point"""
+    import sys
+    
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Bare `--network X` (the original interface) means deploy
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv.insert(0, "deploy")
+    
     parser = argparse.ArgumentParser(description="Deploy Farm Food Tokenization Platform")
-    parser.add_argument(
-        "--network",
-        choices=["localnet", "testnet"],
-        default="localnet",
-        help="Network to deploy to"
-    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command, help_text in [
+        ("plan", "Validate the config and list the transactions a deploy would submit (offline)"),
+        ("deploy", "Deploy, or incrementally redeploy, the contract and ASA"),
+        ("status", "Show the deployed app's on-chain state"),
+        ("verify", "Check the on-chain deployment against the record, source and config"),
+    ]:
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument(
+            "--network",
+            choices=NETWORKS,
+            default="localnet",
+            help="Network to use"
+        )
+        if command == "deploy":
+            subparser.add_argument(
+                "--async",
+                dest="run_async",
+                action="store_true",
+                help="Run independent deployment steps concurrently"
+            )
+        subparser.add_argument("--metrics-file", type=Path, help="Write Prometheus metrics here when done")
+        subparser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port while running")
+        subparser.add_argument("--trace-file", type=Path, help="Append JSON-lines trace spans here when done")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
-    deployer = FarmFoodDeployer(network=args.network)
-    deployer.deploy()
+    if args.metrics_file or args.trace_file or args.metrics_port is not None:
+        TELEMETRY.enable()
+        if args.metrics_port is not None:
+            TELEMETRY.serve_prometheus(args.metrics_port)
+            print(f"📋 Metrics at http://127.0.0.1:{args.metrics_port}/metrics")
+    try:
+        run_command(args)
+    finally:
+        if args.metrics_file:
+            TELEMETRY.write_prometheus(args.metrics_file)
+            print(f"📋 Metrics written to {args.metrics_file}")
+        if args.trace_file:
+            count = TELEMETRY.write_traces(args.trace_file)
+            print(f"📋 {count} trace spans written to {args.trace_file}")
+
+
+def run_command(args: argparse.Namespace):
+    """Run a parsed subcommand"""
+    if args.command == "plan":
+        raise SystemExit(run_plan(FarmFoodDeployer(network=args.network)))
+    if args.command == "status":
+        FarmFoodDeployer(network=args.network).status()
+    elif args.command == "verify":
+        if FarmFoodDeployer(network=args.network).verify():
+            raise SystemExit(1)
+    elif args.run_async:
+        import asyncio
+        from async_deploy import AsyncFarmFoodDeployer
+        
+        asyncio.run(AsyncFarmFoodDeployer(network=args.network).deploy_async())
+    else:
+        deployer = FarmFoodDeployer(network=args.network)
+        deployer.deploy()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""
+Multi-network deployment matrix
+===============================
+
+Deploys to several targets at once: a list of networks, each with one or
+more independent app instances. Every target gets its own deployer, its own
+copy of the config and its own node clients, so nothing is shared between
+targets except the config file read once at start.
+
+- targets run concurrently, each one with the async step graph from
+  async_deploy.py; like a single deploy, a target whose saved record is up
+  to date submits nothing and an incremental change is redeployed in place
+- a failing target does not stop the others
+- deployment records are held in memory and written to deployments/ in one
+  pass once every target has finished
+- a summary table reports timings and errors per target
+
+Instance 1 of a network keeps the usual deployments/<network>_deployment.json
+record; further instances are saved as
+deployments/<network>_<n>_deployment.json.
+
+Usage:
+    python scripts/deploy_matrix.py --networks localnet,testnet
+    python scripts/deploy_matrix.py --networks localnet --instances 3 --summary matrix.json
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from async_deploy import AsyncFarmFoodDeployer
+from compile_cache import CompileCache
+
+NETWORKS = ("localnet", "testnet")
+
+
+class DeploymentTarget:
+    """
+    One network and app instance in the matrix
+    """
+
+    def __init__(self, network: str, instance: int = 1):
+        if network not in NETWORKS:
+            raise ValueError(f"Unknown network: {network}")
+        self.network = network
+        self.instance = instance
+
+    @property
+    def name(self) -> str:
+        return self.network if self.instance == 1 else f"{self.network}#{self.instance}"
+
+    @property
+    def output_file(self) -> Path:
+        if self.instance == 1:
+            return Path(f"deployments/{self.network}_deployment.json")
+        return Path(f"deployments/{self.network}_{self.instance}_deployment.json")
+
+
+def build_targets(networks: Sequence[str], instances: int = 1) -> List[DeploymentTarget]:
+    """Every network crossed with instances 1..n"""
+    return [DeploymentTarget(network, i) for network in networks for i in range(1, instances + 1)]
+
+
+class MatrixDeployer(AsyncFarmFoodDeployer):
+    """
+    Async deployer for one matrix target that keeps its record in memory
+    """
+
+    def __init__(self,
+                 target: DeploymentTarget,
+                 config: Dict[str, Any],
+                 compile_cache: Optional[CompileCache] = None):
+        super().__init__(network=target.network, config=config, compile_cache=compile_cache)
+        self.target = target
+        self.output_file = target.output_file
+        self.record: Optional[Dict[str, Any]] = None
+
+    def save_deployment_info(self, deployment_result: Dict[str, Any], asa_result: Dict[str, Any]):
+        """Hold the record until the whole matrix has finished"""
+        self.record = self.deployment_record(deployment_result, asa_result)
+        self.record["instance"] = self.target.instance
+
+
+def write_records(records: Dict[Path, Dict[str, Any]]):
+    """Write every deployment record, each replaced atomically"""
+    for path, record in records.items():
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(record, indent=2))
+        os.replace(tmp, path)
+
+
+async def deploy_matrix(targets: Sequence[DeploymentTarget],
+                        config: Dict[str, Any],
+                        max_parallel: Optional[int] = None,
+                        deployer_factory=MatrixDeployer,
+                        compile_cache: Optional[CompileCache] = None) -> Dict[str, Any]:
+    """
+    Deploy every target concurrently and save the records of those that succeed
+
+    All targets share one compile cache, so the contract is compiled once.
+
+    Each row's status is "deployed" (new app), "updated" (redeployed in
+    place), "current" (nothing submitted) or "failed".
+
+    Returns:
+        {"targets": {name: summary row}, "seconds": wall time, "failed": count}
+    """
+    names = [target.name for target in targets]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate deployment targets")
+
+    limit = asyncio.Semaphore(max_parallel or len(targets) or 1)
+    compile_cache = compile_cache or CompileCache()
+    origin = time.perf_counter()
+
+    async def run(target: DeploymentTarget) -> Dict[str, Any]:
+        async with limit:
+            started = time.perf_counter()
+            deployer = deployer_factory(target, copy.deepcopy(config), compile_cache)
+            row = {"network": target.network, "instance": target.instance, "start": started - origin}
+            try:
+                outcome = await deployer.deploy_async()
+            except Exception as e:
+                row.update(status="failed", error=f"{type(e).__name__}: {e}")
+            else:
+                plan = outcome["plan"]
+                record = deployer.record or plan["record"]
+                if not plan["changes"]:
+                    status = "current"
+                else:
+                    status = "deployed" if plan["contract"] == "create" else "updated"
+                row.update(
+                    status=status,
+                    app_id=record["contract"]["app_id"],
+                    asset_id=record["asa"]["asset_id"],
+                    steps={name: timing["duration"] for name, timing in outcome["timings"].items()},
+                    record=deployer.record,
+                    output_file=str(target.output_file),
+                )
+            row["seconds"] = time.perf_counter() - started
+            return row
+
+    rows = await asyncio.gather(*(run(target) for target in targets))
+    # Only targets that submitted something have a new record
+    records = {Path(row["output_file"]): row.pop("record") for row in rows if "record" in row}
+    write_records({path: record for path, record in records.items() if record is not None})
+    return {
+        "targets": dict(zip(names, rows)),
+        "seconds": time.perf_counter() - origin,
+        "failed": sum(row["status"] == "failed" for row in rows),
+    }
+
+
+def print_summary(report: Dict[str, Any]):
+    """Summary table of timings and failures per target"""
+    print("=" * 60)
+    print(f"📋 Deployment matrix: {len(report['targets'])} targets in {report['seconds']:.2f}s")
+    print(f"   {'target':<14} {'status':<9} {'seconds':>8} {'app id':>11} {'asset id':>11}")
+    for name, row in report["targets"].items():
+        icon = "❌" if row["status"] == "failed" else "✅"
+        print(f"{icon} {name:<14} {row['status']:<9} {row['seconds']:>8.2f} "
+              f"{row.get('app_id', '-'):>11} {row.get('asset_id', '-'):>11}")
+        if row.get("error"):
+            print(f"   ⚠️ {row['error']}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Deploy Farm Food Tokenization to several targets at once")
+    parser.add_argument("--networks", default="localnet", help="Comma-separated networks to deploy to")
+    parser.add_argument("--instances", type=int, default=1, help="Independent app instances per network")
+    parser.add_argument("--max-parallel", type=int, help="Targets to deploy at the same time (default: all)")
+    parser.add_argument("--summary", type=Path, help="Write the summary as JSON")
+    args = parser.parse_args()
+
+    targets = build_targets(args.networks.split(","), args.instances)
+    config = json.loads(Path("scripts/deploy_config.json").read_text())
+    report = asyncio.run(deploy_matrix(targets, config, args.max_parallel))
+    print_summary(report)
+
+    if args.summary:
+        args.summary.write_text(json.dumps(report, indent=2))
+        print(f"✅ Summary written to {args.summary}")
+    if report["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
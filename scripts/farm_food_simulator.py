@@ -0,0 +1,285 @@
+"""
+FarmFoodTokenizer Simulator
+===========================
+
+In-process, pure-Python engine that applies the same state transitions as
+contracts/farm_food_tokenizer.py, raising `ContractError` with the same
+messages as the contract asserts. It also models the ASA holdings the
+contract moves through inner transactions, so tests can check balances
+without a LocalNet.
+
+Every call is atomic: all checks run before any state is touched, matching
+the all-or-nothing behaviour of an app call.
+
+Usage:
+    sim = FarmFoodSimulator(admin)
+    asset_id = sim.create_asa(admin, "FarmToken", "FT", 100_000_000, 2, cid)
+    sim.opt_in(user)
+    sim.mint_tokens(admin, user, 1_000)
+"""
+
+from typing import Dict, List, Sequence, Set, Tuple
+
+from addresses import application_address, decode_address, multisig_address
+from blacklist_boxes import BoxBlacklist, blacklist_box_name
+from contract_abi import READONLY_METHODS
+from contract_events import encode_event
+from state_layout import encode_global_state, encode_text
+
+DEFAULT_METADATA_CID = "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"
+
+
+class ContractError(Exception):
+    """
+    A simulated call was rejected; the message matches the on-chain failure
+    """
+
+
+class FarmFoodSimulator:
+    """
+    In-memory FarmFoodTokenizer application plus the ASA it manages
+    """
+
+    def __init__(self, admin: str, app_id: int = 1001):
+        decode_address(admin)
+
+        # Contract state (mirrors FarmFoodTokenizer.__init__)
+        self.admin = admin
+        self.farm_token_id = 0
+        self.total_supply = 1_000_000_00
+        self.multisig_threshold = 2
+        self.token_name = "FarmToken"
+        self.token_unit = "FT"
+        self.ipfs_cid = DEFAULT_METADATA_CID
+        self.minted = 0
+        self.burned = 0
+        self.blacklist = BoxBlacklist()
+
+        # Ledger state the contract touches
+        self.app_id = app_id
+        self.app_address = application_address(app_id)
+        self.holdings: Dict[str, Dict[int, int]] = {}
+        self.assets: Dict[int, Dict[str, object]] = {}
+        self.multisig_members: Dict[str, Tuple[int, Set[str]]] = {}
+        # ARC-28 event logs, in the order the contract would write them
+        self.logs: List[bytes] = []
+        self.next_asset_id = app_id + 1
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _require(condition: bool, message: str):
+        if not condition:
+            raise ContractError(message)
+
+    def _require_admin(self, sender: str, message: str):
+        self._require(sender == self.admin, message)
+
+    def _require_text_fits(self, token_name: str, token_unit: str, ipfs_cid: str):
+        try:
+            encode_text(token_name, token_unit, ipfs_cid)
+        except ValueError:
+            self._require(False, "Token text exceeds global state size")
+
+    def _holding(self, address: str) -> Dict[int, int]:
+        return self.holdings.get(address, {})
+
+    def _require_receiver(self, address: str):
+        self._require(self.farm_token_id in self._holding(address), "Receiver not opted in to asset")
+
+    def _emit(self, name: str, *values):
+        self.logs.append(encode_event(name, *values))
+
+    def _emit_blacklist_changes(self, addresses: List[str], before: Set[bytes], blacklisted: bool):
+        emitted = set()
+        for address in addresses:
+            name = blacklist_box_name(address)
+            if (name in before) != blacklisted and name not in emitted:
+                emitted.add(name)
+                self._emit("BlacklistUpdated", address, blacklisted)
+
+    @property
+    def circulating(self) -> int:
+        return self.minted - self.burned
+
+    def _move(self, sender: str, receiver: str, amount: int):
+        self.holdings[sender][self.farm_token_id] -= amount
+        self.holdings[receiver][self.farm_token_id] += amount
+
+    def call(self, method: str, sender: str, *args):
+        """Dispatch an ABI call by method name"""
+        if method in READONLY_METHODS:
+            return getattr(self, method)(*args)
+        return getattr(self, method)(sender, *args)
+
+    # ------------------------------------------------------------------
+    # Accounts and ASA operations
+    # ------------------------------------------------------------------
+
+    def register_multisig(self, threshold: int, addresses: Sequence[str]) -> str:
+        """Register a multisig account and return its address"""
+        address = multisig_address(threshold, addresses)
+        self.multisig_members[address] = (threshold, set(addresses))
+        return address
+
+    def authorize(self, sender: str, signers: Sequence[str]) -> str:
+        """Check that `signers` can authorize a transaction from `sender`"""
+        if sender in self.multisig_members:
+            threshold, members = self.multisig_members[sender]
+            self._require(len(members.intersection(signers)) >= threshold, "Multisig threshold not met")
+        else:
+            self._require(list(signers) == [sender], "Invalid signature")
+        return sender
+
+    def opt_in(self, address: str):
+        """Opt an account in to the FarmToken ASA"""
+        self._require(self.farm_token_id != 0, "ASA not created")
+        self.holdings.setdefault(address, {}).setdefault(self.farm_token_id, 0)
+
+    def balance(self, address: str) -> int:
+        """FarmToken balance of an account"""
+        return self._holding(address).get(self.farm_token_id, 0)
+
+    def transfer(self, sender: str, receiver: str, amount: int):
+        """
+        Plain ASA transfer. The contract is not involved, so the blacklist does
+        not restrict it (only mints check it); the ASA's own opt-in and balance
+        rules apply.
+        """
+        self._require_receiver(receiver)
+        self._require(self.balance(sender) >= amount, "Insufficient asset balance")
+        self._move(sender, receiver, amount)
+
+    # ------------------------------------------------------------------
+    # ABI methods
+    # ------------------------------------------------------------------
+
+    def create_asa(self,
+                   sender: str,
+                   asset_name: str,
+                   unit_name: str,
+                   total_supply: int,
+                   decimals: int,
+                   metadata_cid: str) -> int:
+        self._require_admin(sender, "Only admin can create ASA")
+        self._require(self.farm_token_id == 0, "ASA already created")
+        self._require_text_fits(asset_name, unit_name, metadata_cid)
+
+        asset_id = self.next_asset_id
+        self.next_asset_id += 1
+        self.assets[asset_id] = {
+            "name": asset_name,
+            "unit_name": unit_name,
+            "total": total_supply,
+            "decimals": decimals,
+            "url": f"ipfs://{metadata_cid}",
+            "manager": self.app_address,
+            "reserve": self.app_address,
+            "clawback": self.app_address,
+        }
+        self.holdings.setdefault(self.app_address, {})[asset_id] = total_supply
+
+        self.farm_token_id = asset_id
+        self.token_name = asset_name
+        self.token_unit = unit_name
+        self.total_supply = total_supply
+        self.ipfs_cid = metadata_cid
+        return asset_id
+
+    def mint_tokens(self, sender: str, recipient: str, amount: int) -> str:
+        self._require_admin(sender, "Only admin can mint tokens")
+        self._require(amount > 0, "Amount must be positive")
+        self._require(amount <= self.total_supply - self.circulating, "Mint exceeds available supply")
+        self._require(blacklist_box_name(recipient) not in self.blacklist.boxes, "Recipient is blacklisted")
+        self._require_receiver(recipient)
+        self.minted += amount
+        self._move(self.app_address, recipient, amount)
+        self._emit("Minted", recipient, amount)
+        return "success"
+
+    def mint_tokens_batch(self, sender: str, recipients: List[str], amounts: List[int]) -> int:
+        self._require_admin(sender, "Only admin can mint tokens")
+        self._require(len(recipients) == len(amounts), "Recipients and amounts must match")
+        self._require(len(recipients) > 0, "Batch must not be empty")
+        for amount in amounts:
+            self._require(amount > 0, "Amount must be positive")
+        total = sum(amounts)
+        self._require(total <= self.total_supply - self.circulating, "Mint exceeds available supply")
+        for recipient in recipients:
+            self._require(blacklist_box_name(recipient) not in self.blacklist.boxes, "Recipient is blacklisted")
+        for recipient in recipients:
+            self._require_receiver(recipient)
+
+        self.minted += total
+        for recipient, amount in zip(recipients, amounts):
+            self._move(self.app_address, recipient, amount)
+        for recipient, amount in zip(recipients, amounts):
+            self._emit("Minted", recipient, amount)
+        return total
+
+    def burn_tokens(self, sender: str, amount: int) -> str:
+        self._require_admin(sender, "Only admin can burn tokens")
+        self._require(amount > 0, "Amount must be positive")
+        self._require(self.balance(sender) >= amount, "Insufficient asset balance")
+        self.burned += amount
+        self._move(sender, self.app_address, amount)
+        self._emit("Burned", sender, amount)
+        return "success"
+
+    def add_to_blacklist(self, sender: str, address: str) -> str:
+        self._require_admin(sender, "Only admin can manage blacklist")
+        if self.blacklist.add(address):
+            self._emit("BlacklistUpdated", address, True)
+        return "success"
+
+    def remove_from_blacklist(self, sender: str, address: str) -> str:
+        self._require_admin(sender, "Only admin can manage blacklist")
+        if self.blacklist.remove(address):
+            self._emit("BlacklistUpdated", address, False)
+        return "success"
+
+    def add_to_blacklist_batch(self, sender: str, addresses: List[str]) -> int:
+        self._require_admin(sender, "Only admin can manage blacklist")
+        before = set(self.blacklist.boxes)
+        added = self.blacklist.add_batch(addresses)
+        self._emit_blacklist_changes(addresses, before, True)
+        return added
+
+    def remove_from_blacklist_batch(self, sender: str, addresses: List[str]) -> int:
+        self._require_admin(sender, "Only admin can manage blacklist")
+        before = set(self.blacklist.boxes)
+        removed = self.blacklist.remove_batch(addresses)
+        self._emit_blacklist_changes(addresses, before, False)
+        return removed
+
+    def is_blacklisted(self, address: str) -> bool:
+        return self.blacklist.contains(address)
+
+    def get_metadata_cid(self) -> str:
+        return self.ipfs_cid
+
+    def update_metadata_cid(self, sender: str, new_cid: str) -> str:
+        self._require_admin(sender, "Only admin can update metadata")
+        self._require_text_fits(self.token_name, self.token_unit, new_cid)
+        self.ipfs_cid = new_cid
+        self._emit("MetadataCidUpdated", new_cid)
+        return "success"
+
+    def get_contract_info(self) -> Tuple[str, int, int, int, int, int]:
+        return (self.token_name, self.farm_token_id, self.total_supply, self.minted, self.burned, self.circulating)
+
+    def global_state(self) -> List[Dict[str, object]]:
+        """The app's global state as algod's `application_info` would return it"""
+        return encode_global_state({
+            "admin": self.admin,
+            "farm_token_id": self.farm_token_id,
+            "total_supply": self.total_supply,
+            "multisig_threshold": self.multisig_threshold,
+            "minted": self.minted,
+            "burned": self.burned,
+            "token_name": self.token_name,
+            "token_unit": self.token_unit,
+            "ipfs_cid": self.ipfs_cid,
+        })
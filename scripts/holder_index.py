@@ -0,0 +1,306 @@
+"""
+FarmToken holder index
+======================
+
+Answers "who holds FarmToken at round N", "top-K holders" and "circulating
+supply" locally instead of scanning every account through the indexer.
+
+The index is built once from an indexer balance snapshot and then kept
+current by applying each block's asset-transfer deltas. Layout is
+array-backed so millions of holders stay compact:
+
+- holder public keys packed into one bytearray, 32 bytes per slot
+- balances in an `array('Q')` indexed by slot
+- an append-only delta log (round, slot, delta) in three typed arrays
+- a copy of the balance array every `checkpoint_interval` rounds
+
+A point-in-time query starts from the nearest checkpoint at or before the
+round and replays the logged deltas up to it.
+
+Usage:
+    python scripts/holder_index.py build --network localnet
+    python scripts/holder_index.py sync --network localnet
+    python scripts/holder_index.py top --limit 10 --round 1200
+    python scripts/holder_index.py supply
+"""
+
+import argparse
+import bisect
+import heapq
+import json
+import pickle
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from addresses import application_address, decode_address, encode_address
+from node_client import clients_for_network
+from txn_ingester import PAGE_SIZE, flatten_transactions
+
+DEFAULT_CHECKPOINT_INTERVAL = 1000
+
+# (address, signed balance change)
+Delta = Tuple[str, int]
+
+
+def transfer_deltas(txn: Dict[str, Any]) -> Iterator[Delta]:
+    """Balance changes caused by one asset transfer, including close-outs"""
+    transfer = txn["asset-transfer-transaction"]
+    # Clawbacks carry the account the tokens are taken from
+    sender = transfer.get("sender") or txn["sender"]
+    amount = transfer["amount"]
+    if amount:
+        yield sender, -amount
+        yield transfer["receiver"], amount
+    close_amount = transfer.get("close-amount", 0)
+    if close_amount:
+        yield sender, -close_amount
+        yield transfer["close-to"], close_amount
+
+
+class HolderIndex:
+    """
+    Array-backed FarmToken balances with checkpoints for point-in-time reads
+    """
+
+    def __init__(self, asset_id: int, reserve_address: str, checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        self.asset_id = asset_id
+        self.reserve_address = reserve_address
+        self.checkpoint_interval = checkpoint_interval
+        self.round = 0
+        self.snapshot_round = 0
+        self._keys = bytearray()
+        self._slots: Dict[bytes, int] = {}
+        self._balances = array("Q")
+        self._delta_rounds = array("Q")
+        self._delta_slots = array("I")
+        self._delta_amounts = array("q")
+        self._checkpoints: List[Tuple[int, array]] = []
+
+    def __len__(self) -> int:
+        """Number of addresses ever seen (holders and former holders)"""
+        return len(self._balances)
+
+    def _slot(self, address: str) -> int:
+        key = decode_address(address)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._balances)
+            self._slots[key] = slot
+            self._keys += key
+            self._balances.append(0)
+        return slot
+
+    def _address(self, slot: int) -> str:
+        return encode_address(bytes(self._keys[slot * 32:(slot + 1) * 32]))
+
+    # Building
+
+    def load_snapshot(self, round_number: int, balances: Iterable[Tuple[str, int]]):
+        """Start the index from a full balance snapshot taken at `round_number`"""
+        for address, amount in balances:
+            self._balances[self._slot(address)] = amount
+        self.round = self.snapshot_round = round_number
+        self._checkpoints = [(round_number, array("Q", self._balances))]
+
+    def apply_round(self, round_number: int, deltas: Iterable[Delta]):
+        """
+        Apply one block's balance changes
+
+        Every delta is checked before any is applied, so a rejected round
+        leaves balances and the delta log untouched.
+        """
+        if not self._checkpoints:
+            raise ValueError("Load a snapshot before applying rounds")
+        if round_number <= self.round:
+            raise ValueError(f"Round {round_number} already applied (index is at {self.round})")
+        deltas = list(deltas)
+        running: Dict[str, int] = {}
+        for address, change in deltas:
+            if address not in running:
+                slot = self._slots.get(decode_address(address))
+                running[address] = self._balances[slot] if slot is not None else 0
+            running[address] += change
+            if running[address] < 0:
+                raise ValueError(f"Negative balance for {address} at round {round_number}")
+        for address, change in deltas:
+            slot = self._slot(address)
+            self._balances[slot] += change
+            self._delta_rounds.append(round_number)
+            self._delta_slots.append(slot)
+            self._delta_amounts.append(change)
+        self.round = round_number
+        if round_number - self._checkpoints[-1][0] >= self.checkpoint_interval:
+            self._checkpoints.append((round_number, array("Q", self._balances)))
+
+    def apply_transactions(self, transactions: Iterable[Dict[str, Any]]) -> int:
+        """
+        Apply indexer transactions (in round order) to the index
+
+        Returns:
+            Number of rounds applied
+        """
+        rounds = 0
+        pending_round, pending = None, []
+        for root in transactions:
+            if root["confirmed-round"] <= self.round:
+                continue
+            if root["confirmed-round"] != pending_round:
+                if pending_round is not None:
+                    self.apply_round(pending_round, pending)
+                    rounds += 1
+                pending_round, pending = root["confirmed-round"], []
+            for txn in flatten_transactions(root):
+                if txn.get("tx-type") == "axfer" and txn["asset-transfer-transaction"]["asset-id"] == self.asset_id:
+                    pending.extend(transfer_deltas(txn))
+        if pending_round is not None:
+            self.apply_round(pending_round, pending)
+            rounds += 1
+        return rounds
+
+    # Point-in-time reads
+
+    def balances_at(self, round_number: Optional[int] = None) -> array:
+        """Balance array (indexed by slot) as of `round_number`"""
+        if round_number is None or round_number >= self.round:
+            return self._balances
+        if round_number < self.snapshot_round:
+            raise ValueError(f"Round {round_number} is before the snapshot at round {self.snapshot_round}")
+
+        position = bisect.bisect_right([r for r, _ in self._checkpoints], round_number) - 1
+        checkpoint_round, checkpoint = self._checkpoints[position]
+        balances = array("Q", checkpoint)
+        balances.extend([0] * (len(self._balances) - len(balances)))
+        start = bisect.bisect_right(self._delta_rounds, checkpoint_round)
+        end = bisect.bisect_right(self._delta_rounds, round_number)
+        for i in range(start, end):
+            balances[self._delta_slots[i]] += self._delta_amounts[i]
+        return balances
+
+    def balance_of(self, address: str, round_number: Optional[int] = None) -> int:
+        slot = self._slots.get(decode_address(address))
+        if slot is None:
+            return 0
+        return self.balances_at(round_number)[slot]
+
+    def holders(self, round_number: Optional[int] = None) -> Iterator[Tuple[str, int]]:
+        """(address, balance) for every non-reserve account with a positive balance"""
+        reserve_slot = self._slots.get(decode_address(self.reserve_address))
+        for slot, amount in enumerate(self.balances_at(round_number)):
+            if amount and slot != reserve_slot:
+                yield self._address(slot), amount
+
+    def top_holders(self, k: int, round_number: Optional[int] = None) -> List[Tuple[str, int]]:
+        """The `k` largest non-reserve holders, largest first"""
+        balances = self.balances_at(round_number)
+        reserve_slot = self._slots.get(decode_address(self.reserve_address))
+        slots = heapq.nlargest(
+            k + 1, (slot for slot in range(len(balances)) if balances[slot]), key=balances.__getitem__
+        )
+        return [(self._address(slot), balances[slot]) for slot in slots if slot != reserve_slot][:k]
+
+    def circulating_supply(self, round_number: Optional[int] = None) -> int:
+        """Tokens held outside the app's reserve account"""
+        balances = self.balances_at(round_number)
+        reserve_slot = self._slots.get(decode_address(self.reserve_address))
+        return sum(balances) - (balances[reserve_slot] if reserve_slot is not None else 0)
+
+    # Persistence
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(self.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: Path) -> "HolderIndex":
+        index = cls.__new__(cls)
+        with open(path, "rb") as f:
+            index.__dict__.update(pickle.load(f))
+        return index
+
+
+def snapshot_balances(indexer_client, asset_id: int) -> Tuple[int, List[Tuple[str, int]]]:
+    """
+    Page every balance of the asset from the indexer
+
+    Pages after the first are pinned to the first page's round, so balances
+    that move while paging are not counted twice or missed.
+
+    Returns:
+        (indexer round of the snapshot, [(address, amount)])
+    """
+    round_number, balances, next_token = None, [], None
+    while True:
+        response = indexer_client.asset_balances(asset_id, limit=PAGE_SIZE, next=next_token, round=round_number)
+        if round_number is None:
+            round_number = response["current-round"]
+        balances.extend((b["address"], b["amount"]) for b in response.get("balances", []) if b["amount"])
+        next_token = response.get("next-token")
+        if not next_token or len(response.get("balances", [])) < PAGE_SIZE:
+            return round_number, balances
+
+
+def sync_index(index: HolderIndex, indexer_client) -> int:
+    """
+    Apply every asset transfer after the index's round
+
+    Returns:
+        Number of rounds applied
+    """
+    min_round = index.round + 1
+
+    def transactions() -> Iterator[Dict[str, Any]]:
+        # One stream across pages, so a round split over two pages is applied once
+        next_token = None
+        while True:
+            response = indexer_client.asset_transactions(
+                index.asset_id, **{"min-round": min_round, "limit": PAGE_SIZE, "next": next_token}
+            )
+            yield from response.get("transactions", [])
+            next_token = response.get("next-token")
+            if not next_token or len(response.get("transactions", [])) < PAGE_SIZE:
+                return
+
+    return index.apply_transactions(transactions())
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="FarmToken holder index")
+    parser.add_argument("command", choices=["build", "sync", "top", "supply", "balance"])
+    parser.add_argument("address", nargs="?", help="Address for `balance`")
+    parser.add_argument("--network", choices=["localnet", "testnet"], default="localnet")
+    parser.add_argument("--round", type=int, help="Answer as of this round")
+    parser.add_argument("--limit", type=int, default=10, help="Holders shown by `top`")
+    args = parser.parse_args()
+
+    index_path = Path(f"deployments/{args.network}_holders.idx")
+
+    if args.command in ("build", "sync"):
+        config = json.loads(Path("scripts/deploy_config.json").read_text())
+        deployment = json.loads(Path(f"deployments/{args.network}_deployment.json").read_text())
+        indexer = clients_for_network(config, args.network)[1]
+        if args.command == "build":
+            index = HolderIndex(deployment["asa"]["asset_id"], application_address(deployment["contract"]["app_id"]))
+            index.load_snapshot(*snapshot_balances(indexer, index.asset_id))
+            print(f"✅ Snapshot of {len(index)} holders at round {index.round}")
+        else:
+            index = HolderIndex.load(index_path)
+        rounds = sync_index(index, indexer)
+        index.save(index_path)
+        print(f"✅ Applied {rounds} rounds; index at round {index.round}")
+        return
+
+    index = HolderIndex.load(index_path)
+    if args.command == "top":
+        for position, (address, amount) in enumerate(index.top_holders(args.limit, args.round), 1):
+            print(f"{position:>4}. {address} {amount}")
+    elif args.command == "supply":
+        print(f"🪙 Circulating supply: {index.circulating_supply(args.round)}")
+    else:
+        print(f"🪙 {args.address}: {index.balance_of(args.address, args.round)}")
+
+
+if __name__ == "__main__":
+    main()
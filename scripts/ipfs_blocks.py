@@ -0,0 +1,261 @@
+"""
+Content-addressed IPFS blocks
+=============================
+
+Minimal pure-Python IPFS block layer: CID parsing and encoding, hash
+verification, dag-pb/UnixFS file decoding, and a verified on-disk block
+store. The block store doubles as the local IPFS stand-in the tooling pins
+metadata to.
+
+Supported CIDs are the ones IPFS produces for files: CIDv0 (`Qm...`,
+dag-pb) and base32 CIDv1 (`b...`) with the raw or dag-pb codec, all
+hashed with sha2-256.
+
+Usage:
+    store = BlockStore(Path("deployments/ipfs"))
+    cid = store.add_file(json.dumps(metadata).encode())
+    store.cat(cid)
+"""
+
+import base64
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# Multicodec / multihash codes
+CODEC_RAW = 0x55
+CODEC_DAG_PB = 0x70
+SHA2_256 = 0x12
+
+# Largest single-block file `add_file` produces (go-ipfs default chunk size)
+MAX_BLOCK_SIZE = 256 * 1024
+
+_BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+class CIDVerificationError(ValueError):
+    """
+    Block bytes do not hash to the CID they were fetched or stored under
+    """
+
+
+def _base58_decode(text: str) -> bytes:
+    number = 0
+    for char in text:
+        number = number * 58 + _BASE58_ALPHABET.index(char)
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    return b"\x00" * (len(text) - len(text.lstrip("1"))) + body
+
+
+def _base58_encode(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    text = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        text = _BASE58_ALPHABET[remainder] + text
+    return "1" * (len(data) - len(data.lstrip(b"\x00"))) + text
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+class CID:
+    """
+    Parsed content identifier (version, codec, sha2-256 digest)
+    """
+
+    def __init__(self, version: int, codec: int, digest: bytes):
+        self.version = version
+        self.codec = codec
+        self.digest = digest
+
+    @classmethod
+    def parse(cls, text: str) -> "CID":
+        """Parse a CIDv0 (`Qm...`) or base32 CIDv1 (`b...`) string"""
+        try:
+            if len(text) == 46 and text.startswith("Qm"):
+                return cls.from_bytes(_base58_decode(text))
+            if text.startswith("b"):
+                encoded = text[1:].upper()
+                return cls.from_bytes(base64.b32decode(encoded + "=" * (-len(encoded) % 8)))
+        except (ValueError, IndexError) as e:
+            raise ValueError(f"Malformed CID: {text}") from e
+        raise ValueError(f"Unsupported CID encoding: {text}")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CID":
+        """Parse a binary CID, as found in dag-pb links"""
+        if data[:2] == bytes([SHA2_256, 32]):
+            version, codec, offset = 0, CODEC_DAG_PB, 0
+        else:
+            version, offset = _read_varint(data, 0)
+            codec, offset = _read_varint(data, offset)
+            if version != 1:
+                raise ValueError(f"Unsupported CID version: {version}")
+        hash_code, offset = _read_varint(data, offset)
+        length, offset = _read_varint(data, offset)
+        if hash_code != SHA2_256 or length != 32 or len(data) != offset + length:
+            raise ValueError("Only sha2-256 CIDs are supported")
+        return cls(version, codec, data[offset:])
+
+    def to_bytes(self) -> bytes:
+        multihash = bytes([SHA2_256, 32]) + self.digest
+        if self.version == 0:
+            return multihash
+        return _varint(1) + _varint(self.codec) + multihash
+
+    def __str__(self) -> str:
+        if self.version == 0:
+            return _base58_encode(self.to_bytes())
+        return "b" + base64.b32encode(self.to_bytes()).decode("ascii").lower().rstrip("=")
+
+    def verify(self, block: bytes):
+        """Raise CIDVerificationError unless `block` hashes to this CID"""
+        if hashlib.sha256(block).digest() != self.digest:
+            raise CIDVerificationError(f"Block does not match CID {self}")
+
+
+def _fields(data: bytes) -> Iterator[Tuple[int, object]]:
+    """Protobuf (field number, value) pairs; values are ints or bytes"""
+    offset = 0
+    while offset < len(data):
+        key, offset = _read_varint(data, offset)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, offset = _read_varint(data, offset)
+        elif wire_type == 2:
+            length, offset = _read_varint(data, offset)
+            value, offset = data[offset:offset + length], offset + length
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+        yield field, value
+
+
+def decode_dag_pb(block: bytes) -> Tuple[bytes, List[str]]:
+    """
+    Split a dag-pb UnixFS file node into its inline data and child CIDs
+
+    Returns:
+        (inline file bytes, child CIDs in order)
+    """
+    unixfs, links = b"", []
+    for field, value in _fields(block):
+        if field == 1:
+            unixfs = value
+        elif field == 2:
+            links.extend(str(CID.from_bytes(v)) for f, v in _fields(value) if f == 1)
+    inline = b""
+    for field, value in _fields(unixfs):
+        if field == 1 and value not in (0, 2):
+            raise ValueError("dag-pb node is not a UnixFS file")
+        if field == 2:
+            inline = value
+    return inline, links
+
+
+def encode_file_block(content: bytes) -> bytes:
+    """Single-block dag-pb UnixFS file node, as `ipfs add` builds for small files"""
+    unixfs = b"\x08\x02"  # Type: File
+    if content:
+        unixfs += b"\x12" + _varint(len(content)) + content
+    unixfs += b"\x18" + _varint(len(content))
+    return b"\x0a" + _varint(len(unixfs)) + unixfs
+
+
+def file_cid(content: bytes) -> str:
+    """CIDv0 that `ipfs add` assigns to a small file"""
+    return str(CID(0, CODEC_DAG_PB, hashlib.sha256(encode_file_block(content)).digest()))
+
+
+class BlockStore:
+    """
+    Verified on-disk block store keyed by CID
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, cid: str) -> Path:
+        # Shard on the tail: every CIDv0 starts with "Qm"
+        return self.root / cid[-2:] / cid
+
+    def has(self, cid: str) -> bool:
+        return self._path(cid).exists()
+
+    def get(self, cid: str) -> Optional[bytes]:
+        """Stored block for `cid`, re-verified on every read; None if absent"""
+        try:
+            block = self._path(cid).read_bytes()
+        except FileNotFoundError:
+            return None
+        CID.parse(cid).verify(block)
+        return block
+
+    def put(self, cid: str, block: bytes):
+        """Store a block after checking it matches `cid`"""
+        CID.parse(cid).verify(block)
+        path = self._path(cid)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so readers never see a partial block
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, "wb") as f:
+            f.write(block)
+        os.replace(tmp, path)
+
+    def add_file(self, content: bytes) -> str:
+        """Pin a small file as one dag-pb block; returns its CIDv0"""
+        if len(content) > MAX_BLOCK_SIZE:
+            raise ValueError(f"File of {len(content)} bytes exceeds the {MAX_BLOCK_SIZE}-byte block limit")
+        cid = file_cid(content)
+        self.put(cid, encode_file_block(content))
+        return cid
+
+    def cat(self, cid: str) -> bytes:
+        """File content for `cid` from locally stored blocks"""
+        def load(child: str) -> bytes:
+            block = self.get(child)
+            if block is None:
+                raise KeyError(f"Block {child} is not in the store")
+            return block
+
+        return assemble_file(cid, load)
+
+
+def assemble_file(cid: str, load_block: Callable[[str], bytes]) -> bytes:
+    """
+    Reassemble a file from its blocks
+
+    Args:
+        cid: Root CID
+        load_block: Returns the verified block for a CID
+    """
+    parsed = CID.parse(cid)
+    block = load_block(cid)
+    if parsed.codec == CODEC_RAW:
+        return block
+    if parsed.codec != CODEC_DAG_PB:
+        raise ValueError(f"Unsupported codec 0x{parsed.codec:x} for {cid}")
+    inline, links = decode_dag_pb(block)
+    return inline + b"".join(assemble_file(child, load_block) for child in links)
@@ -0,0 +1,240 @@
+"""
+IPFS metadata client
+====================
+
+Fetches the token metadata documents referenced by the contract's
+`ipfs_cid`. CIDs are immutable, so every document is fetched at most once:
+
+- an in-memory LRU of decoded documents
+- an on-disk block store keyed by CID (see ipfs_blocks.BlockStore)
+- misses race every configured gateway for each block and keep the first
+  response whose bytes hash to the requested CID; a wrong or tampered
+  response is discarded, so the caches can never be poisoned
+- bulk prefetch runs through a bounded worker pool
+
+Blocks are requested in the trustless-gateway raw format
+(`?format=raw`), which is what makes per-block hash verification possible.
+
+Usage:
+    client = MetadataClient.from_config(config)
+    client.get_json(cid)
+    client.prefetch(cids)
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from ipfs_blocks import CID, BlockStore, CIDVerificationError, assemble_file
+from node_client import NodeHTTPClient, RetryPolicy
+
+DEFAULT_STORE = Path("deployments/ipfs")
+
+# Fetches one raw block: (gateway url, cid) -> block bytes
+BlockFetcher = Callable[[str, str], bytes]
+
+
+class MetadataFetchError(Exception):
+    """
+    No gateway returned a verified block for a CID
+    """
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def gateway_fetcher(timeout: float = 10.0) -> BlockFetcher:
+    """Block fetcher over pooled keep-alive connections, one pool per gateway"""
+    clients: Dict[str, NodeHTTPClient] = {}
+    lock = threading.Lock()
+
+    def fetch(gateway: str, cid: str) -> bytes:
+        with lock:
+            if gateway not in clients:
+                # Racing already covers slow gateways; retry only once
+                clients[gateway] = NodeHTTPClient(gateway, timeout=timeout, retry=RetryPolicy(max_retries=1))
+        return clients[gateway].request(
+            "GET", f"/{cid}", params={"format": "raw"}, headers={"Accept": "application/vnd.ipld.raw"}
+        )
+
+    return fetch
+
+
+class MetadataClient:
+    """
+    Cached, verified IPFS metadata reads raced across several gateways
+    """
+
+    def __init__(self,
+                 gateways: Sequence[str],
+                 store: Optional[BlockStore] = None,
+                 fetch: Optional[BlockFetcher] = None,
+                 memory_entries: int = 256,
+                 max_concurrency: int = 8):
+        if not gateways:
+            raise ValueError("At least one gateway is required")
+        self.gateways = list(gateways)
+        self.store = store or BlockStore(DEFAULT_STORE)
+        self.fetch = fetch or gateway_fetcher()
+        self.memory = LRUCache(memory_entries)
+        self.max_concurrency = max_concurrency
+        self._gateway_pool = ThreadPoolExecutor(max_workers=max_concurrency * len(self.gateways))
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "fetched": 0, "rejected": 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **options) -> "MetadataClient":
+        """Client for the `ipfs` section of deploy_config.json"""
+        ipfs_config = config.get("ipfs", {})
+        gateways = ipfs_config.get("gateways") or [ipfs_config.get("gateway", "https://ipfs.io/ipfs/")]
+        store = BlockStore(Path(ipfs_config.get("cache_dir", DEFAULT_STORE)))
+        return cls(gateways, store=store, **options)
+
+    def close(self):
+        self._gateway_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def _race(self, cid: str) -> bytes:
+        """First verified block for `cid` from any gateway"""
+        parsed = CID.parse(cid)
+        pending = {self._gateway_pool.submit(self.fetch, gateway, cid): gateway for gateway in self.gateways}
+        errors = []
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                gateway = pending.pop(future)
+                try:
+                    block = future.result()
+                except Exception as e:
+                    errors.append(f"{gateway}: {e}")
+                    continue
+                try:
+                    parsed.verify(block)
+                except CIDVerificationError as e:
+                    self._count("rejected")
+                    errors.append(f"{gateway}: {e}")
+                    continue
+                for other in pending:
+                    other.cancel()
+                return block
+        raise MetadataFetchError(f"No gateway returned {cid}: {'; '.join(errors)}")
+
+    def _block(self, cid: str) -> bytes:
+        block = self.store.get(cid)
+        if block is not None:
+            self._count("disk_hits")
+            return block
+        block = self._race(cid)
+        self.store.put(cid, block)
+        self._count("fetched")
+        return block
+
+    def get_bytes(self, cid: str) -> bytes:
+        """File content for `cid`"""
+        content = self.memory.get(cid)
+        if content is not None:
+            self._count("memory_hits")
+            return content
+        content = assemble_file(cid, self._block)
+        self.memory.put(cid, content)
+        return content
+
+    def get_json(self, cid: str) -> Dict[str, Any]:
+        """Metadata document for `cid`, parsed as JSON"""
+        return json.loads(self.get_bytes(cid))
+
+    def prefetch(self, cids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Warm the caches for many CIDs through a bounded worker pool
+
+        Returns:
+            Counts of cached, fetched and failed CIDs and elapsed seconds
+        """
+        started = time.perf_counter()
+        before = self.stats()
+        failed: List[str] = []
+        unique = list(dict.fromkeys(cids))
+
+        def load(cid: str):
+            try:
+                self.get_bytes(cid)
+            except (MetadataFetchError, ValueError):
+                failed.append(cid)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            list(pool.map(load, unique))
+
+        after = self.stats()
+        return {
+            "cids": len(unique),
+            "fetched_blocks": after["fetched"] - before["fetched"],
+            "failed": failed,
+            "elapsed_seconds": time.perf_counter() - started,
+        }
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Fetch and cache FarmToken IPFS metadata")
+    parser.add_argument("cids", nargs="*", help="CIDs to fetch")
+    parser.add_argument("--cids-file", type=Path, help="File with one CID per line to prefetch")
+    args = parser.parse_args()
+
+    config = json.loads(Path("scripts/deploy_config.json").read_text())
+    client = MetadataClient.from_config(config)
+    try:
+        cids = list(args.cids)
+        if args.cids_file:
+            cids += [line.strip() for line in args.cids_file.read_text().splitlines() if line.strip()]
+        if len(cids) == 1:
+            print(json.dumps(client.get_json(cids[0]), indent=2))
+        else:
+            report = client.prefetch(cids)
+            print(f"✅ {report['cids'] - len(report['failed'])}/{report['cids']} CIDs cached, "
+                  f"{report['fetched_blocks']} blocks fetched in {report['elapsed_seconds']:.2f}s")
+            for cid in report["failed"]:
+                print(f"❌ {cid}")
+        print(f"📋 Cache: {client.stats()}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
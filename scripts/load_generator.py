@@ -0,0 +1,351 @@
+"""
+FarmFoodTokenizer load generator
+================================
+
+Models how a node's transaction pool and block production respond to the
+mint, transfer, burn and admin flows. A scenario offers a weighted mix of
+ABI calls and ASA transfers at a target TPS, open-loop (Poisson arrivals
+that do not wait for confirmations), to an in-process node model with many
+simulated accounts:
+
+- submissions enter a bounded transaction pool ("pool full" when it is not
+  drained fast enough)
+- every `block_seconds` a block takes up to `block_capacity` transactions
+  from the pool, oldest first, and applies them to a FarmFoodSimulator
+- a transaction still pooled `validity_rounds` after submission expires
+
+This is a queueing model, not a benchmark of the stack: no request goes
+through node_client's AlgodClient, nothing is signed or encoded, and no
+TEAL runs. The capacity it saturates at is the `node` section of the
+scenario, so use it to see how backlog, latency and expiries behave for a
+given capacity and mix (and which calls the contract rejects along the
+way), not to discover what a real node or the client tooling sustains;
+that needs runs against a real node.
+
+Time is virtual, so a run is fully determined by its seed and scenario and a
+minute of load finishes in well under a second. The report gives achieved
+TPS, a confirmation-latency histogram, an error breakdown and backlog growth.
+
+Scenario files are JSON and override DEFAULT_SCENARIO key by key:
+
+    {"tps": 400, "duration": 120, "mix": {"transfer": 0.8, "mint_tokens": 0.2},
+     "node": {"block_capacity": 800}}
+
+Usage:
+    python scripts/load_generator.py --scenario scenario.json
+    python scripts/load_generator.py --tps 300 --seed 7 --json report.json
+    python scripts/load_generator.py --sweep 100,200,400,800
+"""
+
+import argparse
+import bisect
+import copy
+import json
+import random
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from addresses import encode_address
+from benchmark import percentile
+from farm_food_simulator import ContractError, FarmFoodSimulator
+
+DEFAULT_SCENARIO: Dict[str, Any] = {
+    "name": "default",
+    "seed": 0,
+    "tps": 200,
+    "duration": 60,
+    "accounts": 10_000,
+    "initial_balance": 1_000,
+    "mix": {
+        "transfer": 0.70,
+        "mint_tokens": 0.15,
+        "burn_tokens": 0.05,
+        "add_to_blacklist": 0.04,
+        "remove_from_blacklist": 0.03,
+        "update_metadata_cid": 0.03,
+    },
+    "node": {
+        "block_seconds": 2.8,
+        "block_capacity": 1_000,
+        "pool_size": 15_000,
+        "validity_rounds": 1_000,
+    },
+}
+
+# Upper bounds (seconds) of the confirmation-latency histogram buckets
+LATENCY_BUCKETS = (1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, float("inf"))
+
+# A run is saturated when the pool overflows or expires transactions, or the
+# backlog grows faster than this share of the target TPS
+SATURATION_GROWTH = 0.05
+
+POOL_FULL = "transaction pool is full"
+EXPIRED = "transaction expired"
+
+# Each flow returns (method, sender, args) for one submission
+Flow = Callable[[Dict[str, Any], random.Random], tuple]
+
+FLOWS: Dict[str, Flow] = {
+    "transfer": lambda ctx, rng: (
+        "transfer", rng.choice(ctx["users"]), (rng.choice(ctx["users"]), rng.randint(1, ctx["max_amount"]))
+    ),
+    "mint_tokens": lambda ctx, rng: (
+        "mint_tokens", ctx["admin"], (rng.choice(ctx["users"]), rng.randint(1, ctx["max_amount"]))
+    ),
+    "burn_tokens": lambda ctx, rng: ("burn_tokens", ctx["admin"], (rng.randint(1, ctx["max_amount"]),)),
+    "add_to_blacklist": lambda ctx, rng: ("add_to_blacklist", ctx["admin"], (rng.choice(ctx["users"]),)),
+    "remove_from_blacklist": lambda ctx, rng: ("remove_from_blacklist", ctx["admin"], (rng.choice(ctx["users"]),)),
+    "update_metadata_cid": lambda ctx, rng: (
+        "update_metadata_cid", ctx["admin"], (f"QmLoadCID{rng.randrange(10**6)}",)
+    ),
+}
+
+
+def load_scenario(path: Optional[Path] = None, **overrides) -> Dict[str, Any]:
+    """DEFAULT_SCENARIO updated from a scenario file and then `overrides` (None values ignored)"""
+    scenario = copy.deepcopy(DEFAULT_SCENARIO)
+    updates = json.loads(Path(path).read_text()) if path else {}
+    updates.update({key: value for key, value in overrides.items() if value is not None})
+    for key, value in updates.items():
+        if key not in scenario:
+            raise ValueError(f"Unknown scenario key: {key}")
+        if key == "node":
+            scenario["node"].update(value)
+        else:
+            scenario[key] = value
+
+    unknown = set(scenario["mix"]) - set(FLOWS)
+    if unknown:
+        raise ValueError(f"Unknown flows in mix: {', '.join(sorted(unknown))}")
+    if not scenario["mix"] or any(weight < 0 for weight in scenario["mix"].values()) \
+            or sum(scenario["mix"].values()) <= 0:
+        raise ValueError("Flow mix needs at least one positive weight")
+    if scenario["tps"] <= 0 or scenario["duration"] <= 0:
+        raise ValueError("tps and duration must be positive")
+    return scenario
+
+
+def _seeded_address(rng: random.Random) -> str:
+    return encode_address(rng.randbytes(32))
+
+
+def setup_accounts(accounts: int, initial_balance: int, rng: random.Random) -> Dict[str, Any]:
+    """Simulator with a created ASA, an admin with tokens to burn and funded, opted-in users"""
+    admin = _seeded_address(rng)
+    simulator = FarmFoodSimulator(admin)
+    simulator.create_asa(admin, "FarmToken", "FT", 10**15, 2, "QmLoadGeneratorCID")
+    users = [_seeded_address(rng) for _ in range(accounts)]
+    for address in [admin] + users:
+        simulator.opt_in(address)
+    simulator.mint_tokens(admin, admin, 10**12)
+    if initial_balance:
+        simulator.mint_tokens_batch(admin, users, [initial_balance] * len(users))
+    return {
+        "simulator": simulator,
+        "admin": admin,
+        "users": users,
+        "max_amount": max(1, initial_balance // 10),
+    }
+
+
+class NodeStandIn:
+    """
+    Model of a node's transaction pool drained into fixed-size blocks (no algod API)
+    """
+
+    def __init__(self, simulator: FarmFoodSimulator, block_seconds: float, block_capacity: int,
+                 pool_size: int, validity_rounds: int):
+        self.simulator = simulator
+        self.block_seconds = block_seconds
+        self.block_capacity = block_capacity
+        self.pool_size = pool_size
+        self.validity_rounds = validity_rounds
+        self.round = 0
+        # (flow, submit time, submit round, method, sender, args)
+        self.pool: deque = deque()
+
+    def submit(self, flow: str, now: float, method: str, sender: str, args: tuple) -> Optional[str]:
+        """Queue a transaction; returns an error if the pool rejects it"""
+        if len(self.pool) >= self.pool_size:
+            return POOL_FULL
+        self.pool.append((flow, now, self.round, method, sender, args))
+        return None
+
+    def produce_block(self, now: float) -> List[tuple]:
+        """
+        Build the next block from the pool
+
+        Returns:
+            (flow, submit time, error or None) for every transaction that left the pool
+        """
+        self.round += 1
+        outcomes, included = [], 0
+        while self.pool and included < self.block_capacity:
+            flow, submitted, submit_round, method, sender, args = self.pool.popleft()
+            if self.round - submit_round > self.validity_rounds:
+                outcomes.append((flow, submitted, EXPIRED))
+                continue
+            try:
+                self.simulator.call(method, sender, *args)
+            except ContractError as e:
+                # Failed evaluation drops the transaction without using block space
+                outcomes.append((flow, submitted, str(e)))
+                continue
+            included += 1
+            outcomes.append((flow, submitted, None))
+        return outcomes
+
+
+def latency_histogram(latencies: List[float]) -> List[List[float]]:
+    """[[bucket upper bound, count]] over LATENCY_BUCKETS"""
+    counts = [0] * len(LATENCY_BUCKETS)
+    for latency in latencies:
+        counts[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+    return [[bound, count] for bound, count in zip(LATENCY_BUCKETS, counts)]
+
+
+def run_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Drive one scenario open-loop and report what the modelled node achieved"""
+    rng = random.Random(scenario["seed"])
+    ctx = setup_accounts(scenario["accounts"], scenario["initial_balance"], rng)
+    node = NodeStandIn(ctx["simulator"], **scenario["node"])
+    flows = list(scenario["mix"])
+    weights = [scenario["mix"][flow] for flow in flows]
+    duration, block_seconds = scenario["duration"], node.block_seconds
+
+    offered = Counter()
+    confirmed = Counter()
+    errors = Counter()
+    latencies: Dict[str, List[float]] = {flow: [] for flow in flows}
+    confirmed_in_window = 0
+    backlog = []
+    next_block = block_seconds
+
+    def block():
+        nonlocal next_block, confirmed_in_window
+        for flow, submitted, error in node.produce_block(next_block):
+            if error:
+                errors[error] += 1
+                continue
+            confirmed[flow] += 1
+            latencies[flow].append(next_block - submitted)
+            if next_block <= duration:
+                confirmed_in_window += 1
+        if next_block <= duration:
+            backlog.append((next_block, len(node.pool)))
+        next_block += block_seconds
+
+    now = rng.expovariate(scenario["tps"])
+    while now < duration:
+        while next_block <= now:
+            block()
+        flow = rng.choices(flows, weights)[0]
+        method, sender, args = FLOWS[flow](ctx, rng)
+        offered[flow] += 1
+        error = node.submit(flow, now, method, sender, args)
+        if error:
+            errors[error] += 1
+        now += rng.expovariate(scenario["tps"])
+    # Let the backlog drain (or expire) so every submission has an outcome
+    while node.pool:
+        block()
+
+    all_latencies = sorted(latency for values in latencies.values() for latency in values)
+    growth = (backlog[-1][1] - backlog[0][1]) / (backlog[-1][0] - backlog[0][0]) if len(backlog) > 1 else 0.0
+    achieved_tps = confirmed_in_window / duration
+    return {
+        "scenario": scenario["name"],
+        "seed": scenario["seed"],
+        "target_tps": scenario["tps"],
+        "offered": sum(offered.values()),
+        "offered_tps": sum(offered.values()) / duration,
+        "confirmed": sum(confirmed.values()),
+        "achieved_tps": achieved_tps,
+        "errors": dict(errors.most_common()),
+        "latency": {
+            "p50": percentile(all_latencies, 0.50),
+            "p95": percentile(all_latencies, 0.95),
+            "p99": percentile(all_latencies, 0.99),
+            "max": all_latencies[-1] if all_latencies else 0.0,
+            "histogram": latency_histogram(all_latencies),
+        },
+        "backlog": {
+            "max": max((size for _, size in backlog), default=0),
+            "final": backlog[-1][1] if backlog else 0,
+            "growth_per_second": growth,
+        },
+        "flows": {
+            flow: {
+                "offered": offered[flow],
+                "confirmed": confirmed[flow],
+                "p95": percentile(sorted(latencies[flow]), 0.95),
+            }
+            for flow in flows
+        },
+        "saturated": bool(errors[POOL_FULL] or errors[EXPIRED]) or growth > SATURATION_GROWTH * scenario["tps"],
+    }
+
+
+def sweep(scenario: Dict[str, Any], tps_values: List[float]) -> List[Dict[str, Any]]:
+    """Run the scenario at each target TPS (same seed), lowest first"""
+    return [run_scenario({**scenario, "tps": tps}) for tps in sorted(tps_values)]
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"🚀 {report['scenario']} (seed {report['seed']}): offered {report['offered_tps']:.1f} TPS, "
+          f"achieved {report['achieved_tps']:.1f} TPS")
+    latency = report["latency"]
+    print(f"⏱️ Confirmation p50 {latency['p50']:.2f}s  p95 {latency['p95']:.2f}s  "
+          f"p99 {latency['p99']:.2f}s  max {latency['max']:.2f}s")
+    peak = max((count for _, count in latency["histogram"]), default=0) or 1
+    for bound, count in latency["histogram"]:
+        label = "+Inf" if bound == float("inf") else f"≤{bound:g}s"
+        print(f"   {label:>7} {count:>8} {'█' * round(40 * count / peak)}")
+    backlog = report["backlog"]
+    print(f"📋 Backlog max {backlog['max']}, final {backlog['final']}, "
+          f"growth {backlog['growth_per_second']:+.1f} txns/s")
+    for reason, count in report["errors"].items():
+        print(f"❌ {count:>8}  {reason}")
+    if report["saturated"]:
+        print("⚠️ Saturated: the modelled pool and block capacity are not keeping up with the offered load")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Open-loop load generator for FarmFoodTokenizer")
+    parser.add_argument("--scenario", type=Path, help="Scenario JSON file")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--tps", type=float, help="Target transactions per second")
+    parser.add_argument("--duration", type=float, help="Seconds of offered load")
+    parser.add_argument("--accounts", type=int, help="Simulated user accounts")
+    parser.add_argument("--sweep", help="Comma-separated target TPS values to find the saturation point")
+    parser.add_argument("--json", type=Path, help="Write the report(s) here")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario, seed=args.seed, tps=args.tps, duration=args.duration,
+                             accounts=args.accounts)
+    if args.sweep:
+        reports = sweep(scenario, [float(value) for value in args.sweep.split(",")])
+        print(f"{'target':>8}{'achieved':>10}{'p95 s':>8}{'backlog/s':>11}{'errors':>8}")
+        for report in reports:
+            print(f"{report['target_tps']:>8g}{report['achieved_tps']:>10.1f}{report['latency']['p95']:>8.2f}"
+                  f"{report['backlog']['growth_per_second']:>+11.1f}{sum(report['errors'].values()):>8}"
+                  f"{'  ⚠️ saturated' if report['saturated'] else ''}")
+        saturated = [report["target_tps"] for report in reports if report["saturated"]]
+        if saturated:
+            print(f"⚠️ Saturates at {saturated[0]:g} TPS")
+        else:
+            print("✅ No saturation in the swept range")
+    else:
+        reports = run_scenario(scenario)
+        print_report(reports)
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(reports, indent=2))
+        print(f"✅ Report saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
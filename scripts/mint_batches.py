@@ -0,0 +1,493 @@
+"""
+Batch mint driver
+=================
+
+Streams a payout list (recipient, amount) into `mint_tokens_batch` calls and
+submits them as a pipeline of atomic groups.
+
+Each call mints to at most 3 recipients: every recipient takes an account
+reference and a blacklist box reference (the contract rejects blacklisted
+recipients), and with the asset reference that fills the 8 references a
+transaction may carry. Each group holds up to 16 calls, so one round trip
+settles up to 48 payouts. Groups are submitted without waiting for the previous one
+to confirm, keeping up to `--max-in-flight` groups pending at once.
+
+Progress is appended to a JSONL log keyed by payout-file row: a group's
+rows and transaction ids are logged (and fsynced) before it is sent, and
+its outcome once settled. A rerun of the same file first settles groups it
+never saw settle, then skips rows that are minted, so it never mints a
+payout twice; rows of rejected groups are sent again.
+
+A group is rejected when algod refuses it or it expires (its `last_valid`
+round passes unconfirmed). When its outcome is unknown, because the node
+could not be reached mid-send or mid-wait, it is left unsettled instead:
+it may still confirm, so it stays pending in the log. Either stops new
+submissions; the groups already in flight are settled before the run exits.
+
+With `--store`, the payouts of a rejected group are recorded as failed
+mints in the transaction store (txn_ingester.py), under the ids their inner
+transfers would have.
+
+Usage:
+    python scripts/mint_batches.py payouts.csv --dry-run
+    python scripts/mint_batches.py payouts.csv --network localnet --max-in-flight 4
+    python scripts/mint_batches.py payouts.csv --store deployments/transactions.db
+    python scripts/mint_batches.py payouts.csv --progress deployments/payouts_progress.jsonl
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from addresses import application_address, decode_address
+from blacklist_boxes import blacklist_box_name
+from contract_abi import abi_method
+from node_client import NodeHTTPError, clients_for_network
+from opcode_costs import OPCODE_COSTS
+from protocol import (
+    APP_CALL_OPCODE_BUDGET,
+    MAX_ACCOUNT_REFERENCES_PER_TXN,
+    MAX_APP_ARGS_BYTES,
+    MAX_GROUP_SIZE,
+    MAX_INNER_TXNS_PER_CALL,
+    MAX_TOTAL_REFERENCES_PER_TXN,
+    MIN_TXN_FEE,
+)
+from round_cache import CachedAlgodClient
+from txn_ingester import TransactionStore
+
+# (fixed cost, cost per recipient) of mint_tokens_batch, from
+# opcode_costs.json: the fixed part includes the supply counter update, the
+# per-recipient part the blacklist check and the Minted event
+MINT_BATCH_OPCODE_COST: Tuple[int, int] = OPCODE_COSTS["mint_tokens_batch"]
+
+Payout = Tuple[str, int]
+MintCall = List[Payout]
+MintGroup = List[MintCall]
+
+
+def max_recipients_per_call() -> int:
+    """Largest number of payouts a single mint_tokens_batch call can carry"""
+    base, per_recipient = MINT_BATCH_OPCODE_COST
+    by_budget = (APP_CALL_OPCODE_BUDGET - base) // per_recipient
+    # selector + two length prefixes + 32-byte address and 8-byte amount each
+    by_args = (MAX_APP_ARGS_BYTES - 4 - 2 - 2) // 40
+    # one account and one box reference per recipient, plus the asset
+    by_references = (MAX_TOTAL_REFERENCES_PER_TXN - 1) // 2
+    return min(MAX_ACCOUNT_REFERENCES_PER_TXN, MAX_INNER_TXNS_PER_CALL, by_budget, by_args, by_references)
+
+
+def call_fee(call: MintCall) -> int:
+    """Pooled fee for one call: the outer app call plus its inner transfers"""
+    return (1 + len(call)) * MIN_TXN_FEE
+
+
+def load_payouts(path: Path) -> Iterator[Payout]:
+    """Stream (recipient, amount) rows from a CSV file with a header row"""
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            yield row["recipient"].strip(), int(row["amount"])
+
+
+def plan_mint_batches(payouts: Iterable[Payout]) -> Iterator[MintGroup]:
+    """Chunk payouts into groups of mint_tokens_batch calls"""
+    per_call = max_recipients_per_call()
+    group: MintGroup = []
+    call: MintCall = []
+    for recipient, amount in payouts:
+        decode_address(recipient)  # raises ValueError on malformed input
+        if amount <= 0:
+            raise ValueError(f"Amount must be positive for {recipient}")
+        call.append((recipient, amount))
+        if len(call) == per_call:
+            group.append(call)
+            call = []
+            if len(group) == MAX_GROUP_SIZE:
+                yield group
+                group = []
+    if call:
+        group.append(call)
+    if group:
+        yield group
+
+
+class GroupRejected(Exception):
+    """
+    A mint group was rejected or expired: none of its payouts were minted
+    """
+
+    def __init__(self, txids: List[str], error: Exception):
+        super().__init__(str(error))
+        # One app call id per call of the group
+        self.txids = txids
+        self.error = error
+
+
+class GroupUnsettled(Exception):
+    """
+    A mint group's outcome is unknown: it may still confirm (the send or the
+    wait lost contact with the node). Its payouts stay pending in the
+    progress log for the next run to settle.
+    """
+
+    def __init__(self, txids: List[str], error: Exception):
+        super().__init__(str(error))
+        self.txids = txids
+        self.error = error
+
+
+def mint_failure_recorder(store: TransactionStore,
+                          asset_id: int,
+                          app_id: int) -> Callable[[MintGroup, GroupRejected], None]:
+    """Record every payout of a rejected group as a failed mint, keyed like its inner transfer"""
+    reserve = application_address(app_id)
+
+    def record(group: MintGroup, rejected: GroupRejected):
+        for txid, call in zip(rejected.txids, group):
+            for position, (recipient, amount) in enumerate(call):
+                store.record_failure(
+                    f"{txid}/inner/{position}", asset_id, "mint", reserve, recipient, amount, str(rejected.error)
+                )
+
+    return record
+
+
+def pending_payouts(payouts: Iterable[Payout], done: Set[int]) -> Iterator[Tuple[int, Payout]]:
+    """Number payouts by their position in the file, leaving out rows in `done`"""
+    for row, payout in enumerate(payouts):
+        if row not in done:
+            yield row, payout
+
+
+class MintProgressLog:
+    """
+    Append-only JSONL record of sent, confirmed and rejected mint groups
+
+    Payouts are identified by their row in the payout file. A group is logged
+    (and fsynced) with its rows, payouts and handle before it is sent, so a
+    rerun of the same file skips confirmed rows, settles groups it never saw
+    settle and only resends rows whose group was rejected.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        # With no path the log is kept in memory only (dry runs)
+        self.path = path
+        self.confirmed: Set[int] = set()
+        submitted: Dict[str, Dict[str, Any]] = {}
+        if path and path.exists():
+            for line in path.read_text().splitlines():
+                entry = json.loads(line)
+                if entry["event"] == "submitted":
+                    submitted[entry["handle"]["txids"][0]] = entry
+                elif entry["event"] == "confirmed":
+                    self.confirmed.update(submitted.pop(entry["txid"])["rows"])
+                elif entry["event"] == "rejected":
+                    submitted.pop(entry["txid"], None)
+        self.pending: List[Dict[str, Any]] = list(submitted.values())
+
+    def _append(self, entry: Dict[str, Any]):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def submitted(self, rows: List[int], group: MintGroup, handle: Dict[str, Any]):
+        self._append({"event": "submitted", "rows": rows, "group": group, "handle": handle})
+
+    def confirmed_group(self, rows: List[int], handle: Dict[str, Any]):
+        self.confirmed.update(rows)
+        self._append({"event": "confirmed", "txid": handle["txids"][0]})
+
+    def rejected(self, handle: Dict[str, Any], error: str):
+        self._append({"event": "rejected", "txid": handle["txids"][0], "error": error})
+
+    def done(self) -> Set[int]:
+        """Rows that are minted or may still be"""
+        return self.confirmed | {row for entry in self.pending for row in entry["rows"]}
+
+
+class PayoutPipeline:
+    """
+    Submits mint groups with a bounded number of unconfirmed groups in flight
+
+    `sign_group(group)` returns (handle, signed): a JSON-able handle with the
+    group's app call `txids`, and the signed transactions for
+    `send_group(signed)`. The handle is logged before the group is sent;
+    `wait_group(handle)` returns once it confirms. Sending and waiting raise
+    GroupRejected when the group cannot mint and GroupUnsettled when its
+    outcome is unknown. Either stops new submissions: the groups already in
+    flight are settled first, then the first error is raised.
+    """
+
+    def __init__(self,
+                 sign_group: Callable[[MintGroup], Tuple[Dict[str, Any], Any]],
+                 send_group: Callable[[Any], Any],
+                 wait_group: Callable[[Dict[str, Any]], Any],
+                 max_in_flight: int = 4,
+                 on_reject: Optional[Callable[[MintGroup, GroupRejected], None]] = None,
+                 progress: Optional[MintProgressLog] = None):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.sign_group = sign_group
+        self.send_group = send_group
+        self.wait_group = wait_group
+        self.max_in_flight = max_in_flight
+        self.on_reject = on_reject
+        self.progress = progress or MintProgressLog(None)
+
+    def _guarded(self, group: MintGroup, handle: Dict[str, Any], step: Callable[[Any], Any],
+                 argument: Any) -> Optional[Exception]:
+        """Run a send or wait step; returns the GroupRejected/GroupUnsettled it raised, if any"""
+        try:
+            step(argument)
+        except GroupRejected as rejected:
+            self.progress.rejected(handle, str(rejected.error))
+            if self.on_reject:
+                self.on_reject(group, rejected)
+            return rejected
+        except GroupUnsettled as unsettled:
+            return unsettled
+        return None
+
+    def _settle(self, rows: List[int], group: MintGroup, handle: Dict[str, Any]) -> Optional[Exception]:
+        error = self._guarded(group, handle, self.wait_group, handle)
+        if error is None:
+            self.progress.confirmed_group(rows, handle)
+        return error
+
+    def recover(self) -> Dict[str, int]:
+        """Settle groups a previous run sent but never saw settle; raises if one is still unsettled"""
+        recovered = {"confirmed_payouts": 0, "rejected_payouts": 0}
+        pending, self.progress.pending = self.progress.pending, []
+        for position, entry in enumerate(pending):
+            group = [[tuple(payout) for payout in call] for call in entry["group"]]
+            error = self._settle(entry["rows"], group, entry["handle"])
+            if isinstance(error, GroupUnsettled):
+                self.progress.pending = pending[position:]
+                raise error
+            recovered["rejected_payouts" if error else "confirmed_payouts"] += len(entry["rows"])
+        return recovered
+
+    def run(self, groups: Iterable[MintGroup], rows: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """
+        Submit every group and wait for all confirmations
+
+        Args:
+            groups: Planned mint groups
+            rows: Payout-file row of each payout, in planned order (default 0, 1, ...)
+        """
+        rows = iter(rows) if rows is not None else itertools.count()
+        report = {"groups": 0, "calls": 0, "payouts": 0, "amount": 0, "fees_microalgos": 0}
+        in_flight = deque()
+        errors: List[Exception] = []
+        start = time.perf_counter()
+
+        def settle_oldest():
+            group_rows, group, handle = in_flight.popleft()
+            error = self._settle(group_rows, group, handle)
+            if error:
+                errors.append(error)
+
+        for group in groups:
+            if len(in_flight) >= self.max_in_flight:
+                settle_oldest()
+            if errors:
+                break
+
+            group_rows = [next(rows) for call in group for _ in call]
+            handle, signed = self.sign_group(group)
+            # Logged before sending: if we die after the send, the rerun finds
+            # the txids and settles the group instead of minting it again
+            self.progress.submitted(group_rows, group, handle)
+            error = self._guarded(group, handle, self.send_group, signed)
+            if error:
+                errors.append(error)
+                break
+            in_flight.append((group_rows, group, handle))
+
+            report["groups"] += 1
+            report["calls"] += len(group)
+            for call in group:
+                report["payouts"] += len(call)
+                report["amount"] += sum(amount for _, amount in call)
+                report["fees_microalgos"] += call_fee(call)
+
+        while in_flight:
+            settle_oldest()
+        if errors:
+            raise errors[0]
+
+        report["elapsed_seconds"] = time.perf_counter() - start
+        report["one_by_one_fees_microalgos"] = report["payouts"] * 2 * MIN_TXN_FEE
+        return report
+
+
+def make_atc_pipeline_io(algod_client, app_id: int, asset_id: int, sender: str, signer, indexer_client=None):
+    """
+    Build (sign_group, send_group, wait_group) on top of algosdk's AtomicTransactionComposer
+
+    A group's handle is its app call ids and `last_valid` round. The wait
+    has no timeout of its own: a group is rejected once algod reports a pool
+    error or its `last_valid` round passes unconfirmed. A group algod no
+    longer knows about is looked up on `indexer_client`; without one, or
+    when the node cannot be reached, the group is left unsettled.
+    """
+    from algosdk import transaction
+    from algosdk.atomic_transaction_composer import AtomicTransactionComposer
+
+    method = abi_method("mint_tokens_batch")
+
+    def sign_group(group: MintGroup) -> Tuple[Dict[str, Any], List[Any]]:
+        atc = AtomicTransactionComposer()
+        sp = algod_client.suggested_params()
+        for call in group:
+            call_sp = transaction.SuggestedParams(**vars(sp))
+            call_sp.flat_fee = True
+            call_sp.fee = call_fee(call)
+            recipients = [recipient for recipient, _ in call]
+            atc.add_method_call(
+                app_id=app_id,
+                method=method,
+                sender=sender,
+                sp=call_sp,
+                signer=signer,
+                method_args=[recipients, [amount for _, amount in call]],
+                accounts=recipients,
+                foreign_assets=[asset_id],
+                boxes=[(0, blacklist_box_name(recipient)) for recipient in recipients],
+            )
+        txids = [entry.txn.get_txid() for entry in atc.build_group()]
+        return {"txids": txids, "last_valid": sp.last}, atc.gather_signatures()
+
+    def send_group(signed: List[Any]):
+        try:
+            algod_client.send_transactions(signed)
+        except NodeHTTPError as e:
+            txids = [txn.get_txid() for txn in signed]
+            if e.status is None:
+                raise GroupUnsettled(txids, e) from e
+            raise GroupRejected(txids, e) from e
+
+    def wait_group(handle: Dict[str, Any]) -> Dict[str, Any]:
+        txids = handle["txids"]
+        try:
+            while True:
+                try:
+                    info = algod_client.pending_transaction_info(txids[0])
+                except NodeHTTPError as e:
+                    if e.status != 404:
+                        raise
+                    info = None
+                if info and info.get("confirmed-round"):
+                    return info
+                if info and info.get("pool-error"):
+                    raise GroupRejected(txids, RuntimeError(info["pool-error"]))
+                status = algod_client.status()
+                if info is None:
+                    # Unknown to algod: confirmed long ago, or never received
+                    if indexer_client is None:
+                        raise GroupUnsettled(txids, RuntimeError("not in algod's pending pool; check the indexer"))
+                    response = indexer_client.search_transactions(txid=txids[0])
+                    if response.get("transactions"):
+                        return response["transactions"][0]
+                    if response.get("current-round", 0) > handle["last_valid"]:
+                        raise GroupRejected(txids, RuntimeError(f"expired after round {handle['last_valid']}"))
+                elif status["last-round"] > handle["last_valid"]:
+                    raise GroupRejected(txids, RuntimeError(f"expired after round {handle['last_valid']}"))
+                algod_client.status_after_block(status["last-round"])
+        except NodeHTTPError as e:
+            raise GroupUnsettled(txids, e) from e
+
+    return sign_group, send_group, wait_group
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Batch mint FarmToken payouts")
+    parser.add_argument("payouts_file", type=Path, help="CSV with recipient,amount columns")
+    parser.add_argument("--network", choices=["localnet", "testnet"], default="localnet")
+    parser.add_argument("--max-in-flight", type=int, default=4, help="Unconfirmed groups allowed at once")
+    parser.add_argument("--dry-run", action="store_true", help="Plan without submitting")
+    parser.add_argument("--store", type=Path, help="Transaction store to record rejected payouts in")
+    parser.add_argument("--progress", type=Path,
+                        help="Progress log (default: deployments/<network>_mint_<payouts file>.jsonl)")
+    args = parser.parse_args()
+
+    store = None
+
+    if args.dry_run:
+        progress = MintProgressLog(None)
+        pipeline = PayoutPipeline(lambda group: ({"txids": [""]}, None), lambda signed: None, lambda handle: None,
+                                  args.max_in_flight)
+    else:
+        from algosdk import account, mnemonic
+        from algosdk.atomic_transaction_composer import AccountTransactionSigner
+
+        config = json.loads(Path("scripts/deploy_config.json").read_text())
+        deployment = json.loads(Path(f"deployments/{args.network}_deployment.json").read_text())
+        private_key = mnemonic.to_private_key(os.environ["DEPLOYER_MNEMONIC"])
+        algod, indexer = clients_for_network(config, args.network)
+        client = CachedAlgodClient(algod)
+        io = make_atc_pipeline_io(
+            client,
+            deployment["contract"]["app_id"],
+            deployment["asa"]["asset_id"],
+            account.address_from_private_key(private_key),
+            AccountTransactionSigner(private_key),
+            indexer,
+        )
+        on_reject = None
+        if args.store:
+            store = TransactionStore(args.store)
+            on_reject = mint_failure_recorder(store, deployment["asa"]["asset_id"], deployment["contract"]["app_id"])
+        progress = MintProgressLog(
+            args.progress or Path(f"deployments/{args.network}_mint_{args.payouts_file.stem}.jsonl")
+        )
+        pipeline = PayoutPipeline(*io, args.max_in_flight, on_reject, progress)
+
+    try:
+        if not args.dry_run:
+            recovery = pipeline.recover()
+            if any(recovery.values()):
+                print(f"♻️ Settled earlier groups: {recovery['confirmed_payouts']} payouts minted, "
+                      f"{recovery['rejected_payouts']} rejected and resent")
+        done = progress.done()
+        numbered, numbered_rows = itertools.tee(pending_payouts(load_payouts(args.payouts_file), done))
+        groups = plan_mint_batches(payout for _, payout in numbered)
+        report = pipeline.run(groups, (row for row, _ in numbered_rows))
+    except GroupRejected as rejected:
+        print(f"❌ Mint group {rejected.txids[0]} failed: {rejected.error}")
+        if store:
+            print(f"📋 Its payouts were recorded as failed in {args.store}")
+        print("   Groups already in flight were settled; rerun to resend the rejected payouts")
+        raise SystemExit(1)
+    except GroupUnsettled as unsettled:
+        print(f"⚠️ Mint group {unsettled.txids[0]} may still confirm: {unsettled.error}")
+        print(f"   Its payouts stay pending in {progress.path}; rerun to settle them before resending anything")
+        raise SystemExit(1)
+    finally:
+        if store:
+            store.close()
+
+    print(f"🪙 Minted {report['amount']} to {report['payouts']} recipients")
+    print(f"   Skipped (already done): {len(done)}")
+    print(f"   Calls: {report['calls']} in {report['groups']} groups")
+    print(f"   Fees: {report['fees_microalgos']} µAlgo "
+          f"(one-by-one: {report['one_by_one_fees_microalgos']} µAlgo)")
+    print(f"   Elapsed: {report['elapsed_seconds']:.2f}s")
+    if not args.dry_run:
+        for kind, stats in client.cache.stats().items():
+            print(f"   Cache {kind}: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
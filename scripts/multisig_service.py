@@ -0,0 +1,524 @@
+"""
+Multisig signature aggregation service
+======================================
+
+Collects partial signatures from the members of the admin multisig in
+deploy_config.json for pending admin transactions (mint, burn, blacklist,
+metadata update). Once a transaction has `threshold` valid signatures it
+is merged and submitted automatically, so signers no longer pass files
+around.
+
+- proposals are decoded before they are queued: each must be an
+  application call sent by the multisig account (to the FarmFoodTokenizer
+  app, when its id is known) whose method selector matches its kind
+- the queue is a SQLite database: proposals, signatures and status
+  changes are committed before they are acknowledged, and on restart any
+  transaction that reached its threshold but was never submitted is
+  resubmitted
+- signatures are verified against the member's public key before they
+  count toward the threshold
+- submission runs on a background worker, so intake stays fast with
+  hundreds of transactions pending. Transient node errors (no response,
+  429, 5xx) are retried with backoff and leave the transaction `ready`,
+  and the worker queues such transactions again every
+  `ready_retry_interval` seconds; anything else marks it `failed` without
+  stopping the worker
+
+Signers talk to it over a small local JSON API:
+
+    POST /transactions                      {"kind", "txn": b64 msgpack}
+    GET  /transactions?status=pending
+    GET  /transactions/<txid>
+    POST /transactions/<txid>/signatures    {"signer", "signature": b64}
+
+Usage:
+    python scripts/multisig_service.py serve --network localnet --port 8765
+    SIGNER_MNEMONIC="..." python scripts/multisig_service.py sign <txid>
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+from addresses import decode_address, encode_address, is_valid_address, multisig_address
+from contract_abi import method_selector
+from node_client import NodeHTTPClient, NodeHTTPError, RetryPolicy, clients_for_network
+
+# Contract methods a proposal of each kind may call
+KIND_METHODS = {
+    "mint": ("mint_tokens", "mint_tokens_batch"),
+    "burn": ("burn_tokens",),
+    "blacklist": ("add_to_blacklist", "remove_from_blacklist",
+                  "add_to_blacklist_batch", "remove_from_blacklist_batch"),
+    "metadata": ("update_metadata_cid",),
+}
+KINDS = tuple(KIND_METHODS)
+
+# Node rejections meaning an earlier attempt already got the transaction through
+ALREADY_SUBMITTED = ("already in ledger", "transaction already in pool")
+
+DEFAULT_QUEUE = Path("deployments/multisig_queue.db")
+
+# Seconds a transaction left `ready` by a transient failure waits before the
+# worker queues it again
+READY_RETRY_SECONDS = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    txid TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    txn BLOB NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    submitted_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS transactions_status ON transactions (status, created_at);
+CREATE TABLE IF NOT EXISTS signatures (
+    txid TEXT NOT NULL REFERENCES transactions (txid),
+    signer TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    PRIMARY KEY (txid, signer)
+);
+"""
+
+# (signer address, signed bytes, signature) -> valid
+Verifier = Callable[[str, bytes, bytes], bool]
+# (unsigned txn bytes, {signer: signature}) -> submitted txid
+Submitter = Callable[[bytes, Dict[str, bytes]], str]
+# msgpack-encoded unsigned txn bytes -> transaction fields ("type", "snd", "apid", "apaa", ...)
+Decoder = Callable[[bytes], Dict[str, Any]]
+
+
+class MultisigError(ValueError):
+    """
+    A proposal or signature was rejected
+    """
+
+
+def txid_of(txn_bytes: bytes) -> str:
+    """Algorand transaction id of msgpack-encoded unsigned transaction bytes"""
+    digest = hashlib.new("sha512_256", b"TX" + txn_bytes).digest()
+    return base64.b32encode(digest).decode("ascii").rstrip("=")
+
+
+def ed25519_verify(signer: str, message: bytes, signature: bytes) -> bool:
+    """Check an Ed25519 signature by an Algorand account"""
+    from nacl.exceptions import BadSignatureError
+    from nacl.signing import VerifyKey
+
+    try:
+        VerifyKey(decode_address(signer)).verify(message, signature)
+    except BadSignatureError:
+        return False
+    return True
+
+
+def msgpack_decode(txn_bytes: bytes) -> Dict[str, Any]:
+    """Fields of a msgpack-encoded unsigned transaction"""
+    import msgpack
+
+    return msgpack.unpackb(txn_bytes, raw=False)
+
+
+def is_transient(error: NodeHTTPError) -> bool:
+    """Whether a failed submission may succeed if sent again"""
+    return error.status is None or error.status == 429 or error.status >= 500
+
+
+def algosdk_submitter(algod_client, threshold: int, members: Sequence[str]) -> Submitter:
+    """Merge signatures into an algosdk MultisigTransaction and send it"""
+    from algosdk import encoding, transaction
+
+    def submit(txn_bytes: bytes, signatures: Dict[str, bytes]) -> str:
+        txn = encoding.msgpack_decode(base64.b64encode(txn_bytes).decode("ascii"))
+        msig = transaction.Multisig(1, threshold, list(members))
+        for subsig in msig.subsigs:
+            signer = encode_address(subsig.public_key)
+            if signer in signatures:
+                subsig.signature = signatures[signer]
+        signed = transaction.MultisigTransaction(txn, msig)
+        return algod_client.send_raw_transaction(base64.b64decode(encoding.msgpack_encode(signed)))
+
+    return submit
+
+
+class MultisigQueue:
+    """
+    Durable queue of multisig transactions awaiting signatures
+    """
+
+    def __init__(self,
+                 path: Path,
+                 threshold: int,
+                 members: Sequence[str],
+                 submit: Submitter,
+                 verify: Verifier = ed25519_verify,
+                 decode: Decoder = msgpack_decode,
+                 app_id: Optional[int] = None,
+                 retry: Optional[RetryPolicy] = None,
+                 ready_retry_interval: float = READY_RETRY_SECONDS):
+        for member in members:
+            if not is_valid_address(member):
+                raise MultisigError(f"Invalid multisig member: {member}")
+        if not 1 <= threshold <= len(members):
+            raise MultisigError("Threshold must be between 1 and the number of members")
+        self.threshold = threshold
+        self.members = list(members)
+        self.address = multisig_address(threshold, members)
+        self.submit = submit
+        self.verify = verify
+        self.decode = decode
+        self.app_id = app_id
+        self.retry = retry or RetryPolicy()
+        self.ready_retry_interval = ready_retry_interval
+        self._selectors = {
+            kind: {method_selector(method) for method in methods} for kind, methods in KIND_METHODS.items()
+        }
+
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._ready: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    # Intake
+
+    def check_proposal(self, kind: str, txn_bytes: bytes):
+        """
+        Decode a proposed transaction and check it is the admin call it claims to be
+
+        Raises:
+            MultisigError: if it is not an app call from the multisig account
+                calling a method of `kind`
+        """
+        if kind not in KINDS:
+            raise MultisigError(f"Unknown transaction kind: {kind}")
+        try:
+            txn = self.decode(txn_bytes)
+        except Exception as e:
+            raise MultisigError(f"Undecodable transaction: {e}") from e
+        if not isinstance(txn, dict) or txn.get("type") != "appl":
+            raise MultisigError("Transaction is not an application call")
+        if txn.get("snd") != decode_address(self.address):
+            raise MultisigError(f"Transaction is not sent by the multisig account {self.address}")
+        if self.app_id is not None and txn.get("apid") != self.app_id:
+            raise MultisigError(f"Transaction does not call app {self.app_id}")
+        args = txn.get("apaa") or [b""]
+        if args[0] not in self._selectors[kind]:
+            raise MultisigError(f"Transaction does not call a {kind} method")
+
+    def propose(self, kind: str, txn_bytes: bytes) -> str:
+        """Queue an unsigned transaction from the multisig account; returns its txid"""
+        self.check_proposal(kind, txn_bytes)
+        txid = txid_of(txn_bytes)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO transactions (txid, kind, txn, status, created_at) "
+                "VALUES (?, ?, ?, 'pending', ?)",
+                (txid, kind, txn_bytes, time.time()),
+            )
+        return txid
+
+    def add_signature(self, txid: str, signer: str, signature: bytes) -> Dict[str, Any]:
+        """
+        Record one member's signature; queues submission when the threshold is met
+
+        Returns:
+            The transaction's status summary
+        """
+        if signer not in self.members:
+            raise MultisigError(f"{signer} is not a member of the multisig")
+        with self._lock:
+            row = self._db.execute("SELECT txn, status FROM transactions WHERE txid = ?", (txid,)).fetchone()
+            if row is None:
+                raise MultisigError(f"Unknown transaction: {txid}")
+            if not self.verify(signer, b"TX" + row["txn"], signature):
+                raise MultisigError(f"Invalid signature from {signer}")
+
+            with self._db:
+                self._db.execute(
+                    "INSERT OR IGNORE INTO signatures (txid, signer, signature) VALUES (?, ?, ?)",
+                    (txid, signer, signature),
+                )
+                count = self._signature_count(txid)
+                ready = row["status"] == "pending" and count >= self.threshold
+                if ready:
+                    self._db.execute("UPDATE transactions SET status = 'ready' WHERE txid = ?", (txid,))
+        # Read before queueing, so the reply shows the state this signature
+        # produced rather than whatever the worker has done since
+        summary = self.get(txid)
+        if ready:
+            self._ready.put(txid)
+        return summary
+
+    def _signature_count(self, txid: str) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM signatures WHERE txid = ?", (txid,)).fetchone()[0]
+
+    # Reads
+
+    def get(self, txid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM transactions WHERE txid = ?", (txid,)).fetchone()
+            if row is None:
+                return None
+            signers = [r["signer"] for r in self._db.execute(
+                "SELECT signer FROM signatures WHERE txid = ? ORDER BY signer", (txid,)
+            )]
+        return {
+            "txid": row["txid"],
+            "kind": row["kind"],
+            "txn": base64.b64encode(row["txn"]).decode("ascii"),
+            "status": row["status"],
+            "signers": signers,
+            "threshold": self.threshold,
+            "error": row["error"],
+        }
+
+    def list(self, status: Optional[str] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        with self._lock:
+            if status:
+                rows = self._db.execute(
+                    "SELECT txid FROM transactions WHERE status = ? ORDER BY created_at LIMIT ?", (status, limit)
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT txid FROM transactions ORDER BY created_at LIMIT ?", (limit,)
+                ).fetchall()
+        return [self.get(row["txid"]) for row in rows]
+
+    # Submission
+
+    def submit_ready(self, txid: str):
+        """
+        Merge the signatures of a ready transaction and submit it
+
+        Transient node errors are retried with backoff; if they persist the
+        transaction stays `ready` (with the error recorded) and the worker
+        queues it again once `ready_retry_interval` has passed. Any other
+        error marks it `failed`.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT txn, status FROM transactions WHERE txid = ?", (txid,)).fetchone()
+            if row is None or row["status"] != "ready":
+                return
+            # The first `threshold` signatures, in the order they arrived;
+            # later ones are valid but only make the transaction bigger
+            signatures = {
+                r["signer"]: r["signature"]
+                for r in self._db.execute(
+                    "SELECT signer, signature FROM signatures WHERE txid = ? ORDER BY rowid LIMIT ?",
+                    (txid, self.threshold),
+                )
+            }
+        attempt = 0
+        while True:
+            try:
+                self.submit(row["txn"], signatures)
+                status, error = "submitted", None
+            except NodeHTTPError as e:
+                # A resubmission may find the transaction already in the ledger or pool
+                if any(message in str(e) for message in ALREADY_SUBMITTED):
+                    status, error = "submitted", None
+                elif is_transient(e):
+                    if attempt < self.retry.max_retries:
+                        time.sleep(self.retry.delay(attempt))
+                        attempt += 1
+                        continue
+                    status, error = "ready", str(e)
+                else:
+                    status, error = "failed", str(e)
+            except Exception as e:
+                status, error = "failed", f"{type(e).__name__}: {e}"
+            break
+        self._set_status(txid, status, error)
+
+    def _set_status(self, txid: str, status: str, error: Optional[str]):
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE transactions SET status = ?, error = ?, submitted_at = ? WHERE txid = ?",
+                (status, error, time.time(), txid),
+            )
+
+    def _requeue_failed_ready(self):
+        """Queue transactions whose last attempt failed transiently at least `ready_retry_interval` ago"""
+        with self._lock:
+            txids = [r["txid"] for r in self._db.execute(
+                "SELECT txid FROM transactions WHERE status = 'ready' AND error IS NOT NULL "
+                "AND submitted_at <= ? ORDER BY created_at",
+                (time.time() - self.ready_retry_interval,),
+            )]
+        for txid in txids:
+            self._ready.put(txid)
+
+    def _run_worker(self):
+        next_sweep = time.monotonic() + self.ready_retry_interval
+        while True:
+            # Checked between entries too, so a busy queue does not starve retries
+            if time.monotonic() >= next_sweep:
+                self._requeue_failed_ready()
+                next_sweep = time.monotonic() + self.ready_retry_interval
+            try:
+                txid = self._ready.get(timeout=max(0.0, next_sweep - time.monotonic()))
+            except queue.Empty:
+                continue
+            try:
+                if txid is None:
+                    return
+                self.submit_ready(txid)
+            except Exception as e:
+                # Never let one bad entry stop the only submit thread
+                self._set_status(txid, "failed", f"{type(e).__name__}: {e}")
+            finally:
+                self._ready.task_done()
+
+    def start(self):
+        """Start the submit worker, re-queuing anything left ready by a previous run"""
+        with self._lock:
+            leftover = [r["txid"] for r in self._db.execute(
+                "SELECT txid FROM transactions WHERE status = 'ready' ORDER BY created_at"
+            )]
+        for txid in leftover:
+            self._ready.put(txid)
+        self._worker = threading.Thread(target=self._run_worker, daemon=True)
+        self._worker.start()
+
+    def drain(self):
+        """Block until every queued submission has been attempted"""
+        self._ready.join()
+
+    def stop(self):
+        if self._worker:
+            self._ready.put(None)
+            self._worker.join()
+            self._worker = None
+        self._db.close()
+
+
+def make_handler(multisig_queue: MultisigQueue):
+    """HTTP handler class serving the JSON API for one queue"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, payload: Any):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self) -> Dict[str, Any]:
+            return json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            parts = url.path.strip("/").split("/")
+            if parts == ["transactions"]:
+                status = parse_qs(url.query).get("status", [None])[0]
+                self._send(200, {"transactions": multisig_queue.list(status)})
+            elif len(parts) == 2 and parts[0] == "transactions":
+                found = multisig_queue.get(parts[1])
+                self._send(200, found) if found else self._send(404, {"message": "Unknown transaction"})
+            else:
+                self._send(404, {"message": "Not found"})
+
+        def do_POST(self):
+            parts = urlsplit(self.path).path.strip("/").split("/")
+            try:
+                body = self._body()
+                if parts == ["transactions"]:
+                    txid = multisig_queue.propose(body["kind"], base64.b64decode(body["txn"]))
+                    self._send(200, multisig_queue.get(txid))
+                elif len(parts) == 3 and parts[0] == "transactions" and parts[2] == "signatures":
+                    self._send(200, multisig_queue.add_signature(
+                        parts[1], body["signer"], base64.b64decode(body["signature"])
+                    ))
+                else:
+                    self._send(404, {"message": "Not found"})
+            except (MultisigError, KeyError, ValueError) as e:
+                self._send(400, {"message": str(e)})
+
+    return Handler
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Multisig signature aggregation service")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="Run the aggregation service")
+    serve.add_argument("--network", choices=["localnet", "testnet"], default="localnet")
+    serve.add_argument("--queue", type=Path, default=DEFAULT_QUEUE, help="SQLite queue path")
+    serve.add_argument("--port", type=int, default=8765)
+
+    sign = subparsers.add_parser("sign", help="Sign a pending transaction with SIGNER_MNEMONIC")
+    sign.add_argument("txid")
+    sign.add_argument("--service", default="http://127.0.0.1:8765")
+    args = parser.parse_args()
+
+    if args.command == "sign":
+        from algosdk import account, mnemonic
+        from nacl.signing import SigningKey
+
+        private_key = mnemonic.to_private_key(os.environ["SIGNER_MNEMONIC"])
+        service = NodeHTTPClient(args.service)
+        pending = service.get_json(f"/transactions/{args.txid}")
+        signature = SigningKey(base64.b64decode(private_key)[:32]).sign(
+            b"TX" + base64.b64decode(pending["txn"])
+        ).signature
+        body = json.dumps({
+            "signer": account.address_from_private_key(private_key),
+            "signature": base64.b64encode(signature).decode("ascii"),
+        }).encode()
+        result = service.post_json(f"/transactions/{args.txid}/signatures", body, "application/json")
+        print(f"✅ Signed {pending['kind']} {args.txid}: "
+              f"{len(result['signers'])}/{result['threshold']} signatures, status {result['status']}")
+        return
+
+    config = json.loads(Path("scripts/deploy_config.json").read_text())
+    multisig = config["multisig"]
+    algod = clients_for_network(config, args.network)[0]
+    deployment_file = Path(f"deployments/{args.network}_deployment.json")
+    app_id = json.loads(deployment_file.read_text())["contract"]["app_id"] if deployment_file.exists() else None
+    multisig_queue = MultisigQueue(
+        args.queue,
+        multisig["threshold"],
+        multisig["addresses"],
+        algosdk_submitter(algod, multisig["threshold"], multisig["addresses"]),
+        app_id=app_id,
+    )
+    multisig_queue.start()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(multisig_queue))
+    print(f"🔐 Aggregating {multisig['threshold']}-of-{len(multisig['addresses'])} signatures "
+          f"for {multisig_queue.address}")
+    print(f"📋 Listening on http://127.0.0.1:{args.port} ({len(multisig_queue.list('pending'))} pending)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        multisig_queue.stop()
+
+
+if __name__ == "__main__":
+    main()
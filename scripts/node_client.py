@@ -0,0 +1,413 @@
+"""
+Pooled algod/indexer HTTP client
+================================
+
+Shared client layer for the algod and indexer endpoints in
+deploy_config.json. Every script goes through it instead of opening a
+fresh connection per call:
+
+- a pool of persistent HTTP/1.1 (keep-alive) connections per endpoint
+- bounded concurrency: at most `max_connections` requests in flight
+- retries with full-jitter exponential backoff on 429/5xx and dropped
+  connections, honouring Retry-After. Transaction submission (POST
+  /v2/transactions) is not idempotent: once the request has been written it
+  is only retried on 429, never on a 5xx or a dropped connection, since the
+  node may already have accepted it. It goes out on a fresh connection so a
+  stale keep-alive socket cannot cause that ambiguity
+- per-endpoint latency counters (count, errors, retries, avg/max ms)
+- when telemetry is enabled, a span per request and Prometheus metrics per
+  attempt (see telemetry.py)
+
+`AlgodClient` implements the subset of algosdk's AlgodClient interface the
+tooling uses (status, status_after_block, pending_transaction_info,
+suggested_params, send_transactions, compile, simulate_transactions), so it
+can be passed to algosdk's AtomicTransactionComposer directly.
+
+Usage:
+    algod, indexer = clients_for_network(config, "localnet")
+    algod.status()
+    print(algod.stats.snapshot())
+"""
+
+import base64
+import http.client
+import json
+import queue
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from telemetry import TELEMETRY
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Path segments replaced by placeholders so stats group by endpoint
+_PATH_PLACEHOLDERS = [
+    (re.compile(r"^\d+$"), "{n}"),
+    (re.compile(r"^[A-Z2-7]{58}$"), "{address}"),
+    (re.compile(r"^[A-Z2-7]{52}$"), "{txid}"),
+]
+
+
+def endpoint_label(method: str, path: str) -> str:
+    """Stats key for a request, e.g. 'GET /v2/accounts/{address}'"""
+    segments = []
+    for segment in path.split("?")[0].split("/"):
+        for pattern, placeholder in _PATH_PLACEHOLDERS:
+            if pattern.match(segment):
+                segment = placeholder
+                break
+        segments.append(segment)
+    return f"{method} {'/'.join(segments)}"
+
+
+class NodeHTTPError(Exception):
+    """
+    A node request failed with an HTTP error status or after exhausting retries
+    """
+
+    def __init__(self, status: Optional[int], message: str):
+        super().__init__(f"HTTP {status}: {message}" if status else message)
+        self.status = status
+
+
+class RetryPolicy:
+    """
+    Full-jitter exponential backoff
+    """
+
+    def __init__(self, max_retries: int = 4, base_delay: float = 0.1, max_delay: float = 5.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(self.max_delay, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class EndpointStats:
+    """
+    Thread-safe per-endpoint request counters
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, endpoint: str, seconds: float, error: bool = False, retried: bool = False):
+        with self._lock:
+            entry = self._stats.setdefault(
+                endpoint, {"count": 0, "errors": 0, "retries": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            entry["count"] += 1
+            entry["errors"] += error
+            entry["retries"] += retried
+            entry["total_seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                endpoint: {
+                    "count": entry["count"],
+                    "errors": entry["errors"],
+                    "retries": entry["retries"],
+                    "avg_ms": 1000 * entry["total_seconds"] / entry["count"],
+                    "max_ms": 1000 * entry["max_seconds"],
+                }
+                for endpoint, entry in self._stats.items()
+            }
+
+
+class ConnectionPool:
+    """
+    Keep-alive connections to one host, bounded to `max_connections` in use
+
+    At most `max_connections` idle connections are kept; fresh connections
+    (transaction submissions) would otherwise pile up behind the reused ones,
+    so a release beyond that closes the connection instead.
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 8, timeout: float = 70.0):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(max_connections)
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self.opened = 0
+
+    def acquire(self, fresh: bool = False) -> http.client.HTTPConnection:
+        """An idle connection, or a new one if there is none or `fresh` is set"""
+        self._slots.acquire()
+        try:
+            if not fresh:
+                return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        self.opened += 1
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def release(self, connection: http.client.HTTPConnection, reusable: bool):
+        try:
+            if reusable:
+                self._idle.put_nowait(connection)
+            else:
+                connection.close()
+        except queue.Full:
+            connection.close()
+        self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class NodeHTTPClient:
+    """
+    Pooled JSON/binary client for one node endpoint
+    """
+
+    token_header = "X-Algo-API-Token"
+
+    def __init__(self,
+                 base_url: str,
+                 token: str = "",
+                 max_connections: int = 8,
+                 timeout: float = 70.0,
+                 retry: Optional[RetryPolicy] = None,
+                 stats: Optional[EndpointStats] = None):
+        self.pool = ConnectionPool(base_url, max_connections, timeout)
+        self.retry = retry or RetryPolicy()
+        self.stats = stats or EndpointStats()
+        self.headers = {"Connection": "keep-alive", "Accept": "application/json"}
+        if token:
+            self.headers[self.token_header] = token
+
+    def request(self,
+                method: str,
+                path: str,
+                params: Optional[Dict[str, Any]] = None,
+                body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None,
+                idempotent: bool = True) -> bytes:
+        """
+        Send a request, retrying on 429/5xx and dropped connections
+
+        A non-idempotent request is only retried when the node cannot have
+        acted on it: a 429, or a failure before the request was written.
+        """
+        label = endpoint_label(method, path)
+        if not TELEMETRY.enabled:
+            return self._send(method, path, params, body, headers, label, idempotent)
+        with TELEMETRY.span("node.request", endpoint=label, host=self.pool.host):
+            return self._send(method, path, params, body, headers, label, idempotent)
+
+    def _send(self,
+              method: str,
+              path: str,
+              params: Optional[Dict[str, Any]],
+              body: Optional[bytes],
+              headers: Optional[Dict[str, str]],
+              label: str,
+              idempotent: bool = True) -> bytes:
+        url = self.pool.base_path + path
+        if params:
+            url += "?" + urlencode({k: v for k, v in params.items() if v is not None})
+        request_headers = {**self.headers, **(headers or {})}
+
+        attempt = 0
+        while True:
+            connection = self.pool.acquire(fresh=not idempotent)
+            started = time.perf_counter()
+            status, data, retry_after, failure, written = None, b"", None, None, False
+            try:
+                connection.request(method, url, body=body, headers=request_headers)
+                written = True
+                response = connection.getresponse()
+                data = response.read()
+                status = response.status
+                retry_after = response.getheader("Retry-After")
+                self.pool.release(connection, not response.will_close)
+            except (OSError, http.client.HTTPException) as e:
+                self.pool.release(connection, False)
+                failure = e
+
+            if idempotent:
+                retryable = failure is not None or status in RETRY_STATUSES
+            else:
+                retryable = (failure is not None and not written) or status == 429
+            will_retry = retryable and attempt < self.retry.max_retries
+            seconds = time.perf_counter() - started
+            self.stats.record(label, seconds, error=failure is not None or status >= 400, retried=will_retry)
+            if TELEMETRY.enabled:
+                TELEMETRY.observe("farm_node_request_seconds", seconds, endpoint=label)
+                TELEMETRY.inc("farm_node_requests_total", endpoint=label, status=status or "error")
+                if will_retry:
+                    TELEMETRY.inc("farm_node_retries_total", endpoint=label)
+
+            if not retryable:
+                if failure is not None:
+                    raise NodeHTTPError(None, f"{label} may have been delivered; not retried: {failure}") from failure
+                if status >= 400:
+                    raise NodeHTTPError(status, data.decode("utf-8", "replace"))
+                return data
+            if not will_retry:
+                if failure is not None:
+                    raise NodeHTTPError(None, f"{label} failed: {failure}") from failure
+                raise NodeHTTPError(status, data.decode("utf-8", "replace"))
+
+            time.sleep(self.retry.delay(attempt, retry_after))
+            attempt += 1
+
+    def get_json(self, path: str, **params) -> Dict[str, Any]:
+        return json.loads(self.request("GET", path, params=params or None))
+
+    def post_json(self, path: str, body: bytes, content_type: str, idempotent: bool = True,
+                  **params) -> Dict[str, Any]:
+        return json.loads(self.request(
+            "POST", path, params=params or None, body=body, headers={"Content-Type": content_type},
+            idempotent=idempotent,
+        ))
+
+    def close(self):
+        self.pool.close()
+
+
+class AlgodClient(NodeHTTPClient):
+    """
+    Pooled algod v2 client
+    """
+
+    token_header = "X-Algo-API-Token"
+
+    def status(self) -> Dict[str, Any]:
+        return self.get_json("/v2/status")
+
+    def status_after_block(self, round_number: int) -> Dict[str, Any]:
+        return self.get_json(f"/v2/status/wait-for-block-after/{round_number}")
+
+    def pending_transaction_info(self, txid: str) -> Dict[str, Any]:
+        return self.get_json(f"/v2/transactions/pending/{txid}")
+
+    def transaction_params(self) -> Dict[str, Any]:
+        return self.get_json("/v2/transactions/params")
+
+    def suggested_params(self):
+        """Transaction params as an algosdk SuggestedParams object"""
+        from algosdk import transaction
+
+        params = self.transaction_params()
+        return transaction.SuggestedParams(
+            fee=params["fee"],
+            first=params["last-round"],
+            last=params["last-round"] + 1000,
+            gh=params["genesis-hash"],
+            gen=params["genesis-id"],
+            flat_fee=False,
+            consensus_version=params["consensus-version"],
+            min_fee=params["min-fee"],
+        )
+
+    def account_info(self, address: str) -> Dict[str, Any]:
+        return self.get_json(f"/v2/accounts/{address}")
+
+    def application_info(self, app_id: int) -> Dict[str, Any]:
+        return self.get_json(f"/v2/applications/{app_id}")
+
+    def application_box_by_name(self, app_id: int, name: bytes) -> Dict[str, Any]:
+        encoded = "b64:" + base64.b64encode(name).decode("ascii")
+        return self.get_json(f"/v2/applications/{app_id}/box", name=encoded)
+
+    def application_boxes(self, app_id: int, **params) -> Dict[str, Any]:
+        return self.get_json(f"/v2/applications/{app_id}/boxes", **params)
+
+    def send_raw_transaction(self, blob: bytes) -> str:
+        return self.post_json("/v2/transactions", blob, "application/x-binary", idempotent=False)["txId"]
+
+    def send_transactions(self, signed_txns) -> str:
+        """Submit signed algosdk transactions as one (group) blob"""
+        from algosdk import encoding
+
+        blob = b"".join(base64.b64decode(encoding.msgpack_encode(txn)) for txn in signed_txns)
+        return self.send_raw_transaction(blob)
+
+    def compile(self, source: str) -> Dict[str, Any]:
+        return self.post_json("/v2/teal/compile", source.encode("utf-8"), "application/x-binary")
+
+    def simulate_raw_transactions(self, body: bytes) -> Dict[str, Any]:
+        return self.post_json("/v2/transactions/simulate", body, "application/msgpack", format="json")
+
+    def simulate_transactions(self, request) -> Dict[str, Any]:
+        """Simulate an algosdk SimulateRequest"""
+        from algosdk import encoding
+
+        return self.simulate_raw_transactions(base64.b64decode(encoding.msgpack_encode(request)))
+
+
+class IndexerClient(NodeHTTPClient):
+    """
+    Pooled indexer v2 client
+    """
+
+    token_header = "X-Indexer-API-Token"
+
+    def health(self) -> Dict[str, Any]:
+        return self.get_json("/health")
+
+    def search_transactions(self, **params) -> Dict[str, Any]:
+        return self.get_json("/v2/transactions", **params)
+
+    def asset_balances(self, asset_id: int, **params) -> Dict[str, Any]:
+        return self.get_json(f"/v2/assets/{asset_id}/balances", **params)
+
+    def asset_transactions(self, asset_id: int, **params) -> Dict[str, Any]:
+        return self.get_json(f"/v2/assets/{asset_id}/transactions", **params)
+
+
+_clients: Dict[Tuple[str, str], Tuple[AlgodClient, IndexerClient]] = {}
+_clients_lock = threading.Lock()
+
+
+def clients_for_network(config: Dict[str, Any], network: str) -> Tuple[AlgodClient, IndexerClient]:
+    """
+    Shared (algod, indexer) clients for a network in deploy_config.json
+
+    Clients are cached per endpoint so every caller in the process reuses
+    the same connection pools and stats.
+    """
+    network_config = config[network]
+    http_config = config.get("http", {})
+    key = (network_config["algod_address"], network_config["indexer_address"])
+
+    with _clients_lock:
+        if key not in _clients:
+            retry = RetryPolicy(
+                max_retries=http_config.get("max_retries", 4),
+                base_delay=http_config.get("backoff_base_seconds", 0.1),
+                max_delay=http_config.get("backoff_max_seconds", 5.0),
+            )
+            options = {
+                "max_connections": http_config.get("max_connections", 8),
+                "timeout": http_config.get("timeout_seconds", 70.0),
+                "retry": retry,
+            }
+            _clients[key] = (
+                AlgodClient(network_config["algod_address"], network_config["algod_token"], **options),
+                IndexerClient(network_config["indexer_address"], network_config["indexer_token"], **options),
+            )
+        return _clients[key]
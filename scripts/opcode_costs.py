@@ -0,0 +1,36 @@
+"""
+Contract opcode costs
+=====================
+
+Opcode costs of the FarmFoodTokenizer methods the off-chain tooling sizes
+batches against, ARC-4 routing excluded. Single methods are one count;
+batch methods are (fixed cost, cost per item).
+
+The numbers live in opcode_costs.json, which
+
+    python scripts/profile_costs.py --network localnet --write-opcode-costs
+
+rewrites from simulate runs at growing blacklist sizes. Its "source" is
+"simulate" once measured, or "estimate" for the hand-counted values it
+starts from; "contract_sha256" names the contract the measurement ran on.
+
+Usage:
+    from opcode_costs import OPCODE_COSTS
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+OPCODE_COSTS_PATH = Path(__file__).with_name("opcode_costs.json")
+
+
+def load_opcode_costs(path: Path = OPCODE_COSTS_PATH) -> Dict[str, Any]:
+    """Read an opcode cost file, with batch costs as (fixed, per item) tuples"""
+    costs = json.loads(path.read_text())
+    costs["blacklist_batch"] = {method: tuple(pair) for method, pair in costs["blacklist_batch"].items()}
+    costs["mint_tokens_batch"] = tuple(costs["mint_tokens_batch"])
+    return costs
+
+
+OPCODE_COSTS = load_opcode_costs()
@@ -0,0 +1,165 @@
+"""
+Parallel transaction signing
+============================
+
+Spreads msgpack encoding and Ed25519 signing of large transaction batches
+across a process pool, so preparing tens of thousands of payouts or ASA
+creations is no longer bound to one core.
+
+- work is sent to workers in chunks of groups, with a bounded number of
+  chunks outstanding, so memory stays flat on long streams
+- each worker decodes its signing keys once, in the pool initializer
+- each group comes back as (txids, blob): the concatenated signed
+  transactions as raw bytes, ready for `send_raw_transaction` without
+  re-encoding
+- results are yielded in input order
+
+With `workers=1` everything runs in-process, which is the serial baseline
+scripts/signing_benchmark.py compares against.
+
+Usage:
+    with ParallelSigner([private_key], workers=8) as signer:
+        for txids, blob in signer.sign_groups(groups):
+            algod_client.send_raw_transaction(blob)
+"""
+
+import base64
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from addresses import encode_address
+
+DEFAULT_CHUNK_SIZE = 64
+
+# (txids of the group, signed group blob)
+SignedGroup = Tuple[List[str], bytes]
+
+# Per-process state set up by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split a stream into lists of at most `size` items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ChunkedProcessPool:
+    """
+    Ordered, bounded-lookahead map of a chunk function over a process pool
+    """
+
+    def __init__(self,
+                 process_chunk: Callable[[List[Any]], List[Any]],
+                 workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 initializer: Optional[Callable[..., None]] = None,
+                 initargs: Tuple = ()):
+        self.process_chunk = process_chunk
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._initialized_inline = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    def map(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Process every item, yielding results in input order"""
+        if self.workers == 1:
+            if self.initializer and not self._initialized_inline:
+                self.initializer(*self.initargs)
+                self._initialized_inline = True
+            for chunk in chunked(items, self.chunk_size):
+                yield from self.process_chunk(chunk)
+            return
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, initializer=self.initializer, initargs=self.initargs)
+        pending = deque()
+        # Two chunks per worker keeps every core busy without reading ahead unboundedly
+        for chunk in chunked(items, self.chunk_size):
+            if len(pending) >= 2 * self.workers:
+                yield from pending.popleft().result()
+            pending.append(self._executor.submit(self.process_chunk, chunk))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _load_keys(private_keys: Sequence[str]):
+    """Pool initializer: decode each algosdk private key into a signing key once"""
+    from nacl.signing import SigningKey
+
+    keys = {}
+    for private_key in private_keys:
+        raw = base64.b64decode(private_key)
+        keys[encode_address(raw[32:])] = SigningKey(raw[:32])
+    _worker_state["keys"] = keys
+
+
+def _txid(txn_bytes: bytes) -> str:
+    digest = hashlib.new("sha512_256", b"TX" + txn_bytes).digest()
+    return base64.b32encode(digest).decode("ascii").rstrip("=")
+
+
+def sign_group(txns: List[Any]) -> SignedGroup:
+    """Group, encode and sign algosdk transactions with the worker's keys"""
+    from algosdk import encoding, transaction
+
+    if len(txns) > 1:
+        txns = transaction.assign_group_id(txns)
+    keys = _worker_state["keys"]
+    txids, blob = [], bytearray()
+    for txn in txns:
+        key = keys.get(txn.sender)
+        if key is None:
+            raise KeyError(f"No signing key for {txn.sender}")
+        txn_bytes = base64.b64decode(encoding.msgpack_encode(txn))
+        signature = key.sign(b"TX" + txn_bytes).signature
+        signed = transaction.SignedTransaction(txn, base64.b64encode(signature).decode("ascii"))
+        blob += base64.b64decode(encoding.msgpack_encode(signed))
+        txids.append(_txid(txn_bytes))
+    return txids, bytes(blob)
+
+
+def sign_chunk(groups: List[List[Any]]) -> List[SignedGroup]:
+    return [sign_group(group) for group in groups]
+
+
+class ParallelSigner(ChunkedProcessPool):
+    """
+    Signs transaction groups across worker processes
+    """
+
+    def __init__(self,
+                 private_keys: Sequence[str],
+                 workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        super().__init__(sign_chunk, workers, chunk_size, initializer=_load_keys, initargs=(list(private_keys),))
+
+    def sign_groups(self, groups: Iterable[List[Any]]) -> Iterator[SignedGroup]:
+        """(txids, blob) per group, in input order"""
+        return self.map(groups)
+
+    def sign_transactions(self, txns: Iterable[Any]) -> Iterator[SignedGroup]:
+        """Sign ungrouped transactions; one (txids, blob) per transaction"""
+        return self.map([txn] for txn in txns)
@@ -0,0 +1,604 @@
+"""
+Per-method cost profiler
+========================
+
+Reports, for every FarmFoodTokenizer ABI method, the opcode cost against the
+app call budget, the box/account/asset references a call needs, its effect
+on the app account's min-balance and the fee to submit it.
+
+Two sources:
+- simulate (default): compiles the contract with `algokit compile py`,
+  deploys it to a local node and runs each method through algod's simulate
+  endpoint, reading `app-budget-consumed`, inner transactions and the
+  unnamed resources the call touched. Simulated state is discarded after
+  each request, so calls that need existing state (removing or reading a
+  blacklist entry) are simulated in one group behind the call creating it.
+  Min-balance effects cannot be simulated: for create_asa and the blacklist
+  methods they are measured from the app account's min-balance before and
+  after really executing the call on the local node
+- estimate (--estimate): the static cost model below, for environments
+  without a node
+
+With --write-opcode-costs, simulate mode also measures the blacklist and
+mint_tokens_batch opcode costs at growing blacklist sizes (measure_opcode_costs),
+fails if they change with the list size and otherwise saves them to
+opcode_costs.json, which blacklist_boxes.py and mint_batches.py size their
+batches from. `opcode_costs_source` in the report says whether that file
+holds measured costs or the hand-counted estimates.
+
+Each method's `min_balance_source` says whether its min-balance delta was
+"measured" or comes from the "model". Batch methods are profiled at the
+largest batch the client tooling sends.
+The report also compares the packed global state layout with the previous
+one-key-per-field layout: creator min-balance, read-method opcodes and
+client-side decode time. The legacy opcode counts are estimates (that
+contract is not in the tree to simulate), so no opcode saving is derived
+from them. Output is JSON so CI can diff it across contract
+changes.
+
+Usage:
+    python scripts/profile_costs.py --estimate --output build/cost_profile.json
+    python scripts/profile_costs.py --network localnet --output build/cost_profile.json
+    python scripts/profile_costs.py --network localnet --write-opcode-costs
+    python scripts/profile_costs.py --estimate --compare build/cost_profile.json --max-growth 0.1
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+from addresses import application_address, random_address
+from blacklist_boxes import (
+    BLACKLIST_BATCH_OPCODE_COST,
+    BLACKLIST_ENTRY_MIN_BALANCE,
+    BLACKLIST_OPCODE_COST,
+    blacklist_box_name,
+)
+from blacklist_client import max_addresses_per_call
+from contract_abi import METHOD_SIGNATURES, abi_method
+from mint_batches import MINT_BATCH_OPCODE_COST, max_recipients_per_call
+from opcode_costs import OPCODE_COSTS, OPCODE_COSTS_PATH
+from protocol import (
+    APP_CALL_OPCODE_BUDGET,
+    MAX_ACCOUNT_REFERENCES_PER_TXN,
+    MAX_BOX_REFERENCES_PER_TXN,
+    MAX_TOTAL_REFERENCES_PER_TXN,
+    MIN_TXN_FEE,
+)
+from state_layout import (
+    GLOBAL_SCHEMA,
+    LEGACY_GLOBAL_SCHEMA,
+    decode_contract_state,
+    encode_global_state,
+    schema_min_balance,
+)
+
+CONTRACT_PATH = Path("contracts/farm_food_tokenizer.py")
+
+# Approximate cost of the ARC-4 method-selector match shared by every call
+ROUTING_OPCODE_COST = 24
+
+# ASA creation raises the creator's (app account's) min-balance
+ASSET_MIN_BALANCE = 100_000
+
+# Static model per method. Pairs are (fixed, per item); `items` is the batch
+# size profiled (1 for single-item methods). Opcode counts include the
+# ARC-28 event each state-changing method logs.
+COST_MODEL: Dict[str, Dict[str, Any]] = {
+    "create_asa": {"opcodes": (64, 0), "inner_txns": (1, 0), "min_balance": (ASSET_MIN_BALANCE, 0)},
+    "mint_tokens": {
+        "opcodes": (66, 0), "accounts": (1, 0), "assets": (1, 0), "boxes": (1, 0), "inner_txns": (1, 0),
+    },
+    "mint_tokens_batch": {
+        "opcodes": MINT_BATCH_OPCODE_COST,
+        "accounts": (0, 1),
+        "boxes": (0, 1),
+        "assets": (1, 0),
+        "inner_txns": (0, 1),
+        "items": max_recipients_per_call(),
+    },
+    "burn_tokens": {"opcodes": (56, 0), "assets": (1, 0), "inner_txns": (1, 0)},
+    "add_to_blacklist": {
+        "opcodes": (BLACKLIST_OPCODE_COST["add_to_blacklist"], 0),
+        "boxes": (1, 0),
+        "min_balance": (BLACKLIST_ENTRY_MIN_BALANCE, 0),
+    },
+    "remove_from_blacklist": {
+        "opcodes": (BLACKLIST_OPCODE_COST["remove_from_blacklist"], 0),
+        "boxes": (1, 0),
+        "min_balance": (-BLACKLIST_ENTRY_MIN_BALANCE, 0),
+    },
+    "add_to_blacklist_batch": {
+        "opcodes": BLACKLIST_BATCH_OPCODE_COST["add_to_blacklist_batch"],
+        "boxes": (0, 1),
+        "min_balance": (0, BLACKLIST_ENTRY_MIN_BALANCE),
+        "items": max_addresses_per_call("add_to_blacklist_batch"),
+    },
+    "remove_from_blacklist_batch": {
+        "opcodes": BLACKLIST_BATCH_OPCODE_COST["remove_from_blacklist_batch"],
+        "boxes": (0, 1),
+        "min_balance": (0, -BLACKLIST_ENTRY_MIN_BALANCE),
+        "items": max_addresses_per_call("remove_from_blacklist_batch"),
+    },
+    "is_blacklisted": {"opcodes": (BLACKLIST_OPCODE_COST["is_blacklisted"], 0), "boxes": (1, 0)},
+    # Packed state: fields are extracted from the "c"/"t" values and returned
+    # already ARC-4 encoded; updating the CID rebuilds the text tuple
+    "get_metadata_cid": {"opcodes": (12, 0)},
+    "update_metadata_cid": {"opcodes": (42, 0)},
+    "get_contract_info": {"opcodes": (34, 0)},
+}
+
+# Blacklist sizes --write-opcode-costs measures at; box ops are keyed
+# lookups, so each size should report the same costs
+OPCODE_LIST_SIZES = (0, 64, 256)
+
+# The same methods under the one-key-per-field layout (with the supply
+# counters as two more keys). Hand-counted: that contract is no longer in the
+# tree, so it cannot be simulated and the report labels these as estimates
+LEGACY_OPCODES = {"get_metadata_cid": 12, "update_metadata_cid": 18, "get_contract_info": 48}
+
+
+def _linear(pair: Tuple[int, int], items: int) -> int:
+    fixed, per_item = pair
+    return fixed + per_item * items
+
+
+def method_profile(method: str, measured: Dict[str, int] = None) -> Dict[str, Any]:
+    """
+    Build the report entry for one method
+
+    Args:
+        method: ABI method name
+        measured: Values observed on the node; missing keys fall back to the model
+    """
+    model = COST_MODEL[method]
+    items = model.get("items", 1)
+    measured = measured or {}
+
+    def value(key: str) -> int:
+        if key in measured:
+            return measured[key]
+        return _linear(model.get(key, (0, 0)), items)
+
+    opcode_cost = value("opcodes") if "opcodes" in measured else ROUTING_OPCODE_COST + value("opcodes")
+    references = {"boxes": value("boxes"), "accounts": value("accounts"), "assets": value("assets")}
+    inner_txns = value("inner_txns")
+
+    return {
+        "signature": METHOD_SIGNATURES[method],
+        "items": items,
+        "opcode_cost": opcode_cost,
+        "opcode_budget": APP_CALL_OPCODE_BUDGET,
+        "budget_used_pct": round(100 * opcode_cost / APP_CALL_OPCODE_BUDGET, 1),
+        "references": references,
+        "within_reference_limits": (
+            references["boxes"] <= MAX_BOX_REFERENCES_PER_TXN
+            and references["accounts"] <= MAX_ACCOUNT_REFERENCES_PER_TXN
+            and sum(references.values()) <= MAX_TOTAL_REFERENCES_PER_TXN
+        ),
+        "min_balance_delta": value("min_balance"),
+        "min_balance_source": "measured" if "min_balance" in measured else "model",
+        "inner_txns": inner_txns,
+        "fee_microalgos": (1 + inner_txns) * MIN_TXN_FEE,
+    }
+
+
+def _legacy_state_entries(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    entries = []
+    for key, value in state.items():
+        if key == "admin":
+            value = bytes(32)
+        encoded = {"type": 2, "uint": value} if isinstance(value, int) else {
+            "type": 1, "bytes": base64.b64encode(value if isinstance(value, bytes) else value.encode()).decode()
+        }
+        entries.append({"key": base64.b64encode(key.encode()).decode(), "value": encoded})
+    return entries
+
+
+def _decode_microseconds(entries: List[Dict[str, Any]], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        decode_contract_state(entries)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def state_layout_profile(measured: Dict[str, Dict[str, int]] = None, iterations: int = 2_000) -> Dict[str, Any]:
+    """Packed vs one-key-per-field global state: min-balance, read opcodes, decode time"""
+    measured = measured or {}
+    state = {
+        "admin": random_address(),
+        "farm_token_id": 987654321,
+        "total_supply": 1_000_000_00,
+        "multisig_threshold": 2,
+        "minted": 250_000_00,
+        "burned": 1_000_00,
+        "token_name": "FarmToken",
+        "token_unit": "FT",
+        "ipfs_cid": "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG",
+    }
+    packed_us = _decode_microseconds(encode_global_state(state), iterations)
+    legacy_us = _decode_microseconds(_legacy_state_entries(state), iterations)
+    min_balance = schema_min_balance(*GLOBAL_SCHEMA)
+    legacy_min_balance = schema_min_balance(*LEGACY_GLOBAL_SCHEMA)
+
+    opcodes = {}
+    for method, legacy in LEGACY_OPCODES.items():
+        now = method_profile(method, measured.get(method))["opcode_cost"]
+        opcodes[method] = {
+            "opcode_cost": now,
+            "opcode_cost_source": "measured" if "opcodes" in measured.get(method, {}) else "model",
+            "legacy_opcode_cost": ROUTING_OPCODE_COST + legacy,
+            "legacy_opcode_cost_source": "estimate",
+        }
+    return {
+        "global_schema": {"uints": GLOBAL_SCHEMA[0], "byte_slices": GLOBAL_SCHEMA[1]},
+        "creator_min_balance": min_balance,
+        "legacy_creator_min_balance": legacy_min_balance,
+        "min_balance_saved": legacy_min_balance - min_balance,
+        "read_methods": opcodes,
+        "decode_us": round(packed_us, 2),
+        "legacy_decode_us": round(legacy_us, 2),
+    }
+
+
+def build_report(source: str, measured: Dict[str, Dict[str, int]] = None) -> Dict[str, Any]:
+    """Profile every ABI method into one machine-readable report"""
+    measured = measured or {}
+    contract_source = CONTRACT_PATH.read_bytes() if CONTRACT_PATH.exists() else b""
+    return {
+        "contract": str(CONTRACT_PATH),
+        "contract_sha256": hashlib.sha256(contract_source).hexdigest(),
+        "source": source,
+        "opcode_costs_source": OPCODE_COSTS["source"],
+        "methods": {method: method_profile(method, measured.get(method)) for method in COST_MODEL},
+        "state_layout": state_layout_profile(measured),
+    }
+
+
+def cost_growth(current: Dict[str, Any], previous: Dict[str, Any], max_growth: float) -> List[str]:
+    """Describe methods whose opcode cost or fee grew by more than `max_growth`"""
+    problems = []
+    for method, now in current["methods"].items():
+        before = previous["methods"].get(method)
+        if not before:
+            continue
+        for key in ("opcode_cost", "fee_microalgos"):
+            if now[key] > before[key] * (1 + max_growth):
+                problems.append(f"{method}: {key} {before[key]} -> {now[key]}")
+        if not now["within_reference_limits"]:
+            problems.append(f"{method}: exceeds per-transaction reference limits")
+    return problems
+
+
+def compile_contract(out_dir: Path) -> Dict[str, Path]:
+    """Compile the contract to TEAL with the AlgoKit CLI"""
+    subprocess.run(
+        ["algokit", "compile", "py", str(CONTRACT_PATH), "--out-dir", str(out_dir)],
+        check=True,
+    )
+    return {
+        "approval": out_dir / "FarmFoodTokenizer.approval.teal",
+        "clear": out_dir / "FarmFoodTokenizer.clear.teal",
+    }
+
+
+class NodeChain:
+    """
+    A fresh app instance on a local node that profile calls run against
+
+    Built on an algosdk AlgodClient (the AtomicTransactionComposer needs the
+    SDK client, not node_client's). Calls are (method, args, boxes) tuples;
+    their fee covers the inner transactions COST_MODEL expects.
+    """
+
+    def __init__(self, algod_client, sender: str, signer):
+        self.algod_client = algod_client
+        self.sender = sender
+        self.signer = signer
+        self.app_id = 0
+
+    @property
+    def app_address(self) -> str:
+        return application_address(self.app_id)
+
+    def _atc(self, calls: Sequence[Tuple[str, list, Sequence[bytes]]]):
+        from algosdk.atomic_transaction_composer import AtomicTransactionComposer
+
+        atc = AtomicTransactionComposer()
+        for method, args, boxes in calls:
+            sp = self.algod_client.suggested_params()
+            sp.flat_fee = True
+            sp.fee = (1 + inner_txns_of(method)) * MIN_TXN_FEE
+            atc.add_method_call(
+                app_id=self.app_id,
+                method=abi_method(method),
+                sender=self.sender,
+                sp=sp,
+                signer=self.signer,
+                method_args=args,
+                boxes=[(0, name) for name in boxes],
+            )
+        return atc
+
+    def _execute_txns(self, *txns):
+        from algosdk.atomic_transaction_composer import AtomicTransactionComposer, TransactionWithSigner
+
+        atc = AtomicTransactionComposer()
+        for txn in txns:
+            atc.add_transaction(TransactionWithSigner(txn, self.signer))
+        return atc.execute(self.algod_client, 4)
+
+    def create_app(self, teal: Dict[str, Path]) -> int:
+        """Create and fund a new app instance from compiled TEAL"""
+        from algosdk import transaction
+
+        def program(path: Path) -> bytes:
+            return base64.b64decode(self.algod_client.compile(path.read_text())["result"])
+
+        sp = self.algod_client.suggested_params()
+        create = transaction.ApplicationCreateTxn(
+            self.sender, sp, transaction.OnComplete.NoOpOC,
+            program(teal["approval"]), program(teal["clear"]),
+            transaction.StateSchema(num_uints=GLOBAL_SCHEMA[0], num_byte_slices=GLOBAL_SCHEMA[1]),
+            transaction.StateSchema(num_uints=0, num_byte_slices=0),
+        )
+        result = self._execute_txns(create)
+        self.app_id = self.algod_client.pending_transaction_info(result.tx_ids[0])["application-index"]
+        self._execute_txns(transaction.PaymentTxn(self.sender, sp, self.app_address, 10_000_000))
+        return self.app_id
+
+    def opt_in(self, asset_id: int):
+        from algosdk import transaction
+
+        self._execute_txns(transaction.AssetOptInTxn(self.sender, self.algod_client.suggested_params(), asset_id))
+
+    def simulate(self, calls: Sequence[Tuple[str, list, Sequence[bytes]]]) -> Dict[str, Any]:
+        """Simulate calls as one group; returns the simulate txn-group result"""
+        from algosdk.v2client.models import SimulateRequest
+
+        request = SimulateRequest(txn_groups=[], allow_unnamed_resources=True)
+        response = self._atc(calls).simulate(self.algod_client, request)
+        return response.simulate_response["txn-groups"][0]
+
+    def execute(self, method: str, args: list, boxes: Sequence[bytes] = ()) -> Any:
+        """Really run one call; returns its ABI result"""
+        return self._atc([(method, args, boxes)]).execute(self.algod_client, 4).abi_results[0].return_value
+
+    def min_balance(self, address: str) -> int:
+        return self.algod_client.account_info(address)["min-balance"]
+
+
+def inner_txns_of(method: str) -> int:
+    """Inner transactions a call of `method` at its profiled batch size sends"""
+    return _linear(COST_MODEL[method].get("inner_txns", (0, 0)), COST_MODEL[method].get("items", 1))
+
+
+def group_measurement(group: Dict[str, Any], method: str) -> Dict[str, int]:
+    """Opcode cost, references and inner transactions of the last call in a simulated group"""
+    if group.get("failure-message"):
+        raise RuntimeError(f"{method} failed in simulate: {group['failure-message']}")
+    txn_result = group["txn-results"][-1]
+    unnamed = {}
+    for resources in (group.get("unnamed-resources-accessed", {}),
+                      txn_result.get("unnamed-resources-accessed", {})):
+        for key, values in resources.items():
+            unnamed.setdefault(key, []).extend(values)
+    return {
+        "opcodes": txn_result["app-budget-consumed"],
+        "boxes": len(unnamed.get("boxes", [])),
+        "accounts": len(unnamed.get("accounts", [])),
+        "assets": len(unnamed.get("assets", [])),
+        "inner_txns": len(txn_result["txn-result"].get("inner-txns", [])),
+    }
+
+
+def simulate_measurements(chain, teal: Dict[str, Path]) -> Dict[str, Dict[str, int]]:
+    """
+    Deploy a fresh app instance through `chain` (a NodeChain) and measure each method
+
+    Simulated state is discarded, so removes and reads are simulated behind
+    the add creating their entry; min-balance changes come from really
+    executing the call and reading the app account before and after.
+    """
+    sender = chain.sender
+
+    def simulate(method, args, setup=()):
+        calls = [(setup_method, setup_args, ()) for setup_method, setup_args in setup]
+        return group_measurement(chain.simulate(calls + [(method, args, ())]), method)
+
+    def execute_call(method, args, addresses=()):
+        """Really run one call; returns (ABI result, app account min-balance change)"""
+        before = chain.min_balance(chain.app_address)
+        result = chain.execute(method, args, [blacklist_box_name(a) for a in addresses])
+        return result, chain.min_balance(chain.app_address) - before
+
+    chain.create_app(teal)
+    create_args = ["FarmToken", "FT", 1_000_000_00, 2, "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"]
+    measured = {"create_asa": simulate("create_asa", create_args)}
+    asset_id, measured["create_asa"]["min_balance"] = execute_call("create_asa", create_args)
+    chain.opt_in(asset_id)
+    chain.execute("mint_tokens", [sender, 1_000], [blacklist_box_name(sender)])
+
+    recipients = [sender] * COST_MODEL["mint_tokens_batch"]["items"]
+    flagged = [random_address() for _ in range(COST_MODEL["add_to_blacklist_batch"]["items"])]
+    cases = {
+        "mint_tokens": [sender, 1],
+        "mint_tokens_batch": [recipients, [1] * len(recipients)],
+        "burn_tokens": [1],
+        "add_to_blacklist": [flagged[0]],
+        "remove_from_blacklist": [flagged[0]],
+        "add_to_blacklist_batch": [flagged],
+        "remove_from_blacklist_batch": [flagged],
+        "is_blacklisted": [flagged[0]],
+        "get_metadata_cid": [],
+        "update_metadata_cid": ["QmProfileCID"],
+        "get_contract_info": [],
+    }
+    # Removes and reads need the entries to exist within the same simulated group
+    setups = {
+        "remove_from_blacklist": [("add_to_blacklist", [flagged[0]])],
+        "remove_from_blacklist_batch": [("add_to_blacklist_batch", [flagged])],
+        "is_blacklisted": [("add_to_blacklist", [flagged[0]])],
+    }
+    for method, args in cases.items():
+        measured[method] = simulate(method, args, setups.get(method, ()))
+
+    # Box min-balance only shows up in real state, so run the blacklist
+    # methods for real (adds before their removes) and read the app account
+    for method in ("add_to_blacklist", "remove_from_blacklist"):
+        measured[method]["min_balance"] = execute_call(method, [flagged[0]], [flagged[0]])[1]
+    for method in ("add_to_blacklist_batch", "remove_from_blacklist_batch"):
+        measured[method]["min_balance"] = execute_call(method, [flagged], flagged)[1]
+
+    # Batch recipients must be opted in, so the case reuses the sender (who
+    # needs no reference); report the account references from the model
+    del measured["mint_tokens_batch"]["accounts"]
+    return measured
+
+
+def opcode_cost_growth(by_list_size: Dict[int, Dict[str, Any]]) -> List[str]:
+    """Describe measured opcode costs that change as the blacklist grows"""
+    sizes = sorted(by_list_size)
+    first = by_list_size[sizes[0]]
+    problems = []
+    for size in sizes[1:]:
+        for method, cost in by_list_size[size].items():
+            if cost != first[method]:
+                problems.append(f"{method}: opcode cost {first[method]} at {sizes[0]} entries -> {cost} at {size}")
+    return problems
+
+
+def measure_opcode_costs(chain, list_sizes: Sequence[int] = OPCODE_LIST_SIZES) -> Dict[str, Any]:
+    """
+    Measure the blacklist and mint_tokens_batch opcode costs at growing blacklist sizes
+
+    Runs on the app simulate_measurements leaves behind (ASA created, sender
+    opted in). The blacklist is grown by really executing batch adds; at each
+    size the single methods are simulated once and the batch methods at one
+    item and at their profiled batch size, giving (fixed, per item) by
+    difference. Returns the costs seen at each size and, in the layout of
+    opcode_costs.json, those at the largest size with ROUTING_OPCODE_COST
+    taken off.
+    """
+    sender = chain.sender
+
+    def cost(method, args, setup=()):
+        calls = [(setup_method, setup_args, ()) for setup_method, setup_args in setup]
+        return group_measurement(chain.simulate(calls + [(method, args, ())]), method)["opcodes"]
+
+    def batch_costs(method, setup_method=None):
+        costs = []
+        for count in (1, COST_MODEL[method]["items"]):
+            addresses = [random_address() for _ in range(count)]
+            costs.append(cost(method, [addresses], [(setup_method, [addresses])] if setup_method else ()))
+        return costs
+
+    def fit(method, costs):
+        single, largest = costs
+        per_item = (largest - single) // (COST_MODEL[method]["items"] - 1)
+        return [single - per_item - ROUTING_OPCODE_COST, per_item]
+
+    chunk = max_addresses_per_call("add_to_blacklist_batch")
+    listed = 0
+    by_list_size = {}
+    for size in sorted(list_sizes):
+        while listed < size:
+            addresses = [random_address() for _ in range(min(chunk, size - listed))]
+            chain.execute("add_to_blacklist_batch", [addresses], [blacklist_box_name(a) for a in addresses])
+            listed += len(addresses)
+        flagged = random_address()
+        batch = COST_MODEL["mint_tokens_batch"]["items"]
+        by_list_size[size] = {
+            "add_to_blacklist": cost("add_to_blacklist", [flagged]),
+            "remove_from_blacklist": cost("remove_from_blacklist", [flagged], [("add_to_blacklist", [flagged])]),
+            "is_blacklisted": cost("is_blacklisted", [flagged], [("add_to_blacklist", [flagged])]),
+            "add_to_blacklist_batch": batch_costs("add_to_blacklist_batch"),
+            "remove_from_blacklist_batch": batch_costs("remove_from_blacklist_batch", "add_to_blacklist_batch"),
+            "mint_tokens_batch": [cost("mint_tokens_batch", [[sender] * n, [1] * n]) for n in (1, batch)],
+        }
+
+    largest = by_list_size[max(by_list_size)]
+    return {
+        "blacklist": {method: largest[method] - ROUTING_OPCODE_COST for method in BLACKLIST_OPCODE_COST},
+        "blacklist_batch": {method: fit(method, largest[method]) for method in BLACKLIST_BATCH_OPCODE_COST},
+        "mint_tokens_batch": fit("mint_tokens_batch", largest["mint_tokens_batch"]),
+        "by_list_size": by_list_size,
+    }
+
+
+def localnet_chain(config: Dict[str, Any], network: str) -> NodeChain:
+    """NodeChain on an algosdk client, signing as the node's default KMD account"""
+    from algokit_utils import get_localnet_default_account
+    from algosdk.v2client.algod import AlgodClient
+
+    network_config = config[network]
+    algod_client = AlgodClient(network_config["algod_token"], network_config["algod_address"])
+    # Looks the account up through KMD, which needs the SDK client
+    account = get_localnet_default_account(algod_client)
+    return NodeChain(algod_client, account.address, account.signer)
+
+
+def write_opcode_costs(chain, contract_sha256: str):
+    """Measure opcode costs over growing blacklist sizes and save them if they hold steady"""
+    measured = measure_opcode_costs(chain)
+    problems = opcode_cost_growth(measured["by_list_size"])
+    if problems:
+        print("❌ Opcode costs change with blacklist size:")
+        for line in problems:
+            print(f"   {line}")
+        sys.exit(1)
+    costs = {"source": "simulate", "contract_sha256": contract_sha256, **measured}
+    OPCODE_COSTS_PATH.write_text(json.dumps(costs, indent=2) + "\n")
+    print(f"✅ Opcode costs saved to {OPCODE_COSTS_PATH} (blacklist sizes {', '.join(map(str, OPCODE_LIST_SIZES))})")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Profile FarmFoodTokenizer per-method costs")
+    parser.add_argument("--network", choices=["localnet"], default="localnet")
+    parser.add_argument("--estimate", action="store_true", help="Use the static cost model, no node needed")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Previous report to check cost growth against")
+    parser.add_argument("--max-growth", type=float, default=0.1, help="Allowed relative growth, e.g. 0.1")
+    parser.add_argument("--write-opcode-costs", action="store_true",
+                        help=f"Measure blacklist and batch mint opcode costs into {OPCODE_COSTS_PATH.name}")
+    args = parser.parse_args()
+
+    if args.estimate and args.write_opcode_costs:
+        parser.error("--write-opcode-costs needs a node; drop --estimate")
+    if args.estimate:
+        report = build_report("estimate")
+    else:
+        config = json.loads(Path("scripts/deploy_config.json").read_text())
+        chain = localnet_chain(config, args.network)
+        teal = compile_contract(Path("build"))
+        report = build_report("simulate", simulate_measurements(chain, teal))
+        if args.write_opcode_costs:
+            write_opcode_costs(chain, report["contract_sha256"])
+
+    previous = json.loads(args.compare.read_text()) if args.compare else None
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(output)
+        print(f"✅ Cost profile saved to {args.output}")
+    else:
+        print(output)
+
+    if previous:
+        problems = cost_growth(report, previous, args.max_growth)
+        if problems:
+            print("❌ Cost growth beyond limit:")
+            for line in problems:
+                print(f"   {line}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Algorand protocol limits
+========================
+
+Consensus parameters the off-chain tooling sizes its batches against.
+"""
+
+# Transactions and fees
+MIN_TXN_FEE = 1_000
+MAX_GROUP_SIZE = 16
+
+# Application call limits
+APP_CALL_OPCODE_BUDGET = 700
+MAX_APP_ARGS_BYTES = 2048
+MAX_ACCOUNT_REFERENCES_PER_TXN = 4
+MAX_BOX_REFERENCES_PER_TXN = 8
+MAX_TOTAL_REFERENCES_PER_TXN = 8
+MAX_INNER_TXNS_PER_CALL = 16
+MAX_GLOBAL_STATE_KEYS = 64
+
+# Min-balance requirements (microAlgos)
+BOX_FLAT_MIN_BALANCE = 2_500
+BOX_BYTE_MIN_BALANCE = 400
+
+# Per global-state schema entry, paid by the app creator
+APP_GLOBAL_UINT_MIN_BALANCE = 28_500
+APP_GLOBAL_BYTES_MIN_BALANCE = 50_000
+MAX_STATE_KEY_VALUE_BYTES = 128
@@ -0,0 +1,267 @@
+"""
+Read-only contract calls
+========================
+
+Answers FarmFoodTokenizer's read-only ABI methods (`is_blacklisted`,
+`get_metadata_cid`, `get_contract_info`) without submitting a transaction,
+so dashboards and compliance checks pay no fee and never wait for a block:
+
+- "state" (default): decode global state and blacklist boxes straight from
+  algod. A batch of reads costs one global-state fetch plus one box lookup
+  per distinct address.
+- "simulate": run the methods themselves through algod's simulate endpoint
+  with empty signatures. algod simulates one group per request, so reads
+  are packed 16 calls per group and up to SIMULATE_CONCURRENCY requests
+  are in flight at once.
+
+Usage:
+    python scripts/readonly_client.py get_contract_info --network localnet
+    python scripts/readonly_client.py is_blacklisted ADDR1 ADDR2 --simulate
+    python scripts/readonly_client.py is_blacklisted --addresses-file flagged.txt
+"""
+
+import argparse
+import base64
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from addresses import encode_address
+from contract_abi import READONLY_METHODS, abi_method, return_type
+from contract_state import ContractStateReader, contract_info, metadata_cid
+from node_client import clients_for_network
+from protocol import MAX_GROUP_SIZE, MIN_TXN_FEE
+from round_cache import CachedAlgodClient
+
+# Prefix of the log line carrying an ARC-4 method's return value
+ABI_RETURN_PREFIX = bytes.fromhex("151f7c75")
+
+# Simulate requests (one group each) in flight at once
+SIMULATE_CONCURRENCY = 4
+
+ReadCall = Tuple[str, Tuple[Any, ...]]
+
+
+def _split_tuple_types(type_str: str) -> List[str]:
+    """Top-level component types of '(a,b,(c,d))'"""
+    types, depth, current = [], 0, ""
+    for char in type_str[1:-1]:
+        if char == "," and depth == 0:
+            types.append(current)
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    if current:
+        types.append(current)
+    return types
+
+
+def decode_abi_value(type_str: str, data: bytes) -> Any:
+    """Decode an ARC-4 encoded value of the types the contract returns"""
+    if type_str == "bool":
+        return data[0] & 0x80 != 0
+    if type_str == "uint64":
+        return int.from_bytes(data[:8], "big")
+    if type_str == "address":
+        return encode_address(data[:32])
+    if type_str == "string":
+        length = int.from_bytes(data[:2], "big")
+        return data[2:2 + length].decode("utf-8")
+    if type_str.startswith("("):
+        values, offset = [], 0
+        for component in _split_tuple_types(type_str):
+            if component == "string" or component.endswith("[]"):
+                tail = int.from_bytes(data[offset:offset + 2], "big")
+                values.append(decode_abi_value(component, data[tail:]))
+                offset += 2
+            else:
+                values.append(decode_abi_value(component, data[offset:]))
+                offset += {"bool": 1, "uint64": 8, "address": 32}[component]
+        return tuple(values)
+    raise ValueError(f"Unsupported ABI type: {type_str}")
+
+
+def decode_abi_return(method: str, logs: Sequence[bytes]) -> Any:
+    """Return value of `method` from the logs of its app call"""
+    if not logs or not logs[-1].startswith(ABI_RETURN_PREFIX):
+        raise ValueError(f"{method} did not log an ABI return value")
+    return decode_abi_value(return_type(method), logs[-1][len(ABI_RETURN_PREFIX):])
+
+
+def parse_simulate_response(response: Dict[str, Any], calls: List[ReadCall]) -> List[Any]:
+    """Decode return values for `calls`, in order, from a simulate response"""
+    results = []
+    for group in response["txn-groups"]:
+        if group.get("failure-message"):
+            raise RuntimeError(f"Read-only call failed in simulate: {group['failure-message']}")
+        for txn_result in group["txn-results"]:
+            logs = [base64.b64decode(log) for log in txn_result["txn-result"].get("logs", [])]
+            method = calls[len(results)][0]
+            results.append(decode_abi_return(method, logs))
+    if len(results) != len(calls):
+        raise RuntimeError(f"Simulate returned {len(results)} results for {len(calls)} calls")
+    return results
+
+
+def build_call_group(sp, sender: str, app_id: int, calls: List[ReadCall], first_index: int) -> List[Any]:
+    """One unsigned group of up to 16 read-only app calls"""
+    from algosdk import transaction
+
+    sp.flat_fee = True
+    sp.fee = MIN_TXN_FEE
+    txns = []
+    for index, (name, args) in enumerate(calls, first_index):
+        method = abi_method(name)
+        app_args = [method.get_selector()]
+        app_args += [arg.type.encode(value) for arg, value in zip(method.args, args)]
+        txns.append(transaction.ApplicationCallTxn(
+            sender,
+            sp,
+            app_id,
+            transaction.OnComplete.NoOpOC,
+            app_args=app_args,
+            # Keeps identical calls from sharing a transaction id
+            note=index.to_bytes(4, "big"),
+        ))
+    if len(txns) > 1:
+        txns = transaction.assign_group_id(txns)
+    return [transaction.SignedTransaction(txn, None) for txn in txns]
+
+
+def simulate_request(group: List[Any]):
+    """SimulateRequest for a single group with empty signatures"""
+    from algosdk.v2client.models import SimulateRequest, SimulateRequestTransactionGroup
+
+    return SimulateRequest(
+        txn_groups=[SimulateRequestTransactionGroup(txns=group)],
+        allow_empty_signatures=True,
+        allow_unnamed_resources=True,
+    )
+
+
+class ReadOnlyClient:
+    """
+    Answers read-only ABI methods from state or simulate, never submitting
+    """
+
+    def __init__(self, algod_client, app_id: int, sender: Optional[str] = None, mode: str = "state"):
+        if mode not in ("state", "simulate"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.algod_client = algod_client
+        self.app_id = app_id
+        self.mode = mode
+        self.reader = ContractStateReader(algod_client, app_id)
+        self._sender = sender
+
+    @property
+    def sender(self) -> str:
+        # Simulate still checks fee balances, so default to the funded admin
+        if self._sender is None:
+            self._sender = self.reader.get_admin()
+        return self._sender
+
+    def call(self, method: str, *args) -> Any:
+        """Answer one read-only call"""
+        return self.call_many([(method, tuple(args))])[0]
+
+    def call_many(self, calls: Iterable[ReadCall]) -> List[Any]:
+        """
+        Answer many read-only calls with as few node requests as possible
+
+        Args:
+            calls: (method name, args) pairs
+
+        Returns:
+            Return values in the order of `calls`
+        """
+        calls = [(method, tuple(args)) for method, args in calls]
+        for method, _ in calls:
+            if method not in READONLY_METHODS:
+                raise ValueError(f"{method} is not a read-only method")
+
+        # Repeated reads are answered once
+        unique = list(dict.fromkeys(calls))
+        if self.mode == "simulate":
+            answers = self._simulate(unique)
+        else:
+            answers = self._from_state(unique)
+        by_call = dict(zip(unique, answers))
+        return [by_call[call] for call in calls]
+
+    def is_blacklisted_many(self, addresses: Iterable[str]) -> Dict[str, bool]:
+        """Blacklist status for each address"""
+        addresses = list(dict.fromkeys(addresses))
+        results = self.call_many(("is_blacklisted", (address,)) for address in addresses)
+        return dict(zip(addresses, results))
+
+    def _from_state(self, calls: List[ReadCall]) -> List[Any]:
+        state = None
+        results = []
+        for method, args in calls:
+            if method == "is_blacklisted":
+                results.append(self.reader.is_blacklisted(*args))
+                continue
+            if state is None:
+                state = self.reader.global_state()
+            results.append(metadata_cid(state) if method == "get_metadata_cid" else contract_info(state))
+        return results
+
+    def _simulate(self, calls: List[ReadCall]) -> List[Any]:
+        sender = self.sender
+        sp = self.algod_client.suggested_params()
+
+        def simulate_chunk(start: int) -> List[Any]:
+            chunk = calls[start:start + MAX_GROUP_SIZE]
+            group = build_call_group(sp, sender, self.app_id, chunk, start)
+            response = self.algod_client.simulate_transactions(simulate_request(group))
+            return parse_simulate_response(response, chunk)
+
+        starts = range(0, len(calls), MAX_GROUP_SIZE)
+        if len(starts) == 1:
+            return simulate_chunk(0)
+        with ThreadPoolExecutor(max_workers=min(SIMULATE_CONCURRENCY, len(starts))) as pool:
+            return [result for chunk in pool.map(simulate_chunk, starts) for result in chunk]
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Read-only FarmFoodTokenizer queries")
+    parser.add_argument("method", choices=sorted(READONLY_METHODS), help="Read-only method to call")
+    parser.add_argument("addresses", nargs="*", help="Addresses for is_blacklisted")
+    parser.add_argument("--addresses-file", type=Path, help="File with one address per line")
+    parser.add_argument("--network", choices=["localnet", "testnet"], default="localnet")
+    parser.add_argument("--simulate", action="store_true", help="Run the methods through simulate")
+    args = parser.parse_args()
+
+    config = json.loads(Path("scripts/deploy_config.json").read_text())
+    deployment = json.loads(Path(f"deployments/{args.network}_deployment.json").read_text())
+    algod = CachedAlgodClient(clients_for_network(config, args.network)[0])
+    client = ReadOnlyClient(
+        algod,
+        deployment["contract"]["app_id"],
+        mode="simulate" if args.simulate else "state",
+    )
+
+    started = time.perf_counter()
+    if args.method == "is_blacklisted":
+        addresses = list(args.addresses)
+        if args.addresses_file:
+            addresses += [a.strip() for a in args.addresses_file.read_text().splitlines() if a.strip()]
+        results = client.is_blacklisted_many(addresses)
+        elapsed = time.perf_counter() - started
+        for address, flagged in results.items():
+            print(f"{'❌' if flagged else '✅'} {address}")
+        print(f"📋 {sum(results.values())}/{len(results)} blacklisted")
+    else:
+        result = client.call(args.method)
+        elapsed = time.perf_counter() - started
+        print(f"📋 {args.method}: {result}")
+    print(f"⏱️ {elapsed * 1000:.1f}ms via {client.mode}, 0 µAlgo fees")
+
+
+if __name__ == "__main__":
+    main()
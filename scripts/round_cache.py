@@ -0,0 +1,180 @@
+"""
+Round-aware read cache
+======================
+
+Caches suggested params and app state reads (global state, boxes) keyed by
+the last round seen. Within a round every repeat read is served locally;
+when a new block is observed, or when we submit our own transactions, the
+affected entries are dropped.
+
+A new round is observed whenever a status/status-after-block response
+passes through the client (e.g. from the async deployer's RoundWatcher).
+If no round has been seen for `max_round_age` seconds, the next read
+refreshes it with one status call, so data is never more than about one
+block stale.
+
+Usage:
+    algod = CachedAlgodClient(algod_client)
+    reader = ContractStateReader(algod, app_id)
+    ...
+    print(algod.cache.stats())
+"""
+
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from node_client import NodeHTTPError
+
+# Average Algorand block time
+BLOCK_TIME_SECONDS = 2.8
+
+
+class RoundCache:
+    """
+    Entries valid for the round they were loaded in
+    """
+
+    def __init__(self, max_round_age: float = BLOCK_TIME_SECONDS):
+        self.max_round_age = max_round_age
+        self.round: Optional[int] = None
+        self.round_seen_at = 0.0
+        self._entries: Dict[Hashable, Any] = {}
+        self._generation = 0
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def round_is_stale(self) -> bool:
+        return self.round is None or time.monotonic() - self.round_seen_at > self.max_round_age
+
+    def observe_round(self, round_number: int):
+        """Record the latest round; entries from older rounds are dropped"""
+        with self._lock:
+            self.round_seen_at = time.monotonic()
+            if self.round is None or round_number > self.round:
+                self.round = round_number
+                self._entries.clear()
+                self._generation += 1
+
+    def get(self, kind: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for (kind, key), loading it on a miss"""
+        cache_key = (kind, key)
+        with self._lock:
+            counters = self._counters.setdefault(kind, {"hits": 0, "misses": 0})
+            if cache_key in self._entries:
+                counters["hits"] += 1
+                return self._entries[cache_key]
+            counters["misses"] += 1
+            generation = self._generation
+
+        value = loader()
+        with self._lock:
+            # Drop values that a new round or an invalidation overtook
+            if self._generation == generation:
+                self._entries[cache_key] = value
+        return value
+
+    def invalidate(self, kind: Optional[str] = None):
+        """Drop every entry, or only those of one kind"""
+        with self._lock:
+            self._generation += 1
+            if kind is None:
+                self._entries.clear()
+            else:
+                for cache_key in [k for k in self._entries if k[0] == kind]:
+                    del self._entries[cache_key]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Hit and miss counts and hit rate per kind of read"""
+        with self._lock:
+            report = {}
+            for kind, counters in self._counters.items():
+                total = counters["hits"] + counters["misses"]
+                report[kind] = {**counters, "hit_rate": counters["hits"] / total if total else 0.0}
+            return report
+
+
+class _Missing:
+    """Cached 404 for a box that does not exist"""
+
+    def __init__(self, error: NodeHTTPError):
+        self.error = error
+
+
+class CachedAlgodClient:
+    """
+    Wraps an algod client with a RoundCache; other calls pass through
+    """
+
+    def __init__(self, algod_client, cache: Optional[RoundCache] = None):
+        self.algod_client = algod_client
+        self.cache = cache or RoundCache()
+
+    def __getattr__(self, name: str):
+        return getattr(self.algod_client, name)
+
+    def _ensure_round(self):
+        if self.cache.round_is_stale():
+            self.status()
+
+    # Round sources
+
+    def status(self) -> Dict[str, Any]:
+        status = self.algod_client.status()
+        self.cache.observe_round(status["last-round"])
+        return status
+
+    def status_after_block(self, round_number: int) -> Dict[str, Any]:
+        status = self.algod_client.status_after_block(round_number)
+        self.cache.observe_round(status["last-round"])
+        return status
+
+    # Cached reads
+
+    def suggested_params(self):
+        # Callers adjust fees on the returned object, so hand out copies
+        self._ensure_round()
+        return copy.copy(self.cache.get("params", "suggested", self.algod_client.suggested_params))
+
+    def transaction_params(self) -> Dict[str, Any]:
+        self._ensure_round()
+        return self.cache.get("params", "raw", self.algod_client.transaction_params)
+
+    def application_info(self, app_id: int) -> Dict[str, Any]:
+        self._ensure_round()
+        return self.cache.get("application", app_id, lambda: self.algod_client.application_info(app_id))
+
+    def application_box_by_name(self, app_id: int, name: bytes) -> Dict[str, Any]:
+        self._ensure_round()
+
+        def load():
+            try:
+                return self.algod_client.application_box_by_name(app_id, name)
+            except NodeHTTPError as e:
+                if e.status == 404:
+                    return _Missing(e)
+                raise
+
+        value = self.cache.get("box", (app_id, name), load)
+        if isinstance(value, _Missing):
+            raise value.error
+        return value
+
+    # Writes invalidate app state we may have changed
+
+    def _submitted(self):
+        self.cache.invalidate("application")
+        self.cache.invalidate("box")
+
+    def send_raw_transaction(self, blob: bytes) -> str:
+        try:
+            return self.algod_client.send_raw_transaction(blob)
+        finally:
+            self._submitted()
+
+    def send_transactions(self, signed_txns) -> str:
+        try:
+            return self.algod_client.send_transactions(signed_txns)
+        finally:
+            self._submitted()
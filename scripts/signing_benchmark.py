@@ -0,0 +1,105 @@
+"""
+Signing throughput benchmark
+============================
+
+Measures how ParallelSigner scales with worker count. It builds a batch of
+FarmToken asset transfers offline, with fixed suggested params and a
+generated key, so no node is needed. The batch is then signed with 1, 2,
+4, ... workers up to the core count.
+
+Usage:
+    python scripts/signing_benchmark.py --transactions 20000
+    python scripts/signing_benchmark.py --workers 1,2,4,8 --group-size 16 --output signing.json
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from parallel_signer import DEFAULT_CHUNK_SIZE, ParallelSigner
+from protocol import MAX_GROUP_SIZE, MIN_TXN_FEE
+
+
+def default_worker_counts() -> List[int]:
+    """1, 2, 4, ... up to and including the core count"""
+    cores = os.cpu_count() or 1
+    counts = []
+    workers = 1
+    while workers < cores:
+        counts.append(workers)
+        workers *= 2
+    return counts + [cores]
+
+
+def build_transfers(count: int, group_size: int):
+    """Offline asset-transfer groups from one generated sender"""
+    from algosdk import account, transaction
+
+    private_key, sender = account.generate_account()
+    receivers = [account.generate_account()[1] for _ in range(64)]
+    sp = transaction.SuggestedParams(
+        fee=MIN_TXN_FEE, first=1, last=1001, gh="SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=", flat_fee=True
+    )
+    txns = [
+        transaction.AssetTransferTxn(sender, sp, receivers[i % len(receivers)], 1, 1002, note=i.to_bytes(4, "big"))
+        for i in range(count)
+    ]
+    groups = [txns[i:i + group_size] for i in range(0, count, group_size)]
+    return private_key, groups
+
+
+def run_signing_benchmark(transactions: int,
+                          worker_counts: Sequence[int],
+                          group_size: int = MAX_GROUP_SIZE,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """Sign the same batch at each worker count and report txns/sec and speedup"""
+    private_key, groups = build_transfers(transactions, group_size)
+    results = {}
+    for workers in worker_counts:
+        with ParallelSigner([private_key], workers=workers, chunk_size=chunk_size) as signer:
+            # Start the pool (and load keys) outside the timed region
+            list(signer.sign_groups(groups[:workers]))
+            started = time.perf_counter()
+            signed_bytes = sum(len(blob) for _, blob in signer.sign_groups(groups))
+            elapsed = time.perf_counter() - started
+        results[workers] = {
+            "seconds": elapsed,
+            "txns_per_second": transactions / elapsed,
+            "signed_bytes": signed_bytes,
+        }
+    serial = results[min(results)]["txns_per_second"]
+    for result in results.values():
+        result["speedup"] = result["txns_per_second"] / serial
+    return {"transactions": transactions, "group_size": group_size, "cores": os.cpu_count(), "results": results}
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark parallel transaction signing")
+    parser.add_argument("--transactions", type=int, default=20_000, help="Transactions to sign per run")
+    parser.add_argument("--workers", help="Comma-separated worker counts (default: 1, 2, 4, ... cores)")
+    parser.add_argument("--group-size", type=int, default=MAX_GROUP_SIZE, help="Transactions per atomic group")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Groups per worker task")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(",")] if args.workers else default_worker_counts()
+    report = run_signing_benchmark(args.transactions, worker_counts, args.group_size, args.chunk_size)
+
+    print(f"📋 Signed {report['transactions']} transactions in groups of {report['group_size']} "
+          f"({report['cores']} cores)")
+    print(f"   {'workers':>7} {'seconds':>9} {'txns/sec':>11} {'speedup':>8}")
+    for workers, result in report["results"].items():
+        print(f"   {workers:>7} {result['seconds']:>9.2f} {result['txns_per_second']:>11.0f} "
+              f"{result['speedup']:>7.2f}x")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
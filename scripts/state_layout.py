@@ -0,0 +1,160 @@
+"""
+Packed FarmFoodTokenizer global state
+=====================================
+
+The contract keeps its state in two global keys instead of one per field:
+
+    "c"  core, fixed width (66 bytes)
+         version             uint8
+         admin               32-byte public key
+         farm_token_id       uint64
+         total_supply        uint64
+         multisig_threshold  uint8
+         minted              uint64
+         burned              uint64
+
+    "t"  text, an ARC-4 (string,string,string) tuple
+         token_name, token_unit, ipfs_cid
+
+Both are ARC-4 structs on-chain (CoreState, TextState), so a field read is
+one global read plus an `extract`. The text tuple must fit the 128-byte
+key+value limit, which the contract checks on every write.
+
+`decode_contract_state` turns algod's `global-state` list into one dict
+with every field, plus `circulating` (minted - burned). Apps deployed
+before the packed layout (one key per field, "version 0") or before the
+supply counters (version 1) are decoded too, with the counters as None.
+
+Usage:
+    state = decode_contract_state(app_info["params"]["global-state"])
+    state["token_name"], state["farm_token_id"], state["ipfs_cid"]
+"""
+
+import base64
+import struct
+from typing import Any, Dict, List, Union
+
+from addresses import decode_address, encode_address
+from protocol import APP_GLOBAL_BYTES_MIN_BALANCE, APP_GLOBAL_UINT_MIN_BALANCE, MAX_STATE_KEY_VALUE_BYTES
+
+STATE_LAYOUT_VERSION = 2
+
+CORE_KEY = b"c"
+TEXT_KEY = b"t"
+CORE_FORMAT = struct.Struct(">B32sQQBQQ")
+# Core layouts still decoded for apps created by older contract versions
+LEGACY_CORE_FORMATS = {1: struct.Struct(">B32sQQB")}
+SUPPLY_FIELDS = ("minted", "burned", "circulating")
+TEXT_FIELDS = ("token_name", "token_unit", "ipfs_cid")
+
+# Global schema the contract declares: (uints, byte slices)
+GLOBAL_SCHEMA = (0, 2)
+LEGACY_GLOBAL_SCHEMA = (3, 4)
+
+_CORE_KEY_B64 = base64.b64encode(CORE_KEY).decode("ascii")
+_TEXT_KEY_B64 = base64.b64encode(TEXT_KEY).decode("ascii")
+
+
+def schema_min_balance(uints: int, byte_slices: int) -> int:
+    """Creator min-balance held for a global state schema, in microAlgos"""
+    return uints * APP_GLOBAL_UINT_MIN_BALANCE + byte_slices * APP_GLOBAL_BYTES_MIN_BALANCE
+
+
+def encode_text(token_name: str, token_unit: str, ipfs_cid: str) -> bytes:
+    """ARC-4 encoding of the (string,string,string) text tuple"""
+    tails = [value.encode("utf-8") for value in (token_name, token_unit, ipfs_cid)]
+    head, offset = b"", 2 * len(tails)
+    for tail in tails:
+        head += offset.to_bytes(2, "big")
+        offset += 2 + len(tail)
+    encoded = head + b"".join(len(tail).to_bytes(2, "big") + tail for tail in tails)
+    if len(TEXT_KEY) + len(encoded) > MAX_STATE_KEY_VALUE_BYTES:
+        raise ValueError(f"Text state is {len(encoded)} bytes; the limit is "
+                         f"{MAX_STATE_KEY_VALUE_BYTES - len(TEXT_KEY)}")
+    return encoded
+
+
+def decode_text(value: bytes) -> Dict[str, str]:
+    fields = {}
+    for i, name in enumerate(TEXT_FIELDS):
+        offset = int.from_bytes(value[2 * i:2 * i + 2], "big")
+        length = int.from_bytes(value[offset:offset + 2], "big")
+        fields[name] = value[offset + 2:offset + 2 + length].decode("utf-8")
+    return fields
+
+
+def encode_core(admin: str, farm_token_id: int, total_supply: int, multisig_threshold: int,
+                minted: int = 0, burned: int = 0) -> bytes:
+    return CORE_FORMAT.pack(STATE_LAYOUT_VERSION, decode_address(admin), farm_token_id, total_supply,
+                            multisig_threshold, minted, burned)
+
+
+def encode_global_state(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """algod `global-state` entries for a contract state dict (as decoded below)"""
+    core = encode_core(state["admin"], state["farm_token_id"], state["total_supply"], state["multisig_threshold"],
+                       state.get("minted", 0), state.get("burned", 0))
+    text = encode_text(*(state[name] for name in TEXT_FIELDS))
+    return [
+        {"key": _CORE_KEY_B64, "value": {"type": 1, "bytes": base64.b64encode(core).decode("ascii"), "uint": 0}},
+        {"key": _TEXT_KEY_B64, "value": {"type": 1, "bytes": base64.b64encode(text).decode("ascii"), "uint": 0}},
+    ]
+
+
+def decode_global_state(entries: List[Dict[str, Any]]) -> Dict[str, Union[int, bytes]]:
+    """Decode algod's `global-state` list into {key: int | bytes}"""
+    state = {}
+    for entry in entries:
+        key = base64.b64decode(entry["key"]).decode("utf-8", "replace")
+        value = entry["value"]
+        state[key] = value.get("uint", 0) if value["type"] == 2 else base64.b64decode(value.get("bytes", ""))
+    return state
+
+
+def _decode_legacy(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    raw = decode_global_state(entries)
+    admin = raw.get("admin")
+    return {
+        "version": 0,
+        "admin": encode_address(admin) if admin else None,
+        "farm_token_id": raw.get("farm_token_id", 0),
+        "total_supply": raw.get("total_supply", 0),
+        "multisig_threshold": raw.get("multisig_threshold", 0),
+        **dict.fromkeys(SUPPLY_FIELDS),
+        **{name: raw.get(name, b"").decode("utf-8") for name in TEXT_FIELDS},
+    }
+
+
+def decode_contract_state(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Every contract field from one `global-state` list
+
+    Only the two packed keys are base64-decoded; the list is scanned once.
+    """
+    core = text = None
+    for entry in entries:
+        if entry["key"] == _CORE_KEY_B64:
+            core = entry["value"]["bytes"]
+        elif entry["key"] == _TEXT_KEY_B64:
+            text = entry["value"]["bytes"]
+    if core is None:
+        return _decode_legacy(entries)
+
+    core = base64.b64decode(core)
+    version = core[0] if core else None
+    if version == STATE_LAYOUT_VERSION:
+        _, admin, farm_token_id, total_supply, threshold, minted, burned = CORE_FORMAT.unpack(core)
+        supply = {"minted": minted, "burned": burned, "circulating": minted - burned}
+    elif version in LEGACY_CORE_FORMATS:
+        _, admin, farm_token_id, total_supply, threshold = LEGACY_CORE_FORMATS[version].unpack(core)
+        supply = dict.fromkeys(SUPPLY_FIELDS)
+    else:
+        raise ValueError(f"Unsupported state layout version {version}")
+    return {
+        "version": version,
+        "admin": encode_address(admin),
+        "farm_token_id": farm_token_id,
+        "total_supply": total_supply,
+        "multisig_threshold": threshold,
+        **supply,
+        **decode_text(base64.b64decode(text or "")),
+    }
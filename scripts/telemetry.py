@@ -0,0 +1,319 @@
+"""
+Metrics and tracing
+===================
+
+One process-wide registry of counters, latency histograms and trace spans
+for the deployer steps and every algod/indexer request:
+
+- `span(name, **attributes)` times a block as a trace span; spans nest
+  (across threads started with asyncio.to_thread too) and share a trace id
+- `traced(name)` does the same for every call of a function
+- each finished span feeds `farm_span_seconds{span=...}` and
+  `farm_spans_total{span=...,status=...}`
+- node_client adds `farm_node_request_seconds{endpoint=...}`,
+  `farm_node_requests_total{endpoint=...,status=...}` and
+  `farm_node_retries_total{endpoint=...}`
+
+Metrics export as Prometheus text (a file, or an HTTP endpoint on a
+background thread) and spans as JSON lines. Telemetry is off unless
+FARM_TELEMETRY=1 or `TELEMETRY.enable()`; while off, `span` returns a
+shared no-op and `traced` adds one attribute check per call, so it can stay
+in bulk jobs.
+
+Usage:
+    from telemetry import TELEMETRY, span, traced
+
+    TELEMETRY.enable()
+    with span("mint.batch", size=16):
+        ...
+    TELEMETRY.write_prometheus(Path("deployments/metrics.prom"))
+    TELEMETRY.write_traces(Path("deployments/traces.jsonl"))
+"""
+
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Prometheus' default latency buckets (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Finished spans kept for export; the oldest are dropped beyond this
+MAX_SPANS = 100_000
+
+METRIC_HELP = {
+    "farm_span_seconds": "Duration of traced steps",
+    "farm_spans_total": "Traced steps by outcome",
+    "farm_node_request_seconds": "Latency of one algod/indexer request attempt",
+    "farm_node_requests_total": "algod/indexer request attempts by HTTP status",
+    "farm_node_retries_total": "algod/indexer request attempts that were retried",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("farm_span", default=None)
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _le(bound) -> str:
+    return f'le="{bound:g}"' if isinstance(bound, float) else f'le="{bound}"'
+
+
+def _format_value(value: float) -> str:
+    # Whole numbers print exactly (`:g` would turn 1234567 into 1.23457e+06)
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _NoopSpan:
+    """Returned by `span` while telemetry is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """
+    One timed operation in a trace
+    """
+
+    __slots__ = ("telemetry", "name", "attributes", "trace_id", "span_id", "parent_id",
+                 "start", "_started", "_token")
+
+    def __init__(self, telemetry: "Telemetry", name: str, attributes: Dict[str, Any]):
+        self.telemetry = telemetry
+        self.name = name
+        self.attributes = attributes
+
+    def set(self, **attributes):
+        """Add attributes to the span"""
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.parent_id = parent.span_id if parent else None
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._started
+        _current_span.reset(self._token)
+        self.telemetry._finish(self, duration, None if exc is None else f"{exc_type.__name__}: {exc}")
+        return False
+
+
+class Telemetry:
+    """
+    Thread-safe counters, histograms and finished spans
+    """
+
+    def __init__(self, enabled: bool = False, buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+                 max_spans: int = MAX_SPANS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        # name -> labels -> [bucket counts..., sum, count]
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+        self._spans: deque = deque(maxlen=max_spans)
+        self._server = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Drop every recorded metric and span"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._spans.clear()
+
+    # Recording
+
+    def inc(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            entry = series.get(key)
+            if entry is None:
+                entry = series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    entry[i] += 1
+                    break
+            entry[-2] += seconds
+            entry[-1] += 1
+
+    def span(self, name: str, **attributes):
+        """Context manager timing a block as a trace span"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def traced(self, name: Optional[str] = None) -> Callable:
+        """Decorator running every call of the function inside a span"""
+
+        def decorator(function: Callable) -> Callable:
+            span_name = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with Span(self, span_name, {}):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def _finish(self, span: Span, duration: float, error: Optional[str]):
+        record = {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "name": span.name,
+            "start": span.start,
+            "duration_ms": duration * 1000,
+            "status": "error" if error else "ok",
+            "attributes": span.attributes,
+        }
+        if error:
+            record["error"] = error
+        with self._lock:
+            self._spans.append(record)
+        self.observe("farm_span_seconds", duration, span=span.name)
+        self.inc("farm_spans_total", span=span.name, status=record["status"])
+
+    # Export
+
+    def spans(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._spans)
+
+    def prometheus_text(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, entry in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets, entry):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key, _le(bound))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key, _le('+Inf'))} {entry[-1]}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {entry[-2]:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {entry[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path):
+        """Write the metrics for a node-exporter textfile collector (atomically)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f".{path.name}.tmp")
+        staging.write_text(self.prometheus_text())
+        staging.replace(path)
+
+    def write_traces(self, path: Path) -> int:
+        """Append finished spans as JSON lines; returns the number written"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        spans = self.spans()
+        with open(path, "a") as f:
+            for record in spans:
+                f.write(json.dumps(record, default=str) + "\n")
+        return len(spans)
+
+    def serve_prometheus(self, port: int, host: str = "127.0.0.1"):
+        """Serve /metrics from a daemon thread; returns the server (port 0 picks a free port)"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        telemetry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = telemetry.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True).start()
+        return self._server
+
+
+TELEMETRY = Telemetry(enabled=os.environ.get("FARM_TELEMETRY") == "1")
+
+
+def span(name: str, **attributes):
+    """`TELEMETRY.span`"""
+    return TELEMETRY.span(name, **attributes)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """`TELEMETRY.traced`"""
+    return TELEMETRY.traced(name)
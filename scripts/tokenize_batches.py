@@ -0,0 +1,462 @@
+"""
+Harvest-batch tokenization pipeline
+===================================
+
+Turns a CSV or JSONL file of product batches (metadata shaped like the
+`sample_metadata` test fixture) into one ASA per batch, as a streaming
+pipeline:
+
+    read rows -> validate -> pin metadata -> build ASA-create groups of 16
+    -> sign -> submit, with up to `--max-in-flight` unconfirmed groups
+
+Each ASA follows ARC-3: its URL is `ipfs://<cid>#arc3` and its metadata hash
+is the sha256 of the pinned JSON. Metadata is pinned to the local IPFS
+stand-in (ipfs_blocks.BlockStore) under `ipfs.cache_dir`.
+
+Progress is appended to a JSONL log. A group's transaction ids and
+`last_valid` round are logged (and fsynced) after signing but before it is
+sent, and again when it confirms. A rerun skips confirmed batches and first
+settles any logged group that was never seen confirmed, so a crash at any
+point never creates the same batch twice. Groups too old for algod's pending
+pool are looked up on the indexer; one that neither confirmed nor can still
+confirm (past `last_valid`) is treated as expired and resubmitted.
+
+Note: the contract's `create_asa` manages the single FarmToken ASA; batch
+ASAs are plain asset-config transactions from the deployer account.
+
+Usage:
+    python scripts/tokenize_batches.py batches.csv --dry-run
+    python scripts/tokenize_batches.py batches.jsonl --network localnet --max-in-flight 4
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import time
+from collections import deque
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ipfs_blocks import BlockStore
+from node_client import NodeHTTPError, clients_for_network
+from protocol import MAX_GROUP_SIZE, MIN_TXN_FEE
+from round_cache import CachedAlgodClient
+
+REQUIRED_FIELDS = ("batchId", "origin", "harvest_date", "expiry", "quantity")
+
+# ASA field limits
+MAX_ASSET_NAME_BYTES = 32
+MAX_UNIT_NAME_BYTES = 8
+MAX_URL_BYTES = 96
+
+_BATCH_ID = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+_QUANTITY = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([A-Za-z]*)\s*$")
+
+# A batch ready to tokenize: {"batchId", "cid", "params"}
+PreparedBatch = Dict[str, Any]
+BatchGroup = List[PreparedBatch]
+
+
+class BatchValidationError(ValueError):
+    """
+    A batch row is missing fields or has inconsistent values
+    """
+
+
+def load_batches(path: Path) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Stream (line number, row) from a CSV file with a header row, or JSONL"""
+    with open(path, newline="") as f:
+        if path.suffix == ".jsonl":
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_number, json.loads(line)
+        else:
+            for line_number, row in enumerate(csv.DictReader(f), 2):
+                yield line_number, {k: v.strip() for k, v in row.items() if k and v and v.strip()}
+
+
+def validate_batch(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check a batch row and return its normalized metadata document
+
+    Raises:
+        BatchValidationError: describing the first problem found
+    """
+    missing = [field for field in REQUIRED_FIELDS if not str(row.get(field, "")).strip()]
+    if missing:
+        raise BatchValidationError(f"Missing fields: {', '.join(missing)}")
+
+    batch_id = str(row["batchId"])
+    if not _BATCH_ID.match(batch_id):
+        raise BatchValidationError(f"Invalid batchId: {batch_id!r}")
+    try:
+        harvested = date.fromisoformat(str(row["harvest_date"]))
+        expiry = date.fromisoformat(str(row["expiry"]))
+    except ValueError as e:
+        raise BatchValidationError(f"Invalid date: {e}") from e
+    if expiry <= harvested:
+        raise BatchValidationError("expiry must be after harvest_date")
+    match = _QUANTITY.match(str(row["quantity"]))
+    if not match or float(match.group(1)) <= 0:
+        raise BatchValidationError(f"Invalid quantity: {row['quantity']!r}")
+
+    metadata = dict(row)
+    metadata.setdefault("name", f"Farm Batch {batch_id}")
+    return metadata
+
+
+def batch_total(quantity: str, decimals: int) -> int:
+    """ASA total for a quantity such as '100 kg', in base units"""
+    return round(float(_QUANTITY.match(quantity).group(1)) * 10 ** decimals)
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text.encode("utf-8")[:limit].decode("utf-8", "ignore")
+
+
+def asa_params(metadata: Dict[str, Any], cid: str, content: bytes, decimals: int) -> Dict[str, Any]:
+    """ARC-3 asset-config fields for one pinned batch"""
+    url = f"ipfs://{cid}#arc3"
+    if len(url) > MAX_URL_BYTES:
+        raise BatchValidationError(f"Metadata URL exceeds {MAX_URL_BYTES} bytes")
+    return {
+        "asset_name": _truncate(metadata["name"], MAX_ASSET_NAME_BYTES),
+        "unit_name": _truncate(metadata["batchId"], MAX_UNIT_NAME_BYTES),
+        "total": batch_total(str(metadata["quantity"]), decimals),
+        "decimals": decimals,
+        "url": url,
+        "metadata_hash": hashlib.sha256(content).digest(),
+    }
+
+
+class ProgressLog:
+    """
+    Append-only JSONL record of signed (about to be sent) and confirmed groups
+    """
+
+    def __init__(self, path: Optional[Path]):
+        # With no path the log is kept in memory only (dry runs)
+        self.path = path
+        self.confirmed: Dict[str, int] = {}
+        submitted: Dict[str, Dict[str, Any]] = {}
+        if path and path.exists():
+            for line in path.read_text().splitlines():
+                entry = json.loads(line)
+                if entry["event"] == "submitted":
+                    submitted[entry["handle"]["txid"]] = entry
+                elif entry["event"] == "confirmed":
+                    submitted.pop(entry["txid"], None)
+                    self.confirmed.update(entry["asset_ids"])
+                elif entry["event"] == "expired":
+                    submitted.pop(entry["txid"], None)
+        self.pending: List[Dict[str, Any]] = list(submitted.values())
+
+    def _append(self, entry: Dict[str, Any]):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def submitted(self, batch_ids: List[str], handle: Dict[str, Any]):
+        self._append({"event": "submitted", "batch_ids": batch_ids, "handle": handle})
+
+    def confirmed_group(self, txid: str, asset_ids: Dict[str, int]):
+        self.confirmed.update(asset_ids)
+        self._append({"event": "confirmed", "txid": txid, "asset_ids": asset_ids})
+
+    def expired(self, txid: str):
+        self._append({"event": "expired", "txid": txid})
+
+    def done(self) -> Set[str]:
+        """Batch ids that are confirmed or may still confirm"""
+        return set(self.confirmed) | {batch for entry in self.pending for batch in entry["batch_ids"]}
+
+
+def prepare_batches(rows: Iterable[Tuple[int, Dict[str, Any]]],
+                    store: BlockStore,
+                    decimals: int,
+                    skip: Set[str],
+                    rejected: List[Dict[str, Any]]) -> Iterator[PreparedBatch]:
+    """
+    Validate and pin each row, skipping finished batches
+
+    Invalid rows are appended to `rejected` instead of stopping the stream.
+    """
+    seen = set(skip)
+    for line_number, row in rows:
+        batch_id = str(row.get("batchId", ""))
+        if batch_id in skip:
+            continue
+        try:
+            metadata = validate_batch(row)
+            if batch_id in seen:
+                raise BatchValidationError(f"Duplicate batchId: {batch_id}")
+            content = json.dumps(metadata, sort_keys=True, separators=(",", ":")).encode()
+            cid = store.add_file(content)
+            params = asa_params(metadata, cid, content, decimals)
+        except (BatchValidationError, ValueError) as e:
+            rejected.append({"line": line_number, "batchId": batch_id, "error": str(e)})
+            continue
+        seen.add(batch_id)
+        yield {"batchId": batch_id, "cid": cid, "params": params}
+
+
+def plan_groups(batches: Iterable[PreparedBatch]) -> Iterator[BatchGroup]:
+    """Chunk prepared batches into atomic groups of ASA creations"""
+    group: BatchGroup = []
+    for batch in batches:
+        group.append(batch)
+        if len(group) == MAX_GROUP_SIZE:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+class TokenizationPipeline:
+    """
+    Submits ASA-create groups with a bounded number in flight, logging progress
+
+    `sign_group(group)` builds and signs a group and returns (handle, signed):
+    a JSON-able handle with at least a `txid`, and the signed transactions
+    for `send_group(signed)`. The handle is logged before the group is sent;
+    if the node refuses it (NodeHTTPError with a status), it is logged as
+    expired before the error propagates.
+    `wait_group(handle)` returns {batchId: asset_id} once confirmed, or None
+    if the group expired.
+    """
+
+    def __init__(self,
+                 sign_group: Callable[[BatchGroup], Tuple[Dict[str, Any], Any]],
+                 send_group: Callable[[Any], Any],
+                 wait_group: Callable[[Dict[str, Any]], Optional[Dict[str, int]]],
+                 progress: ProgressLog,
+                 max_in_flight: int = 4):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.sign_group = sign_group
+        self.send_group = send_group
+        self.wait_group = wait_group
+        self.progress = progress
+        self.max_in_flight = max_in_flight
+
+    def _settle(self, handle: Dict[str, Any]) -> int:
+        asset_ids = self.wait_group(handle)
+        if asset_ids is None:
+            self.progress.expired(handle["txid"])
+            return 0
+        self.progress.confirmed_group(handle["txid"], asset_ids)
+        return len(asset_ids)
+
+    def recover(self) -> Dict[str, int]:
+        """Settle groups a previous run submitted but never saw confirmed"""
+        recovered = expired = 0
+        for entry in self.progress.pending:
+            settled = self._settle(entry["handle"])
+            recovered += settled
+            expired += not settled
+        self.progress.pending = []
+        return {"recovered_batches": recovered, "expired_groups": expired}
+
+    def run(self, groups: Iterable[BatchGroup]) -> Dict[str, Any]:
+        """Submit every group and wait for all confirmations"""
+        report = {"groups": 0, "batches": 0, "confirmed": 0, "fees_microalgos": 0}
+        stage_seconds = {"prepare": 0.0, "submit": 0.0, "confirm": 0.0}
+        in_flight = deque()
+        start = time.perf_counter()
+
+        def settle_oldest():
+            started = time.perf_counter()
+            report["confirmed"] += self._settle(in_flight.popleft())
+            stage_seconds["confirm"] += time.perf_counter() - started
+
+        groups = iter(groups)
+        while True:
+            started = time.perf_counter()
+            group = next(groups, None)
+            stage_seconds["prepare"] += time.perf_counter() - started
+            if group is None:
+                break
+            if len(in_flight) >= self.max_in_flight:
+                settle_oldest()
+
+            started = time.perf_counter()
+            handle, signed = self.sign_group(group)
+            # Logged before sending: if we die after the send, the rerun finds
+            # the txids and settles the group instead of creating it again
+            self.progress.submitted([batch["batchId"] for batch in group], handle)
+            try:
+                self.send_group(signed)
+            except NodeHTTPError as e:
+                # The node answered, so it refused the group: nothing can
+                # confirm, and the rerun should create these batches again.
+                # With no answer (status None) it may have landed; the entry
+                # stays pending for the rerun to settle
+                if e.status is not None:
+                    self.progress.expired(handle["txid"])
+                raise
+            in_flight.append(handle)
+            stage_seconds["submit"] += time.perf_counter() - started
+
+            report["groups"] += 1
+            report["batches"] += len(group)
+            report["fees_microalgos"] += len(group) * MIN_TXN_FEE
+
+        while in_flight:
+            settle_oldest()
+
+        elapsed = time.perf_counter() - start
+        report["elapsed_seconds"] = elapsed
+        report["batches_per_second"] = report["confirmed"] / elapsed if elapsed else 0.0
+        report["stage_seconds"] = stage_seconds
+        return report
+
+
+def make_algosdk_io(algod_client, sender: str, private_key: str, indexer_client=None):
+    """
+    Build (sign_group, send_group, wait_group) that sign with the deployer key
+
+    `indexer_client` lets `wait_group` find groups that confirmed too long
+    ago to still be in algod's pending pool (as during recovery). Without
+    it, a group missing from the pool once its `last_valid` round has passed
+    is reported expired.
+    """
+
+    def sign_group(group: BatchGroup) -> Tuple[Dict[str, Any], List[Any]]:
+        from algosdk import transaction
+
+        sp = algod_client.suggested_params()
+        txns = [
+            transaction.AssetConfigTxn(
+                sender,
+                sp,
+                manager=sender,
+                reserve=sender,
+                strict_empty_address_check=False,
+                **batch["params"],
+            )
+            for batch in group
+        ]
+        if len(txns) > 1:
+            txns = transaction.assign_group_id(txns)
+        signed = [txn.sign(private_key) for txn in txns]
+        handle = {
+            "txid": txns[-1].get_txid(),
+            "txids": {batch["batchId"]: txn.get_txid() for batch, txn in zip(group, txns)},
+            "last_valid": sp.last,
+        }
+        return handle, signed
+
+    def send_group(signed: List[Any]):
+        algod_client.send_transactions(signed)
+
+    def pending_info(txid: str) -> Optional[Dict[str, Any]]:
+        try:
+            return algod_client.pending_transaction_info(txid)
+        except NodeHTTPError as e:
+            if e.status != 404:
+                raise
+            return None
+
+    def indexed(handle: Dict[str, Any]) -> Tuple[Optional[Dict[str, int]], int]:
+        """({batchId: asset_id} or None if not indexed, indexer's current round)"""
+        response = indexer_client.search_transactions(txid=handle["txid"])
+        if not response.get("transactions"):
+            return None, response.get("current-round", 0)
+        asset_ids = {
+            batch_id: indexer_client.search_transactions(txid=txid)["transactions"][0]["created-asset-index"]
+            for batch_id, txid in handle["txids"].items()
+        }
+        return asset_ids, response.get("current-round", 0)
+
+    def wait_group(handle: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        while True:
+            info = pending_info(handle["txid"])
+            if info and info.get("confirmed-round"):
+                return {
+                    batch_id: algod_client.pending_transaction_info(txid)["asset-index"]
+                    for batch_id, txid in handle["txids"].items()
+                }
+            status = algod_client.status()
+            if info is None:
+                # Unknown to algod: confirmed long ago, or never sent
+                if indexer_client is not None:
+                    asset_ids, indexed_round = indexed(handle)
+                    if asset_ids is not None:
+                        return asset_ids
+                    if indexed_round > handle["last_valid"]:
+                        return None
+                elif status["last-round"] > handle["last_valid"]:
+                    return None
+            elif info.get("pool-error") or status["last-round"] > handle["last_valid"]:
+                return None
+            algod_client.status_after_block(status["last-round"])
+
+    return sign_group, send_group, wait_group
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Tokenize harvest batches as ARC-3 ASAs")
+    parser.add_argument("batches_file", type=Path, help="CSV (with header) or .jsonl file of batches")
+    parser.add_argument("--network", choices=["localnet", "testnet"], default="localnet")
+    parser.add_argument("--max-in-flight", type=int, default=4, help="Unconfirmed groups allowed at once")
+    parser.add_argument("--progress", type=Path, help="Progress log (default: deployments/<network>_tokenize.jsonl)")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and pin without submitting")
+    args = parser.parse_args()
+
+    config = json.loads(Path("scripts/deploy_config.json").read_text())
+    store = BlockStore(Path(config.get("ipfs", {}).get("cache_dir", "deployments/ipfs")))
+    decimals = config["token_config"]["decimals"]
+
+    if args.dry_run:
+        progress = ProgressLog(None)
+        dry_run_ids = iter(range(1, 1 << 62))
+        pipeline = TokenizationPipeline(
+            lambda group: ({"txid": "", "batch_ids": [b["batchId"] for b in group]}, None),
+            lambda signed: None,
+            lambda handle: {batch_id: next(dry_run_ids) for batch_id in handle["batch_ids"]},
+            progress,
+            args.max_in_flight,
+        )
+    else:
+        from algosdk import account, mnemonic
+
+        private_key = mnemonic.to_private_key(os.environ["DEPLOYER_MNEMONIC"])
+        algod, indexer = clients_for_network(config, args.network)
+        progress = ProgressLog(args.progress or Path(f"deployments/{args.network}_tokenize.jsonl"))
+        io = make_algosdk_io(CachedAlgodClient(algod), account.address_from_private_key(private_key), private_key,
+                             indexer)
+        pipeline = TokenizationPipeline(*io, progress, args.max_in_flight)
+        recovery = pipeline.recover()
+        if any(recovery.values()):
+            print(f"♻️ Recovered {recovery['recovered_batches']} batches; "
+                  f"{recovery['expired_groups']} expired groups will be resubmitted")
+
+    rejected: List[Dict[str, Any]] = []
+    already_done = len(progress.done())
+    batches = prepare_batches(load_batches(args.batches_file), store, decimals, progress.done(), rejected)
+    report = pipeline.run(plan_groups(batches))
+
+    print(f"🪙 Tokenized {report['confirmed']} batches in {report['groups']} groups"
+          f"{' (dry run)' if args.dry_run else ''}")
+    print(f"   Skipped (already done): {already_done}")
+    print(f"   Rejected: {len(rejected)}")
+    for entry in rejected:
+        print(f"   ❌ line {entry['line']} {entry['batchId'] or '?'}: {entry['error']}")
+    print(f"   Fees: {report['fees_microalgos']} µAlgo")
+    print(f"   Throughput: {report['batches_per_second']:.1f} batches/sec over {report['elapsed_seconds']:.2f}s")
+    stages = report["stage_seconds"]
+    print(f"   Stages: validate+pin {stages['prepare']:.2f}s, sign+submit {stages['submit']:.2f}s, "
+          f"confirm {stages['confirm']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+FarmToken transfer pre-flight checks
+====================================
+
+Every transfer that fails on-chain ("Receiver not opted in to asset",
+"Insufficient asset balance", ...) still costs a fee and a block of
+latency. Pre-flight runs the same checks locally over a batch of pending
+transfers before anything is submitted:
+
+- amount is positive and within the total supply (mints: within the reserve)
+- the receiver is opted in to the ASA
+- the sender can cover the amount, counting earlier transfers in the batch
+
+so a verdict names the same failure the chain would. Transfers that would
+succeed are then held to the blacklist. The contract rejects a mint to a
+blacklisted recipient, so that is an on-chain failure like the others. A
+plain ASA transfer does not pass through the contract and the ASA has no
+freeze address, so nothing on-chain stops one to or from a blacklisted
+account: those are policy rejections (`"policy": True`), reported apart and
+not counted as avoided on-chain failures or saved fees.
+
+Lookups go through a `PreflightIndex`: the synced holder index (see
+holder_index.py) plus the set of blacklist box names. The only case the
+index cannot settle is a receiver with a zero balance, which may or may not
+be opted in. Those receivers (and only those) are probed before the batch
+is checked, with zero-amount transfers simulated 16 to a group, and the
+answers are remembered.
+
+Usage:
+    python scripts/transfer_preflight.py pending.json --network localnet
+    python scripts/transfer_preflight.py pending.json --no-simulate
+"""
+
+import argparse
+import base64
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from addresses import application_address, decode_address
+from blacklist_boxes import BLACKLIST_BOX_PREFIX
+from contract_state import ContractStateReader
+from holder_index import HolderIndex, snapshot_balances, sync_index
+from node_client import clients_for_network
+from protocol import MAX_GROUP_SIZE, MIN_TXN_FEE
+
+# Reasons match the contract / simulator error messages
+AMOUNT_NOT_POSITIVE = "Amount must be positive"
+EXCEEDS_SUPPLY = "Amount exceeds total supply"
+MINT_EXCEEDS_SUPPLY = "Mint exceeds available supply"
+NOT_OPTED_IN = "Receiver not opted in to asset"
+INSUFFICIENT_BALANCE = "Insufficient asset balance"
+
+# Policy reasons: the chain would accept these transfers (except a mint to a
+# blacklisted recipient, which the contract rejects with the same message)
+SENDER_BLACKLISTED = "Sender is blacklisted"
+RECIPIENT_BLACKLISTED = "Recipient is blacklisted"
+
+# Opt-in probe: addresses -> {address: opted in}
+Resolver = Callable[[List[str]], Dict[str, bool]]
+
+# Simulates one group of zero-amount probes: addresses -> simulate txn-group result
+GroupSimulator = Callable[[List[str]], Dict[str, Any]]
+
+
+class PreflightIndex:
+    """
+    Local view of blacklist and holder state used to answer pre-flight checks
+    """
+
+    def __init__(self, holders: HolderIndex, total_supply: int, blacklist: Iterable[str] = ()):
+        self.holders = holders
+        self.total_supply = total_supply
+        self._blacklist: Set[bytes] = {decode_address(address) for address in blacklist}
+        # Opt-in status of zero-balance accounts, which holder balances cannot show
+        self._opt_ins: Dict[str, bool] = {}
+
+    def is_blacklisted(self, address: str) -> bool:
+        return decode_address(address) in self._blacklist
+
+    def balance_of(self, address: str) -> int:
+        return self.holders.balance_of(address)
+
+    def opted_in(self, address: str) -> Optional[bool]:
+        """Whether the account is opted in to FarmToken; None if the index cannot tell"""
+        if self.holders.balance_of(address) > 0:
+            return True
+        return self._opt_ins.get(address)
+
+    def set_opted_in(self, address: str, opted_in: bool):
+        """Remember an opt-in status learned outside the holder index"""
+        self._opt_ins[address] = opted_in
+
+    def load_blacklist_boxes(self, box_names: Iterable[bytes]):
+        """Replace the blacklist with the flagged keys among the app's box names"""
+        self._blacklist = {
+            name[len(BLACKLIST_BOX_PREFIX):] for name in box_names if name.startswith(BLACKLIST_BOX_PREFIX)
+        }
+
+    def sync(self, algod_client, indexer_client, app_id: int) -> int:
+        """
+        Bring holder balances and the blacklist up to date
+
+        Returns:
+            Number of rounds applied to the holder index
+        """
+        rounds = sync_index(self.holders, indexer_client)
+        boxes = algod_client.application_boxes(app_id).get("boxes", [])
+        self.load_blacklist_boxes(base64.b64decode(box["name"]) for box in boxes)
+        return rounds
+
+
+def resolve_opt_ins(addresses: List[str], simulate_group: GroupSimulator) -> Dict[str, bool]:
+    """
+    Opt-in status of each address from grouped zero-amount transfer probes
+
+    A group stops at its first failing transaction (`failed-at`), so the
+    probes before it passed, the failed one is settled by its message
+    ("asset ... missing from <address>" means not opted in) and the rest
+    go into the next group.
+    """
+    opted_in = {}
+    remaining = list(addresses)
+    while remaining:
+        chunk = remaining[:MAX_GROUP_SIZE]
+        group = simulate_group(chunk)
+        failed_at = (group.get("failed-at") or [len(chunk)])[0]
+        for address in chunk[:failed_at]:
+            opted_in[address] = True
+        if failed_at < len(chunk):
+            opted_in[chunk[failed_at]] = "missing from" not in group.get("failure-message", "")
+            failed_at += 1
+        remaining = remaining[failed_at:]
+    return opted_in
+
+
+def simulate_resolver(algod_client, asset_id: int, reserve_address: str) -> Resolver:
+    """
+    Resolver that simulates a zero-amount transfer from the reserve to each
+    address, one group of up to 16 probes per simulate request
+    """
+
+    def simulate_group(chunk: List[str]) -> Dict[str, Any]:
+        from algosdk import transaction
+        from algosdk.v2client.models import SimulateRequest, SimulateRequestTransactionGroup
+
+        sp = algod_client.suggested_params()
+        sp.flat_fee = True
+        sp.fee = MIN_TXN_FEE
+        txns = [transaction.AssetTransferTxn(reserve_address, sp, address, 0, asset_id) for address in chunk]
+        if len(txns) > 1:
+            txns = transaction.assign_group_id(txns)
+        request = SimulateRequest(
+            txn_groups=[SimulateRequestTransactionGroup(txns=[transaction.SignedTransaction(t, None) for t in txns])],
+            allow_empty_signatures=True,
+        )
+        return algod_client.simulate_transactions(request)["txn-groups"][0]
+
+    return lambda addresses: resolve_opt_ins(addresses, simulate_group)
+
+
+class PreflightEngine:
+    """
+    Checks batches of pending transfers against a PreflightIndex
+    """
+
+    def __init__(self, index: PreflightIndex, resolver: Optional[Resolver] = None):
+        self.index = index
+        self.resolver = resolver
+        self.checks = 0
+        self.rejected = 0
+        self.policy_rejected = 0
+        self.simulated = 0
+        self.unchecked = 0
+        self.seconds = 0.0
+
+    def check_batch(self, transfers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Verdict for each transfer, as if the batch were submitted in order
+
+        Returns:
+            [{"sender", "receiver", "amount", "ok", "reason", "policy", "source"}]
+            in batch order. policy is True for blacklist rejections the chain
+            would have accepted (all but mints). source is "index",
+            "simulate" (opt-in settled by simulate) or "unchecked" (opt-in
+            unknown and no resolver; let through)
+        """
+        started = time.perf_counter()
+        index = self.index
+        reserve = index.holders.reserve_address
+        probed = self._probe_receivers(transfers, reserve)
+        # Balance changes from earlier accepted transfers in this batch
+        pending: Dict[str, int] = {}
+        verdicts = []
+
+        for transfer in transfers:
+            sender, receiver, amount = transfer["sender"], transfer["receiver"], transfer["amount"]
+            verdict = {"sender": sender, "receiver": receiver, "amount": amount,
+                       "ok": False, "reason": None, "policy": False, "source": "index"}
+            verdicts.append(verdict)
+
+            opted_in = receiver == reserve or index.opted_in(receiver)
+            if receiver in probed:
+                verdict["source"] = "simulate"
+            if amount <= 0:
+                verdict["reason"] = AMOUNT_NOT_POSITIVE
+            elif amount > index.total_supply:
+                verdict["reason"] = EXCEEDS_SUPPLY
+            elif opted_in is False:
+                verdict["reason"] = NOT_OPTED_IN
+            elif amount > index.balance_of(sender) + pending.get(sender, 0):
+                verdict["reason"] = MINT_EXCEEDS_SUPPLY if sender == reserve else INSUFFICIENT_BALANCE
+            elif index.is_blacklisted(sender):
+                verdict["reason"], verdict["policy"] = SENDER_BLACKLISTED, True
+            elif index.is_blacklisted(receiver):
+                verdict["reason"], verdict["policy"] = RECIPIENT_BLACKLISTED, sender != reserve
+            else:
+                if opted_in is None:
+                    verdict["source"] = "unchecked"
+                verdict["ok"] = True
+                pending[sender] = pending.get(sender, 0) - amount
+                pending[receiver] = pending.get(receiver, 0) + amount
+
+        self.checks += len(verdicts)
+        self.rejected += sum(not verdict["ok"] for verdict in verdicts)
+        self.policy_rejected += sum(verdict["policy"] for verdict in verdicts)
+        self.unchecked += sum(verdict["source"] == "unchecked" for verdict in verdicts)
+        self.seconds += time.perf_counter() - started
+        return verdicts
+
+    def _probe_receivers(self, transfers: List[Dict[str, Any]], reserve: str) -> Set[str]:
+        """Settle unknown opt-ins with one resolver call; returns the addresses probed"""
+        if self.resolver is None:
+            return set()
+        unknown = list(dict.fromkeys(
+            t["receiver"] for t in transfers
+            if t["receiver"] != reserve and self.index.opted_in(t["receiver"]) is None
+        ))
+        if not unknown:
+            return set()
+        for address, opted_in in self.resolver(unknown).items():
+            self.index.set_opted_in(address, opted_in)
+        self.simulated += len(unknown)
+        return set(unknown)
+
+    def report(self) -> Dict[str, Any]:
+        """Throughput and how many on-chain failures pre-flight stopped"""
+        avoided = self.rejected - self.policy_rejected
+        return {
+            "checks": self.checks,
+            "rejected": self.rejected,
+            "avoided_failures": avoided,
+            "policy_rejected": self.policy_rejected,
+            "simulated": self.simulated,
+            "unchecked": self.unchecked,
+            "seconds": self.seconds,
+            "checks_per_second": self.checks / self.seconds if self.seconds else 0.0,
+            "avoided_failure_rate": avoided / self.checks if self.checks else 0.0,
+            "fees_saved": avoided * MIN_TXN_FEE,
+        }
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Pre-flight check pending FarmToken transfers")
+    parser.add_argument("transfers", type=Path, help='JSON list of {"sender", "receiver", "amount"}')
+    parser.add_argument("--network", choices=["localnet", "testnet"], default="localnet")
+    parser.add_argument("--no-simulate", action="store_true",
+                        help="Let zero-balance receivers through unchecked instead of simulating them")
+    args = parser.parse_args()
+
+    config = json.loads(Path("scripts/deploy_config.json").read_text())
+    deployment = json.loads(Path(f"deployments/{args.network}_deployment.json").read_text())
+    algod, indexer = clients_for_network(config, args.network)
+    app_id, asset_id = deployment["contract"]["app_id"], deployment["asa"]["asset_id"]
+
+    index_path = Path(f"deployments/{args.network}_holders.idx")
+    if index_path.exists():
+        holders = HolderIndex.load(index_path)
+    else:
+        holders = HolderIndex(asset_id, application_address(app_id))
+        holders.load_snapshot(*snapshot_balances(indexer, asset_id))
+    index = PreflightIndex(holders, ContractStateReader(algod, app_id).global_state()["total_supply"])
+    rounds = index.sync(algod, indexer, app_id)
+    holders.save(index_path)
+    print(f"✅ Index at round {holders.round} ({rounds} rounds applied)")
+
+    resolver = None if args.no_simulate else simulate_resolver(algod, asset_id, holders.reserve_address)
+    engine = PreflightEngine(index, resolver)
+    verdicts = engine.check_batch(json.loads(args.transfers.read_text()))
+    for verdict in verdicts:
+        if not verdict["ok"]:
+            kind = "policy" if verdict["policy"] else verdict["source"]
+            print(f"❌ {verdict['sender'][:8]}… -> {verdict['receiver'][:8]}… "
+                  f"{verdict['amount']}: {verdict['reason']} ({kind})")
+
+    report = engine.report()
+    print(f"📋 {report['checks']} transfers checked, {report['avoided_failures']} would fail on-chain, "
+          f"{report['policy_rejected']} blocked by policy, {report['simulated']} simulated")
+    print(f"⏱️ {report['checks_per_second']:,.0f} checks/sec")
+    print(f"♻️ Avoided failure rate {report['avoided_failure_rate']:.1%} "
+          f"({report['fees_saved']} µAlgo in fees saved)")
+
+
+if __name__ == "__main__":
+    main()
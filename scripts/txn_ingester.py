@@ -0,0 +1,387 @@
+"""
+FarmToken transaction ingester
+==============================
+
+Streams the FarmToken ASA's history from the indexer into a local SQLite
+store that the transaction log can query instead of filtering an in-memory
+array:
+
+- indexer pages are consumed through a generator, one page in memory at a
+  time, and written with the round checkpoint in the same SQLite
+  transaction, so an interrupted backfill resumes where it stopped
+- asset transfers are classified as mint (sent by the app's reserve),
+  burn (clawed back into the app) or transfer; inner transactions of the
+  contract's app calls are flattened out of their parent
+- payouts of mint groups that mint_batches.py saw rejected (`--store`) are
+  recorded as "failed" and replaced if they confirm after all
+- type and address lookups use (type, time) / (address, time) indexes;
+  txn id search uses an FTS5 trigram index, so substrings match as well
+
+Usage:
+    python scripts/txn_ingester.py ingest --network localnet
+    python scripts/txn_ingester.py query --type mint --limit 20
+    python scripts/txn_ingester.py search 7XKQ
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from addresses import application_address
+from node_client import clients_for_network
+
+DEFAULT_STORE = Path("deployments/transactions.db")
+
+# Indexer page size (the indexer caps `limit` at 1000)
+PAGE_SIZE = 1000
+
+TRANSACTION_TYPES = ("mint", "transfer", "burn")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    asset_id INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    receiver TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS transactions_type_time ON transactions (type, timestamp);
+CREATE INDEX IF NOT EXISTS transactions_status_time ON transactions (status, timestamp);
+CREATE INDEX IF NOT EXISTS transactions_sender_time ON transactions (sender, timestamp);
+CREATE INDEX IF NOT EXISTS transactions_receiver_time ON transactions (receiver, timestamp);
+CREATE VIRTUAL TABLE IF NOT EXISTS transactions_search USING fts5 (
+    id, content='transactions', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS transactions_search_insert AFTER INSERT ON transactions BEGIN
+    INSERT INTO transactions_search (rowid, id) VALUES (new.rowid, new.id);
+END;
+CREATE TABLE IF NOT EXISTS checkpoints (
+    asset_id INTEGER PRIMARY KEY,
+    round INTEGER NOT NULL
+);
+"""
+
+COLUMNS = ("id", "asset_id", "round", "timestamp", "type", "status", "sender", "receiver", "amount", "error")
+
+
+def classify_transfer(txn: Dict[str, Any], app_address: str) -> Optional[Dict[str, Any]]:
+    """
+    Turn one indexer asset-transfer into a store record
+
+    Returns:
+        The record, or None for opt-ins and opt-outs that move no tokens
+    """
+    transfer = txn["asset-transfer-transaction"]
+    amount = transfer["amount"]
+    receiver = transfer["receiver"]
+    # Clawbacks carry the account the tokens are taken from
+    sender = transfer.get("sender") or txn["sender"]
+
+    if amount == 0 and sender == receiver:
+        return None
+    if sender == app_address:
+        kind = "mint"
+    elif receiver == app_address:
+        kind = "burn"
+    else:
+        kind = "transfer"
+
+    return {
+        "id": txn["id"],
+        "asset_id": transfer["asset-id"],
+        "round": txn["confirmed-round"],
+        "timestamp": txn.get("round-time", 0),
+        "type": kind,
+        "status": "completed",
+        "sender": sender,
+        "receiver": receiver,
+        "amount": amount,
+        "error": None,
+    }
+
+
+def flatten_transactions(txn: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield a transaction and its inner transactions, giving inner ones stable ids"""
+    yield txn
+    for position, inner in enumerate(txn.get("inner-txns", [])):
+        yield from flatten_transactions({
+            **inner,
+            "id": f"{txn['id']}/inner/{position}",
+            "confirmed-round": txn["confirmed-round"],
+            "round-time": txn.get("round-time", 0),
+        })
+
+
+class TransactionStore:
+    """
+    SQLite store of FarmToken transactions with a per-asset round checkpoint
+    """
+
+    def __init__(self, path: Path = DEFAULT_STORE):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def checkpoint(self, asset_id: int) -> int:
+        """Last fully ingested round for an asset (0 if none)"""
+        row = self.connection.execute("SELECT round FROM checkpoints WHERE asset_id = ?", (asset_id,)).fetchone()
+        return row["round"] if row else 0
+
+    def write_page(self, asset_id: int, records: Iterable[Dict[str, Any]], round_number: int) -> int:
+        """
+        Insert a page of records and advance the checkpoint atomically
+
+        Records already stored (same id) are skipped, so re-reading the
+        checkpoint round after a resume is harmless; a stored failure with
+        the same id is overwritten.
+
+        Returns:
+            Number of new records
+        """
+        with self.connection:
+            last_rowid = self.connection.execute("SELECT COALESCE(MAX(rowid), 0) FROM transactions").fetchone()[0]
+            self.connection.executemany(
+                f"INSERT INTO transactions ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))}) "
+                # A failed submission that later confirmed takes the indexer's record
+                f"ON CONFLICT (id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in COLUMNS[1:])} "
+                f"WHERE transactions.status = 'failed'",
+                (tuple(record[column] for column in COLUMNS) for record in records),
+            )
+            inserted = self.connection.execute(
+                "SELECT COUNT(*) FROM transactions WHERE rowid > ?", (last_rowid,)
+            ).fetchone()[0]
+            self.connection.execute(
+                "INSERT INTO checkpoints (asset_id, round) VALUES (?, ?) "
+                "ON CONFLICT (asset_id) DO UPDATE SET round = MAX(round, excluded.round)",
+                (asset_id, round_number),
+            )
+        return inserted
+
+    def record_failure(self,
+                       txn_id: str,
+                       asset_id: int,
+                       kind: str,
+                       sender: str,
+                       receiver: str,
+                       amount: int,
+                       error: str,
+                       timestamp: Optional[int] = None):
+        """Record a rejected submission; failed transactions never reach the indexer"""
+        record = {
+            "id": txn_id,
+            "asset_id": asset_id,
+            "round": 0,
+            "timestamp": int(time.time()) if timestamp is None else timestamp,
+            "type": kind,
+            "status": "failed",
+            "sender": sender,
+            "receiver": receiver,
+            "amount": amount,
+            "error": error,
+        }
+        with self.connection:
+            self.connection.execute(
+                f"INSERT OR IGNORE INTO transactions ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                tuple(record[column] for column in COLUMNS),
+            )
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def query(self,
+              kind: Optional[str] = None,
+              status: Optional[str] = None,
+              address: Optional[str] = None,
+              limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Newest transactions matching the filters
+
+        Args:
+            kind: mint, transfer or burn
+            status: completed or failed
+            address: Matches either side of the transfer
+            limit: Maximum number of rows
+        """
+        conditions, params = [], []
+        if kind:
+            conditions.append("type = ?")
+            params.append(kind)
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        where = " AND ".join(conditions) or "1"
+
+        if address:
+            # Two index range scans merged, instead of an OR that scans the table
+            sql = (
+                f"SELECT * FROM (SELECT * FROM transactions WHERE sender = ? AND {where} "
+                f"ORDER BY timestamp DESC LIMIT ?) "
+                f"UNION SELECT * FROM (SELECT * FROM transactions WHERE receiver = ? AND {where} "
+                f"ORDER BY timestamp DESC LIMIT ?) "
+                f"ORDER BY timestamp DESC LIMIT ?"
+            )
+            params = [address, *params, limit, address, *params, limit, limit]
+        else:
+            sql = f"SELECT * FROM transactions WHERE {where} ORDER BY timestamp DESC LIMIT ?"
+            params.append(limit)
+        return [self._to_log_entry(row) for row in self.connection.execute(sql, params)]
+
+    def search(self, term: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Transactions whose id contains `term` (at least 3 characters)"""
+        if len(term) < 3:
+            raise ValueError("Search term must be at least 3 characters")
+        rows = self.connection.execute(
+            "SELECT transactions.* FROM transactions_search "
+            "JOIN transactions ON transactions.rowid = transactions_search.rowid "
+            "WHERE transactions_search MATCH ? ORDER BY transactions.timestamp DESC LIMIT ?",
+            ('"' + term.replace('"', '""') + '"', limit),
+        )
+        return [self._to_log_entry(row) for row in rows]
+
+    @staticmethod
+    def _to_log_entry(row: sqlite3.Row) -> Dict[str, Any]:
+        """Row in the shape TransactionLogs.tsx renders"""
+        entry = {
+            "id": row["id"],
+            "type": row["type"],
+            "amount": row["amount"],
+            "timestamp": datetime.fromtimestamp(row["timestamp"], timezone.utc).isoformat().replace("+00:00", "Z"),
+            "status": row["status"],
+            "from": row["sender"],
+            "to": row["receiver"],
+            "round": row["round"],
+        }
+        if row["error"]:
+            entry["error"] = row["error"]
+        return entry
+
+
+class TransactionIngester:
+    """
+    Pages the indexer's asset transactions into a TransactionStore
+    """
+
+    def __init__(self, indexer_client, store: TransactionStore, asset_id: int, app_id: int,
+                 page_size: int = PAGE_SIZE):
+        self.indexer_client = indexer_client
+        self.store = store
+        self.asset_id = asset_id
+        self.app_address = application_address(app_id)
+        self.page_size = page_size
+
+    def pages(self, min_round: int) -> Iterator[List[Dict[str, Any]]]:
+        """Yield indexer pages of asset transactions from `min_round` on"""
+        next_token = None
+        while True:
+            response = self.indexer_client.asset_transactions(
+                self.asset_id,
+                **{"min-round": min_round, "limit": self.page_size, "next": next_token},
+            )
+            transactions = response.get("transactions", [])
+            if transactions:
+                yield transactions
+            next_token = response.get("next-token")
+            if not next_token or len(transactions) < self.page_size:
+                return
+
+    def records(self, transactions: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Store records for the FarmToken transfers in one page"""
+        for root in transactions:
+            for txn in flatten_transactions(root):
+                if txn.get("tx-type") != "axfer":
+                    continue
+                if txn["asset-transfer-transaction"]["asset-id"] != self.asset_id:
+                    continue
+                record = classify_transfer(txn, self.app_address)
+                if record:
+                    yield record
+
+    def run(self, max_pages: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Ingest from the saved checkpoint onwards
+
+        Returns:
+            Pages, new records, checkpoint round and elapsed seconds
+        """
+        started = time.perf_counter()
+        pages = inserted = 0
+        for transactions in self.pages(self.store.checkpoint(self.asset_id)):
+            last_round = max(txn["confirmed-round"] for txn in transactions)
+            inserted += self.store.write_page(self.asset_id, self.records(transactions), last_round)
+            pages += 1
+            if max_pages is not None and pages >= max_pages:
+                break
+        return {
+            "pages": pages,
+            "records": inserted,
+            "round": self.store.checkpoint(self.asset_id),
+            "elapsed_seconds": time.perf_counter() - started,
+        }
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="FarmToken transaction history store")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE, help="SQLite database path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest = subparsers.add_parser("ingest", help="Backfill or catch up from the indexer")
+    ingest.add_argument("--network", choices=["localnet", "testnet"], default="localnet")
+
+    query = subparsers.add_parser("query", help="Newest transactions matching filters")
+    query.add_argument("--type", choices=TRANSACTION_TYPES)
+    query.add_argument("--status", choices=["completed", "failed"])
+    query.add_argument("--address")
+    query.add_argument("--limit", type=int, default=20)
+
+    search = subparsers.add_parser("search", help="Find transactions by (partial) txn id")
+    search.add_argument("term")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = TransactionStore(args.store)
+    started = time.perf_counter()
+    if args.command == "ingest":
+        config = json.loads(Path("scripts/deploy_config.json").read_text())
+        deployment = json.loads(Path(f"deployments/{args.network}_deployment.json").read_text())
+        ingester = TransactionIngester(
+            clients_for_network(config, args.network)[1],
+            store,
+            deployment["asa"]["asset_id"],
+            deployment["contract"]["app_id"],
+        )
+        report = ingester.run()
+        print(f"✅ Ingested {report['records']} records from {report['pages']} pages "
+              f"in {report['elapsed_seconds']:.1f}s; checkpoint round {report['round']}")
+        print(f"📋 Store holds {store.count()} transactions")
+    else:
+        if args.command == "query":
+            rows = store.query(args.type, args.status, args.address, args.limit)
+        else:
+            rows = store.search(args.term, args.limit)
+        elapsed = time.perf_counter() - started
+        for row in rows:
+            print(json.dumps(row))
+        print(f"📋 {len(rows)} rows in {elapsed * 1000:.1f}ms")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Shared pytest configuration
+===========================
+
+Makes the modules under scripts/ importable the same way they import each
+other when run as `python scripts/<name>.py`, and holds the node fakes and
+fixtures shared by several test modules (import helpers with
+`from conftest import ...`; fixtures are picked up automatically).
+"""
+
+import base64
+import json
+import shutil
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from addresses import random_address  # noqa: E402
+from blacklist_boxes import blacklist_box_name  # noqa: E402
+from compile_cache import CompileCache  # noqa: E402
+from node_client import AlgodClient, NodeHTTPError, RetryPolicy  # noqa: E402
+from state_layout import encode_global_state  # noqa: E402
+
+
+# Deploy workspace
+
+class FakeCompiler:
+    """Writes puyapy-shaped artifacts and counts compiles"""
+
+    def __init__(self):
+        self.compiles = 0
+
+    def __call__(self, contract_path, out_dir):
+        self.compiles += 1
+        source = contract_path.read_text()
+        (out_dir / "FarmFoodTokenizer.approval.teal").write_text(f"#pragma version 10\n// {len(source)}\n")
+        (out_dir / "FarmFoodTokenizer.clear.teal").write_text("#pragma version 10\npushint 1\n")
+        (out_dir / "FarmFoodTokenizer.arc56.json").write_text(json.dumps({"name": "FarmFoodTokenizer"}))
+
+
+def fake_cache(root, version="puyapy 4.0.0"):
+    """A CompileCache under `root` backed by a FakeCompiler; returns (cache, compiler)"""
+    compiler = FakeCompiler()
+    return CompileCache(root, compiler=compiler, compiler_version=lambda: version), compiler
+
+
+def deploy_workspace(tmp_path, monkeypatch):
+    """A working directory with the config and contract, as deploys expect"""
+    for relative in ("scripts/deploy_config.json", "contracts/farm_food_tokenizer.py"):
+        (tmp_path / relative).parent.mkdir(exist_ok=True)
+        shutil.copy(REPO_ROOT / relative, tmp_path / relative)
+    monkeypatch.chdir(tmp_path)
+
+
+# Algod fakes
+
+def state_entry(key, value):
+    """algod global-state entry for a uint (int) or bytes value"""
+    if isinstance(value, int):
+        return {"key": base64.b64encode(key.encode()).decode(), "value": {"type": 2, "uint": value}}
+    return {
+        "key": base64.b64encode(key.encode()).decode(),
+        "value": {"type": 1, "bytes": base64.b64encode(value).decode()},
+    }
+
+
+class CountingAlgod:
+    """algod stand-in serving one app (in the packed state layout) and counting requests"""
+
+    def __init__(self, flagged):
+        self.round = 10
+        self.calls = {}
+        self.admin = random_address()
+        self.cid = "QmFirstCID"
+        self.boxes = {blacklist_box_name(address) for address in flagged}
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def status(self):
+        self._count("status")
+        return {"last-round": self.round}
+
+    def suggested_params(self):
+        self._count("suggested_params")
+        return {"fee": 0, "last-round": self.round}
+
+    def application_info(self, app_id):
+        self._count("application_info")
+        return {"params": {"global-state": encode_global_state({
+            "admin": self.admin,
+            "farm_token_id": 1002,
+            "total_supply": 100_000_000,
+            "multisig_threshold": 2,
+            "minted": 40_000_000,
+            "burned": 1_500_000,
+            "token_name": "FarmToken",
+            "token_unit": "FT",
+            "ipfs_cid": self.cid,
+        })}}
+
+    def application_box_by_name(self, app_id, name):
+        self._count("box")
+        if name not in self.boxes:
+            raise NodeHTTPError(404, "box not found")
+        return {"name": base64.b64encode(name).decode(), "value": "gA=="}
+
+    def send_raw_transaction(self, blob):
+        self._count("send")
+        self.cid = "QmSecondCID"
+        return "TXID"
+
+
+# algod HTTP stand-in
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 algod stand-in; see the `stand_in` fixture for the server state it uses"""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = 65536  # send headers and body in one segment
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            hits = server.hits[self.path]
+
+        if self.headers.get("X-Algo-API-Token") != "secret":
+            self._send(401, {"message": "Invalid API Token"})
+        elif self.path == "/v2/status":
+            self._send(200, {"last-round": 42})
+        elif self.path.startswith("/v2/status/wait-for-block-after/"):
+            self._send(200, {"last-round": int(self.path.rsplit("/", 1)[1]) + 1})
+        elif self.path == "/flaky":
+            if hits <= 2:
+                self._send(503 if hits == 1 else 429, {"message": "busy"}, {"Retry-After": "0"})
+            else:
+                self._send(200, {"ok": True})
+        elif self.path == "/down":
+            self._send(500, {"message": "down"})
+        else:
+            self._send(404, {"message": "not found"})
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            outcome = server.post_outcomes.pop(0) if server.post_outcomes else 200
+
+        if outcome == "drop":
+            # Accepted, then the connection dies before the response
+            self.close_connection = True
+        elif outcome == 200:
+            self._send(200, {"txId": "TX1"})
+        else:
+            self._send(outcome, {"message": "busy"}, {"Retry-After": "0"})
+
+
+@pytest.fixture
+def stand_in():
+    """Local stand-in server; `post_outcomes` scripts POST responses ("drop" or a status code)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.lock = threading.Lock()
+    server.connections = set()
+    server.hits = {}
+    server.post_outcomes = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def stand_in_client(server, **kwargs):
+    """AlgodClient for the stand-in with fast retries"""
+    host, port = server.server_address
+    retry = RetryPolicy(max_retries=3, base_delay=0.001, max_delay=0.01)
+    return AlgodClient(f"http://{host}:{port}", "secret", retry=retry, **kwargs)
+
+
+# Indexer fakes
+
+ASSET_ID = 1002
+
+
+def axfer(txid, round_number, sender, receiver, amount, clawback_from=None, asset_id=ASSET_ID):
+    """Indexer record of an asset transfer (a clawback when `clawback_from` is given)"""
+    transfer = {"asset-id": asset_id, "amount": amount, "receiver": receiver}
+    if clawback_from:
+        transfer["sender"] = clawback_from
+    return {
+        "id": txid,
+        "tx-type": "axfer",
+        "sender": sender,
+        "confirmed-round": round_number,
+        "round-time": 1_700_000_000 + round_number,
+        "asset-transfer-transaction": transfer,
+    }
+
+
+class FakeIndexer:
+    """Indexer stand-in paging a fixed transaction list by round"""
+
+    def __init__(self, transactions):
+        self.transactions = transactions
+        self.requests = []
+
+    def asset_transactions(self, asset_id, **params):
+        self.requests.append(params)
+        matching = [t for t in self.transactions if t["confirmed-round"] >= params["min-round"]]
+        start = int(params["next"] or 0)
+        page = matching[start:start + params["limit"]]
+        response = {"transactions": page}
+        if start + params["limit"] < len(matching):
+            response["next-token"] = str(start + params["limit"])
+        return response
@@ -0,0 +1,210 @@
+"""
+Tests for the asynchronous deployment pipeline
+==============================================
+
+Usage:
+    pytest tests/test_async_deploy.py -v
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from async_deploy import AsyncFarmFoodDeployer, ConfirmationTimeout, PipelineStep, RoundWatcher, run_pipeline
+from conftest import deploy_workspace, fake_cache
+
+
+class FakeAlgod:
+    """Node stand-in producing a block every `block_time` seconds"""
+
+    def __init__(self, block_time=0.01, confirm_after=None):
+        self.block_time = block_time
+        self.round = 100
+        self.confirm_after = confirm_after or {}
+        self.long_polls = 0
+        self.lock = threading.Lock()
+
+    def status(self):
+        return {"last-round": self.round}
+
+    def status_after_block(self, round_number):
+        with self.lock:
+            self.long_polls += 1
+        time.sleep(self.block_time)
+        self.round = max(self.round, round_number) + 1
+        return {"last-round": self.round}
+
+    def pending_transaction_info(self, txid):
+        if self.round >= self.confirm_after.get(txid, 10**9):
+            return {"confirmed-round": self.confirm_after[txid]}
+        return {}
+
+
+def test_watcher_shares_one_long_poll_across_waits():
+    """Test that many concurrent waits are woken by a single round stream"""
+    algod = FakeAlgod(confirm_after={f"TX{i}": 100 + i % 3 + 1 for i in range(20)})
+
+    async def scenario():
+        watcher = RoundWatcher(algod)
+        await watcher.start()
+        try:
+            infos = await asyncio.gather(*(watcher.wait_for_confirmation(f"TX{i}") for i in range(20)))
+        finally:
+            await watcher.stop()
+        return infos
+
+    infos = asyncio.run(scenario())
+
+    assert [info["confirmed-round"] for info in infos] == [100 + i % 3 + 1 for i in range(20)]
+    assert algod.long_polls <= 5
+
+
+def test_watcher_times_out_after_max_rounds():
+    """Test that an unconfirmed transaction fails after max_rounds blocks"""
+    algod = FakeAlgod(block_time=0.001)
+
+    async def scenario():
+        watcher = RoundWatcher(algod)
+        await watcher.start()
+        try:
+            await watcher.wait_for_confirmation("NEVER", max_rounds=3)
+        finally:
+            await watcher.stop()
+
+    with pytest.raises(ConfirmationTimeout):
+        asyncio.run(scenario())
+
+
+def test_watcher_failure_and_stall_reach_every_wait():
+    """Test that a failed long-poll is re-raised by waits and a stalled node times out"""
+
+    class DownAlgod(FakeAlgod):
+        def status_after_block(self, round_number):
+            time.sleep(self.block_time)
+            raise ConnectionError("node down")
+
+    class StalledAlgod(FakeAlgod):
+        def status_after_block(self, round_number):
+            time.sleep(self.block_time)
+            return {"last-round": self.round}
+
+    async def wait_all(watcher):
+        await watcher.start()
+        try:
+            return await asyncio.gather(*(watcher.wait_for_confirmation(f"TX{i}") for i in range(5)),
+                                        return_exceptions=True)
+        finally:
+            await watcher.stop()
+
+    errors = asyncio.run(wait_all(RoundWatcher(DownAlgod())))
+    assert all(isinstance(e, RuntimeError) and "node down" in str(e) for e in errors)
+
+    errors = asyncio.run(wait_all(RoundWatcher(StalledAlgod(block_time=0.001), round_timeout=0.05)))
+    assert all(isinstance(e, ConfirmationTimeout) and "No new round" in str(e) for e in errors)
+    print("✅ Watcher failures reach every waiter")
+
+
+def test_stop_does_not_wait_for_a_long_poll_in_progress():
+    """Test that asyncio.run returns after stop() while the node is still holding the long-poll"""
+    release = threading.Event()
+
+    class HangingAlgod(FakeAlgod):
+        def status_after_block(self, round_number):
+            release.wait()
+            return {"last-round": round_number + 1}
+
+    async def scenario():
+        watcher = RoundWatcher(HangingAlgod())
+        await watcher.start()
+        await asyncio.sleep(0.01)
+        await watcher.stop()
+
+    finished = threading.Event()
+    runner = threading.Thread(target=lambda: (asyncio.run(scenario()), finished.set()), daemon=True)
+    runner.start()
+    try:
+        assert finished.wait(5), "asyncio.run blocked on the watcher's long-poll"
+    finally:
+        release.set()
+    print("✅ Stopping the watcher does not wait for the node")
+
+
+def test_pipeline_overlaps_independent_steps():
+    """Test that steps sharing only a dependency run concurrently"""
+    def slow(result):
+        return lambda r: (time.sleep(0.05), result)[1]
+
+    steps = [
+        PipelineStep("root", slow("root")),
+        PipelineStep("left", slow("left"), ["root"]),
+        PipelineStep("right", slow("right"), ["root"]),
+        PipelineStep("join", lambda r: r["left"] + r["right"], ["left", "right"]),
+    ]
+    results, timings = asyncio.run(run_pipeline(steps))
+
+    assert results["join"] == "leftright"
+    assert timings["left"]["start"] < timings["right"]["end"]
+    assert timings["right"]["start"] < timings["left"]["end"]
+    assert timings["join"]["start"] >= max(timings["left"]["end"], timings["right"]["end"])
+
+    with pytest.raises(ValueError, match="unknown steps"):
+        asyncio.run(run_pipeline([PipelineStep("orphan", lambda r: None, ["missing"])]))
+
+
+def test_async_deployer_end_to_end(tmp_path, monkeypatch):
+    """Test that the async deployer runs every step and saves the record"""
+    deploy_workspace(tmp_path, monkeypatch)
+    cache, _ = fake_cache(tmp_path / "build")
+
+    outcome = asyncio.run(AsyncFarmFoodDeployer(network="localnet", compile_cache=cache).deploy_async())
+
+    assert set(outcome["timings"]) == {
+        "setup_client", "deployer_account", "deploy_contract", "fund_app_account",
+        "configure_multisig", "create_asa", "opt_in_asa", "set_initial_metadata",
+        "save_deployment_info",
+    }
+    saved = json.loads((tmp_path / "deployments" / "localnet_deployment.json").read_text())
+    assert saved["asa"]["asset_id"] == outcome["results"]["create_asa"]["asset_id"]
+
+
+def test_async_deployer_confirms_real_transactions(tmp_path, monkeypatch):
+    """Test that step results with real transaction ids are confirmed and mock ids are not"""
+    deploy_workspace(tmp_path, monkeypatch)
+    cache, _ = fake_cache(tmp_path / "build")
+    txid = "A" * 52
+    algod = FakeAlgod(confirm_after={txid: 102})
+    deployer = AsyncFarmFoodDeployer(network="localnet", compile_cache=cache)
+    monkeypatch.setattr(deployer, "setup_client", lambda: setattr(deployer, "algod_client", algod))
+    monkeypatch.setattr(deployer, "fund_app_account", lambda deployment: {"txn_id": txid})
+
+    results = asyncio.run(deployer.deploy_async())["results"]
+
+    assert results["fund_app_account"]["confirmation"] == {"confirmed-round": 102}
+    assert results["create_asa"]["confirmation"] is None
+    assert algod.long_polls >= 2
+    print("✅ Real transaction ids are confirmed before dependent steps")
+
+
+def test_async_deployer_follows_the_deployment_plan(tmp_path, monkeypatch):
+    """Test that a saved record is reused or updated in place instead of creating a new app"""
+    deploy_workspace(tmp_path, monkeypatch)
+    cache, _ = fake_cache(tmp_path / "build")
+    first = asyncio.run(AsyncFarmFoodDeployer(network="localnet", compile_cache=cache).deploy_async())
+    app_id = first["results"]["deploy_contract"]["app_id"]
+
+    again = asyncio.run(AsyncFarmFoodDeployer(network="localnet", compile_cache=cache).deploy_async())
+    assert again["plan"]["changes"] == [] and again["results"] == {}
+
+    deployer = AsyncFarmFoodDeployer(network="localnet", compile_cache=cache)
+    deployer.config["token_config"]["metadata_cid"] = "QmUpdatedCID"
+    monkeypatch.setattr(deployer, "deploy_contract", lambda account: pytest.fail("created a new app"))
+    updated = asyncio.run(deployer.deploy_async())
+
+    assert updated["plan"]["metadata"] == "set" and updated["results"] == {}
+    saved = json.loads((tmp_path / "deployments" / "localnet_deployment.json").read_text())
+    assert saved["contract"]["app_id"] == app_id
+    assert saved["config"]["token_config"]["metadata_cid"] == "QmUpdatedCID"
+    print("✅ Async deploys reuse the saved deployment")
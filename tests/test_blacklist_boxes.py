@@ -0,0 +1,162 @@
+"""
+Tests for the box-backed blacklist layout
+=========================================
+
+Measures the min-balance each add locks and each remove frees as the
+blacklist grows, to confirm capacity is bound by the app account's balance
+rather than global state. Opcode costs are static per method
+(BLACKLIST_OPCODE_COST) and are measured against a node by profile_costs.py.
+
+Usage:
+    pytest tests/test_blacklist_boxes.py -v
+"""
+
+import pytest
+
+from addresses import decode_address, encode_address, is_valid_address, random_address
+from blacklist_boxes import BLACKLIST_ENTRY_MIN_BALANCE, BoxBlacklist, blacklist_box_name
+from blacklist_client import BlacklistClient, box_funding, max_addresses_per_call, plan_batches
+from farm_food_simulator import FarmFoodSimulator
+from protocol import (
+    APP_CALL_OPCODE_BUDGET,
+    MAX_BOX_REFERENCES_PER_TXN,
+    MAX_GLOBAL_STATE_KEYS,
+    MAX_GROUP_SIZE,
+)
+
+
+def test_address_round_trip():
+    """Test address encoding, decoding and checksum validation"""
+    public_key = bytes(range(32))
+    address = encode_address(public_key)
+
+    assert len(address) == 58
+    assert decode_address(address) == public_key
+    assert is_valid_address(address)
+
+    tampered = address[:-1] + ("A" if address[-1] != "A" else "B")
+    assert not is_valid_address(tampered)
+    with pytest.raises(ValueError):
+        decode_address("NOT_AN_ADDRESS")
+
+
+def test_box_name_layout():
+    """Test that box names are the prefix plus the 32-byte public key"""
+    address = random_address()
+    name = blacklist_box_name(address)
+
+    assert name[:2] == b"bl"
+    assert name[2:] == decode_address(address)
+    assert BLACKLIST_ENTRY_MIN_BALANCE == 2_500 + 400 * (34 + 1)
+
+
+def test_min_balance_per_entry_as_list_grows():
+    """Test that each add locks, and each remove frees, one entry's MBR from 1 to 20k entries"""
+    admin = random_address()
+    simulator = FarmFoodSimulator(admin)
+    probe = random_address()
+    checkpoints = [1, 100, 1_000, 20_000]
+
+    add_deltas = []
+    remove_deltas = []
+
+    for size in checkpoints:
+        simulator.add_to_blacklist_batch(admin, [random_address() for _ in range(size - len(simulator.blacklist))])
+
+        before = simulator.blacklist.min_balance
+        simulator.add_to_blacklist(admin, probe)
+        add_deltas.append(simulator.blacklist.min_balance - before)
+        assert simulator.is_blacklisted(probe)
+
+        before = simulator.blacklist.min_balance
+        simulator.remove_from_blacklist(admin, probe)
+        remove_deltas.append(before - simulator.blacklist.min_balance)
+        assert not simulator.is_blacklisted(probe)
+
+    print(f"\n   Entries:             {checkpoints}")
+    print(f"   MBR per add (µAlgo): {add_deltas}")
+    print(f"   MBR per remove:      {remove_deltas}")
+
+    assert add_deltas == remove_deltas == [BLACKLIST_ENTRY_MIN_BALANCE] * len(checkpoints)
+    assert simulator.blacklist.min_balance == len(simulator.blacklist) * BLACKLIST_ENTRY_MIN_BALANCE
+    assert len(simulator.blacklist) > MAX_GLOBAL_STATE_KEYS
+
+
+def test_add_and_remove_are_idempotent():
+    """Test that duplicate adds and removes of absent entries are no-ops"""
+    blacklist = BoxBlacklist()
+    address = random_address()
+
+    assert blacklist.add(address)
+    assert not blacklist.add(address)
+    assert len(blacklist) == 1
+
+    assert blacklist.remove(address)
+    assert not blacklist.remove(address)
+    assert blacklist.min_balance == 0
+
+
+def test_batch_plan_respects_protocol_limits():
+    """Test that batches fit box-reference, group and opcode limits"""
+    addresses = [random_address() for _ in range(500)]
+    plan = plan_batches(addresses + addresses[:10], "add_to_blacklist_batch")
+
+    calls = [call for group in plan for call in group]
+    assert sum(len(call) for call in calls) == 500
+    assert all(len(call) <= MAX_BOX_REFERENCES_PER_TXN for call in calls)
+    assert all(len(group) <= MAX_GROUP_SIZE for group in plan)
+    assert len(calls) == -(-500 // max_addresses_per_call("add_to_blacklist_batch"))
+
+    blacklist = BoxBlacklist()
+    for call in calls:
+        blacklist.add_batch(call)
+        assert blacklist.last_opcode_cost <= APP_CALL_OPCODE_BUDGET
+
+    # Add groups keep a slot for the box funding payment; removes need none
+    assert max(len(group) for group in plan) == MAX_GROUP_SIZE - 1
+    assert max(len(group) for group in plan_batches(addresses, "remove_from_blacklist_batch")) == MAX_GROUP_SIZE
+
+
+def test_add_groups_fund_their_boxes():
+    """Test that the funding payment covers every box a group may create, less the spare balance"""
+    per_call = max_addresses_per_call("add_to_blacklist_batch")
+    addresses = [random_address() for _ in range(per_call * (MAX_GROUP_SIZE - 1))]
+    group = plan_batches(addresses, "add_to_blacklist_batch")[0]
+
+    blacklist = BoxBlacklist()
+    for call in group:
+        blacklist.add_batch(call)
+    assert box_funding(len(addresses)) == blacklist.min_balance == len(addresses) * 16_500
+    assert box_funding(8, spare_balance=40_000) == 8 * 16_500 - 40_000
+    assert box_funding(8, spare_balance=10**6) == 0
+    assert box_funding(8, spare_balance=-5) == 8 * 16_500
+    print(f"✅ One payment of {box_funding(len(addresses))} µAlgo funds a full group of {len(addresses)} boxes")
+
+
+def test_batched_client_against_one_by_one():
+    """Test calls and fees of the batched client against single-address calls"""
+    blacklist = BoxBlacklist()
+    groups_sent = []
+
+    def send_group(method, calls):
+        groups_sent.append(calls)
+        apply = blacklist.add_batch if method == "add_to_blacklist_batch" else blacklist.remove_batch
+        return [apply(call) for call in calls]
+
+    client = BlacklistClient(send_group)
+    addresses = [random_address() for _ in range(300)]
+
+    report = client.add(addresses)
+    assert report["changed"] == 300
+    assert len(blacklist) == 300
+    assert len(groups_sent) == report["batched"]["groups"]
+
+    batched, single = report["batched"], report["one_by_one"]
+    print(f"\n   Batched:    {batched['calls']} calls, {batched['groups']} round trips, "
+          f"{batched['fees_microalgos']} µAlgo")
+    print(f"   One-by-one: {single['calls']} calls, {single['fees_microalgos']} µAlgo")
+    assert batched["calls"] * MAX_BOX_REFERENCES_PER_TXN >= single["calls"]
+    assert batched["fees_microalgos"] < single["fees_microalgos"] / 7
+
+    assert client.remove(addresses[:100])["changed"] == 100
+    assert len(blacklist) == 200
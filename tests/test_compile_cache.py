@@ -0,0 +1,111 @@
+"""
+Tests for the compile cache and incremental redeploys
+=====================================================
+
+puyapy is replaced by a compiler stand-in that writes fixed artifacts and
+counts invocations.
+
+Usage:
+    pytest tests/test_compile_cache.py -v
+"""
+
+import json
+import time
+
+from conftest import deploy_workspace, fake_cache
+from deploy_farm_food import FarmFoodDeployer
+
+
+class RecordingDeployer(FarmFoodDeployer):
+    """Deployer that records which transaction-submitting steps ran"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.steps = []
+
+    def _record(self, name, result):
+        self.steps.append(name)
+        return result
+
+    def deploy_contract(self, deployer_account):
+        return self._record("deploy_contract", super().deploy_contract(deployer_account))
+
+    def update_contract(self, deployment_result):
+        return self._record("update_contract", super().update_contract(deployment_result))
+
+    def create_asa(self, deployment_result):
+        return self._record("create_asa", super().create_asa(deployment_result))
+
+    def configure_multisig(self, deployment_result):
+        return self._record("configure_multisig", super().configure_multisig(deployment_result))
+
+    def set_initial_metadata(self, deployment_result, asa_result):
+        return self._record("set_initial_metadata", super().set_initial_metadata(deployment_result, asa_result))
+
+
+def test_cache_keyed_by_source_and_compiler(tmp_path):
+    """Test hits on unchanged source, misses on source or compiler changes"""
+    contract = tmp_path / "contract.py"
+    contract.write_text("class A: pass\n")
+    cache, compiler = fake_cache(tmp_path / "build")
+
+    first = cache.artifacts(contract)
+    assert cache.artifacts(contract).key == first.key
+    assert compiler.compiles == 1 and cache.hits == 1
+    assert first.app_spec()["name"] == "FarmFoodTokenizer"
+    assert first.approval_teal().startswith("#pragma version 10")
+
+    contract.write_text("class A: x = 1\n")
+    assert cache.artifacts(contract).key != first.key
+    upgraded, upgraded_compiler = fake_cache(tmp_path / "build", version="puyapy 4.1.0")
+    upgraded.artifacts(contract)
+    assert compiler.compiles == 2 and upgraded_compiler.compiles == 1
+
+    # A fresh process finds earlier entries on disk; no partial entries are left
+    reopened, reopened_compiler = fake_cache(tmp_path / "build")
+    assert reopened.lookup(first.source_hash) is not None
+    reopened.artifacts(contract)
+    assert reopened_compiler.compiles == 0
+    assert not [p for p in (tmp_path / "build").iterdir() if p.name.startswith(".")]
+    print("✅ Compile cache test passed")
+
+
+def test_redeploy_skips_unchanged_and_updates_in_place(tmp_path, monkeypatch):
+    """Test that a no-op redeploy submits nothing and changes are applied in place"""
+    deploy_workspace(tmp_path, monkeypatch)
+    cache, compiler = fake_cache(tmp_path / "deployments" / "build")
+
+    first = RecordingDeployer("localnet", compile_cache=cache)
+    first.deploy()
+    assert first.steps == ["deploy_contract", "create_asa", "configure_multisig", "set_initial_metadata"]
+
+    started = time.perf_counter()
+    again = RecordingDeployer("localnet", compile_cache=cache)
+    plan = again.deploy()
+    assert time.perf_counter() - started < 1.0
+    assert plan["changes"] == [] and again.steps == []
+
+    # Contract and metadata changes: update in place, keep app and ASA
+    contract = tmp_path / "contracts" / "farm_food_tokenizer.py"
+    contract.write_text(contract.read_text() + "\n# tweak\n")
+    config_path = tmp_path / "scripts" / "deploy_config.json"
+    config = json.loads(config_path.read_text())
+    config["token_config"]["metadata_cid"] = "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"
+    config_path.write_text(json.dumps(config))
+
+    changed = RecordingDeployer("localnet", compile_cache=cache)
+    plan = changed.deploy()
+    assert (plan["contract"], plan["asa"], plan["metadata"], plan["multisig"]) == ("update", "skip", "set", "skip")
+    assert changed.steps == ["update_contract", "set_initial_metadata"]
+    record = json.loads((tmp_path / "deployments" / "localnet_deployment.json").read_text())
+    assert record["contract"]["source_hash"] == plan["source_hash"]
+    assert record["asa"]["asset_id"] == 987654321
+    assert compiler.compiles == 2
+
+    # Immutable ASA parameters force a fresh app
+    config["token_config"]["decimals"] = 6
+    config_path.write_text(json.dumps(config))
+    plan = RecordingDeployer("localnet", compile_cache=cache).plan_deployment()
+    assert plan["contract"] == plan["asa"] == "create"
+    assert "decimals" in plan["changes"][0]
+    print("✅ Incremental redeploy test passed")
@@ -0,0 +1,120 @@
+"""
+Tests for ARC-28 events and the batch event decoder
+===================================================
+
+Usage:
+    pytest tests/test_contract_events.py -v
+"""
+
+import base64
+import time
+
+from addresses import random_address
+from contract_events import EventDecoder, encode_event, event_selector
+from farm_food_simulator import FarmFoodSimulator
+from readonly_client import decode_abi_value
+
+ABI_RETURN_PREFIX = bytes.fromhex("151f7c75")
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def test_simulator_events_decode_to_operations():
+    """Test that decoding the simulator's logs reproduces the state-changing calls"""
+    admin, alice, bob = random_address(), random_address(), random_address()
+    sim = FarmFoodSimulator(admin)
+    sim.create_asa(admin, "FarmToken", "FT", 1_000_000, 2, "QmOld")
+    for account in (admin, alice, bob):
+        sim.opt_in(account)
+
+    sim.mint_tokens(admin, alice, 500)
+    sim.mint_tokens_batch(admin, [alice, bob], [10, 20])
+    sim.mint_tokens(admin, admin, 7)
+    sim.burn_tokens(admin, 7)
+    sim.add_to_blacklist(admin, bob)
+    sim.add_to_blacklist(admin, bob)  # already flagged: no event
+    sim.add_to_blacklist_batch(admin, [alice, bob, alice])
+    sim.remove_from_blacklist_batch(admin, [bob, alice, bob])
+    sim.update_metadata_cid(admin, "QmNew")
+
+    batch = EventDecoder().decode_logs((log, 9, 0) for log in sim.logs)
+    assert [(e["recipient"], e["amount"]) for e in batch.rows("Minted")] == [
+        (alice, 500), (alice, 10), (bob, 20), (admin, 7)]
+    assert [(e["account"], e["amount"]) for e in batch.rows("Burned")] == [(admin, 7)]
+    assert [(e["account"], e["blacklisted"]) for e in batch.rows("BlacklistUpdated")] == [
+        (bob, True), (alice, True), (bob, False), (alice, False)]
+    assert list(batch.columns["MetadataCidUpdated"]["cid"]) == ["QmNew"]
+    assert set(batch.columns["Minted"]["round"]) == {9}
+    assert event_selector("Minted(address,uint64)") == sim.logs[0][:4]
+    print(f"✅ {len(batch)} simulator events decoded")
+
+
+def test_decode_indexer_transactions_columnar():
+    """Test columnar decoding across inner transactions, skipping ABI returns and other apps"""
+    app_id, holders = 1001, [random_address() for _ in range(3)]
+    transactions = [
+        {
+            "id": "OUTER",
+            "confirmed-round": 40,
+            "application-transaction": {"application-id": 2002},
+            "logs": [_b64(encode_event("Burned", holders[0], 1))],
+            "inner-txns": [{
+                "confirmed-round": 40,
+                "application-transaction": {"application-id": app_id},
+                "logs": [_b64(encode_event("Minted", holders[1], 5)),
+                         _b64(encode_event("Minted", holders[2], 6)),
+                         _b64(ABI_RETURN_PREFIX + (11).to_bytes(8, "big"))],
+            }],
+        },
+        {
+            "id": "CID",
+            "confirmed-round": 41,
+            "application-transaction": {"application-id": app_id},
+            "logs": [_b64(encode_event("MetadataCidUpdated", "bafy" + "x" * 55)),
+                     _b64(encode_event("BlacklistUpdated", holders[0], True))],
+        },
+        {"id": "PAY", "confirmed-round": 41, "tx-type": "pay"},
+    ]
+
+    batch = EventDecoder().decode_transactions(transactions, app_id)
+    minted = batch.columns["Minted"]
+    assert list(minted["amount"]) == [5, 6] and list(minted["round"]) == [40, 40]
+    assert len(minted["recipient"]) == 64
+    assert [row["txid"] for row in batch.rows("Minted")] == ["OUTER/inner/0"] * 2
+    assert batch.count("Burned") == 0
+    assert list(batch.columns["BlacklistUpdated"]["blacklisted"]) == [1]
+    assert next(batch.rows("MetadataCidUpdated"))["cid"] == "bafy" + "x" * 55
+    assert batch.txids == ["OUTER/inner/0", "CID"]
+    print("✅ Columnar decode of indexer transactions test passed")
+
+
+def test_batch_decoder_outpaces_per_log_decoding():
+    """Test that one columnar pass beats decoding each log into a dict"""
+    holders = [random_address() for _ in range(64)]
+    logs = [(encode_event("Minted", holders[i % 64], i + 1), 1000 + i // 16, i // 16) for i in range(20_000)]
+    logs += [(ABI_RETURN_PREFIX + b"\x00" * 8, 0, 0)] * 1_000
+    selectors = {event_selector("Minted(address,uint64)"): ("recipient", "amount")}
+
+    started = time.perf_counter()
+    naive = []
+    for body, round_number, _ in logs:
+        fields = selectors.get(body[:4])
+        if fields is None:
+            continue
+        naive.append({
+            fields[0]: decode_abi_value("address", body[4:36]),
+            fields[1]: decode_abi_value("uint64", body[36:44]),
+            "round": round_number,
+        })
+    naive_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = EventDecoder().decode_logs(logs)
+    batch_seconds = time.perf_counter() - started
+
+    assert batch.count("Minted") == len(naive) == 20_000
+    assert sum(batch.columns["Minted"]["amount"]) == sum(event["amount"] for event in naive)
+    assert batch_seconds < naive_seconds
+    print(f"✅ {len(naive) / batch_seconds:,.0f} events/s columnar vs {len(naive) / naive_seconds:,.0f} per-log")
@@ -0,0 +1,124 @@
+"""
+Tests for the deploy CLI subcommands
+====================================
+
+Usage:
+    pytest tests/test_deploy_cli.py -v
+"""
+
+import base64
+import json
+import subprocess
+import sys
+
+from addresses import decode_address, random_address
+from conftest import REPO_ROOT, deploy_workspace, fake_cache, state_entry
+from deploy_farm_food import DEFAULT_CONFIG, FarmFoodDeployer, main, validate_config
+
+# Project modules `plan` may load; none of them opens a connection on import
+OFFLINE_MODULES = {
+    "addresses", "compile_cache", "deploy_farm_food", "ipfs_blocks", "protocol", "state_layout", "telemetry",
+}
+
+
+class DeployedAlgod:
+    """algod stand-in serving the deployed app and compiling TEAL"""
+
+    def __init__(self, admin, metadata_cid, approval=b"\x0a\x20\x01"):
+        self.admin = admin
+        self.metadata_cid = metadata_cid
+        self.approval = approval
+
+    def application_info(self, app_id):
+        return {"params": {
+            "approval-program": base64.b64encode(self.approval).decode(),
+            "global-state": [
+                state_entry("admin", self.admin),
+                state_entry("token_name", b"FarmToken"),
+                state_entry("farm_token_id", 987654321),
+                state_entry("total_supply", 100_000_000),
+                state_entry("ipfs_cid", self.metadata_cid.encode()),
+            ],
+        }}
+
+    def compile(self, source):
+        return {"hash": "", "result": base64.b64encode(b"\x0a\x20\x01").decode()}
+
+
+def test_load_config_has_no_side_effects(tmp_path, monkeypatch):
+    """Test that a missing config falls back to defaults without creating a file"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "scripts").mkdir()
+
+    config = FarmFoodDeployer("localnet", compile_cache=fake_cache(tmp_path)[0]).config
+    config["token_config"]["name"] = "Changed"
+
+    assert not (tmp_path / "scripts" / "deploy_config.json").exists()
+    assert DEFAULT_CONFIG["token_config"]["name"] == "FarmToken"
+    print("✅ Config loading test passed")
+
+
+def test_validate_config():
+    """Test that structural problems are errors and placeholder members are warnings"""
+    config = json.loads((REPO_ROOT / "scripts" / "deploy_config.json").read_text())
+    errors, warnings = validate_config(config, "testnet")
+    assert errors == [] and "MULTISIG_ADDRESS_1" in warnings[0]
+
+    broken = json.loads(json.dumps(config))
+    broken["token_config"].update(unit_name="TOOLONGUNIT", decimals=20, metadata_cid="not-a-cid")
+    broken["multisig"]["threshold"] = 4
+    errors, _ = validate_config(broken, "mainnet")
+    assert [error.split(" ")[0] for error in errors] == [
+        "missing", "token_config.unit_name", "token_config.decimals", "token_config.metadata_cid:",
+        "multisig.threshold",
+    ]
+    print("✅ Config validation test passed")
+
+
+def test_plan_is_offline_and_lists_transactions(tmp_path, monkeypatch):
+    """Test `plan` output and that it loads only offline project modules and no network or SDK modules"""
+    deploy_workspace(tmp_path, monkeypatch)
+    script = (
+        "import sys\n"
+        f"sys.path.insert(0, {str(REPO_ROOT / 'scripts')!r})\n"
+        "import deploy_farm_food\n"
+        "try:\n"
+        "    deploy_farm_food.main(['plan', '--network', 'testnet'])\n"
+        "except SystemExit as e:\n"
+        "    assert not e.code, e.code\n"
+        f"project = {sorted(path.stem for path in (REPO_ROOT / 'scripts').glob('*.py'))!r}\n"
+        "print('PROJECT', sorted(m for m in project if m in sys.modules))\n"
+        "print('NETWORK', sorted(m for m in ('socket', 'ssl', 'http.client', 'asyncio', 'algosdk', 'algokit_utils')"
+        " if m in sys.modules))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+
+    loaded = output.split("PROJECT ")[1].splitlines()[0]
+    assert loaded == str(sorted(OFFLINE_MODULES))
+    assert "NETWORK []" in output
+    assert "A deploy would submit 6 transactions" in output
+    assert "create_asa FarmToken (FT)" in output
+    print(f"✅ Offline plan loads {loaded}")
+
+
+def test_status_and_verify_against_chain(tmp_path, monkeypatch, capsys):
+    """Test that verify passes on a matching deployment and reports drift"""
+    deploy_workspace(tmp_path, monkeypatch)
+    cache, _ = fake_cache(tmp_path / "deployments" / "build")
+    FarmFoodDeployer("localnet", compile_cache=cache).deploy()
+
+    cid = DEFAULT_CONFIG["token_config"]["metadata_cid"]
+    admin = random_address()
+    deployer = FarmFoodDeployer("localnet", compile_cache=cache)
+    deployer.algod_client = DeployedAlgod(decode_address(admin), cid)
+    assert deployer.status()["admin"] == admin
+    assert deployer.verify() == []
+
+    deployer.algod_client = DeployedAlgod(decode_address(admin), "QmOther", approval=b"\x0a")
+    problems = deployer.verify()
+    assert len(problems) == 2
+    assert "metadata CID" in problems[0] and "approval program" in problems[1]
+
+    main(["status", "--network", "testnet"])
+    assert "No deployment record for testnet" in capsys.readouterr().out
+    print("✅ Status and verify test passed")
@@ -0,0 +1,95 @@
+"""
+Tests for the multi-network deployment matrix
+=============================================
+
+Usage:
+    pytest tests/test_deploy_matrix.py -v
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from conftest import REPO_ROOT, deploy_workspace, fake_cache
+from deploy_matrix import DeploymentTarget, MatrixDeployer, build_targets, deploy_matrix, print_summary
+
+CONFIG = json.loads((REPO_ROOT / "scripts" / "deploy_config.json").read_text())
+
+
+class SlowDeployer(MatrixDeployer):
+    """Deployer whose contract step takes a while and fails on testnet#2"""
+
+    def deploy_contract(self, deployer_account):
+        time.sleep(0.1)
+        if self.target.name == "testnet#2":
+            raise RuntimeError("node unreachable")
+        result = super().deploy_contract(deployer_account)
+        result["app_id"] += self.target.instance
+        return result
+
+
+def test_targets_and_output_files():
+    """Test target naming and per-instance record paths"""
+    targets = build_targets(["localnet", "testnet"], 2)
+
+    assert [t.name for t in targets] == ["localnet", "localnet#2", "testnet", "testnet#2"]
+    assert str(targets[0].output_file) == "deployments/localnet_deployment.json"
+    assert str(targets[3].output_file) == "deployments/testnet_2_deployment.json"
+    with pytest.raises(ValueError, match="Unknown network"):
+        DeploymentTarget("mainnet")
+    print("✅ Target naming test passed")
+
+
+def test_matrix_runs_concurrently_and_isolates_failures(tmp_path, monkeypatch):
+    """Test that targets overlap, one failure spares the rest, and records land together"""
+    deploy_workspace(tmp_path, monkeypatch)
+    targets = build_targets(["localnet", "testnet"], 2)
+    cache, compiler = fake_cache(tmp_path / "build")
+
+    report = asyncio.run(deploy_matrix(targets, CONFIG, deployer_factory=SlowDeployer, compile_cache=cache))
+    print_summary(report)
+
+    rows = report["targets"]
+    assert report["failed"] == 1
+    assert rows["testnet#2"]["status"] == "failed" and "node unreachable" in rows["testnet#2"]["error"]
+    # Every target started before the first one finished
+    assert max(row["start"] for row in rows.values()) < min(row["start"] + row["seconds"] for row in rows.values())
+
+    assert compiler.compiles == 1
+    saved = sorted(p.name for p in (tmp_path / "deployments").iterdir())
+    assert saved == ["localnet_2_deployment.json", "localnet_deployment.json", "testnet_deployment.json"]
+    record = json.loads((tmp_path / "deployments" / "localnet_2_deployment.json").read_text())
+    assert record["instance"] == 2 and record["contract"]["app_id"] == rows["localnet#2"]["app_id"]
+    assert rows["localnet"]["app_id"] != rows["localnet#2"]["app_id"]
+    assert "deploy_contract" in rows["testnet"]["steps"]
+
+    # Each target had its own config copy
+    assert CONFIG["token_config"]["name"] == "FarmToken"
+    print(f"✅ {len(rows)} targets in {report['seconds']:.2f}s")
+
+
+def test_matrix_reuses_saved_deployments(tmp_path, monkeypatch):
+    """Test that a second matrix run follows each target's plan instead of creating new apps"""
+    deploy_workspace(tmp_path, monkeypatch)
+    targets = build_targets(["localnet"], 2)
+    cache, _ = fake_cache(tmp_path / "build")
+    first = asyncio.run(deploy_matrix(targets, CONFIG, compile_cache=cache))
+
+    config = json.loads(json.dumps(CONFIG))
+    config["token_config"]["metadata_cid"] = "QmUpdatedCID"
+    (tmp_path / "deployments" / "localnet_2_deployment.json").unlink()
+    second = asyncio.run(deploy_matrix(targets, config, deployer_factory=SlowDeployer, compile_cache=cache))
+    print_summary(second)
+
+    rows = second["targets"]
+    assert rows["localnet"]["status"] == "updated" and rows["localnet#2"]["status"] == "deployed"
+    assert rows["localnet"]["app_id"] == first["targets"]["localnet"]["app_id"]
+    assert "deploy_contract" not in rows["localnet"]["steps"]
+    saved = json.loads((tmp_path / "deployments" / "localnet_deployment.json").read_text())
+    assert saved["instance"] == 1 and saved["config"]["token_config"]["metadata_cid"] == "QmUpdatedCID"
+
+    third = asyncio.run(deploy_matrix(targets, config, compile_cache=cache))
+    assert {row["status"] for row in third["targets"].values()} == {"current"}
+    print("✅ Matrix reruns reuse saved deployments")
@@ -9,62 +9,66 @@ This test suite covers all smart contract functionality including:
 - Metadata CID management
 - Multisig enforcement
 
+Tests run against FarmFoodSimulator (scripts/farm_food_simulator.py), an
+in-process engine with the same state transitions and failure messages as
+the contract, so the suite needs no LocalNet.
+
 Requirements:
 - pytest
-- AlgoKit test utilities
-- algosdk
 
 Usage:
     pytest tests/test_farm_food.py -v
     pytest tests/test_farm_food.py::TestFarmFoodTokenizer::test_create_asa -v
 """
 
+import json
+
 import pytest
-from pathlib import Path
-from typing import Dict, Any
 
-# Import AlgoKit test utilities (placeholder - actual imports would be from algokit_utils)
-# from algokit_utils.beta.algorand_client import AlgorandClient
-# from algokit_utils.beta.application_client import ApplicationClient
-# from algosdk import account
-# from algosdk.v2client import algod
+from addresses import multisig_address, random_address
+from benchmark import WORKLOADS, find_regressions, run_benchmarks, run_workload, setup_context, warmup_iterations
+from farm_food_simulator import ContractError, FarmFoodSimulator
+from ipfs_blocks import BlockStore
+from ipfs_metadata import MetadataClient
+
+
+def _create_token(simulator: FarmFoodSimulator, admin: str) -> int:
+    return simulator.create_asa(
+        admin, "FarmToken", "FT", 1_000_000_00, 2, "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"
+    )
+
+
+@pytest.fixture
+def setup_test_environment():
+    """Set up test environment with a simulated contract and ASA"""
+    admin, user, blacklisted = random_address(), random_address(), random_address()
+    simulator = FarmFoodSimulator(admin)
+    asset_id = _create_token(simulator, admin)
+    for address in (admin, user, blacklisted):
+        simulator.opt_in(address)
+
+    test_context = {
+        "admin_account": {"address": admin},
+        "user_account": {"address": user},
+        "blacklisted_account": {"address": blacklisted},
+        "simulator": simulator,
+        "asset_id": asset_id,
+        "contract_app_id": simulator.app_id,
+        "contract_address": simulator.app_address,
+    }
+
+    return test_context
+
 
 class TestFarmFoodTokenizer:
     """
     Test cases for Farm Food Tokenization smart contract
     """
     
-    @pytest.fixture
-    def setup_test_environment(self):
-        """Set up test environment with LocalNet"""
-        # In actual implementation:
-        # 1. Start LocalNet
-        # 2. Create test accounts
-        # 3. Deploy contract
-        # 4. Return test context
-        
-        test_context = {
-            "admin_account": {
-                "address": "ADMIN_TEST_ADDRESS",
-                "private_key": "ADMIN_TEST_PRIVATE_KEY"
-            },
-            "user_account": {
-                "address": "USER_TEST_ADDRESS", 
-                "private_key": "USER_TEST_PRIVATE_KEY"
-            },
-            "blacklisted_account": {
-                "address": "BLACKLISTED_TEST_ADDRESS",
-                "private_key": "BLACKLISTED_TEST_PRIVATE_KEY"
-            },
-            "contract_app_id": 123456789,
-            "contract_address": "CONTRACT_TEST_ADDRESS"
-        }
-        
-        return test_context
-    
-    def test_create_asa(self, setup_test_environment):
+    def test_create_asa(self):
         """Test ASA creation with metadata"""
-        context = setup_test_environment
+        admin = random_address()
+        simulator = FarmFoodSimulator(admin)
         
         # Test data
         asset_name = "Test Farm Potato Batch"
@@ -73,191 +77,178 @@ class TestFarmFoodTokenizer:
         decimals = 2
         metadata_cid = "QmTestCID123456789"
         
-        # In actual implementation:
-        # 1. Call create_asa method
-        # 2. Verify transaction success
-        # 3. Check asset properties
-        # 4. Verify metadata URL
-        
-        # Mock test assertions
-        assert True  # Asset created successfully
-        print(f"✅ ASA created: {asset_name} ({unit_name})")
-        print(f"   Total Supply: {total_supply}")
-        print(f"   Decimals: {decimals}")
-        print(f"   Metadata CID: {metadata_cid}")
+        with pytest.raises(ContractError, match="Only admin can create ASA"):
+            simulator.create_asa(random_address(), asset_name, unit_name, total_supply, decimals, metadata_cid)
+        
+        asset_id = simulator.create_asa(admin, asset_name, unit_name, total_supply, decimals, metadata_cid)
+        asset = simulator.assets[asset_id]
+        
+        assert asset["name"] == asset_name
+        assert asset["unit_name"] == unit_name
+        assert asset["total"] == total_supply
+        assert asset["decimals"] == decimals
+        assert asset["url"] == f"ipfs://{metadata_cid}"
+        assert asset["reserve"] == simulator.app_address
+        assert simulator.balance(simulator.app_address) == total_supply
+        
+        with pytest.raises(ContractError, match="ASA already created"):
+            simulator.create_asa(admin, asset_name, unit_name, total_supply, decimals, metadata_cid)
+        
+        print(f"✅ ASA created: {asset_name} ({unit_name}), asset ID {asset_id}")
     
     def test_mint_tokens_admin_only(self, setup_test_environment):
         """Test that only admin can mint tokens"""
         context = setup_test_environment
-        
-        # Test successful minting by admin
-        mint_amount = 1000
+        simulator = context["simulator"]
+        admin = context["admin_account"]["address"]
         recipient = context["user_account"]["address"]
+        mint_amount = 1000
         
-        # In actual implementation:
-        # 1. Call mint_tokens as admin
-        # 2. Verify transaction success
-        # 3. Check recipient balance
-        
-        # Mock test assertion
-        assert True  # Admin can mint
+        # Test successful minting by admin
+        assert simulator.mint_tokens(admin, recipient, mint_amount) == "success"
+        assert simulator.balance(recipient) == mint_amount
         print(f"✅ Admin successfully minted {mint_amount} tokens to {recipient}")
         
         # Test failed minting by non-admin
-        # In actual implementation:
-        # 1. Call mint_tokens as regular user
-        # 2. Expect transaction to fail
-        # 3. Verify error message
+        with pytest.raises(ContractError, match="Only admin can mint tokens"):
+            simulator.mint_tokens(recipient, recipient, mint_amount)
+        assert simulator.balance(recipient) == mint_amount
         
-        # Mock test assertion
-        with pytest.raises(Exception, match="Only admin can mint tokens"):
-            # Mock: non-admin tries to mint
-            pass
+        with pytest.raises(ContractError, match="Amount must be positive"):
+            simulator.mint_tokens(admin, recipient, 0)
+        with pytest.raises(ContractError, match="Mint exceeds available supply"):
+            simulator.mint_tokens(admin, recipient, simulator.total_supply)
         
         print("✅ Non-admin correctly prevented from minting")
     
+    def test_mint_tokens_batch(self, setup_test_environment):
+        """Test batch minting is all-or-nothing"""
+        context = setup_test_environment
+        simulator = context["simulator"]
+        admin = context["admin_account"]["address"]
+        recipients = [random_address() for _ in range(4)]
+        for recipient in recipients:
+            simulator.opt_in(recipient)
+        
+        assert simulator.mint_tokens_batch(admin, recipients, [10, 20, 30, 40]) == 100
+        assert [simulator.balance(r) for r in recipients] == [10, 20, 30, 40]
+        
+        # A single bad entry rejects the whole batch
+        with pytest.raises(ContractError, match="Receiver not opted in to asset"):
+            simulator.mint_tokens_batch(admin, recipients + [random_address()], [1] * 5)
+        assert [simulator.balance(r) for r in recipients] == [10, 20, 30, 40]
+    
     def test_burn_tokens_admin_only(self, setup_test_environment):
         """Test that only admin can burn tokens"""
         context = setup_test_environment
-        
-        # Test successful burning by admin
+        simulator = context["simulator"]
+        admin = context["admin_account"]["address"]
+        user = context["user_account"]["address"]
         burn_amount = 500
         
-        # In actual implementation:
-        # 1. First mint some tokens to admin
-        # 2. Call burn_tokens as admin
-        # 3. Verify transaction success
-        # 4. Check supply reduction
+        # First mint some tokens to admin, then burn part of them
+        simulator.mint_tokens(admin, admin, 1000)
+        reserve = simulator.balance(simulator.app_address)
         
-        # Mock test assertion
-        assert True  # Admin can burn
+        assert simulator.burn_tokens(admin, burn_amount) == "success"
+        assert simulator.balance(admin) == 500
+        assert simulator.balance(simulator.app_address) == reserve + burn_amount
         print(f"✅ Admin successfully burned {burn_amount} tokens")
         
         # Test failed burning by non-admin
-        # In actual implementation:
-        # 1. Call burn_tokens as regular user
-        # 2. Expect transaction to fail
-        # 3. Verify error message
-        
-        # Mock test assertion
-        with pytest.raises(Exception, match="Only admin can burn tokens"):
-            # Mock: non-admin tries to burn
-            pass
+        with pytest.raises(ContractError, match="Only admin can burn tokens"):
+            simulator.burn_tokens(user, burn_amount)
+        with pytest.raises(ContractError, match="Insufficient asset balance"):
+            simulator.burn_tokens(admin, 501)
         
         print("✅ Non-admin correctly prevented from burning")
     
     def test_blacklist_functionality(self, setup_test_environment):
         """Test blacklist add/remove functionality"""
         context = setup_test_environment
+        simulator = context["simulator"]
+        admin = context["admin_account"]["address"]
         blacklisted_address = context["blacklisted_account"]["address"]
         
         # Test adding to blacklist
-        # In actual implementation:
-        # 1. Call add_to_blacklist as admin
-        # 2. Verify transaction success
-        # 3. Check is_blacklisted returns True
-        
-        # Mock test assertion
-        assert True  # Address added to blacklist
+        assert not simulator.is_blacklisted(blacklisted_address)
+        assert simulator.add_to_blacklist(admin, blacklisted_address) == "success"
+        assert simulator.is_blacklisted(blacklisted_address)
         print(f"✅ Address {blacklisted_address} added to blacklist")
         
-        # Test blacklist check
-        # In actual implementation:
-        # 1. Call is_blacklisted method
-        # 2. Verify returns True for blacklisted address
-        
-        # Mock test assertion
-        is_blacklisted = True  # Mock result
-        assert is_blacklisted
-        print("✅ Blacklist check working correctly")
+        with pytest.raises(ContractError, match="Only admin can manage blacklist"):
+            simulator.add_to_blacklist(context["user_account"]["address"], random_address())
         
         # Test removing from blacklist
-        # In actual implementation:
-        # 1. Call remove_from_blacklist as admin
-        # 2. Verify transaction success
-        # 3. Check is_blacklisted returns False
-        
-        # Mock test assertion
-        assert True  # Address removed from blacklist
+        assert simulator.remove_from_blacklist(admin, blacklisted_address) == "success"
+        assert not simulator.is_blacklisted(blacklisted_address)
         print(f"✅ Address {blacklisted_address} removed from blacklist")
+        
+        # Batch variants report how many entries changed
+        batch = [random_address() for _ in range(8)]
+        assert simulator.add_to_blacklist_batch(admin, batch + batch[:2]) == 8
+        assert simulator.remove_from_blacklist_batch(admin, batch[:5]) == 5
+        assert sum(simulator.is_blacklisted(a) for a in batch) == 3
     
     def test_transfer_restrictions(self, setup_test_environment):
         """Test transfer restrictions for blacklisted addresses"""
         context = setup_test_environment
-        
-        # Setup: Add address to blacklist
+        simulator = context["simulator"]
+        admin = context["admin_account"]["address"]
         blacklisted_address = context["blacklisted_account"]["address"]
+        normal_address = context["user_account"]["address"]
+        transfer_amount = 100
         
-        # Test transfer to blacklisted address fails
-        # In actual implementation:
-        # 1. Add address to blacklist
-        # 2. Try to transfer tokens to blacklisted address
-        # 3. Expect transaction to fail
-        # 4. Verify error message
+        # Setup: fund the admin and add address to blacklist
+        simulator.mint_tokens(admin, admin, 1000)
+        simulator.add_to_blacklist(admin, blacklisted_address)
         
-        # Mock test assertion
-        with pytest.raises(Exception, match="Recipient is blacklisted"):
-            # Mock: transfer to blacklisted address
-            pass
+        # Test mint to blacklisted address fails, alone or anywhere in a batch
+        with pytest.raises(ContractError, match="Recipient is blacklisted"):
+            simulator.mint_tokens(admin, blacklisted_address, transfer_amount)
+        with pytest.raises(ContractError, match="Recipient is blacklisted"):
+            simulator.mint_tokens_batch(admin, [normal_address, blacklisted_address], [1, 1])
+        assert simulator.balance(blacklisted_address) == 0
+        assert simulator.balance(normal_address) == 0
         
-        print("✅ Transfer to blacklisted address correctly blocked")
+        print("✅ Mint to blacklisted address correctly blocked")
         
         # Test transfer to normal address succeeds
-        normal_address = context["user_account"]["address"]
-        transfer_amount = 100
-        
-        # In actual implementation:
-        # 1. Transfer tokens to normal address
-        # 2. Verify transaction success
-        # 3. Check recipient balance
+        simulator.transfer(admin, normal_address, transfer_amount)
+        assert simulator.balance(normal_address) == transfer_amount
+        assert simulator.balance(admin) == 900
         
-        # Mock test assertion
-        assert True  # Transfer successful
         print(f"✅ Transfer to normal address successful: {transfer_amount} tokens to {normal_address}")
     
     def test_metadata_cid_management(self, setup_test_environment):
         """Test IPFS metadata CID management"""
         context = setup_test_environment
+        simulator = context["simulator"]
+        admin = context["admin_account"]["address"]
         
         # Test getting current CID
-        # In actual implementation:
-        # 1. Call get_metadata_cid method
-        # 2. Verify returns expected CID
-        
-        current_cid = "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"  # Mock
-        assert current_cid is not None
+        current_cid = simulator.get_metadata_cid()
+        assert current_cid == "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"
         print(f"✅ Current metadata CID: {current_cid}")
         
         # Test updating CID (admin only)
         new_cid = "QmNewTestCID987654321"
-        
-        # In actual implementation:
-        # 1. Call update_metadata_cid as admin
-        # 2. Verify transaction success
-        # 3. Check get_metadata_cid returns new CID
-        
-        # Mock test assertion
-        assert True  # CID updated successfully
+        assert simulator.update_metadata_cid(admin, new_cid) == "success"
+        assert simulator.get_metadata_cid() == new_cid
         print(f"✅ Metadata CID updated to: {new_cid}")
         
         # Test non-admin cannot update CID
-        # In actual implementation:
-        # 1. Call update_metadata_cid as regular user
-        # 2. Expect transaction to fail
-        # 3. Verify error message
-        
-        # Mock test assertion
-        with pytest.raises(Exception, match="Only admin can update metadata"):
-            # Mock: non-admin tries to update CID
-            pass
+        with pytest.raises(ContractError, match="Only admin can update metadata"):
+            simulator.update_metadata_cid(context["user_account"]["address"], "QmAttackerCID")
+        assert simulator.get_metadata_cid() == new_cid
         
         print("✅ Non-admin correctly prevented from updating metadata CID")
     
-    def test_ipfs_metadata_fetch(self, setup_test_environment):
+    def test_ipfs_metadata_fetch(self, setup_test_environment, tmp_path):
         """Test IPFS metadata fetching and validation"""
         context = setup_test_environment
+        simulator = context["simulator"]
         
-        # Mock IPFS metadata
         expected_metadata = {
             "name": "Farm Potato Batch 014",
             "origin": "Punjab, India", 
@@ -268,15 +259,20 @@ class TestFarmFoodTokenizer:
             "certification": "Organic"
         }
         
-        # Test fetching metadata from IPFS
-        # In actual implementation:
-        # 1. Get CID from contract
-        # 2. Fetch metadata from IPFS gateway
-        # 3. Parse JSON response
-        # 4. Validate structure
+        # Pin the document to a local IPFS stand-in and point the contract at it
+        gateway = BlockStore(tmp_path / "gateway")
+        cid = gateway.add_file(json.dumps(expected_metadata).encode())
+        simulator.update_metadata_cid(context["admin_account"]["address"], cid)
+        
+        # Get CID from contract, fetch through the verifying client, parse JSON
+        client = MetadataClient(
+            ["http://gateway.local/ipfs/"],
+            BlockStore(tmp_path / "cache"),
+            fetch=lambda url, block_cid: gateway.get(block_cid),
+        )
+        metadata = client.get_json(simulator.get_metadata_cid())
         
-        # Mock test assertion
-        metadata = expected_metadata  # Mock fetch result
+        assert metadata == expected_metadata
         assert metadata["name"] == "Farm Potato Batch 014"
         assert metadata["origin"] == "Punjab, India"
         assert metadata["batchId"] == "F014P"
@@ -290,68 +286,45 @@ class TestFarmFoodTokenizer:
         """Test getting contract information"""
         context = setup_test_environment
         
-        # Test getting contract info
-        # In actual implementation:
-        # 1. Call get_contract_info method
-        # 2. Verify returns expected values
+        token_name, asset_id, total_supply, minted, burned, circulating = context["simulator"].get_contract_info()
         
-        # Mock test assertion
-        contract_info = {
-            "token_name": "FarmToken",
-            "asset_id": 987654321,
-            "total_supply": 1000000
-        }
-        
-        assert contract_info["token_name"] == "FarmToken"
-        assert contract_info["asset_id"] > 0
-        assert contract_info["total_supply"] == 1000000
+        assert token_name == "FarmToken"
+        assert asset_id == context["asset_id"] > 0
+        assert total_supply == 1_000_000_00
+        assert minted == burned == circulating == 0
         
         print("✅ Contract info retrieved successfully")
-        print(f"   Token: {contract_info['token_name']}")
-        print(f"   Asset ID: {contract_info['asset_id']}")
-        print(f"   Supply: {contract_info['total_supply']}")
+        print(f"   Token: {token_name}")
+        print(f"   Asset ID: {asset_id}")
+        print(f"   Supply: {total_supply}")
     
-    def test_multisig_enforcement(self, setup_test_environment):
+    def test_multisig_enforcement(self):
         """Test multisig enforcement for critical operations"""
-        context = setup_test_environment
+        signers = [random_address() for _ in range(3)]
+        admin = multisig_address(2, signers)
+        
+        simulator = FarmFoodSimulator(admin)
+        assert simulator.register_multisig(2, signers) == admin
+        _create_token(simulator, admin)
+        simulator.opt_in(signers[0])
         
-        # Test that critical operations require multisig
-        # In actual implementation:
-        # 1. Try operation with single signature
-        # 2. Expect failure
-        # 3. Try with multisig (2-of-3)
-        # 4. Expect success
+        # A single signature cannot authorize an admin call
+        with pytest.raises(ContractError, match="Multisig threshold not met"):
+            simulator.authorize(admin, signers[:1])
         
-        # Mock test assertion
-        single_sig_success = False
-        multisig_success = True
+        # 2-of-3 signatures can
+        sender = simulator.authorize(admin, signers[1:])
+        simulator.mint_tokens(sender, signers[0], 10)
+        assert simulator.balance(signers[0]) == 10
         
-        assert not single_sig_success
-        assert multisig_success
+        # Individual members are not the admin
+        with pytest.raises(ContractError, match="Only admin can mint tokens"):
+            simulator.mint_tokens(simulator.authorize(signers[0], signers[:1]), signers[0], 10)
         
         print("✅ Multisig enforcement working correctly")
         print("   Single signature: Rejected")
         print("   2-of-3 multisig: Accepted")
 
-# Integration test fixtures
-@pytest.fixture(scope="session")
-def localnet_setup():
-    """Set up LocalNet for integration tests"""
-    # In actual implementation:
-    # 1. Start LocalNet using AlgoKit
-    # 2. Wait for network to be ready
-    # 3. Create funded test accounts
-    # 4. Return cleanup function
-    
-    print("🚀 Setting up LocalNet for integration tests...")
-    
-    yield {
-        "network": "localnet",
-        "status": "ready"
-    }
-    
-    print("🧹 Cleaning up LocalNet...")
-
 # Test data fixtures
 @pytest.fixture
 def sample_metadata():
@@ -372,21 +345,43 @@ def sample_metadata():
 class TestPerformance:
     """Performance tests for the smart contract"""
     
-    def test_bulk_operations_performance(self, setup_test_environment):
-        """Test performance of bulk operations"""
-        # In actual implementation:
-        # 1. Perform multiple mint operations
-        # 2. Measure transaction times
-        # 3. Verify performance meets requirements
+    def test_bulk_operations_performance(self):
+        """Test throughput and tail latency of every benchmarked ABI method"""
+        operations_count = 500
+        results = run_benchmarks(iterations=operations_count)
         
-        operations_count = 100
-        avg_time_per_op = 0.5  # Mock: 500ms per operation
-        
-        assert avg_time_per_op < 1.0  # Should be under 1 second
+        assert set(results) == set(WORKLOADS)
+        for method, result in results.items():
+            assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
         
         print(f"✅ Bulk operations performance test passed")
-        print(f"   Operations: {operations_count}")
-        print(f"   Avg time: {avg_time_per_op}s per operation")
+        print(f"   Operations: {operations_count} per method")
+        for method, result in results.items():
+            print(f"   {method}: {result['ops_per_sec']:.0f} ops/sec, p99 {result['p99_ms']:.4f}ms")
+    
+    def test_blacklist_workloads_change_state_on_every_call(self):
+        """Test that warm-up and timed blacklist calls each get a fresh address"""
+        iterations = 200
+        fresh = iterations + warmup_iterations(iterations)
+        
+        for method, change in [("add_to_blacklist", 1), ("remove_from_blacklist", -1)]:
+            ctx = setup_context(fresh=fresh)
+            before = len(ctx["simulator"].blacklist)
+            run_workload(ctx, WORKLOADS[method], iterations)
+            assert len(ctx["simulator"].blacklist) - before == change * fresh, method
+        
+        print("✅ Every blacklist benchmark call changes the blacklist")
+    
+    def test_regression_detection(self):
+        """Test that slower runs are flagged against a baseline"""
+        baseline = {"mint_tokens": {"ops_per_sec": 10_000, "p95_ms": 0.5}}
+        
+        steady = {"mint_tokens": {"ops_per_sec": 9_000, "p95_ms": 0.55}}
+        slower = {"mint_tokens": {"ops_per_sec": 5_000, "p95_ms": 1.0}}
+        
+        assert find_regressions(steady, baseline, threshold=0.25) == []
+        assert len(find_regressions(slower, baseline, threshold=0.25)) == 2
+        assert find_regressions(slower, baseline, threshold=1.5) == []
 
 # Run tests
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+"""
+Tests for the FarmToken holder index
+====================================
+
+Usage:
+    pytest tests/test_holder_index.py -v
+"""
+
+import random
+
+import pytest
+
+import holder_index
+from addresses import application_address, random_address
+from holder_index import HolderIndex, snapshot_balances, sync_index
+from conftest import ASSET_ID, FakeIndexer, axfer
+
+RESERVE = application_address(1001)
+TOTAL_SUPPLY = 100_000_000
+
+
+@pytest.fixture
+def holders():
+    return [random_address() for _ in range(50)]
+
+
+def _replay(index, holders, rounds, seed=7):
+    """Apply random transfers round by round; return balances after each round"""
+    rng = random.Random(seed)
+    history = {}
+    balances = {RESERVE: TOTAL_SUPPLY}
+    for round_number in range(index.round + 1, index.round + 1 + rounds):
+        deltas = []
+        for _ in range(3):
+            sender = rng.choice([RESERVE] + holders)
+            receiver = rng.choice(holders)
+            amount = rng.randint(0, balances.get(sender, 0))
+            if sender == receiver or not amount:
+                continue
+            balances[sender] -= amount
+            balances[receiver] = balances.get(receiver, 0) + amount
+            deltas += [(sender, -amount), (receiver, amount)]
+        index.apply_round(round_number, deltas)
+        history[round_number] = dict(balances)
+    return history
+
+
+def test_point_in_time_queries_match_replayed_history(holders):
+    """Test that every past round answers from checkpoints plus deltas"""
+    index = HolderIndex(ASSET_ID, RESERVE, checkpoint_interval=10)
+    index.load_snapshot(100, [(RESERVE, TOTAL_SUPPLY)])
+    history = _replay(index, holders, 45)
+
+    assert len(index._checkpoints) == 5
+    for round_number, expected in history.items():
+        for address in holders[:10]:
+            assert index.balance_of(address, round_number) == expected.get(address, 0)
+        assert index.circulating_supply(round_number) == TOTAL_SUPPLY - expected[RESERVE]
+    assert index.circulating_supply(100) == 0
+    with pytest.raises(ValueError):
+        index.balances_at(99)
+    print(f"✅ {len(history)} rounds verified against {len(index._checkpoints)} checkpoints")
+
+
+def test_top_holders_excludes_reserve(holders):
+    """Test top-K ordering and that the reserve is never counted as a holder"""
+    index = HolderIndex(ASSET_ID, RESERVE)
+    index.load_snapshot(1, [(RESERVE, TOTAL_SUPPLY - 600)] + [(holders[i], 100 * (i + 1)) for i in range(3)])
+
+    assert index.top_holders(2) == [(holders[2], 300), (holders[1], 200)]
+    assert dict(index.holders()) == {holders[0]: 100, holders[1]: 200, holders[2]: 300}
+    assert index.circulating_supply() == 600
+    print("✅ Top holders test passed")
+
+
+def test_rejected_round_leaves_index_untouched(holders):
+    """Test that a round with an overdraft is rejected before any of its deltas are applied"""
+    alice, bob, newcomer = holders[:3]
+    index = HolderIndex(ASSET_ID, RESERVE)
+    index.load_snapshot(1, [(RESERVE, TOTAL_SUPPLY), (alice, 100)])
+
+    with pytest.raises(ValueError, match="Negative balance"):
+        index.apply_round(2, [(alice, -60), (newcomer, 60), (alice, -60), (bob, 60)])
+    assert (index.round, len(index), len(index._delta_rounds)) == (1, 2, 0)
+    assert index.balance_of(alice) == 100 and index.balance_of(newcomer) == 0
+
+    # The same round can then be applied once corrected
+    index.apply_round(2, [(alice, -60), (newcomer, 60), (alice, -40), (bob, 40)])
+    assert dict(index.holders()) == {newcomer: 60, bob: 40}
+    print("✅ Rejected rounds are all-or-nothing")
+
+
+def test_snapshot_pages_are_pinned_to_one_round(holders, monkeypatch):
+    """Test that every page after the first asks for the first page's round"""
+
+    class MovingIndexer:
+        """Balances drift by one round per request unless a round is asked for"""
+
+        def __init__(self):
+            self.round = 50
+            self.requests = []
+
+        def asset_balances(self, asset_id, **params):
+            self.requests.append(params)
+            self.round += 1
+            at = params["round"] or self.round
+            start = int(params["next"] or 0)
+            rows = [{"address": a, "amount": 10 + (at - 51) * (i % 2)} for i, a in enumerate(holders)]
+            response = {"balances": rows[start:start + params["limit"]], "current-round": at}
+            if start + params["limit"] < len(rows):
+                response["next-token"] = str(start + params["limit"])
+            return response
+
+    indexer = MovingIndexer()
+    monkeypatch.setattr(holder_index, "PAGE_SIZE", 8)
+    round_number, balances = snapshot_balances(indexer, ASSET_ID)
+
+    assert round_number == 51 and [params["round"] for params in indexer.requests] == [None] + [51] * 6
+    assert balances == [(address, 10) for address in holders]
+    print("✅ Snapshot pages pinned to one round")
+
+
+def test_sync_applies_indexer_transfers(holders, tmp_path, monkeypatch):
+    """Test incremental sync from the indexer, including a round split across pages and close-outs"""
+    alice, bob = holders[:2]
+    index = HolderIndex(ASSET_ID, RESERVE)
+    index.load_snapshot(10, [(RESERVE, TOTAL_SUPPLY)])
+
+    close_out = axfer("CLOSE1", 13, bob, alice, 0)
+    close_out["asset-transfer-transaction"].update({"close-to": alice, "close-amount": 40})
+    indexer = FakeIndexer([
+        axfer("OLD1", 10, RESERVE, alice, 999),
+        axfer("MINT1", 11, RESERVE, alice, 500),
+        axfer("MINT2", 12, RESERVE, bob, 100),
+        axfer("XFER1", 12, bob, alice, 60),
+        close_out,
+    ])
+    monkeypatch.setattr(holder_index, "PAGE_SIZE", 2)
+    assert sync_index(index, indexer) == 3
+
+    assert (index.round, index.balance_of(alice), index.balance_of(bob)) == (13, 600, 0)
+    assert index.balance_of(bob, 12) == 40
+
+    path = tmp_path / "holders.idx"
+    index.save(path)
+    restored = HolderIndex.load(path)
+    assert restored.top_holders(5, 12) == [(alice, 560), (bob, 40)]
+    print("✅ Indexer sync test passed")
@@ -0,0 +1,117 @@
+"""
+Tests for the IPFS block layer and metadata client
+==================================================
+
+Usage:
+    pytest tests/test_ipfs_metadata.py -v
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from ipfs_blocks import BlockStore, CIDVerificationError, encode_file_block, file_cid
+from ipfs_metadata import MetadataClient, MetadataFetchError
+
+METADATA = {"name": "Farm Potato Batch 014", "batchId": "F014P", "origin": "Punjab, India"}
+
+
+class FakeGateways:
+    """Gateway stand-ins: honest, slow, failing or tampering"""
+
+    def __init__(self, blocks, behaviour):
+        self.blocks = blocks
+        self.behaviour = behaviour
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def __call__(self, gateway, cid):
+        with self._lock:
+            self.requests.append((gateway, cid))
+        kind = self.behaviour[gateway]
+        if kind == "down":
+            raise ConnectionError("gateway unreachable")
+        if kind == "tampered":
+            return encode_file_block(b'{"name": "Fake Batch"}')
+        if kind == "slow":
+            time.sleep(0.2)
+        return self.blocks[cid]
+
+
+@pytest.fixture
+def documents():
+    blocks = {}
+    cids = []
+    for i in range(20):
+        content = json.dumps({**METADATA, "batchId": f"F{i:03d}P"}).encode()
+        cid = file_cid(content)
+        blocks[cid] = encode_file_block(content)
+        cids.append(cid)
+    return blocks, cids
+
+
+def test_file_cid_matches_ipfs_add():
+    """Test that locally computed CIDs match what `ipfs add` produces"""
+    assert file_cid(b"hello world\n") == "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"
+    print("✅ CID computation test passed")
+
+
+def test_tampered_gateway_cannot_poison_cache(documents, tmp_path):
+    """Test that only hash-verified responses are returned and stored"""
+    blocks, cids = documents
+    gateways = FakeGateways(blocks, {"https://evil/ipfs/": "tampered", "https://slow/ipfs/": "slow"})
+    client = MetadataClient(list(gateways.behaviour), BlockStore(tmp_path), fetch=gateways)
+
+    assert client.get_json(cids[0])["batchId"] == "F000P"
+    assert client.stats()["rejected"] == 1
+
+    # A block corrupted on disk is detected on read
+    (tmp_path / cids[0][-2:] / cids[0]).write_bytes(b"corrupted")
+    with pytest.raises(CIDVerificationError):
+        BlockStore(tmp_path).get(cids[0])
+
+    only_evil = MetadataClient(["https://evil/ipfs/"], BlockStore(tmp_path / "other"), fetch=gateways)
+    with pytest.raises(MetadataFetchError):
+        only_evil.get_bytes(cids[1])
+    assert not BlockStore(tmp_path / "other").has(cids[1])
+    print("✅ Cache poisoning test passed")
+
+
+def test_race_returns_first_verified_response(documents, tmp_path):
+    """Test that a fast gateway wins the race and a dead one is ignored"""
+    blocks, cids = documents
+    gateways = FakeGateways(blocks, {
+        "https://slow/ipfs/": "slow",
+        "https://down/ipfs/": "down",
+        "https://fast/ipfs/": "ok",
+    })
+    client = MetadataClient(list(gateways.behaviour), BlockStore(tmp_path), fetch=gateways)
+
+    started = time.perf_counter()
+    assert client.get_json(cids[0])["batchId"] == "F000P"
+    assert time.perf_counter() - started < 0.15
+    print("✅ Gateway race test passed")
+
+
+def test_prefetch_then_serve_from_caches(documents, tmp_path):
+    """Test bulk prefetch, then memory and disk hits without network requests"""
+    blocks, cids = documents
+    gateways = FakeGateways(blocks, {"https://a/ipfs/": "ok"})
+    client = MetadataClient(["https://a/ipfs/"], BlockStore(tmp_path), fetch=gateways, max_concurrency=4)
+
+    report = client.prefetch(cids + cids[:5] + ["QmInvalid"])
+    assert report["cids"] == 21
+    assert report["fetched_blocks"] == 20
+    assert report["failed"] == ["QmInvalid"]
+
+    for cid in cids:
+        client.get_json(cid)
+    fresh = MetadataClient(["https://a/ipfs/"], BlockStore(tmp_path), fetch=gateways)
+    fresh.get_json(cids[3])
+
+    assert len(gateways.requests) == 20
+    assert client.stats()["memory_hits"] == 20
+    assert fresh.stats()["disk_hits"] == 1
+    print(f"✅ Prefetched {report['cids']} CIDs in {report['elapsed_seconds'] * 1000:.1f}ms")
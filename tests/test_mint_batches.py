@@ -0,0 +1,217 @@
+"""
+Tests for the batch mint driver
+===============================
+
+Usage:
+    pytest tests/test_mint_batches.py -v
+"""
+
+import pytest
+
+from addresses import application_address, random_address
+from conftest import ASSET_ID
+from mint_batches import (
+    GroupRejected,
+    GroupUnsettled,
+    MintProgressLog,
+    PayoutPipeline,
+    load_payouts,
+    max_recipients_per_call,
+    mint_failure_recorder,
+    pending_payouts,
+    plan_mint_batches,
+)
+from protocol import MAX_ACCOUNT_REFERENCES_PER_TXN, MAX_GROUP_SIZE
+from txn_ingester import TransactionStore
+
+
+def test_plan_respects_protocol_limits():
+    """Test that payouts are chunked to account-reference and group limits"""
+    payouts = [(random_address(), i + 1) for i in range(1_000)]
+    groups = list(plan_mint_batches(iter(payouts)))
+
+    calls = [call for group in groups for call in group]
+    assert [payout for call in calls for payout in call] == payouts
+    assert all(len(call) <= MAX_ACCOUNT_REFERENCES_PER_TXN for call in calls)
+    assert all(len(group) <= MAX_GROUP_SIZE for group in groups)
+    assert len(calls) == -(-1_000 // max_recipients_per_call())
+
+
+def test_plan_rejects_invalid_payouts():
+    """Test that malformed recipients and non-positive amounts are rejected"""
+    with pytest.raises(ValueError):
+        list(plan_mint_batches([("NOT_AN_ADDRESS", 10)]))
+    with pytest.raises(ValueError, match="Amount must be positive"):
+        list(plan_mint_batches([(random_address(), 0)]))
+
+
+def test_pipeline_bounds_in_flight_groups(tmp_path):
+    """Test that the pipeline overlaps submissions up to the in-flight limit"""
+    payouts_file = tmp_path / "payouts.csv"
+    rows = [(random_address(), 25) for _ in range(640)]
+    payouts_file.write_text("recipient,amount\n" + "".join(f"{r},{a}\n" for r, a in rows))
+
+    pending = set()
+    peak = 0
+    confirmed = []
+
+    def sign_group(group):
+        return {"txids": [len(confirmed) + len(pending)]}, group
+
+    def send_group(signed):
+        nonlocal peak
+        pending.add(len(confirmed) + len(pending))
+        peak = max(peak, len(pending))
+
+    def wait_group(handle):
+        pending.remove(handle["txids"][0])
+        confirmed.append(handle["txids"][0])
+
+    report = PayoutPipeline(sign_group, send_group, wait_group, max_in_flight=3).run(
+        plan_mint_batches(load_payouts(payouts_file))
+    )
+
+    assert report["payouts"] == 640
+    assert report["amount"] == 640 * 25
+    assert report["groups"] == -(-640 // (max_recipients_per_call() * MAX_GROUP_SIZE))
+    assert peak == 3
+    assert not pending and confirmed == sorted(confirmed)
+    assert report["fees_microalgos"] < report["one_by_one_fees_microalgos"]
+
+
+def test_rejected_groups_are_recorded_as_failed_mints():
+    """Test that every payout of a group that fails to confirm is stored as a failed mint"""
+    payouts = [(random_address(), 10 + i) for i in range(max_recipients_per_call() * MAX_GROUP_SIZE * 3)]
+    groups = list(plan_mint_batches(payouts))
+    store = TransactionStore(":memory:")
+    submitted = []
+
+    def sign_group(group):
+        submitted.append(group)
+        return {"txids": [f"G{len(submitted)}C{position}" for position in range(len(group))]}, group
+
+    def wait_group(handle):
+        if handle["txids"][0] == "G2C0":
+            raise GroupRejected(handle["txids"], RuntimeError("logic eval error: Recipient is blacklisted"))
+
+    pipeline = PayoutPipeline(sign_group, lambda signed: None, wait_group, max_in_flight=1,
+                              on_reject=mint_failure_recorder(store, ASSET_ID, 1001))
+    with pytest.raises(GroupRejected):
+        pipeline.run(groups)
+
+    failed = store.query(status="failed", limit=1_000)
+    assert len(submitted) == 2 and len(failed) == max_recipients_per_call() * MAX_GROUP_SIZE
+    assert {(row["to"], row["amount"]) for row in failed} == {payout for call in groups[1] for payout in call}
+    assert {row["from"] for row in failed} == {application_address(1001)}
+    assert "G2C3/inner/2" in {row["id"] for row in failed}
+    assert failed[0]["type"] == "mint" and "blacklisted" in failed[0]["error"]
+    print(f"✅ {len(failed)} rejected payouts recorded as failed mints")
+
+
+class FakeMintNode:
+    """
+    Fake send/wait: records minted payouts; groups listed in `reject` or
+    `unsettle` (by 1-based send order) fail that way once
+    """
+
+    def __init__(self, reject=(), unsettle=()):
+        self.reject = set(reject)
+        self.unsettle = set(unsettle)
+        self.sent = []
+        self.waited = []
+        self.minted = []
+        self.groups = {}
+
+    def sign_group(self, group):
+        txid = f"G{len(self.groups) + 1}"
+        self.groups[txid] = group
+        return {"txids": [f"{txid}C{position}" for position in range(len(group))]}, txid
+
+    def send_group(self, txid):
+        self.sent.append(txid)
+
+    def wait_group(self, handle):
+        txid = handle["txids"][0].split("C")[0]
+        self.waited.append(txid)
+        number = int(txid[1:])
+        if number in self.reject:
+            self.reject.remove(number)
+            raise GroupRejected(handle["txids"], RuntimeError("pool error: overspend"))
+        if number in self.unsettle:
+            self.unsettle.remove(number)
+            raise GroupUnsettled(handle["txids"], RuntimeError("node unreachable"))
+        self.minted.extend(payout for call in self.groups[txid] for payout in call)
+
+    def pipeline(self, progress, store=None):
+        on_reject = mint_failure_recorder(store, ASSET_ID, 1001) if store else None
+        return PayoutPipeline(self.sign_group, self.send_group, self.wait_group, 3, on_reject, progress)
+
+
+def run_file(pipeline, progress, payouts):
+    numbered = list(pending_payouts(payouts, progress.done()))
+    return pipeline.run(plan_mint_batches(payout for _, payout in numbered), (row for row, _ in numbered))
+
+
+def test_rejection_drains_groups_in_flight():
+    """Test that a rejected group stops new submissions but the groups already sent are settled"""
+    per_group = max_recipients_per_call() * MAX_GROUP_SIZE
+    payouts = [(random_address(), 1) for _ in range(per_group * 8)]
+    node = FakeMintNode(reject=[1])
+    store = TransactionStore(":memory:")
+    progress = MintProgressLog(None)
+
+    with pytest.raises(GroupRejected):
+        run_file(node.pipeline(progress, store), progress, payouts)
+
+    # Three groups were in flight when the first was rejected; the other two still confirm
+    assert node.sent == ["G1", "G2", "G3"] and node.waited == ["G1", "G2", "G3"]
+    assert len(node.minted) == 2 * per_group
+    assert len(store.query(status="failed", limit=1_000)) == per_group
+    assert progress.done() == set(range(per_group, 3 * per_group))
+    print("✅ In-flight groups are settled before the rejection is raised")
+
+
+def test_unsettled_group_is_not_recorded_as_failed(tmp_path):
+    """Test that a group whose outcome is unknown stays pending instead of being marked failed"""
+    per_group = max_recipients_per_call() * MAX_GROUP_SIZE
+    payouts = [(random_address(), 1) for _ in range(per_group * 2)]
+    node = FakeMintNode(unsettle=[2])
+    store = TransactionStore(":memory:")
+    progress = MintProgressLog(tmp_path / "mint_progress.jsonl")
+
+    with pytest.raises(GroupUnsettled):
+        run_file(node.pipeline(progress, store), progress, payouts)
+
+    assert store.query(status="failed", limit=1_000) == []
+    reloaded = MintProgressLog(progress.path)
+    assert [entry["rows"] for entry in reloaded.pending] == [list(range(per_group, 2 * per_group))]
+    assert reloaded.done() == set(range(2 * per_group))
+    print("✅ Unsettled groups are not recorded as failed mints")
+
+
+def test_rerun_resumes_without_double_minting(tmp_path):
+    """Test that rerunning the same payout file after failures mints every row exactly once"""
+    per_group = max_recipients_per_call() * MAX_GROUP_SIZE
+    payouts = [(random_address(), row + 1) for row in range(per_group * 6)]
+    log = tmp_path / "mint_progress.jsonl"
+    node = FakeMintNode(reject=[2], unsettle=[3])
+
+    with pytest.raises(GroupRejected):
+        run_file(node.pipeline(MintProgressLog(log)), MintProgressLog(log), payouts)
+    # Reloaded: group 1 confirmed, group 2 rejected, group 3 unsettled
+    progress = MintProgressLog(log)
+    assert len(progress.pending) == 1 and progress.pending[0]["handle"]["txids"][0] == "G3C0"
+
+    with pytest.raises(GroupUnsettled):
+        node.unsettle.add(3)
+        node.pipeline(progress).recover()
+
+    progress = MintProgressLog(log)
+    pipeline = node.pipeline(progress)
+    assert pipeline.recover() == {"confirmed_payouts": per_group, "rejected_payouts": 0}
+    report = run_file(pipeline, progress, payouts)
+
+    assert report["payouts"] == 3 * per_group
+    assert sorted(node.minted, key=lambda payout: payout[1]) == payouts
+    assert MintProgressLog(log).done() == set(range(len(payouts)))
+    print(f"✅ Rerun minted the remaining {report['payouts']} payouts once each")
@@ -0,0 +1,299 @@
+"""
+Tests for the multisig signature aggregation service
+====================================================
+
+Signature checks use a keyed-hash stand-in for Ed25519 and proposals are
+JSON-encoded stand-ins for msgpack, so the tests run without PyNaCl or
+msgpack; submission goes to a recording fake.
+
+Usage:
+    pytest tests/test_multisig_service.py -v
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from addresses import decode_address, multisig_address, random_address
+from contract_abi import method_selector
+from multisig_service import MultisigError, MultisigQueue, make_handler, txid_of
+from node_client import NodeHTTPClient, NodeHTTPError, RetryPolicy
+
+MEMBERS = [random_address() for _ in range(3)]
+MULTISIG = multisig_address(2, MEMBERS)
+
+
+def _txn(nonce, method="mint_tokens", sender=MULTISIG, kind="appl"):
+    """Encoded proposal: an app call to `method`, made unique by `nonce`"""
+    return json.dumps({
+        "type": kind, "snd": sender, "apid": 1001, "apaa": [method_selector(method).hex()], "note": nonce,
+    }).encode()
+
+
+def fake_decode(txn_bytes):
+    fields = json.loads(txn_bytes)
+    fields["snd"] = decode_address(fields["snd"])
+    fields["apaa"] = [bytes.fromhex(arg) for arg in fields["apaa"]]
+    return fields
+
+
+def fake_sign(signer, message):
+    return hashlib.sha256(signer.encode() + message).digest()
+
+
+def fake_verify(signer, message, signature):
+    return signature == fake_sign(signer, message)
+
+
+class FakeSubmitter:
+    """Records each submission; optionally fails like a node would, `failures` times"""
+
+    def __init__(self, error=None, status=400, failures=None):
+        self.error = error
+        self.status = status
+        self.failures = failures
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, txn_bytes, signatures):
+        with self.lock:
+            self.calls.append((txn_bytes, dict(signatures)))
+            failing = self.error and (self.failures is None or len(self.calls) <= self.failures)
+        if failing:
+            raise NodeHTTPError(self.status, self.error)
+        return txid_of(txn_bytes)
+
+
+def _queue(path, submit, **options):
+    options.setdefault("retry", RetryPolicy(max_retries=2, base_delay=0.001))
+    return MultisigQueue(path, 2, MEMBERS, submit, verify=fake_verify, decode=fake_decode, **options)
+
+
+def _sign(multisig_queue, txid, txn, signer):
+    return multisig_queue.add_signature(txid, signer, fake_sign(signer, b"TX" + txn))
+
+
+def test_threshold_submits_once(tmp_path):
+    """Test that the threshold signature triggers exactly one merged submission"""
+    submit = FakeSubmitter()
+    multisig_queue = _queue(tmp_path / "queue.db", submit)
+    multisig_queue.start()
+    txn = _txn(1)
+    txid = multisig_queue.propose("mint", txn)
+
+    assert _sign(multisig_queue, txid, txn, MEMBERS[0])["status"] == "pending"
+    assert _sign(multisig_queue, txid, txn, MEMBERS[0])["signers"] == [MEMBERS[0]]
+    assert _sign(multisig_queue, txid, txn, MEMBERS[1])["status"] == "ready"
+    _sign(multisig_queue, txid, txn, MEMBERS[2])
+    multisig_queue.drain()
+
+    assert len(submit.calls) == 1
+    assert set(submit.calls[0][1]) == set(MEMBERS[:2])
+    assert multisig_queue.get(txid)["status"] == "submitted"
+    multisig_queue.stop()
+    print("✅ Threshold submission test passed")
+
+
+def test_rejects_outsiders_and_bad_signatures(tmp_path):
+    """Test that non-members, forged signatures and unknown kinds are rejected"""
+    multisig_queue = _queue(tmp_path / "queue.db", FakeSubmitter())
+    txn = _txn(2, "burn_tokens")
+    txid = multisig_queue.propose("burn", txn)
+
+    outsider = random_address()
+    with pytest.raises(MultisigError, match="not a member"):
+        _sign(multisig_queue, txid, txn, outsider)
+    with pytest.raises(MultisigError, match="Invalid signature"):
+        multisig_queue.add_signature(txid, MEMBERS[0], b"\x00" * 32)
+    with pytest.raises(MultisigError, match="Unknown transaction kind"):
+        multisig_queue.propose("transfer", txn)
+    assert multisig_queue.get(txid)["signers"] == []
+    multisig_queue.stop()
+    print("✅ Rejection test passed")
+
+
+def test_proposals_are_decoded_and_checked(tmp_path):
+    """Test that only app calls from the multisig account to a method of the stated kind are queued"""
+    multisig_queue = _queue(tmp_path / "queue.db", FakeSubmitter(), app_id=1001)
+    for kind, txn, message in [
+        ("mint", b"\x81\xa3amt\x02", "Undecodable transaction"),
+        ("mint", _txn(1, kind="pay"), "not an application call"),
+        ("mint", _txn(1, sender=MEMBERS[0]), "not sent by the multisig account"),
+        ("mint", _txn(1).replace(b'"apid": 1001', b'"apid": 7'), "does not call app 1001"),
+        ("mint", _txn(1, "add_to_blacklist"), "does not call a mint method"),
+        ("metadata", _txn(1, "burn_tokens"), "does not call a metadata method"),
+    ]:
+        with pytest.raises(MultisigError, match=message):
+            multisig_queue.propose(kind, txn)
+    assert multisig_queue.list() == []
+
+    for kind, method in [("mint", "mint_tokens_batch"), ("blacklist", "remove_from_blacklist_batch"),
+                         ("metadata", "update_metadata_cid")]:
+        multisig_queue.propose(kind, _txn(1, method))
+    assert len(multisig_queue.list("pending")) == 3
+    multisig_queue.stop()
+    print("✅ Proposal validation test passed")
+
+
+def test_restart_resubmits_ready_transactions(tmp_path):
+    """Test that a ready-but-unsubmitted transaction is submitted after a restart"""
+    path = tmp_path / "queue.db"
+    txn = _txn(3, "add_to_blacklist")
+
+    # The first process reaches threshold but dies before its worker runs
+    first = _queue(path, FakeSubmitter())
+    txid = first.propose("blacklist", txn)
+    _sign(first, txid, txn, MEMBERS[0])
+    _sign(first, txid, txn, MEMBERS[2])
+    first.stop()
+
+    # The node already has it from an earlier attempt; that counts as submitted
+    submit = FakeSubmitter(error="transaction already in ledger")
+    second = _queue(path, submit)
+    assert second.get(txid)["status"] == "ready"
+    second.start()
+    second.drain()
+    assert len(submit.calls) == 1
+    assert second.get(txid)["status"] == "submitted"
+    second.stop()
+
+    failing = FakeSubmitter(error="overspend")
+    third = _queue(path, failing)
+    txn = _txn(4, "update_metadata_cid")
+    txid = third.propose("metadata", txn)
+    third.start()
+    _sign(third, txid, txn, MEMBERS[1])
+    _sign(third, txid, txn, MEMBERS[2])
+    third.drain()
+    assert third.get(txid)["status"] == "failed" and "overspend" in third.get(txid)["error"]
+    third.stop()
+    print("✅ Restart durability test passed")
+
+
+def test_transient_errors_retry_and_bad_entries_do_not_stop_the_worker(tmp_path):
+    """Test that 5xx submissions are retried, and an entry the submitter chokes on is failed, not fatal"""
+    path = tmp_path / "queue.db"
+    flaky = FakeSubmitter(error="upstream unavailable", status=503, failures=2)
+    multisig_queue = _queue(path, flaky)
+    multisig_queue.start()
+    txn = _txn(5)
+    txid = multisig_queue.propose("mint", txn)
+    _sign(multisig_queue, txid, txn, MEMBERS[0])
+    _sign(multisig_queue, txid, txn, MEMBERS[1])
+    multisig_queue.drain()
+    assert len(flaky.calls) == 3 and multisig_queue.get(txid)["status"] == "submitted"
+
+    # A node that stays down leaves the transaction ready for a later retry
+    down = FakeSubmitter(error="connection refused", status=None)
+    multisig_queue.submit = down
+    txn = _txn(6)
+    txid = multisig_queue.propose("mint", txn)
+    _sign(multisig_queue, txid, txn, MEMBERS[0])
+    _sign(multisig_queue, txid, txn, MEMBERS[1])
+    multisig_queue.drain()
+    assert len(down.calls) == 3
+    assert multisig_queue.get(txid)["status"] == "ready" and "connection refused" in multisig_queue.get(txid)["error"]
+
+    # An entry that cannot even be merged is failed and the worker keeps going
+    def choke(txn_bytes, signatures):
+        if txn_bytes == poisoned:
+            raise ValueError("could not decode transaction")
+        return txid_of(txn_bytes)
+
+    multisig_queue.submit = choke
+    poisoned, healthy = _txn(7), _txn(8)
+    txids = [multisig_queue.propose("mint", txn) for txn in (poisoned, healthy)]
+    for txid, txn in zip(txids, (poisoned, healthy)):
+        _sign(multisig_queue, txid, txn, MEMBERS[0])
+        _sign(multisig_queue, txid, txn, MEMBERS[2])
+    multisig_queue.drain()
+    assert multisig_queue.get(txids[0])["status"] == "failed"
+    assert "could not decode" in multisig_queue.get(txids[0])["error"]
+    assert multisig_queue.get(txids[1])["status"] == "submitted"
+    multisig_queue.stop()
+    print("✅ Transient retries and poisoned entries handled")
+
+
+def test_ready_transactions_are_retried_after_the_node_recovers(tmp_path):
+    """Test that the worker queues a transaction left ready by a transient failure again"""
+    outage = FakeSubmitter(error="connection refused", status=None, failures=3)
+    multisig_queue = _queue(tmp_path / "queue.db", outage, ready_retry_interval=0.05)
+    multisig_queue.start()
+    txn = _txn(9)
+    txid = multisig_queue.propose("mint", txn)
+    _sign(multisig_queue, txid, txn, MEMBERS[0])
+    _sign(multisig_queue, txid, txn, MEMBERS[1])
+    multisig_queue.drain()
+    assert len(outage.calls) == 3 and multisig_queue.get(txid)["status"] == "ready"
+
+    deadline = time.monotonic() + 5
+    while multisig_queue.get(txid)["status"] != "submitted" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert multisig_queue.get(txid)["status"] == "submitted" and multisig_queue.get(txid)["error"] is None
+    assert len(outage.calls) == 4
+    multisig_queue.stop()
+    print("✅ Ready transactions are retried without a restart")
+
+
+def test_concurrent_signing_of_hundreds_pending(tmp_path):
+    """Test many signers racing over hundreds of pending transactions"""
+    submit = FakeSubmitter()
+    multisig_queue = _queue(tmp_path / "queue.db", submit)
+    multisig_queue.start()
+    txns = [_txn(i) for i in range(300)]
+    txids = [multisig_queue.propose("mint", txn) for txn in txns]
+    assert len(multisig_queue.list("pending")) == 300
+
+    jobs = [(txid, txn, member) for txid, txn in zip(txids, txns) for member in MEMBERS]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda job: _sign(multisig_queue, *job), jobs))
+    multisig_queue.drain()
+
+    assert len(submit.calls) == 300
+    assert {txid_of(txn) for txn, _ in submit.calls} == set(txids)
+    assert len(multisig_queue.list("submitted")) == 300
+    multisig_queue.stop()
+    print("✅ 300 transactions aggregated and submitted once each")
+
+
+def test_http_round_trip(tmp_path):
+    """Test proposing and signing through the JSON API"""
+    submit = FakeSubmitter()
+    multisig_queue = _queue(tmp_path / "queue.db", submit)
+    multisig_queue.start()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(multisig_queue))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = NodeHTTPClient(f"http://127.0.0.1:{server.server_address[1]}")
+    txn = _txn(5)
+
+    def post(path, payload):
+        return client.post_json(path, json.dumps(payload).encode(), "application/json")
+
+    try:
+        proposed = post("/transactions", {"kind": "mint", "txn": base64.b64encode(txn).decode()})
+        txid = proposed["txid"]
+        assert client.get_json("/transactions", status="pending")["transactions"][0]["txid"] == txid
+
+        for member in MEMBERS[:2]:
+            signature = base64.b64encode(fake_sign(member, b"TX" + txn)).decode()
+            result = post(f"/transactions/{txid}/signatures", {"signer": member, "signature": signature})
+        assert result["status"] == "ready"
+
+        with pytest.raises(NodeHTTPError) as error:
+            post(f"/transactions/{txid}/signatures", {"signer": random_address(), "signature": ""})
+        assert error.value.status == 400
+
+        multisig_queue.drain()
+        assert client.get_json(f"/transactions/{txid}")["status"] == "submitted"
+    finally:
+        server.shutdown()
+        server.server_close()
+        client.close()
+        multisig_queue.stop()
+    print("✅ HTTP round trip test passed")
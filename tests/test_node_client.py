@@ -0,0 +1,113 @@
+"""
+Tests for the pooled algod/indexer HTTP client
+==============================================
+
+Runs against a local HTTP/1.1 stand-in for algod (the `stand_in` fixture in
+conftest.py).
+
+Usage:
+    pytest tests/test_node_client.py -v
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import stand_in_client
+from node_client import AlgodClient, NodeHTTPError, clients_for_network, endpoint_label
+
+
+def test_keep_alive_reuses_connections(stand_in):
+    """Test that sequential requests share one persistent connection"""
+    client = stand_in_client(stand_in)
+    for _ in range(50):
+        assert client.status()["last-round"] == 42
+
+    assert client.pool.opened == 1
+    assert len(stand_in.connections) == 1
+    stats = client.stats.snapshot()["GET /v2/status"]
+    assert stats["count"] == 50 and stats["errors"] == 0
+
+
+def test_concurrency_is_bounded_by_pool(stand_in):
+    """Test that concurrent callers never open more than max_connections"""
+    client = stand_in_client(stand_in, max_connections=3)
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        rounds = list(pool.map(lambda r: client.status_after_block(r)["last-round"], range(60)))
+
+    assert rounds == list(range(1, 61))
+    assert client.pool.opened <= 3
+    assert "GET /v2/status/wait-for-block-after/{n}" in client.stats.snapshot()
+
+
+def test_retries_on_429_and_5xx(stand_in):
+    """Test that throttled and failing responses are retried with backoff"""
+    client = stand_in_client(stand_in)
+
+    assert client.get_json("/flaky") == {"ok": True}
+    stats = client.stats.snapshot()["GET /flaky"]
+    assert stats["count"] == 3 and stats["retries"] == 2
+
+    with pytest.raises(NodeHTTPError) as excinfo:
+        client.get_json("/down")
+    assert excinfo.value.status == 500
+    assert stand_in.hits["/down"] == 4
+
+
+def test_transaction_submission_is_not_retried_once_sent(stand_in):
+    """Test that POST /v2/transactions is retried on 429 only, never after a 5xx or a dropped response"""
+    client = stand_in_client(stand_in)
+    client.status()
+
+    stand_in.post_outcomes = [429, 200]
+    assert client.send_raw_transaction(b"signed") == "TX1"
+    assert stand_in.hits["/v2/transactions"] == 2
+
+    for outcome, status in [(503, 503), ("drop", None)]:
+        stand_in.hits["/v2/transactions"] = 0
+        stand_in.post_outcomes = [outcome, 200]
+        with pytest.raises(NodeHTTPError) as excinfo:
+            client.send_raw_transaction(b"signed")
+        assert excinfo.value.status == status
+        assert stand_in.hits["/v2/transactions"] == 1
+
+    # Submissions use their own connections; idempotent POSTs still retry
+    assert client.pool.opened == 5
+    stand_in.post_outcomes = [503, 200]
+    assert client.post_json("/v2/teal/compile", b"int 1", "application/x-binary") == {"txId": "TX1"}
+    print("✅ Transaction submission is never resent after it may have landed")
+
+
+def test_submission_connections_do_not_pile_up(stand_in):
+    """Test that fresh submission connections beyond the pool size are closed, not kept idle"""
+    client = stand_in_client(stand_in, max_connections=2)
+    for _ in range(20):
+        assert client.send_raw_transaction(b"signed") == "TX1"
+
+    assert client.pool.opened == 20
+    assert client.pool._idle.qsize() == 2
+    assert client.status()["last-round"] == 42
+    assert client.pool.opened == 20
+    print("✅ Idle connections stay within max_connections")
+
+
+def test_client_errors_are_not_retried(stand_in):
+    """Test that 4xx responses other than 429 fail immediately"""
+    host, port = stand_in.server_address
+    client = AlgodClient(f"http://{host}:{port}", "wrong-token")
+
+    with pytest.raises(NodeHTTPError, match="Invalid API Token"):
+        client.status()
+    assert stand_in.hits["/v2/status"] == 1
+
+
+def test_clients_are_shared_per_network():
+    """Test that every caller gets the same pooled clients for a network"""
+    config = {
+        "localnet": {
+            "algod_address": "http://127.0.0.1:1", "algod_token": "",
+            "indexer_address": "http://127.0.0.1:2", "indexer_token": "",
+        }
+    }
+    assert clients_for_network(config, "localnet") is clients_for_network(config, "localnet")
+    assert endpoint_label("GET", "/v2/accounts/" + "A" * 58) == "GET /v2/accounts/{address}"
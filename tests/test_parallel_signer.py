@@ -0,0 +1,73 @@
+"""
+Tests for the chunked process pool behind parallel signing
+==========================================================
+
+Signing itself needs algosdk and PyNaCl; these tests cover ordering,
+chunking, bounded lookahead and per-worker initialization with a pure
+chunk function.
+
+Usage:
+    pytest tests/test_parallel_signer.py -v
+"""
+
+import os
+
+from parallel_signer import ChunkedProcessPool, _txid, _worker_state, chunked
+
+_init_calls = []
+
+
+def _remember_factor(factor):
+    _worker_state["factor"] = factor
+    _init_calls.append(os.getpid())
+
+
+def _scale_chunk(items):
+    return [(item * _worker_state["factor"], os.getpid()) for item in items]
+
+
+def test_chunked_splits_streams():
+    """Test chunking of a stream into fixed-size lists"""
+    assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+    print("✅ Chunking test passed")
+
+
+def test_pool_preserves_order_across_workers():
+    """Test that results come back in input order with keys set up per worker"""
+    with ChunkedProcessPool(_scale_chunk, workers=3, chunk_size=5,
+                            initializer=_remember_factor, initargs=(10,)) as pool:
+        results = list(pool.map(range(200)))
+
+    assert [value for value, _ in results] == [i * 10 for i in range(200)]
+    assert len({pid for _, pid in results} - {os.getpid()}) >= 1
+    print(f"✅ 200 items across {len({pid for _, pid in results})} worker processes")
+
+
+def test_inline_pool_initializes_once_and_reads_lazily():
+    """Test the single-worker path: one init and bounded read-ahead"""
+    _init_calls.clear()
+    consumed = []
+
+    def items():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+
+    pool = ChunkedProcessPool(_scale_chunk, workers=1, chunk_size=10, initializer=_remember_factor, initargs=(2,))
+    results = pool.map(items())
+    first = [next(results) for _ in range(3)]
+
+    assert first == [(0, os.getpid()), (2, os.getpid()), (4, os.getpid())]
+    assert len(consumed) == 10
+    assert [value for value, _ in results] == [i * 2 for i in range(3, 100)]
+    list(pool.map(range(5)))
+    assert _init_calls == [os.getpid()]
+    print("✅ Inline pool test passed")
+
+
+def test_txid_matches_algorand_format():
+    """Test that txids are 52-character unpadded base32 digests"""
+    txid = _txid(b"\x81\xa3amt\x01")
+    assert len(txid) == 52 and txid.isupper() and "=" not in txid
+    print("✅ Txid format test passed")
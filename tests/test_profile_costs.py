@@ -0,0 +1,181 @@
+"""
+Tests for the per-method cost profiler
+======================================
+
+Usage:
+    pytest tests/test_profile_costs.py -v
+"""
+
+import copy
+
+import pytest
+
+from addresses import random_address
+from contract_abi import METHOD_SIGNATURES
+from farm_food_simulator import ContractError, FarmFoodSimulator
+from blacklist_boxes import BLACKLIST_BATCH_OPCODE_COST, BLACKLIST_OPCODE_COST
+from mint_batches import MINT_BATCH_OPCODE_COST
+from profile_costs import (
+    ROUTING_OPCODE_COST,
+    build_report,
+    cost_growth,
+    inner_txns_of,
+    measure_opcode_costs,
+    opcode_cost_growth,
+    simulate_measurements,
+)
+
+BLACKLIST_METHODS = {"add_to_blacklist", "remove_from_blacklist", "add_to_blacklist_batch",
+                     "remove_from_blacklist_batch", "is_blacklisted"}
+
+
+class SimulatorChain:
+    """
+    Stand-in for NodeChain: runs calls on FarmFoodSimulator and answers with
+    simulate-shaped results (blacklist and batch mint opcodes from the cost
+    constants plus routing, 100 otherwise)
+    """
+
+    def __init__(self):
+        self.sender = random_address()
+        self.simulator = FarmFoodSimulator(self.sender)
+        self.app_address = self.simulator.app_address
+        self.simulated: list = []
+
+    def create_app(self, teal):
+        return self.simulator.app_id
+
+    def opt_in(self, asset_id):
+        self.simulator.opt_in(self.sender)
+
+    def min_balance(self, address):
+        return 100_000 * (1 + len(self.simulator.assets)) + self.simulator.blacklist.min_balance
+
+    def execute(self, method, args, boxes=()):
+        return self.simulator.call(method, self.sender, *args)
+
+    def simulate(self, calls):
+        self.simulated.append([method for method, _, _ in calls])
+        simulator = copy.deepcopy(self.simulator)
+        results = []
+        try:
+            for method, args, _ in calls:
+                simulator.call(method, self.sender, *args)
+                results.append({"app-budget-consumed": self.opcodes(simulator, method, args),
+                                "txn-result": {"inner-txns": [{}] * inner_txns_of(method)}})
+        except ContractError as error:
+            return {"failure-message": str(error), "txn-results": results}
+        return {"txn-results": results, "unnamed-resources-accessed": {"boxes": [{}] * len(calls)}}
+
+    def opcodes(self, simulator, method, args):
+        if method in BLACKLIST_METHODS:
+            return ROUTING_OPCODE_COST + simulator.blacklist.last_opcode_cost
+        if method == "mint_tokens_batch":
+            base, per_recipient = MINT_BATCH_OPCODE_COST
+            return ROUTING_OPCODE_COST + base + per_recipient * len(args[0])
+        return 100
+
+
+class GrowingLookupChain(SimulatorChain):
+    """SimulatorChain whose is_blacklisted cost grows with the list"""
+
+    def opcodes(self, simulator, method, args):
+        cost = super().opcodes(simulator, method, args)
+        return cost + len(simulator.blacklist) // 8 if method == "is_blacklisted" else cost
+
+
+def test_estimate_report_covers_every_method_within_limits():
+    """Test that every ABI method is profiled and fits budget and reference limits"""
+    report = build_report("estimate")
+
+    assert report["source"] == "estimate"
+    assert set(report["methods"]) == set(METHOD_SIGNATURES)
+    for method, profile in report["methods"].items():
+        assert profile["opcode_cost"] <= profile["opcode_budget"], method
+        assert profile["within_reference_limits"], method
+        assert profile["fee_microalgos"] == 1_000 * (1 + profile["inner_txns"])
+
+    assert report["methods"]["add_to_blacklist"]["min_balance_delta"] == 16_500
+    assert report["methods"]["remove_from_blacklist"]["min_balance_delta"] == -16_500
+    assert {profile["min_balance_source"] for profile in report["methods"].values()} == {"model"}
+
+
+def test_measured_values_override_the_model():
+    """Test that simulate measurements replace estimates key by key"""
+    report = build_report("simulate", {
+        "is_blacklisted": {"opcodes": 55, "boxes": 1},
+        "add_to_blacklist_batch": {"opcodes": 400, "min_balance": 132_100},
+    })
+    profile = report["methods"]["is_blacklisted"]
+
+    assert profile["opcode_cost"] == 55
+    assert profile["references"]["boxes"] == 1
+    assert profile["min_balance_source"] == "model"
+    batch = report["methods"]["add_to_blacklist_batch"]
+    assert batch["min_balance_delta"] == 132_100 and batch["min_balance_source"] == "measured"
+
+
+def test_cost_growth_is_flagged():
+    """Test that CI comparison flags opcode growth beyond the limit"""
+    previous = build_report("estimate")
+    current = copy.deepcopy(previous)
+    current["methods"]["mint_tokens"]["opcode_cost"] *= 2
+
+    assert cost_growth(previous, previous, 0.1) == []
+    problems = cost_growth(current, previous, 0.1)
+    assert len(problems) == 1 and problems[0].startswith("mint_tokens")
+
+
+def test_simulate_mode_measures_through_the_chain():
+    """Test that simulate mode measures every method against a chain stand-in"""
+    chain = SimulatorChain()
+    report = build_report("simulate", simulate_measurements(chain, teal={}))
+    methods = report["methods"]
+
+    assert set(methods) == set(METHOD_SIGNATURES)
+    assert methods["mint_tokens"]["opcode_cost"] == 100
+    assert methods["add_to_blacklist"]["min_balance_delta"] == 16_500
+    assert methods["remove_from_blacklist"]["min_balance_delta"] == -16_500
+    assert methods["add_to_blacklist_batch"]["min_balance_source"] == "measured"
+    assert methods["create_asa"]["min_balance_delta"] == 100_000
+    assert methods["mint_tokens"]["inner_txns"] == 1
+    # Removes and reads are simulated behind the add that creates their entry
+    assert ["add_to_blacklist", "remove_from_blacklist"] in chain.simulated
+    assert ["add_to_blacklist", "is_blacklisted"] in chain.simulated
+    # Simulated calls leave the real state alone; executed ones add then remove
+    assert len(chain.simulator.blacklist) == 0
+
+
+def test_simulate_failure_is_reported():
+    """Test that a call failing in simulate stops the profile with its message"""
+    chain = SimulatorChain()
+    chain.sender = random_address()
+
+    with pytest.raises(RuntimeError, match="create_asa failed in simulate: Only admin"):
+        simulate_measurements(chain, teal={})
+
+
+def test_opcode_costs_hold_as_blacklist_grows():
+    """Test that opcode costs measured at growing blacklist sizes match and fit the constants"""
+    chain = SimulatorChain()
+    simulate_measurements(chain, teal={})
+    measured = measure_opcode_costs(chain, list_sizes=(0, 20, 100))
+
+    assert sorted(measured["by_list_size"]) == [0, 20, 100]
+    assert len(chain.simulator.blacklist) == 100
+    assert opcode_cost_growth(measured["by_list_size"]) == []
+    # Routing comes off and batch costs are recovered as (fixed, per item)
+    assert measured["blacklist"] == BLACKLIST_OPCODE_COST
+    assert {method: tuple(pair) for method, pair in measured["blacklist_batch"].items()} == BLACKLIST_BATCH_OPCODE_COST
+    assert tuple(measured["mint_tokens_batch"]) == MINT_BATCH_OPCODE_COST
+
+
+def test_opcode_cost_growing_with_the_list_is_flagged():
+    """Test that a lookup getting dearer as the blacklist grows is reported"""
+    chain = GrowingLookupChain()
+    simulate_measurements(chain, teal={})
+    measured = measure_opcode_costs(chain, list_sizes=(0, 20, 100))
+
+    problems = opcode_cost_growth(measured["by_list_size"])
+    assert len(problems) == 2
+    assert all(problem.startswith("is_blacklisted") for problem in problems)
@@ -0,0 +1,119 @@
+"""
+Tests for read-only contract calls
+==================================
+
+Usage:
+    pytest tests/test_readonly_client.py -v
+"""
+
+import base64
+
+import pytest
+
+import readonly_client
+from addresses import random_address
+from conftest import CountingAlgod
+from readonly_client import ABI_RETURN_PREFIX, ReadOnlyClient, decode_abi_value, parse_simulate_response
+
+
+def _return_log(value: bytes) -> str:
+    return base64.b64encode(ABI_RETURN_PREFIX + value).decode()
+
+
+def test_decode_contract_return_types():
+    """Test decoding of every return type the read-only methods use"""
+    # Head: string offset (2 + 8 + 8), two uint64s; tail: the string
+    info = (
+        (18).to_bytes(2, "big")
+        + (1002).to_bytes(8, "big")
+        + (100_000_000).to_bytes(8, "big")
+        + (9).to_bytes(2, "big") + b"FarmToken"
+    )
+
+    assert decode_abi_value("(string,uint64,uint64)", info) == ("FarmToken", 1002, 100_000_000)
+    assert decode_abi_value("string", (4).to_bytes(2, "big") + b"QmAB") == "QmAB"
+    assert decode_abi_value("bool", b"\x80") is True
+    assert decode_abi_value("bool", b"\x00") is False
+    print("✅ ABI return decoding test passed")
+
+
+def test_state_reads_batch_into_few_requests():
+    """Test that a batch of reads costs one state fetch plus one box per address"""
+    flagged = [random_address() for _ in range(3)]
+    clean = [random_address() for _ in range(3)]
+    algod = CountingAlgod(flagged)
+    client = ReadOnlyClient(algod, 1001)
+
+    calls = [("get_contract_info", ()), ("get_metadata_cid", ())] * 10
+    calls += [("is_blacklisted", (address,)) for address in (flagged + clean) * 5]
+    results = client.call_many(calls)
+
+    assert results[:2] == [("FarmToken", 1002, 100_000_000, 40_000_000, 1_500_000, 38_500_000), "QmFirstCID"]
+    assert results[20:26] == [True] * 3 + [False] * 3
+    assert algod.calls == {"application_info": 1, "box": 6}
+    assert client.is_blacklisted_many(flagged[:1] + clean[:1]) == {flagged[0]: True, clean[0]: False}
+    print(f"✅ {len(calls)} reads answered with {sum(algod.calls.values())} requests")
+
+
+def test_mutating_methods_are_rejected():
+    """Test that only read-only methods can go through the client"""
+    client = ReadOnlyClient(CountingAlgod([]), 1001)
+
+    with pytest.raises(ValueError, match="not a read-only method"):
+        client.call("update_metadata_cid", "QmNew")
+    with pytest.raises(ValueError, match="Unknown mode"):
+        ReadOnlyClient(CountingAlgod([]), 1001, mode="submit")
+    print("✅ Read-only guard test passed")
+
+
+def test_parse_simulate_response_across_groups():
+    """Test that results from several simulated groups come back in call order"""
+    calls = [("is_blacklisted", ("A",)), ("get_metadata_cid", ()), ("is_blacklisted", ("B",))]
+    response = {"txn-groups": [
+        {"txn-results": [
+            {"txn-result": {"logs": [_return_log(b"\x80")]}},
+            {"txn-result": {"logs": [_return_log((3).to_bytes(2, "big") + b"Qm1")]}},
+        ]},
+        {"txn-results": [{"txn-result": {"logs": [_return_log(b"\x00")]}}]},
+    ]}
+
+    assert parse_simulate_response(response, calls) == [True, "Qm1", False]
+
+    response["txn-groups"][1]["failure-message"] = "logic eval error"
+    with pytest.raises(RuntimeError, match="logic eval error"):
+        parse_simulate_response(response, calls)
+    print("✅ Simulate response parsing test passed")
+
+
+class SimulateAlgod:
+    """algod stand-in recording simulate requests and answering every call"""
+
+    def __init__(self):
+        self.requests = []
+
+    def suggested_params(self):
+        return {}
+
+    def simulate_transactions(self, request):
+        self.requests.append(request)
+        return {"txn-groups": [{"txn-results": [
+            {"txn-result": {"logs": [_return_log(b"\x80" if name == "is_blacklisted" else b"\x00\x02Qm")]}}
+            for name, _ in group
+        ]} for group in request["txn-groups"]]}
+
+
+def test_simulate_sends_one_group_per_request(monkeypatch):
+    """Test that simulate mode packs 16 calls per group and one group per request"""
+    monkeypatch.setattr(readonly_client, "build_call_group",
+                        lambda sp, sender, app_id, calls, first_index: list(calls))
+    monkeypatch.setattr(readonly_client, "simulate_request", lambda group: {"txn-groups": [group]})
+    algod = SimulateAlgod()
+    client = ReadOnlyClient(algod, 1001, sender=random_address(), mode="simulate")
+
+    addresses = [random_address() for _ in range(40)]
+    results = client.call_many([("get_metadata_cid", ())] + [("is_blacklisted", (a,)) for a in addresses])
+
+    assert results == ["Qm"] + [True] * 40
+    assert [len(request["txn-groups"]) for request in algod.requests] == [1, 1, 1]
+    assert sorted(len(request["txn-groups"][0]) for request in algod.requests) == [9, 16, 16]
+    print(f"✅ {len(results)} simulated reads sent as {len(algod.requests)} single-group requests")
@@ -0,0 +1,81 @@
+"""
+Tests for the round-aware read cache
+====================================
+
+Usage:
+    pytest tests/test_round_cache.py -v
+"""
+
+import pytest
+
+from addresses import random_address
+from conftest import CountingAlgod
+from contract_state import ContractStateReader
+from round_cache import CachedAlgodClient, RoundCache
+
+
+@pytest.fixture
+def cached_reader():
+    flagged = [random_address() for _ in range(5)]
+    algod = CountingAlgod(flagged)
+    client = CachedAlgodClient(algod, RoundCache(max_round_age=60))
+    return algod, client, ContractStateReader(client, 1001), flagged
+
+
+def test_reads_within_a_round_are_served_from_cache(cached_reader):
+    """Test that bulk reads cost one request per distinct key per round"""
+    algod, client, reader, flagged = cached_reader
+    addresses = flagged + [random_address() for _ in range(5)]
+
+    for _ in range(100):
+        client.suggested_params()
+        assert reader.get_contract_info() == ("FarmToken", 1002, 100_000_000, 40_000_000, 1_500_000, 38_500_000)
+        assert reader.get_metadata_cid() == "QmFirstCID"
+        assert [reader.is_blacklisted(a) for a in addresses] == [True] * 5 + [False] * 5
+
+    requests = sum(algod.calls.values())
+    stats = client.cache.stats()
+    print(f"\n   Requests: {requests} for 1300 reads; hit rates: "
+          + ", ".join(f"{kind} {s['hit_rate']:.1%}" for kind, s in stats.items()))
+
+    assert algod.calls == {"status": 1, "suggested_params": 1, "application_info": 1, "box": 10}
+    assert all(s["hit_rate"] > 0.9 for s in stats.values())
+
+
+def test_new_round_drops_entries(cached_reader):
+    """Test that observing a new block forces fresh reads"""
+    algod, client, reader, _ = cached_reader
+    reader.get_metadata_cid()
+
+    client.status()  # same round: entries kept
+    reader.get_metadata_cid()
+    assert algod.calls["application_info"] == 1
+
+    algod.round += 1
+    client.status()
+    reader.get_metadata_cid()
+    assert algod.calls["application_info"] == 2
+
+
+def test_own_transactions_invalidate_app_state(cached_reader):
+    """Test that submitting a transaction drops cached state but keeps params"""
+    algod, client, reader, _ = cached_reader
+    client.suggested_params()
+    assert reader.get_metadata_cid() == "QmFirstCID"
+
+    client.send_raw_transaction(b"signed")
+
+    assert reader.get_metadata_cid() == "QmSecondCID"
+    client.suggested_params()
+    assert algod.calls["suggested_params"] == 1
+
+
+def test_stale_round_is_refreshed():
+    """Test that a round older than max_round_age is re-checked with one status call"""
+    algod = CountingAlgod([])
+    client = CachedAlgodClient(algod, RoundCache(max_round_age=0))
+
+    client.suggested_params()
+    client.suggested_params()
+    assert algod.calls["status"] == 2
+    assert algod.calls["suggested_params"] == 1
@@ -0,0 +1,141 @@
+"""
+Tests for the packed global state layout
+========================================
+
+Usage:
+    pytest tests/test_state_layout.py -v
+"""
+
+import base64
+import json
+
+import pytest
+
+from addresses import random_address
+from conftest import deploy_workspace, fake_cache
+from contract_state import ContractStateReader
+from deploy_farm_food import FarmFoodDeployer
+from farm_food_simulator import ContractError, FarmFoodSimulator
+from profile_costs import state_layout_profile
+from state_layout import CORE_FORMAT, LEGACY_CORE_FORMATS, decode_contract_state, encode_global_state, encode_text
+
+STATE = {
+    "admin": random_address(),
+    "farm_token_id": 987654321,
+    "total_supply": 1_000_000_00,
+    "multisig_threshold": 2,
+    "minted": 40_000_00,
+    "burned": 1_500_00,
+    "token_name": "FarmToken",
+    "token_unit": "FT",
+    "ipfs_cid": "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG",
+}
+
+
+class SimulatorAlgod:
+    """algod stand-in serving a simulator's global state"""
+
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self.requests = 0
+
+    def application_info(self, app_id):
+        self.requests += 1
+        return {"params": {"global-state": self.simulator.global_state()}}
+
+
+def test_round_trip_and_limits():
+    """Test packed encoding, decoding and the 128-byte text limit"""
+    entries = encode_global_state(STATE)
+
+    assert len(entries) == 2
+    assert len(base64.b64decode(entries[0]["value"]["bytes"])) == CORE_FORMAT.size == 66
+    assert decode_contract_state(entries) == {"version": 2, **STATE, "circulating": 38_500_00}
+
+    # A 59-character CIDv1 with the longest name and unit still fits
+    encode_text("N" * 32, "U" * 8, "b" * 59)
+    with pytest.raises(ValueError, match="limit is 127"):
+        encode_text("N" * 32, "U" * 8, "b" * 80)
+
+    # Apps created before the supply counters still decode
+    v1 = LEGACY_CORE_FORMATS[1].pack(1, bytes(32), 7, 100, 2)
+    entries[0]["value"]["bytes"] = base64.b64encode(v1).decode()
+    state = decode_contract_state(entries)
+    assert (state["version"], state["farm_token_id"], state["total_supply"]) == (1, 7, 100)
+    assert state["minted"] is state["burned"] is state["circulating"] is None
+
+    bad_version = CORE_FORMAT.pack(9, bytes(32), 0, 0, 0, 0, 0)
+    entries[0]["value"]["bytes"] = base64.b64encode(bad_version).decode()
+    with pytest.raises(ValueError, match="layout version 9"):
+        decode_contract_state(entries)
+    print("✅ Packed state round trip test passed")
+
+
+def test_reader_decodes_everything_in_one_fetch():
+    """Test that all contract fields come from a single application_info call"""
+    admin = random_address()
+    simulator = FarmFoodSimulator(admin)
+    simulator.create_asa(admin, "FarmToken", "FT", 100_000_000, 2, STATE["ipfs_cid"])
+    algod = SimulatorAlgod(simulator)
+
+    state = ContractStateReader(algod, simulator.app_id).global_state()
+
+    assert algod.requests == 1
+    fields = ("token_name", "farm_token_id", "total_supply", "minted", "burned", "circulating")
+    assert tuple(state[name] for name in fields) == simulator.get_contract_info()
+    assert state["admin"] == admin and state["ipfs_cid"] == simulator.get_metadata_cid()
+
+    with pytest.raises(ContractError, match="Token text exceeds global state size"):
+        simulator.update_metadata_cid(admin, "b" * 120)
+    assert simulator.get_metadata_cid() == STATE["ipfs_cid"]
+    print("✅ Single-fetch reader test passed")
+
+
+def test_supply_counters_track_mint_and_burn():
+    """Test that minted/burned/circulating follow mints and burns and cap mints at total_supply"""
+    admin, holder = random_address(), random_address()
+    simulator = FarmFoodSimulator(admin)
+    simulator.create_asa(admin, "FarmToken", "FT", 1_000, 2, STATE["ipfs_cid"])
+    for account in (admin, holder):
+        simulator.opt_in(account)
+
+    simulator.mint_tokens(admin, holder, 300)
+    simulator.mint_tokens_batch(admin, [admin, holder], [200, 100])
+    simulator.burn_tokens(admin, 150)
+    assert simulator.get_contract_info()[3:] == (600, 150, 450)
+
+    # Burned tokens return to the reserve and may be minted again, up to the cap
+    with pytest.raises(ContractError, match="Mint exceeds available supply"):
+        simulator.mint_tokens_batch(admin, [holder, admin], [500, 51])
+    with pytest.raises(ContractError, match="Insufficient asset balance"):
+        simulator.burn_tokens(admin, 51)
+    assert simulator.get_contract_info()[3:] == (600, 150, 450)
+    simulator.mint_tokens(admin, holder, 550)
+    assert simulator.circulating == simulator.total_supply == 1_000
+
+    state = ContractStateReader(SimulatorAlgod(simulator), simulator.app_id).global_state()
+    assert (state["minted"], state["burned"], state["circulating"]) == (1_150, 150, 1_000)
+    print("✅ Supply counters test passed")
+
+
+def test_layout_savings_and_redeploy_plan(tmp_path, monkeypatch):
+    """Test the reported savings and that a layout change plans a new app"""
+    profile = state_layout_profile(iterations=200)
+    assert profile["min_balance_saved"] == 185_500
+    read = profile["read_methods"]["get_contract_info"]
+    assert read["legacy_opcode_cost_source"] == "estimate" and read["opcode_cost_source"] == "model"
+    assert "saved" not in read
+    assert profile["decode_us"] > 0
+
+    deploy_workspace(tmp_path, monkeypatch)
+    cache, _ = fake_cache(tmp_path / "build")
+    FarmFoodDeployer("localnet", compile_cache=cache).deploy()
+    record_path = tmp_path / "deployments" / "localnet_deployment.json"
+    record = json.loads(record_path.read_text())
+    del record["contract"]["state_layout"]
+    record_path.write_text(json.dumps(record))
+
+    plan = FarmFoodDeployer("localnet", compile_cache=cache).plan_deployment()
+    assert plan["contract"] == "create"
+    assert "layout changed (v0 -> v2)" in plan["changes"][0]
+    print(f"✅ Packed layout saves {profile['min_balance_saved']} microAlgos of creator min-balance")
@@ -0,0 +1,124 @@
+"""
+Tests for metrics and tracing
+=============================
+
+Usage:
+    pytest tests/test_telemetry.py -v
+"""
+
+import json
+import time
+import urllib.request
+
+import pytest
+
+from conftest import deploy_workspace, fake_cache, stand_in_client
+from deploy_farm_food import FarmFoodDeployer, main
+from telemetry import TELEMETRY, Telemetry
+
+
+@pytest.fixture
+def telemetry():
+    TELEMETRY.reset()
+    TELEMETRY.enable()
+    yield TELEMETRY
+    TELEMETRY.disable()
+    TELEMETRY.reset()
+
+
+def test_deploy_steps_are_traced(tmp_path, monkeypatch, telemetry):
+    """Test that every deploy step is a child span of one trace with latency metrics"""
+    deploy_workspace(tmp_path, monkeypatch)
+    cache, _ = fake_cache(tmp_path / "build")
+    FarmFoodDeployer("localnet", compile_cache=cache).deploy()
+
+    spans = {span["name"]: span for span in telemetry.spans()}
+    root = spans["deploy.deploy"]
+    for step in ("setup_client", "deploy_contract", "create_asa", "setup_initial_state", "save_deployment_info"):
+        assert spans[f"deploy.{step}"]["trace_id"] == root["trace_id"]
+    assert spans["deploy.setup_client"]["parent_id"] == root["span_id"]
+    assert spans["deploy.compile_contract"]["parent_id"] == spans["deploy.deploy_contract"]["span_id"]
+    assert spans["deploy.set_initial_metadata"]["parent_id"] == spans["deploy.setup_initial_state"]["span_id"]
+
+    text = telemetry.prometheus_text()
+    assert "# TYPE farm_span_seconds histogram" in text
+    assert 'farm_span_seconds_bucket{span="deploy.create_asa",le="+Inf"} 1' in text
+    assert 'farm_spans_total{span="deploy.deploy",status="ok"} 1' in text
+    print(f"✅ {len(spans)} deploy spans in one trace")
+
+
+def test_node_requests_and_exports(stand_in, tmp_path, monkeypatch, telemetry):
+    """Test per-endpoint request metrics, error spans and the file and HTTP exporters"""
+    client = stand_in_client(stand_in)
+    client.get_json("/flaky")
+    client.status()
+    with pytest.raises(Exception):
+        client.get_json("/down")
+
+    text = telemetry.prometheus_text()
+    assert 'farm_node_requests_total{endpoint="GET /flaky",status="503"} 1' in text
+    assert 'farm_node_requests_total{endpoint="GET /flaky",status="200"} 1' in text
+    assert 'farm_node_retries_total{endpoint="GET /flaky"} 2' in text
+    assert 'farm_node_request_seconds_count{endpoint="GET /v2/status"} 1' in text
+    assert [span["status"] for span in telemetry.spans()] == ["ok", "ok", "error"]
+
+    trace_file = tmp_path / "traces.jsonl"
+    assert telemetry.write_traces(trace_file) == 3
+    assert json.loads(trace_file.read_text().splitlines()[2])["attributes"]["endpoint"] == "GET /down"
+
+    server = telemetry.serve_prometheus(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        assert "farm_node_requests_total" in urllib.request.urlopen(url).read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    deploy_workspace(tmp_path, monkeypatch)
+    metrics_file = tmp_path / "metrics.prom"
+    main(["status", "--network", "testnet", "--metrics-file", str(metrics_file)])
+    assert 'farm_spans_total{span="deploy.status",status="ok"}' in metrics_file.read_text()
+    print("✅ Node request metrics and exporters test passed")
+
+
+def test_large_counters_are_exported_exactly(telemetry):
+    """Test that counters past a million keep every digit and fractional values round-trip"""
+    telemetry.inc("farm_node_requests_total", 1_234_567, endpoint="GET /v2/status", status=200)
+    telemetry.inc("farm_node_requests_total", 2.0 ** 53, endpoint="GET /v2/status", status=500)
+    telemetry.inc("farm_custom_total", 0.1, kind="fraction")
+    telemetry.inc("farm_custom_total", 0.2, kind="fraction")
+
+    text = telemetry.prometheus_text()
+    assert 'farm_node_requests_total{endpoint="GET /v2/status",status="200"} 1234567\n' in text
+    assert 'farm_node_requests_total{endpoint="GET /v2/status",status="500"} 9007199254740992\n' in text
+    assert f'farm_custom_total{{kind="fraction"}} {0.1 + 0.2!r}\n' in text
+    print("✅ Large counters exported exactly")
+
+
+def test_disabled_telemetry_costs_almost_nothing():
+    """Test that a disabled registry records nothing; its per-call overhead is only reported"""
+    registry = Telemetry()
+
+    @registry.traced("work")
+    def traced_work(x):
+        return x + 1
+
+    def plain_work(x):
+        return x + 1
+
+    assert registry.span("a") is registry.span("b")
+    with registry.span("ignored") as span:
+        span.set(size=3)
+    calls = 200_000
+    started = time.perf_counter()
+    for i in range(calls):
+        plain_work(i)
+    plain = time.perf_counter() - started
+    started = time.perf_counter()
+    for i in range(calls):
+        traced_work(i)
+    traced = time.perf_counter() - started
+
+    assert registry.spans() == [] and registry.prometheus_text() == "\n"
+    overhead_ns = (traced - plain) / calls * 1e9
+    print(f"✅ Disabled tracing overhead: {overhead_ns:.0f}ns per call")
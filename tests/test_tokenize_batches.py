@@ -0,0 +1,262 @@
+"""
+Tests for the harvest-batch tokenization pipeline
+=================================================
+
+Usage:
+    pytest tests/test_tokenize_batches.py -v
+"""
+
+import hashlib
+import json
+
+import pytest
+
+from ipfs_blocks import BlockStore
+from node_client import NodeHTTPError
+from protocol import MAX_GROUP_SIZE
+from tokenize_batches import (
+    BatchValidationError,
+    ProgressLog,
+    TokenizationPipeline,
+    load_batches,
+    make_algosdk_io,
+    plan_groups,
+    prepare_batches,
+    validate_batch,
+)
+
+BATCH = {
+    "batchId": "TEST001",
+    "name": "Test Farm Potato Batch 001",
+    "origin": "Test Farm, Test State",
+    "harvest_date": "2025-01-01",
+    "expiry": "2025-03-01",
+    "quantity": "100 kg",
+}
+
+
+class FakeChain:
+    """Sign/send/wait stand-ins that track groups in flight"""
+
+    def __init__(self, confirm=True):
+        self.confirm = confirm
+        self.in_flight = set()
+        self.peak = 0
+        self.next_asset_id = 5000
+        self.signed = 0
+        self.submitted = []
+
+    @property
+    def io(self):
+        return self.sign_group, self.send_group, self.wait_group
+
+    def sign_group(self, group):
+        handle = {"txid": f"TX{self.signed}", "batch_ids": [batch["batchId"] for batch in group]}
+        self.signed += 1
+        return handle, handle
+
+    def send_group(self, signed):
+        self.submitted.append(signed["batch_ids"])
+        self.in_flight.add(signed["txid"])
+        self.peak = max(self.peak, len(self.in_flight))
+
+    def wait_group(self, handle):
+        self.in_flight.discard(handle["txid"])
+        if not self.confirm:
+            return None
+        asset_ids = {}
+        for batch_id in handle["batch_ids"]:
+            asset_ids[batch_id] = self.next_asset_id
+            self.next_asset_id += 1
+        return asset_ids
+
+
+def _write_batches(path, count, bad_rows=()):
+    rows = [{**BATCH, "batchId": f"B{i:04d}", "name": f"Potato Batch {i}"} for i in range(count)]
+    rows += list(bad_rows)
+    if path.suffix == ".jsonl":
+        path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    else:
+        columns = list(BATCH)
+        path.write_text(",".join(columns) + "\n" + "".join(
+            ",".join(f'"{row.get(c, "")}"' for c in columns) + "\n" for row in rows
+        ))
+
+
+def test_validation_rejects_bad_rows():
+    """Test that missing fields, bad dates and bad quantities are rejected"""
+    assert validate_batch(BATCH)["name"] == BATCH["name"]
+    assert validate_batch({k: v for k, v in BATCH.items() if k != "name"})["name"] == "Farm Batch TEST001"
+
+    for bad, message in [
+        ({"origin": ""}, "Missing fields: origin"),
+        ({"expiry": "2024-12-31"}, "expiry must be after harvest_date"),
+        ({"harvest_date": "01/01/2025"}, "Invalid date"),
+        ({"quantity": "lots"}, "Invalid quantity"),
+        ({"batchId": "BAD ID"}, "Invalid batchId"),
+    ]:
+        with pytest.raises(BatchValidationError, match=message):
+            validate_batch({**BATCH, **bad})
+    print("✅ Batch validation test passed")
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_pipeline_pins_groups_and_bounds_in_flight(tmp_path, suffix):
+    """Test the full pipeline from file to confirmed ASAs"""
+    batches_file = tmp_path / f"batches{suffix}"
+    _write_batches(batches_file, 100, bad_rows=[{**BATCH, "batchId": "B0001"}, {**BATCH, "quantity": "0 kg"}])
+    store = BlockStore(tmp_path / "ipfs")
+    chain = FakeChain()
+    progress = ProgressLog(tmp_path / "progress.jsonl")
+    rejected = []
+
+    batches = prepare_batches(load_batches(batches_file), store, 2, progress.done(), rejected)
+    groups = []
+    report = TokenizationPipeline(*chain.io, progress, max_in_flight=3).run(
+        (groups.append(group) or group for group in plan_groups(batches))
+    )
+
+    assert report["confirmed"] == report["batches"] == 100
+    assert report["groups"] == 7 and all(len(g) <= MAX_GROUP_SIZE for g in groups)
+    assert chain.peak == 3
+    assert [entry["error"] for entry in rejected] == ["Duplicate batchId: B0001", "Invalid quantity: '0 kg'"]
+    assert report["batches_per_second"] > 0
+
+    params = groups[0][0]["params"]
+    content = store.cat(groups[0][0]["cid"])
+    assert params["url"] == f"ipfs://{groups[0][0]['cid']}#arc3"
+    assert params["metadata_hash"] == hashlib.sha256(content).digest()
+    assert params["total"] == 10_000 and params["unit_name"] == "B0000"
+    assert json.loads(content)["origin"] == BATCH["origin"]
+    print(f"✅ {report['confirmed']} batches at {report['batches_per_second']:.0f} batches/sec")
+
+
+def test_resume_skips_done_and_settles_pending(tmp_path):
+    """Test that a rerun skips confirmed batches and resubmits only expired groups"""
+    batches_file = tmp_path / "batches.jsonl"
+    _write_batches(batches_file, 40)
+    store = BlockStore(tmp_path / "ipfs")
+    log_path = tmp_path / "progress.jsonl"
+
+    # First run: groups 1-2 confirm, then the process dies with group 3 submitted
+    progress = ProgressLog(log_path)
+    chain = FakeChain()
+    groups = plan_groups(prepare_batches(load_batches(batches_file), store, 2, set(), []))
+    for _ in range(2):
+        handle, signed = chain.sign_group(next(groups))
+        progress.submitted(handle["batch_ids"], handle)
+        chain.send_group(signed)
+        progress.confirmed_group(handle["txid"], chain.wait_group(handle))
+    handle, signed = chain.sign_group(next(groups))
+    progress.submitted(handle["batch_ids"], handle)
+    chain.send_group(signed)
+
+    # Second run: the pending group expired, so its batches are tokenized again
+    progress = ProgressLog(log_path)
+    assert len(progress.confirmed) == 32 and len(progress.pending) == 1
+    retry = FakeChain(confirm=False)
+    pipeline = TokenizationPipeline(*retry.io, progress)
+    assert pipeline.recover() == {"recovered_batches": 0, "expired_groups": 1}
+
+    chain = FakeChain()
+    pipeline = TokenizationPipeline(*chain.io, progress)
+    batches = prepare_batches(load_batches(batches_file), store, 2, progress.done(), [])
+    report = pipeline.run(plan_groups(batches))
+
+    assert report["confirmed"] == 8
+    assert chain.submitted == [[f"B{i:04d}" for i in range(32, 40)]]
+    assert len(ProgressLog(log_path).confirmed) == 40
+    print("✅ Resume test passed")
+
+
+def test_group_is_logged_before_it_is_sent(tmp_path):
+    """Test that a crash while sending leaves a logged group that the rerun settles instead of resending"""
+    batches_file = tmp_path / "batches.jsonl"
+    _write_batches(batches_file, 20)
+    store = BlockStore(tmp_path / "ipfs")
+    log_path = tmp_path / "progress.jsonl"
+    chain = FakeChain()
+
+    def send_then_crash(signed):
+        assert ProgressLog(log_path).pending[-1]["handle"]["txid"] == signed["txid"]
+        chain.send_group(signed)
+        raise KeyboardInterrupt
+
+    pipeline = TokenizationPipeline(chain.sign_group, send_then_crash, chain.wait_group, ProgressLog(log_path))
+    with pytest.raises(KeyboardInterrupt):
+        pipeline.run(plan_groups(prepare_batches(load_batches(batches_file), store, 2, set(), [])))
+
+    # The group reached the chain; the rerun confirms it and only sends the rest
+    progress = ProgressLog(log_path)
+    pipeline = TokenizationPipeline(*chain.io, progress)
+    assert pipeline.recover() == {"recovered_batches": 16, "expired_groups": 0}
+    report = pipeline.run(plan_groups(prepare_batches(load_batches(batches_file), store, 2, progress.done(), [])))
+    assert report["confirmed"] == 4
+    assert chain.submitted == [[f"B{i:04d}" for i in range(16)], [f"B{i:04d}" for i in range(16, 20)]]
+    print("✅ Groups are logged before they are sent")
+
+
+def test_refused_group_is_expired_but_dropped_send_stays_pending(tmp_path):
+    """Test that a 4xx on send marks the group expired, while a send with no answer leaves it to settle"""
+    batches_file = tmp_path / "batches.jsonl"
+    _write_batches(batches_file, 16)
+    store = BlockStore(tmp_path / "ipfs")
+    chain = FakeChain()
+
+    for error, pending in [(NodeHTTPError(400, "overspend"), 0), (NodeHTTPError(None, "connection dropped"), 1)]:
+        log_path = tmp_path / f"progress_{error.status}.jsonl"
+
+        def send_fails(signed):
+            raise error
+
+        pipeline = TokenizationPipeline(chain.sign_group, send_fails, chain.wait_group, ProgressLog(log_path))
+        with pytest.raises(NodeHTTPError):
+            pipeline.run(plan_groups(prepare_batches(load_batches(batches_file), store, 2, set(), [])))
+
+        progress = ProgressLog(log_path)
+        assert len(progress.pending) == pending
+        assert len(progress.done()) == 16 * pending
+    print("✅ Refused groups are expired; unanswered sends stay pending")
+
+
+def test_recovery_falls_back_to_indexer_when_algod_forgot_the_group():
+    """Test that a group missing from algod's pending pool is found on the indexer or expires after last_valid"""
+    handle = {"txid": "TXB", "txids": {"B0": "TXA", "B1": "TXB"}, "last_valid": 120}
+
+    class ForgetfulAlgod:
+        def __init__(self, last_round):
+            self.last_round = last_round
+
+        def pending_transaction_info(self, txid):
+            raise NodeHTTPError(404, "txn does not exist")
+
+        def status(self):
+            return {"last-round": self.last_round}
+
+        def status_after_block(self, round_number):
+            self.last_round += 1
+            return self.status()
+
+    class Indexer:
+        def __init__(self, confirmed, current_round=130):
+            self.confirmed = confirmed
+            self.current_round = current_round
+
+        def search_transactions(self, txid):
+            found = [{"id": txid, "created-asset-index": self.confirmed[txid]}] if txid in self.confirmed else []
+            return {"transactions": found, "current-round": self.current_round}
+
+    def wait(algod, indexer=None):
+        return make_algosdk_io(algod, "SENDER", "KEY", indexer)[2](handle)
+
+    assert wait(ForgetfulAlgod(500), Indexer({"TXA": 7001, "TXB": 7002})) == {"B0": 7001, "B1": 7002}
+    assert wait(ForgetfulAlgod(500), Indexer({})) is None
+    # An indexer still behind last_valid cannot rule the group out yet
+    lagging = Indexer({}, current_round=118)
+    algod = ForgetfulAlgod(119)
+    algod.status_after_block = lambda round_number: setattr(lagging, "current_round", 121) or {}
+    assert wait(algod, lagging) is None and lagging.current_round == 121
+    # Without an indexer, a 404 is only final once last_valid has passed
+    algod = ForgetfulAlgod(118)
+    assert wait(algod) is None and algod.last_round == 121
+    print("✅ Recovery survives algod's pending pool forgetting old groups")
@@ -0,0 +1,182 @@
+"""
+Tests for transfer pre-flight checks
+====================================
+
+Usage:
+    pytest tests/test_transfer_preflight.py -v
+"""
+
+import base64
+import random
+
+import pytest
+
+from addresses import random_address
+from farm_food_simulator import ContractError, FarmFoodSimulator
+from holder_index import HolderIndex
+from protocol import MIN_TXN_FEE
+from transfer_preflight import (
+    NOT_OPTED_IN, RECIPIENT_BLACKLISTED, PreflightEngine, PreflightIndex, resolve_opt_ins,
+)
+
+
+def _deployed(holders, seed=3):
+    """Simulator with funded holders, zero-balance opt-ins and a few blacklisted accounts"""
+    rng = random.Random(seed)
+    admin = random_address()
+    sim = FarmFoodSimulator(admin)
+    sim.create_asa(admin, "FarmToken", "FT", 100_000_000, 2, sim.ipfs_cid)
+    for address in holders:
+        sim.opt_in(address)
+    for address in holders[:30]:
+        sim.mint_tokens(admin, address, rng.randint(1, 5_000))
+    sim.add_to_blacklist_batch(admin, holders[40:45])
+    return sim
+
+
+def _index_of(sim):
+    """PreflightIndex built the way a sync would: balances plus blacklist box names"""
+    holders = HolderIndex(sim.farm_token_id, sim.app_address)
+    holders.load_snapshot(1, [(address, sim.balance(address)) for address in sim.holdings if sim.balance(address)])
+    index = PreflightIndex(holders, sim.total_supply)
+    index.load_blacklist_boxes(sim.blacklist.boxes)
+    return index
+
+
+def _simulator_resolver(sim, calls):
+    def resolve(addresses):
+        calls.append(list(addresses))
+        return {address: sim.farm_token_id in sim._holding(address) for address in addresses}
+    return resolve
+
+
+def test_verdicts_match_on_chain_outcome():
+    """Test that every submitted verdict agrees with the chain and policy rejections are counted apart"""
+    rng = random.Random(11)
+    holders = [random_address() for _ in range(50)]
+    strangers = [random_address() for _ in range(5)]
+    sim = _deployed(holders)
+    calls = []
+    engine = PreflightEngine(_index_of(sim), _simulator_resolver(sim, calls))
+
+    transfers = [
+        {"sender": rng.choice(holders[:30]), "receiver": rng.choice(holders + strangers),
+         "amount": rng.randint(1, 3_000)}
+        for _ in range(400)
+    ]
+    verdicts = engine.check_batch(transfers)
+
+    for transfer, verdict in zip(transfers, verdicts):
+        if verdict["policy"]:
+            # Held back by the blacklist policy; never submitted
+            continue
+        try:
+            sim.transfer(transfer["sender"], transfer["receiver"], transfer["amount"])
+            outcome = None
+        except ContractError as e:
+            outcome = str(e)
+        assert verdict["reason"] == outcome, (transfer, verdict)
+
+    # Only zero-balance receivers were probed, all in one call
+    assert len(calls) == 1 and set(calls[0]) <= set(holders[30:] + strangers)
+    assert any(v["reason"] == RECIPIENT_BLACKLISTED for v in verdicts)
+    assert any(v["reason"] == NOT_OPTED_IN and v["source"] == "simulate" for v in verdicts)
+    report = engine.report()
+    assert report["rejected"] == sum(not v["ok"] for v in verdicts) > 0
+    assert report["policy_rejected"] == sum(v["policy"] for v in verdicts) > 0
+    assert report["avoided_failures"] == report["rejected"] - report["policy_rejected"]
+    assert report["fees_saved"] == report["avoided_failures"] * MIN_TXN_FEE
+    print(f"✅ {report['checks']} verdicts match; {report['avoided_failure_rate']:.0%} of failures avoided")
+
+
+def test_batch_order_and_remembered_opt_ins():
+    """Test in-batch balance tracking and that probed opt-ins are not probed again"""
+    holders = [random_address() for _ in range(50)]
+    sim = _deployed(holders)
+    calls = []
+    engine = PreflightEngine(_index_of(sim), _simulator_resolver(sim, calls))
+    rich, empty, stranger = holders[0], holders[35], random_address()
+    balance = sim.balance(rich)
+
+    verdicts = engine.check_batch([
+        {"sender": rich, "receiver": empty, "amount": balance},
+        {"sender": empty, "receiver": rich, "amount": balance},
+        {"sender": rich, "receiver": stranger, "amount": 1},
+        {"sender": rich, "receiver": empty, "amount": balance + 1},
+    ])
+    assert [v["ok"] for v in verdicts] == [True, True, False, False]
+    assert verdicts[2]["reason"] == NOT_OPTED_IN and verdicts[3]["reason"] == "Insufficient asset balance"
+
+    engine.check_batch([{"sender": rich, "receiver": empty, "amount": 1}])
+    assert calls == [[empty, stranger]]
+
+    # Without a resolver an unknown opt-in is let through and counted
+    unchecked = PreflightEngine(_index_of(sim)).check_batch([{"sender": rich, "receiver": holders[36], "amount": 1}])
+    assert unchecked[0]["ok"] and unchecked[0]["source"] == "unchecked"
+    print("✅ Batch order test passed")
+
+
+def test_mint_to_blacklisted_recipient_is_an_on_chain_failure():
+    """Test that a mint to a blacklisted recipient is rejected like the contract, not as policy"""
+    holders = [random_address() for _ in range(50)]
+    sim = _deployed(holders)
+    engine = PreflightEngine(_index_of(sim))
+
+    verdict = engine.check_batch([{"sender": sim.app_address, "receiver": holders[40], "amount": 10}])[0]
+    assert verdict["reason"] == RECIPIENT_BLACKLISTED and not verdict["policy"]
+    with pytest.raises(ContractError, match=RECIPIENT_BLACKLISTED):
+        sim.mint_tokens(sim.admin, holders[40], 10)
+    assert engine.report()["avoided_failures"] == 1
+    print("✅ Blacklisted mint recipients are on-chain failures")
+
+
+def test_sync_and_throughput():
+    """Test syncing the blacklist from box listings and local check throughput"""
+    holders = [random_address() for _ in range(50)]
+    sim = _deployed(holders)
+
+    class BoxAlgod:
+        def application_boxes(self, app_id):
+            return {"boxes": [{"name": base64.b64encode(name).decode()} for name in sim.blacklist.boxes]}
+
+    class EmptyIndexer:
+        def asset_transactions(self, asset_id, **params):
+            return {"transactions": []}
+
+    index = _index_of(sim)
+    index.load_blacklist_boxes([])
+    assert not index.is_blacklisted(holders[40])
+    index.sync(BoxAlgod(), EmptyIndexer(), sim.app_id)
+    assert index.is_blacklisted(holders[40]) and not index.is_blacklisted(holders[0])
+
+    engine = PreflightEngine(index, _simulator_resolver(sim, []))
+    rng = random.Random(5)
+    for _ in range(10):
+        engine.check_batch([
+            {"sender": rng.choice(holders), "receiver": rng.choice(holders), "amount": rng.randint(1, 500)}
+            for _ in range(2_000)
+        ])
+    report = engine.report()
+    assert report["checks"] == 20_000 and report["simulated"] <= 20
+    print(f"✅ {report['checks_per_second']:,.0f} checks/sec, {report['fees_saved']} µAlgo in fees saved")
+
+
+def test_opt_in_probes_are_grouped():
+    """Test that probes go 16 to a group and a failed probe only re-sends the rest"""
+    addresses = [random_address() for _ in range(40)]
+    missing = {addresses[3], addresses[20], addresses[21]}
+    groups = []
+
+    def simulate_group(chunk):
+        groups.append(list(chunk))
+        for position, address in enumerate(chunk):
+            if address in missing:
+                return {"failed-at": [position], "failure-message": f"asset 7 missing from {address}"}
+        return {}
+
+    opted_in = resolve_opt_ins(addresses, simulate_group)
+    assert opted_in == {address: address not in missing for address in addresses}
+    assert all(len(group) <= 16 for group in groups)
+    # 0-15 stops at 3; 4-19 pass; 20-35 and 21-36 stop at once; 22-37 and 38-39 pass
+    assert [len(group) for group in groups] == [16, 16, 16, 16, 16, 2]
+    print(f"✅ {len(addresses)} opt-ins settled with {len(groups)} simulate requests")
@@ -0,0 +1,129 @@
+"""
+Tests for the FarmToken transaction ingester
+============================================
+
+Usage:
+    pytest tests/test_txn_ingester.py -v
+"""
+
+import time
+
+import pytest
+
+from addresses import application_address, random_address
+from conftest import ASSET_ID, FakeIndexer, axfer
+from txn_ingester import TransactionIngester, TransactionStore
+
+APP_ID = 1001
+APP_ADDRESS = application_address(APP_ID)
+
+
+def _app_call(txid, round_number, sender, inner):
+    return {
+        "id": txid,
+        "tx-type": "appl",
+        "sender": sender,
+        "confirmed-round": round_number,
+        "round-time": 1_700_000_000 + round_number,
+        "inner-txns": inner,
+    }
+
+
+@pytest.fixture
+def history():
+    admin, alice, bob = random_address(), random_address(), random_address()
+    transactions = [
+        axfer("OPTIN1", 1, alice, alice, 0),
+        _app_call("MINT1", 2, admin, [axfer("", 0, APP_ADDRESS, alice, 500)]),
+        axfer("XFER1", 3, alice, bob, 200),
+        _app_call("BURN1", 4, bob, [axfer("", 0, APP_ADDRESS, APP_ADDRESS, 50, clawback_from=bob)]),
+        axfer("OTHER1", 5, alice, bob, 9, asset_id=ASSET_ID + 1),
+        axfer("XFER2", 6, bob, alice, 25),
+    ]
+    return transactions, alice, bob
+
+
+def test_ingest_classifies_transfers(history):
+    """Test that mints, transfers and burns are recorded and opt-ins skipped"""
+    transactions, alice, bob = history
+    store = TransactionStore(":memory:")
+    report = TransactionIngester(FakeIndexer(transactions), store, ASSET_ID, APP_ID, page_size=2).run()
+
+    assert report == {**report, "pages": 3, "records": 4, "round": 6}
+    assert [row["type"] for row in store.query(kind="mint")] == ["mint"]
+    burn = store.query(kind="burn")[0]
+    assert (burn["id"], burn["from"], burn["amount"]) == ("BURN1/inner/0", bob, 50)
+    assert [row["id"] for row in store.query(address=alice)] == ["XFER2", "XFER1", "MINT1/inner/0"]
+    assert store.query()[0]["timestamp"] == "2023-11-14T22:13:26Z"
+    print("✅ Transfer classification test passed")
+
+
+def test_resume_from_checkpoint(history):
+    """Test that a resumed ingest re-reads only from the checkpoint round, without duplicates"""
+    transactions, _, _ = history
+    store = TransactionStore(":memory:")
+    TransactionIngester(FakeIndexer(transactions), store, ASSET_ID, APP_ID, page_size=2).run(max_pages=2)
+    assert store.checkpoint(ASSET_ID) == 4
+
+    indexer = FakeIndexer(transactions)
+    report = TransactionIngester(indexer, store, ASSET_ID, APP_ID, page_size=2).run()
+
+    assert indexer.requests[0]["min-round"] == 4
+    assert report["records"] == 1
+    assert store.count() == 4
+    print("✅ Checkpoint resume test passed")
+
+
+def test_failed_records_and_search(history):
+    """Test that rejected submissions are stored and replaced once confirmed"""
+    transactions, alice, bob = history
+    store = TransactionStore(":memory:")
+    store.record_failure("XFER2", ASSET_ID, "transfer", bob, alice, 25, "Recipient is blacklisted")
+
+    assert store.query(status="failed")[0]["error"] == "Recipient is blacklisted"
+    TransactionIngester(FakeIndexer(transactions), store, ASSET_ID, APP_ID).run()
+
+    assert store.query(status="failed") == []
+    assert [row["id"] for row in store.search("FER")] == ["XFER2", "XFER1"]
+    assert [row["id"] for row in store.search("BURN1/inner")] == ["BURN1/inner/0"]
+    with pytest.raises(ValueError):
+        store.search("XF")
+    print("✅ Failed record and search test passed")
+
+
+def test_queries_stay_fast_on_large_store():
+    """Test that indexed queries do not scan the table"""
+    store = TransactionStore(":memory:")
+    addresses = [random_address() for _ in range(200)]
+    rows = 50_000
+    records = (
+        {
+            "id": f"TX{i:010d}",
+            "asset_id": ASSET_ID,
+            "round": i,
+            "timestamp": i,
+            "type": ("mint", "transfer", "burn")[i % 3],
+            "status": "completed",
+            "sender": addresses[i % 200],
+            "receiver": addresses[(i * 7) % 200],
+            "amount": i,
+            "error": None,
+        }
+        for i in range(rows)
+    )
+    store.write_page(ASSET_ID, records, rows)
+
+    started = time.perf_counter()
+    burns = store.query(kind="burn", limit=20)
+    mine = store.query(address=addresses[3], limit=20)
+    found = store.search("0000099")
+    elapsed = time.perf_counter() - started
+    print(f"\n   3 queries over {rows} rows: {elapsed * 1000:.2f}ms")
+
+    assert len(burns) == 20 and burns[0]["id"] == "TX0000049997"
+    assert len(mine) == 20
+    assert len(found) == 50
+    plan = " ".join(row[3] for row in store.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM transactions WHERE type = 'burn' ORDER BY timestamp DESC LIMIT 20"
+    ))
+    assert "transactions_type_time" in plan